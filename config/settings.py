@@ -6,15 +6,41 @@ incluyendo variables de entorno, validaciones y configuraciones por defecto.
 """
 
 import os
+import sys
 import logging
-from typing import Optional
+from collections.abc import Mapping
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Type
 from pydantic import field_validator, ValidationError
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import (
+    BaseSettings,
+    EnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Detección de modo testing, calculada una sola vez al importar el módulo.
+# La consulta O(1) a sys.modules va primero; argv solo se recorre si falla.
+_IS_TESTING = 'pytest' in sys.modules or any('test' in arg for arg in map(str.lower, sys.argv))
+
+# Archivo .env resuelto una sola vez respecto a la raíz de la aplicación.
+# En Azure Functions las variables ya vienen inyectadas, así que no se consulta el disco.
+_ENV_FILE: Optional[Path] = (
+    None if os.environ.get("AZURE_FUNCTIONS_ENVIRONMENT")
+    else Path(__file__).resolve().parent.parent / ".env"
+)
+if _ENV_FILE is not None and not _ENV_FILE.is_file():
+    _ENV_FILE = None
+
+
+# Máscara precalculada para evitar construir "*" * n en cada llamada
+_MASK = "*" * 256
+
 
 def sanitize_log_message(message: str) -> str:
     """Sanitiza mensajes para logging removiendo información sensible."""
@@ -22,19 +48,62 @@ def sanitize_log_message(message: str) -> str:
         return ""
     
     # Ocultar tokens y claves API
-    if len(message) > 10:
-        return message[:4] + "*" * (len(message) - 8) + message[-4:]
-    else:
-        return "*" * len(message)
+    length = len(message)
+    if length <= 10:
+        return _MASK[:length]
+    
+    hidden = length - 8
+    mask = _MASK[:hidden] if hidden <= len(_MASK) else "*" * hidden
+    return f"{message[:4]}{mask}{message[-4:]}"
+
+
+class LazyEnvMapping(Mapping):
+    """
+    Vista perezosa de `os.environ`.
+    
+    Resuelve cada variable con `os.environ.get` solo cuando se consulta y
+    cachea el resultado, en lugar de copiar y normalizar todo el entorno.
+    Las claves se buscan tal cual y en sus formas MAYÚSCULA/minúscula.
+    """
+    
+    def __init__(self) -> None:
+        self._cache: Dict[str, Optional[str]] = {}
+    
+    def __getitem__(self, key: str) -> str:
+        try:
+            value = self._cache[key]
+        except KeyError:
+            value = os.environ.get(key)
+            if value is None:
+                value = os.environ.get(key.upper())
+            if value is None:
+                value = os.environ.get(key.lower())
+            self._cache[key] = value
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, value in self._cache.items() if value is not None)
+    
+    def __len__(self) -> int:
+        return sum(1 for value in self._cache.values() if value is not None)
+
+
+class LazyEnvSettingsSource(EnvSettingsSource):
+    """Fuente de variables de entorno que solo lee las claves de los campos declarados."""
+    
+    def _load_env_vars(self) -> Mapping[str, Optional[str]]:
+        return LazyEnvMapping()
 
 
 class Settings(BaseSettings):
     """Configuración de la aplicación con validación estricta de variables críticas."""
     
     model_config = SettingsConfigDict(
-        env_file=".env" if os.path.exists(".env") else None,
+        env_file=_ENV_FILE,
         case_sensitive=False,
-        extra="allow"
+        extra="ignore"
     )
     
     # Variables críticas - la aplicación fallará si no están definidas
@@ -66,6 +135,7 @@ class Settings(BaseSettings):
     blob_account_name: Optional[str] = None
     blob_account_key: Optional[str] = None
     blob_container_name: Optional[str] = None
+    blob_validate_on_init: bool = False
     queue_name: Optional[str] = "doc-processing"
     
     # Variables de OpenAI (para compatibilidad)
@@ -102,14 +172,29 @@ class Settings(BaseSettings):
     azure_computer_vision_endpoint: Optional[str] = None
     azure_computer_vision_api_key: Optional[str] = None
     
-    @field_validator('acs_connection_string')
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        """Sustituye la fuente de entorno por defecto por la resolución perezosa."""
+        return (
+            init_settings,
+            LazyEnvSettingsSource(settings_cls),
+            dotenv_settings,
+            file_secret_settings,
+        )
+    
+    @field_validator('acs_connection_string', mode='before')
     @classmethod
     def validate_acs_connection_string(cls, v):
         """Valida que la cadena de conexión de ACS esté presente y tenga formato válido."""
         # Skip validation in testing mode
-        import sys
-        is_testing = any('test' in arg.lower() for arg in sys.argv) or 'pytest' in sys.modules
-        if is_testing:
+        if _IS_TESTING:
             return v
             
         if not v or not v.strip():
@@ -118,14 +203,12 @@ class Settings(BaseSettings):
             raise ValueError("ACS_CONNECTION_STRING debe tener formato válido de Azure Communication Services")
         return v
     
-    @field_validator('acs_phone_number')
+    @field_validator('acs_phone_number', mode='before')
     @classmethod
     def validate_acs_phone_number(cls, v):
         """Valida que el número de teléfono de ACS esté presente y tenga formato válido."""
         # Skip validation in testing mode
-        import sys
-        is_testing = any('test' in arg.lower() for arg in sys.argv) or 'pytest' in sys.modules
-        if is_testing:
+        if _IS_TESTING:
             return v
             
         if not v or not v.strip():
@@ -134,14 +217,12 @@ class Settings(BaseSettings):
             raise ValueError("ACS_PHONE_NUMBER debe incluir código de país (ej: +1234567890)")
         return v
     
-    @field_validator('openai_api_key')
+    @field_validator('openai_api_key', mode='before')
     @classmethod
     def validate_openai_api_key(cls, v):
         """Valida que la API key de OpenAI esté presente y tenga formato válido."""
         # Skip validation in testing mode
-        import sys
-        is_testing = any('test' in arg.lower() for arg in sys.argv) or 'pytest' in sys.modules
-        if is_testing:
+        if _IS_TESTING:
             return v
             
         if not v or not v.strip():
@@ -150,14 +231,12 @@ class Settings(BaseSettings):
             raise ValueError("OPENAI_API_KEY debe tener formato válido (comenzar con 'sk-')")
         return v
     
-    @field_validator('redis_connection_string')
+    @field_validator('redis_connection_string', mode='before')
     @classmethod
     def validate_redis_connection_string(cls, v):
         """Valida que la cadena de conexión de Redis esté presente."""
         # Skip validation in testing mode
-        import sys
-        is_testing = any('test' in arg.lower() for arg in sys.argv) or 'pytest' in sys.modules
-        if is_testing:
+        if _IS_TESTING:
             return v
             
         if not v or not v.strip():
@@ -220,10 +299,15 @@ class Settings(BaseSettings):
         
         logger.info("Validación de configuraciones completada exitosamente")
     
+    @cached_property
+    def sanitized_acs_phone_number(self) -> str:
+        """Número de teléfono de ACS sanitizado, calculado una sola vez por instancia."""
+        return sanitize_log_message(self.acs_phone_number or "")
+    
     def get_sanitized_settings_summary(self) -> dict:
         """Retorna un resumen de las configuraciones con datos sensibles sanitizados."""
         return {
-            "acs_phone_number": sanitize_log_message(self.acs_phone_number or ""),
+            "acs_phone_number": self.sanitized_acs_phone_number,
             "whatsapp_phone_number_id": self.whatsapp_phone_number_id,
             "log_level": self.log_level,
             "has_whatsapp_config": bool(self.whatsapp_verify_token and self.whatsapp_access_token),
@@ -231,32 +315,36 @@ class Settings(BaseSettings):
             "has_storage_config": bool(self.azure_storage_connection_string),
         }
 
-# Instancia global con validación estricta
-try:
-    settings = Settings()
-    
-    # Solo validar configuraciones críticas si no estamos en modo test
-    import sys
-    is_testing = any('test' in arg.lower() for arg in sys.argv) or 'pytest' in sys.modules
-    
-    if not is_testing:
-        settings.validate_critical_settings()
-        # Log del resumen de configuraciones (sanitizado)
-        summary = settings.get_sanitized_settings_summary()
-        logger.info(f"Configuraciones cargadas: {summary}")
-    else:
-        logger.info("Modo testing detectado - validación de configuraciones críticas omitida")
-    
-except ValidationError as e:
-    logger.error(f"Error de validación en configuraciones: {e}")
-    raise
-except ValueError as e:
-    logger.error(f"Error en configuraciones críticas: {e}")
-    raise
-except Exception as e:
-    logger.error(f"Error inesperado cargando configuraciones: {e}")
-    raise
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Retorna la instancia global de configuraciones."""
-    return settings 
\ No newline at end of file
+    """Retorna la instancia global de configuraciones, construida y validada en el primer uso."""
+    try:
+        instance = Settings()
+        
+        # Solo validar configuraciones críticas si no estamos en modo test
+        if not _IS_TESTING:
+            instance.validate_critical_settings()
+            # Log del resumen de configuraciones (sanitizado)
+            summary = instance.get_sanitized_settings_summary()
+            logger.info(f"Configuraciones cargadas: {summary}")
+        else:
+            logger.info("Modo testing detectado - validación de configuraciones críticas omitida")
+        
+        return instance
+    
+    except ValidationError as e:
+        logger.error(f"Error de validación en configuraciones: {e}")
+        raise
+    except ValueError as e:
+        logger.error(f"Error en configuraciones críticas: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Error inesperado cargando configuraciones: {e}")
+        raise
+
+
+def __getattr__(name: str):
+    """Resuelve `settings` de forma perezosa para mantener `from config.settings import settings`."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,38 @@
+import azure.functions as func
+import json
+import logging
+from datetime import datetime
+from whatsapp_bot.whatsapp_bot import WhatsAppBot
+
+def _to_event_grid_event(event_data: dict) -> func.EventGridEvent:
+    """
+    Convierte el JSON de Event Grid encolado en un func.EventGridEvent.
+    """
+    event_time = event_data.get("eventTime")
+    return func.EventGridEvent(
+        id=event_data.get("id"),
+        data=event_data.get("data"),
+        topic=event_data.get("topic"),
+        subject=event_data.get("subject"),
+        event_type=event_data.get("eventType"),
+        event_time=datetime.fromisoformat(event_time.replace("Z", "+00:00")) if event_time else None,
+        data_version=event_data.get("dataVersion")
+    )
+
+def main(msg: func.QueueMessage) -> None:
+    """
+    Azure Function para procesar eventos de Event Grid (ACS) entregados vía Storage Queue.
+    
+    Un error (incluida una respuesta 5xx del bot) se propaga para que el host
+    reintente el mensaje y lo mueva a la cola poison tras agotar los reintentos.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        event = _to_event_grid_event(json.loads(msg.get_body().decode("utf-8")))
+        bot = WhatsAppBot()
+        response = bot.process_event_grid_event(event)
+        if response.status_code >= 500:
+            raise RuntimeError(f"Error procesando evento {event.id}: HTTP {response.status_code}")
+    except Exception as e:
+        logger.error(f"Error en event_grid_queue_handler: {str(e)}")
+        raise
@@ -10,6 +10,7 @@ import logging
 import json
 import tempfile
 import os
+import numpy as np
 from typing import Dict, Any, Optional
 from pathlib import Path
 from shared_code.azure_blob_storage import blob_storage_service
@@ -61,7 +62,9 @@ def main(msg: func.QueueMessage) -> None:
         
         try:
             # Download file from blob storage
-            download_success = blob_storage_service.download_file(blob_name, temp_file_path)
+            download_success = blob_storage_service.download_file(
+                blob_storage_service.container_name, blob_name, temp_file_path
+            )
             if not download_success:
                 logger.error(f"Failed to download blob: {blob_name}")
                 return
@@ -288,12 +291,10 @@ def store_document_embeddings(
         # Store main document embedding (average of all chunks)
         if embeddings:
             # Calculate average embedding
-            avg_embedding = []
-            embedding_length = len(embeddings[0]["embedding"])
-            
-            for i in range(embedding_length):
-                avg_value = sum(emb["embedding"][i] for emb in embeddings) / len(embeddings)
-                avg_embedding.append(avg_value)
+            avg_embedding = np.mean(
+                np.asarray([emb["embedding"] for emb in embeddings], dtype=np.float32),
+                axis=0
+            )
             
             # Store in Redis
             redis_service.store_embedding(document_id, avg_embedding, document_metadata)
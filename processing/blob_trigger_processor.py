@@ -10,6 +10,7 @@ import logging
 import json
 import tempfile
 import os
+import numpy as np
 from typing import Dict, Any, Optional
 from pathlib import Path
 from shared_code.azure_blob_storage import blob_storage_service
@@ -261,12 +262,10 @@ def store_document_embeddings(
         # Store main document embedding (average of all chunks)
         if embeddings:
             # Calculate average embedding
-            avg_embedding = []
-            embedding_length = len(embeddings[0]["embedding"])
-            
-            for i in range(embedding_length):
-                avg_value = sum(emb["embedding"][i] for emb in embeddings) / len(embeddings)
-                avg_embedding.append(avg_value)
+            avg_embedding = np.mean(
+                np.asarray([emb["embedding"] for emb in embeddings], dtype=np.float32),
+                axis=0
+            )
             
             # Store in Redis
             redis_service.store_embedding(document_id, avg_embedding, document_metadata)
@@ -1,10 +1,13 @@
+import asyncio
 import logging
 import azure.functions as func
-import json
-from shared_code.azure_blob_storage import blob_storage_service
-from shared_code.redis_service import redis_service
+import orjson
 
-def main(req: func.HttpRequest) -> func.HttpResponse:
+# Cuerpos de respuesta estáticos serializados una sola vez
+_OK_BODY = orjson.dumps({"message": "Documento eliminado correctamente de Blob Storage y Redis."})
+_MISSING_PARAMS_BODY = orjson.dumps({"error": "Se requiere blob_name o document_id como parámetro."})
+
+async def main(req: func.HttpRequest) -> func.HttpResponse:
     logger = logging.getLogger(__name__)
     logger.info("Solicitud de eliminación recibida")
     
@@ -14,7 +17,7 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
     if not blob_name and not document_id:
         logger.error("Faltan parámetros: blob_name o document_id")
         return func.HttpResponse(
-            json.dumps({"error": "Se requiere blob_name o document_id como parámetro."}),
+            body=_MISSING_PARAMS_BODY,
             status_code=400,
             mimetype="application/json"
         )
@@ -25,23 +28,45 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         document_id = blob_name  # Ajusta esto según tu lógica real
 
     try:
-        # Eliminar de Blob Storage
+        # Los servicios se importan solo cuando se usan para no abrir
+        # conexiones a Blob Storage o Redis que la solicitud no necesita.
+        # Ambas eliminaciones son independientes y se ejecutan en paralelo.
+        operations = {}
         if blob_name:
-            blob_storage_service.delete_blob(blob_name)
-            logger.info(f"Blob eliminado: {blob_name}")
-        # Eliminar de Redis
+            from shared_code.azure_blob_storage import get_async_blob_storage_service
+            async_blob_storage_service = await get_async_blob_storage_service()
+            operations[f"Blob eliminado: {blob_name}"] = async_blob_storage_service.delete_blob(blob_name)
         if document_id:
-            redis_service.delete_document(document_id)
-            logger.info(f"Documento eliminado de Redis: {document_id}")
+            from shared_code.redis_service import redis_service
+            operations[f"Documento eliminado de Redis: {document_id}"] = asyncio.to_thread(
+                redis_service.delete_document, document_id
+            )
+
+        results = await asyncio.gather(*operations.values(), return_exceptions=True)
+
+        errors = []
+        for success_message, result in zip(operations, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error eliminando documento: {result}")
+                errors.append(result)
+            else:
+                logger.info(success_message)
+
+        if errors:
+            return func.HttpResponse(
+                body=orjson.dumps({"error": str(errors[0])}),
+                status_code=500,
+                mimetype="application/json"
+            )
         return func.HttpResponse(
-            json.dumps({"message": "Documento eliminado correctamente de Blob Storage y Redis."}),
+            body=_OK_BODY,
             status_code=200,
             mimetype="application/json"
         )
     except Exception as e:
         logger.error(f"Error eliminando documento: {e}")
         return func.HttpResponse(
-            json.dumps({"error": str(e)}),
+            body=orjson.dumps({"error": str(e)}),
             status_code=500,
             mimetype="application/json"
-        ) 
\ No newline at end of file
+        )
@@ -11,10 +11,73 @@ import sys
 import time
 import subprocess
 import json
+import multiprocessing
+import threading
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Dict, Any, List, Optional
 import argparse
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+# Límite de ejecución por comando y líneas de salida retenidas para el reporte
+COMMAND_TIMEOUT_SECONDS = 300
+OUTPUT_TAIL_LINES = 200
+
+# Resultado de la última validación de tipos junto al mtime de las fuentes
+TYPE_VALIDATION_CACHE_FILE = ".mypy_last.json"
+# Módulos precargados en el forkserver que ejecuta pytest
+PYTEST_PRELOAD_MODULES = ["pytest", "shared_code", "config.settings"]
+
+# Directorio de tests -> clave de resultados en el reporte
+SUITE_RESULT_KEYS = {
+    "unit": "unit_tests",
+    "integration": "integration_tests",
+    "e2e": "integration_tests",
+    "performance": "performance_tests",
+}
+
+# Secciones del reporte de texto: (título, clave en self.results)
+REPORT_SECTIONS = (
+    ("TESTS UNITARIOS", "unit_tests"),
+    ("TESTS DE INTEGRACIÓN", "integration_tests"),
+    ("TESTS DE PERFORMANCE", "performance_tests"),
+    ("ANÁLISIS DE COBERTURA", "coverage"),
+)
+
+
+def _pytest_worker(pytest_args: List[str], log_path: str) -> None:
+    """Proceso hijo: ejecutar pytest con stdout/stderr redirigidos al log."""
+    import pytest
+    
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        os.dup2(log_file.fileno(), sys.stdout.fileno())
+        os.dup2(log_file.fileno(), sys.stderr.fileno())
+        exit_code = int(pytest.main(pytest_args))
+        sys.stdout.flush()
+        sys.stderr.flush()
+    sys.exit(exit_code)
+
+
+def _create_pytest_context() -> multiprocessing.context.BaseContext:
+    """Contexto forkserver con pytest precargado (spawn donde no existe forkserver)."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(PYTEST_PRELOAD_MODULES)
+    return context
+
+
+_PYTEST_CONTEXT = _create_pytest_context()
+
 
 class TestRunner:
     """Ejecutor de tests con reportes detallados."""
@@ -30,165 +93,244 @@ class TestRunner:
             "coverage": {},
             "errors": []
         }
+        self.report_file: Optional[str] = None
         
         # Crear directorio de reportes si no existe
         os.makedirs(output_dir, exist_ok=True)
     
     def run_command(self, command: List[str], test_type: str) -> Dict[str, Any]:
-        """Ejecutar comando y capturar resultados."""
+        """
+        Ejecutar comando y capturar resultados.
+        
+        La salida se vuelca línea a línea a `<output_dir>/<test_type>.log` y solo
+        se conservan en memoria las últimas líneas para el reporte.
+        """
         print(f"\n{'='*60}")
         print(f"Ejecutando: {' '.join(command)}")
         print(f"{'='*60}")
         
-        start_time = time.time()
+        log_path = os.path.join(self.output_dir, f"{test_type}.log")
+        tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+        start_time = time.monotonic()
         
         try:
-            result = subprocess.run(
+            with open(log_path, 'w', encoding='utf-8') as log_file, subprocess.Popen(
                 command,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutos de timeout
-            )
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=1,
+                text=True
+            ) as process:
+                # El timer garantiza el corte aunque el proceso deje de emitir salida
+                timer = threading.Timer(COMMAND_TIMEOUT_SECONDS, process.kill)
+                timer.start()
+                try:
+                    for line in process.stdout:
+                        log_file.write(line)
+                        tail.append(line)
+                    return_code = process.wait()
+                finally:
+                    timer.cancel()
             
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = time.monotonic() - start_time
+            
+            if duration >= COMMAND_TIMEOUT_SECONDS and return_code != 0:
+                tail.append(f"Timeout después de {COMMAND_TIMEOUT_SECONDS // 60} minutos\n")
+                return_code = -1
             
             return {
                 "command": command,
-                "return_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
+                "return_code": return_code,
+                "log_path": log_path,
+                "tail": "".join(tail),
                 "duration": duration,
-                "success": result.returncode == 0
+                "success": return_code == 0
             }
             
-        except subprocess.TimeoutExpired:
+        except Exception as e:
             return {
                 "command": command,
                 "return_code": -1,
-                "stdout": "",
-                "stderr": "Timeout después de 5 minutos",
-                "duration": 300,
+                "log_path": log_path,
+                "tail": str(e),
+                "duration": time.monotonic() - start_time,
                 "success": False
             }
+    
+    def run_pytest(self, pytest_args: List[str], test_type: str) -> Dict[str, Any]:
+        """
+        Ejecutar pytest.main() en un proceso hijo con pytest ya importado.
+        
+        El proceso se crea desde un forkserver que precarga pytest y los módulos
+        de la aplicación, evitando arrancar un intérprete nuevo por ejecución.
+        """
+        print(f"\n{'='*60}")
+        print(f"Ejecutando: pytest {' '.join(pytest_args)}")
+        print(f"{'='*60}")
+        
+        log_path = os.path.join(self.output_dir, f"{test_type}.log")
+        start_time = time.monotonic()
+        
+        try:
+            process = _PYTEST_CONTEXT.Process(target=_pytest_worker, args=(pytest_args, log_path))
+            process.start()
+            process.join(COMMAND_TIMEOUT_SECONDS)
+            
+            timed_out = process.is_alive()
+            if timed_out:
+                process.kill()
+                process.join()
+            
+            with open(log_path, encoding="utf-8", errors="replace") as log_file:
+                tail = deque(log_file, maxlen=OUTPUT_TAIL_LINES)
+            if timed_out:
+                tail.append(f"Timeout después de {COMMAND_TIMEOUT_SECONDS // 60} minutos\n")
+            
+            return_code = -1 if timed_out else process.exitcode
+            return {
+                "command": ["pytest", *pytest_args],
+                "return_code": return_code,
+                "log_path": log_path,
+                "tail": "".join(tail),
+                "duration": time.monotonic() - start_time,
+                "success": return_code == 0
+            }
+            
         except Exception as e:
             return {
-                "command": command,
+                "command": ["pytest", *pytest_args],
                 "return_code": -1,
-                "stdout": "",
-                "stderr": str(e),
-                "duration": 0,
+                "log_path": log_path,
+                "tail": str(e),
+                "duration": time.monotonic() - start_time,
                 "success": False
             }
     
-    def run_unit_tests(self) -> Dict[str, Any]:
-        """Ejecutar tests unitarios."""
-        print("\n🔬 Ejecutando Tests Unitarios...")
-        
-        # Tests de interfaces
-        interface_result = self.run_command(
-            ["python", "-m", "pytest", "tests/unit/test_interfaces.py", "-v"],
-            "interfaces"
-        )
-        
-        # Tests del contenedor de dependencias
-        container_result = self.run_command(
-            ["python", "-m", "pytest", "tests/unit/test_dependency_container.py", "-v"],
-            "dependency_container"
-        )
-        
-        # Tests del manejador de errores
-        error_handler_result = self.run_command(
-            ["python", "-m", "pytest", "tests/unit/test_error_handler.py", "-v"],
-            "error_handler"
-        )
-        
-        # Tests del procesador de mensajes
-        message_processor_result = self.run_command(
-            ["python", "-m", "pytest", "tests/unit/test_message_processor.py", "-v"],
-            "message_processor"
-        )
+    def run_test_suites(self, paths: List[str], run_name: str = "tests") -> Dict[str, Any]:
+        """
+        Ejecutar pytest una sola vez sobre las rutas indicadas.
+        
+        La ejecución genera un reporte JUnit y uno de cobertura, a partir de los
+        cuales se desglosan los resultados por tipo de test y por módulo.
+        """
+        junit_path = os.path.join(self.output_dir, f"{run_name}_junit.xml")
+        coverage_path = os.path.join(self.output_dir, f"{run_name}_coverage.json")
+        
+        pytest_args = [
+            *paths,
+            "-n", "auto", "--dist=loadfile",
+            "-o", "cache_dir=.pytest_cache",
+            f"--junitxml={junit_path}",
+            "--cov=shared_code",
+            f"--cov-report=json:{coverage_path}",
+            "--cov-report=html",
+        ]
+        run_result = self.run_pytest(pytest_args, run_name)
+        
+        grouped = self.parse_junit_results(junit_path)
+        for results_key, suite_results in grouped.items():
+            self.results[results_key] = suite_results
+        self.results["coverage"] = self.parse_coverage_results(coverage_path, run_result)
+        
+        return run_result
+    
+    def parse_junit_results(self, junit_path: str) -> Dict[str, Dict[str, Any]]:
+        """Agrupar los casos del reporte JUnit por tipo de test y módulo."""
+        grouped: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(junit_path):
+            self.results["errors"].append(f"Reporte JUnit no generado: {junit_path}")
+            return grouped
+        
+        for testcase in ET.parse(junit_path).getroot().iter("testcase"):
+            # classname tiene la forma "tests.<tipo>.<módulo>[.<Clase>]"; en los
+            # errores de colección viene vacío y el módulo aparece en name
+            dotted_name = testcase.get("classname") or testcase.get("name", "")
+            parts = dotted_name.split(".")
+            if len(parts) > 2 and parts[1] in SUITE_RESULT_KEYS:
+                results_key = SUITE_RESULT_KEYS[parts[1]]
+                module_name = parts[2]
+            else:
+                results_key = "unit_tests"
+                module_name = parts[1] if len(parts) > 1 else parts[0]
+            
+            module_result = grouped.setdefault(results_key, {}).setdefault(module_name, {
+                "tests": 0,
+                "failures": 0,
+                "errors": 0,
+                "skipped": 0,
+                "duration": 0.0,
+                "success": True,
+            })
+            module_result["tests"] += 1
+            module_result["duration"] += float(testcase.get("time", 0) or 0)
+            if testcase.find("failure") is not None:
+                module_result["failures"] += 1
+                module_result["success"] = False
+            elif testcase.find("error") is not None:
+                module_result["errors"] += 1
+                module_result["success"] = False
+            elif testcase.find("skipped") is not None:
+                module_result["skipped"] += 1
+        
+        return grouped
+    
+    def parse_coverage_results(self, coverage_path: str, run_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Extraer el resumen de cobertura del reporte JSON de pytest-cov."""
+        if not os.path.exists(coverage_path):
+            return {}
         
-        # Tests de todos los servicios
-        services_result = self.run_command(
-            ["python", "-m", "pytest", "tests/unit/", "-v", "--tb=short"],
-            "all_services"
-        )
+        with open(coverage_path, encoding="utf-8") as f:
+            totals = json.load(f).get("totals", {})
         
         return {
-            "interfaces": interface_result,
-            "dependency_container": container_result,
-            "error_handler": error_handler_result,
-            "message_processor": message_processor_result,
-            "all_services": services_result
+            "shared_code": {
+                "percent_covered": totals.get("percent_covered", 0.0),
+                "covered_lines": totals.get("covered_lines", 0),
+                "num_statements": totals.get("num_statements", 0),
+                "duration": run_result["duration"],
+                "success": run_result["return_code"] in (0, 1),
+            }
         }
     
+    def run_unit_tests(self) -> Dict[str, Any]:
+        """Ejecutar tests unitarios."""
+        print("\n🔬 Ejecutando Tests Unitarios...")
+        self.run_test_suites(["tests/unit/"], "unit")
+        return self.results["unit_tests"]
+    
     def run_integration_tests(self) -> Dict[str, Any]:
         """Ejecutar tests de integración."""
         print("\n🔗 Ejecutando Tests de Integración...")
-        
-        # Tests de integración del sistema completo
-        complete_system_result = self.run_command(
-            ["python", "-m", "pytest", "tests/integration/test_integration_complete_system.py", "-v"],
-            "complete_system"
-        )
-        
-        # Tests de integración existentes
-        existing_integration_result = self.run_command(
-            ["python", "-m", "pytest", "tests/integration/", "-v", "--tb=short"],
-            "existing_integration"
-        )
-        
-        return {
-            "complete_system": complete_system_result,
-            "existing_integration": existing_integration_result
-        }
+        self.run_test_suites(["tests/integration/"], "integration")
+        return self.results["integration_tests"]
     
     def run_performance_tests(self) -> Dict[str, Any]:
         """Ejecutar tests de performance."""
         print("\n⚡ Ejecutando Tests de Performance...")
-        
-        # Tests de benchmarks de performance
-        performance_result = self.run_command(
-            ["python", "-m", "pytest", "tests/performance/test_performance_benchmarks.py", "-v"],
-            "performance_benchmarks"
-        )
-        
-        return {
-            "performance_benchmarks": performance_result
-        }
+        self.run_test_suites(["tests/performance/"], "performance")
+        return self.results["performance_tests"]
     
-    def run_coverage_analysis(self) -> Dict[str, Any]:
-        """Ejecutar análisis de cobertura."""
-        print("\n📊 Ejecutando Análisis de Cobertura...")
-        
-        # Cobertura de tests unitarios
-        unit_coverage_result = self.run_command(
-            ["python", "-m", "pytest", "tests/unit/", "--cov=shared_code", "--cov-report=term-missing"],
-            "unit_coverage"
-        )
+    def run_type_validation(self) -> Dict[str, Any]:
+        """
+        Ejecutar validación de tipos.
         
-        # Cobertura de tests de integración
-        integration_coverage_result = self.run_command(
-            ["python", "-m", "pytest", "tests/integration/", "--cov=shared_code", "--cov-report=term-missing"],
-            "integration_coverage"
-        )
+        Si ningún archivo de `shared_code/` (ni el propio validate_types.py) cambió
+        desde la última ejecución, se reutiliza el resultado cacheado.
+        """
+        print("\n🔍 Ejecutando Validación de Tipos...")
         
-        # Cobertura completa
-        full_coverage_result = self.run_command(
-            ["python", "-m", "pytest", "tests/", "--cov=shared_code", "--cov-report=html", "--cov-report=term-missing"],
-            "full_coverage"
-        )
+        cache_path = os.path.join(self.output_dir, TYPE_VALIDATION_CACHE_FILE)
+        sources = [*Path("shared_code").rglob("*.py"), Path("validate_types.py")]
+        latest_mtime = max((p.stat().st_mtime for p in sources if p.exists()), default=0.0)
         
-        return {
-            "unit_coverage": unit_coverage_result,
-            "integration_coverage": integration_coverage_result,
-            "full_coverage": full_coverage_result
-        }
-    
-    def run_type_validation(self) -> Dict[str, Any]:
-        """Ejecutar validación de tipos."""
-        print("\n🔍 Ejecutando Validación de Tipos...")
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if latest_mtime <= cached["source_mtime"]:
+                print("   Sin cambios en shared_code/ - usando resultado cacheado")
+                return {"mypy_validation": cached["result"]}
+        except (OSError, ValueError, KeyError):
+            pass
         
         # Validación con mypy
         mypy_result = self.run_command(
@@ -196,12 +338,19 @@ class TestRunner:
             "mypy_validation"
         )
         
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"source_mtime": latest_mtime, "result": mypy_result}, f)
+        
         return {
             "mypy_validation": mypy_result
         }
     
     def analyze_results(self) -> Dict[str, Any]:
         """Analizar resultados de todos los tests."""
+        # El análisis agrega entradas a self.results["errors"]; repetirlo duplicaría los fallos
+        if self.results["summary"]:
+            return self.results["summary"]
+        
         print("\n📈 Analizando Resultados...")
         
         # Contar tests exitosos y fallidos
@@ -249,6 +398,16 @@ class TestRunner:
         
         return self.results["summary"]
     
+    @staticmethod
+    def _write_section(f, title: str, section_results: Dict[str, Any]) -> None:
+        """Escribir una sección del reporte de texto con el estado de cada entrada."""
+        lines = [f"{title}\n", "-" * 40 + "\n"]
+        for test_name, result in section_results.items():
+            status = "✅ PASÓ" if result["success"] else "❌ FALLÓ"
+            lines.append(f"{test_name}: {status} ({result['duration']:.2f}s)\n")
+        lines.append("\n")
+        f.writelines(lines)
+    
     def generate_report(self) -> str:
         """Generar reporte completo."""
         print("\n📋 Generando Reporte...")
@@ -256,20 +415,27 @@ class TestRunner:
         # Analizar resultados
         summary = self.analyze_results()
         
+        # Una única lectura del reloj para nombres de archivo y cuerpo del reporte
+        report_time = datetime.now(timezone.utc)
+        report_basename = f"test_report_{report_time.strftime('%Y%m%d_%H%M%S')}"
+        
         # Generar reporte en formato JSON
-        report_file = os.path.join(self.output_dir, f"test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        report_file = os.path.join(self.output_dir, f"{report_basename}.json")
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        with open(report_file, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                f.write(json.dumps(self.results, indent=2, ensure_ascii=False).encode('utf-8'))
         
         # Generar reporte en formato texto
-        text_report_file = os.path.join(self.output_dir, f"test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+        text_report_file = os.path.join(self.output_dir, f"{report_basename}.txt")
         
         with open(text_report_file, 'w', encoding='utf-8') as f:
             f.write("=" * 80 + "\n")
             f.write("REPORTE COMPLETO DE TESTS - FASE 3\n")
             f.write("=" * 80 + "\n")
-            f.write(f"Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Fecha: {report_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Timestamp: {self.results['timestamp']}\n\n")
             
             # Resumen
@@ -281,37 +447,9 @@ class TestRunner:
             f.write(f"Tasa de éxito: {summary['success_rate']:.2f}%\n")
             f.write(f"Estado general: {summary['overall_status']}\n\n")
             
-            # Tests Unitarios
-            f.write("TESTS UNITARIOS\n")
-            f.write("-" * 40 + "\n")
-            for test_name, result in self.results["unit_tests"].items():
-                status = "✅ PASÓ" if result["success"] else "❌ FALLÓ"
-                f.write(f"{test_name}: {status} ({result['duration']:.2f}s)\n")
-            f.write("\n")
-            
-            # Tests de Integración
-            f.write("TESTS DE INTEGRACIÓN\n")
-            f.write("-" * 40 + "\n")
-            for test_name, result in self.results["integration_tests"].items():
-                status = "✅ PASÓ" if result["success"] else "❌ FALLÓ"
-                f.write(f"{test_name}: {status} ({result['duration']:.2f}s)\n")
-            f.write("\n")
-            
-            # Tests de Performance
-            f.write("TESTS DE PERFORMANCE\n")
-            f.write("-" * 40 + "\n")
-            for test_name, result in self.results["performance_tests"].items():
-                status = "✅ PASÓ" if result["success"] else "❌ FALLÓ"
-                f.write(f"{test_name}: {status} ({result['duration']:.2f}s)\n")
-            f.write("\n")
-            
-            # Cobertura
-            f.write("ANÁLISIS DE COBERTURA\n")
-            f.write("-" * 40 + "\n")
-            for test_name, result in self.results["coverage"].items():
-                status = "✅ PASÓ" if result["success"] else "❌ FALLÓ"
-                f.write(f"{test_name}: {status} ({result['duration']:.2f}s)\n")
-            f.write("\n")
+            # Secciones por tipo de test y cobertura
+            for title, results_key in REPORT_SECTIONS:
+                self._write_section(f, title, self.results[results_key])
             
             # Errores
             if self.results["errors"]:
@@ -339,6 +477,7 @@ class TestRunner:
             
             f.write("\n" + "=" * 80 + "\n")
         
+        self.report_file = text_report_file
         return text_report_file
     
     def run_all_tests(self) -> Dict[str, Any]:
@@ -349,21 +488,17 @@ class TestRunner:
         start_time = time.time()
         
         try:
-            # Ejecutar tests unitarios
-            self.results["unit_tests"] = self.run_unit_tests()
-            
-            # Ejecutar tests de integración
-            self.results["integration_tests"] = self.run_integration_tests()
-            
-            # Ejecutar tests de performance
-            self.results["performance_tests"] = self.run_performance_tests()
-            
-            # Ejecutar análisis de cobertura
-            self.results["coverage"] = self.run_coverage_analysis()
+            # Ejecutar todos los tests con cobertura y, en paralelo, la validación
+            # de tipos (mypy es independiente de pytest y solo espera al subproceso)
+            print("\n🧪 Ejecutando Tests Unitarios, de Integración y de Performance con Cobertura...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                tests_future = executor.submit(self.run_test_suites, ["tests/"], "all")
+                type_validation_future = executor.submit(self.run_type_validation)
+                
+                for future in as_completed([tests_future, type_validation_future]):
+                    future.result()
             
-            # Ejecutar validación de tipos
-            type_validation = self.run_type_validation()
-            self.results["type_validation"] = type_validation
+            self.results["type_validation"] = type_validation_future.result()
             
             # Generar reporte
             report_file = self.generate_report()
@@ -421,29 +556,21 @@ def main():
     
     if args.unit_only:
         print("🔬 Ejecutando solo tests unitarios...")
-        runner.results["unit_tests"] = runner.run_unit_tests()
-        runner.results["integration_tests"] = {}
-        runner.results["performance_tests"] = {}
-        runner.results["coverage"] = {}
+        runner.run_unit_tests()
     elif args.integration_only:
         print("🔗 Ejecutando solo tests de integración...")
-        runner.results["unit_tests"] = {}
-        runner.results["integration_tests"] = runner.run_integration_tests()
-        runner.results["performance_tests"] = {}
-        runner.results["coverage"] = {}
+        runner.run_integration_tests()
     elif args.performance_only:
         print("⚡ Ejecutando solo tests de performance...")
-        runner.results["unit_tests"] = {}
-        runner.results["integration_tests"] = {}
-        runner.results["performance_tests"] = runner.run_performance_tests()
-        runner.results["coverage"] = {}
+        runner.run_performance_tests()
     else:
         # Ejecutar todos los tests
         runner.run_all_tests()
     
-    # Generar reporte
-    report_file = runner.generate_report()
-    print(f"\n📄 Reporte generado: {report_file}")
+    # Generar reporte (run_all_tests ya lo genera en la ejecución completa)
+    if runner.report_file is None:
+        report_file = runner.generate_report()
+        print(f"\n📄 Reporte generado: {report_file}")
     
     # Retornar código de salida basado en el éxito
     summary = runner.results["summary"]
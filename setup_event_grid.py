@@ -6,14 +6,34 @@ Este script te ayuda a configurar Event Grid para recibir eventos de WhatsApp
 desde Azure Communication Services.
 """
 
+import asyncio
 import os
 import json
 import requests
+from functools import lru_cache
 from typing import Dict, Any, Optional
+from azure.core.credentials import TokenCredential
 from azure.identity import DefaultAzureCredential
 from azure.mgmt.eventgrid import EventGridManagementClient
 from azure.mgmt.communication import CommunicationServiceManagementClient
-from azure.mgmt.resource import ResourceManagementClient
+
+# Las operaciones de Event Grid suelen terminar en segundos; el intervalo por
+# defecto del SDK (30 s) haría que casi todo el tiempo se pierda esperando
+LRO_POLLING_INTERVAL_SECONDS = 2
+
+# Los eventos se encolan en Storage Queue (consumida por event_grid_queue_handler)
+# en lugar de llamar al webhook de la Function directamente
+EVENTS_QUEUE_NAME = "whatsapp-events"
+DEAD_LETTER_CONTAINER_NAME = "whatsapp-events-deadletter"
+MAX_DELIVERY_ATTEMPTS = 10
+EVENT_TIME_TO_LIVE_MINUTES = 1440
+
+@lru_cache(maxsize=None)
+def get_eventgrid_client(credential: TokenCredential, subscription_id: str) -> EventGridManagementClient:
+    """
+    Devuelve el cliente de Event Grid, creándolo solo en el primer uso.
+    """
+    return EventGridManagementClient(credential, subscription_id)
 
 def setup_event_grid_for_acs():
     """
@@ -25,37 +45,20 @@ def setup_event_grid_for_acs():
     subscription_id = input("Ingresa tu Subscription ID: ")
     resource_group = input("Ingresa el nombre del Resource Group: ")
     acs_resource_name = input("Ingresa el nombre del recurso de Azure Communication Services: ")
-    function_app_name = input("Ingresa el nombre de tu Function App: ")
+    storage_account_id = input("Ingresa el Resource ID de la Storage Account de la Function App: ")
     location = input("Ingresa la ubicación (ej: westus2): ")
     
     try:
-        # Inicializar credenciales
+        # Una sola credencial compartida; los clientes se crean al usarse
         credential = DefaultAzureCredential()
         
-        # Clientes de Azure
-        eventgrid_client = EventGridManagementClient(credential, subscription_id)
-        communication_client = CommunicationServiceManagementClient(credential, subscription_id)
-        resource_client = ResourceManagementClient(credential, subscription_id)
-        
         print("✅ Credenciales de Azure configuradas correctamente")
         
-        # 1. Crear Event Grid Topic
         topic_name = f"{acs_resource_name}-whatsapp-events"
-        topic_endpoint = create_event_grid_topic(
-            eventgrid_client, resource_group, topic_name, location
-        )
-        
-        # 2. Crear Event Subscription
-        subscription_name = f"{acs_resource_name}-whatsapp-subscription"
-        create_event_subscription(
-            eventgrid_client, resource_group, topic_name, subscription_name,
-            function_app_name, location
-        )
-        
-        # 3. Configurar ACS para enviar eventos
-        configure_acs_events(
-            communication_client, resource_group, acs_resource_name, topic_endpoint
-        )
+        topic_endpoint = asyncio.run(run_setup_steps(
+            credential, subscription_id, resource_group, acs_resource_name,
+            topic_name, storage_account_id, location
+        ))
         
         print("\n🎉 ¡Configuración completada!")
         print(f"Event Grid Topic: {topic_name}")
@@ -67,8 +70,46 @@ def setup_event_grid_for_acs():
     except Exception as e:
         print(f"❌ Error durante la configuración: {e}")
 
+async def run_setup_steps(
+    credential: TokenCredential,
+    subscription_id: str,
+    resource_group: str,
+    acs_resource_name: str,
+    topic_name: str,
+    storage_account_id: str,
+    location: str
+) -> str:
+    """
+    Ejecuta los pasos de configuración respetando sus dependencias.
+    
+    La suscripción y la configuración de ACS solo dependen del topic, así que
+    se ejecutan en paralelo una vez creado. Devuelve el endpoint del topic.
+    """
+    # 1. Crear Event Grid Topic
+    topic_endpoint = await asyncio.to_thread(
+        create_event_grid_topic,
+        credential, subscription_id, resource_group, topic_name, location
+    )
+    
+    # 2. Crear Event Subscription y 3. Configurar ACS para enviar eventos
+    subscription_name = f"{acs_resource_name}-whatsapp-subscription"
+    await asyncio.gather(
+        asyncio.to_thread(
+            create_event_subscription,
+            credential, subscription_id, resource_group, topic_name, subscription_name,
+            storage_account_id
+        ),
+        asyncio.to_thread(
+            configure_acs_events,
+            credential, subscription_id, resource_group, acs_resource_name, topic_endpoint
+        )
+    )
+    
+    return topic_endpoint
+
 def create_event_grid_topic(
-    client: EventGridManagementClient,
+    credential: TokenCredential,
+    subscription_id: str,
     resource_group: str,
     topic_name: str,
     location: str
@@ -78,13 +119,15 @@ def create_event_grid_topic(
     """
     print(f"📝 Creando Event Grid Topic: {topic_name}")
     
+    client = get_eventgrid_client(credential, subscription_id)
     topic = client.topics.begin_create_or_update(
         resource_group,
         topic_name,
         {
             "location": location,
             "inputSchema": "EventGridSchema"
-        }
+        },
+        polling_interval=LRO_POLLING_INTERVAL_SECONDS
     ).result()
     
     endpoint = topic.endpoint
@@ -92,30 +135,44 @@ def create_event_grid_topic(
     return endpoint
 
 def create_event_subscription(
-    client: EventGridManagementClient,
+    credential: TokenCredential,
+    subscription_id: str,
     resource_group: str,
     topic_name: str,
     subscription_name: str,
-    function_app_name: str,
-    location: str
+    storage_account_id: str
 ):
     """
-    Crea una suscripción de eventos para la Function App.
+    Crea una suscripción de eventos que entrega en la Storage Queue de la Function App.
+    
+    La cola desacopla la entrega del arranque en frío de la Function y evita las
+    reentregas del webhook cuando el procesamiento supera su timeout; los eventos
+    que agotan los reintentos se guardan en un contenedor de dead-letter.
     """
     print(f"📝 Creando Event Subscription: {subscription_name}")
     
-    # URL del webhook de la Function App
-    webhook_url = f"https://{function_app_name}.azurewebsites.net/api/whatsapp-bot"
-    
+    client = get_eventgrid_client(credential, subscription_id)
     event_subscription = client.event_subscriptions.begin_create_or_update(
         resource_group,
         topic_name,
         subscription_name,
         {
             "destination": {
-                "endpointType": "WebHook",
+                "endpointType": "StorageQueue",
                 "properties": {
-                    "endpointUrl": webhook_url
+                    "resourceId": storage_account_id,
+                    "queueName": EVENTS_QUEUE_NAME
+                }
+            },
+            "retryPolicy": {
+                "maxDeliveryAttempts": MAX_DELIVERY_ATTEMPTS,
+                "eventTimeToLiveInMinutes": EVENT_TIME_TO_LIVE_MINUTES
+            },
+            "deadLetterDestination": {
+                "endpointType": "StorageBlob",
+                "properties": {
+                    "resourceId": storage_account_id,
+                    "blobContainerName": DEAD_LETTER_CONTAINER_NAME
                 }
             },
             "filter": {
@@ -125,13 +182,15 @@ def create_event_subscription(
                     "Microsoft.Communication.AdvancedMessageReadStatusUpdated"
                 ]
             }
-        }
+        },
+        polling_interval=LRO_POLLING_INTERVAL_SECONDS
     ).result()
     
-    print(f"✅ Event Subscription creada: {subscription_name}")
+    print(f"✅ Event Subscription creada: {subscription_name} -> cola {EVENTS_QUEUE_NAME}")
 
 def configure_acs_events(
-    client: CommunicationServiceManagementClient,
+    credential: TokenCredential,
+    subscription_id: str,
     resource_group: str,
     acs_name: str,
     topic_endpoint: str
@@ -142,6 +201,7 @@ def configure_acs_events(
     print(f"📝 Configurando eventos en ACS: {acs_name}")
     
     # Obtener el recurso de ACS
+    client = CommunicationServiceManagementClient(credential, subscription_id)
     acs_resource = client.communication_services.get(resource_group, acs_name)
     
     # Configurar eventos (esto requeriría la API específica de ACS)
@@ -162,13 +222,17 @@ def generate_env_config(topic_endpoint: str):
     print("EVENT_GRID_WEBHOOK_SECRET=<genera una clave secreta>")
     print("=" * 50)
 
-def get_topic_key(subscription_id: str, resource_group: str, topic_name: str) -> str:
+def get_topic_key(
+    subscription_id: str,
+    resource_group: str,
+    topic_name: str,
+    credential: Optional[TokenCredential] = None
+) -> str:
     """
     Obtiene la clave del Event Grid Topic.
     """
     try:
-        credential = DefaultAzureCredential()
-        client = EventGridManagementClient(credential, subscription_id)
+        client = get_eventgrid_client(credential or DefaultAzureCredential(), subscription_id)
         
         keys = client.topics.list_shared_access_keys(resource_group, topic_name)
         return keys.key1
@@ -6,17 +6,161 @@ documents in Azure Blob Storage with production-grade error handling
 and comprehensive logging.
 """
 
+import asyncio
 import logging
 import os
-from typing import Optional, List, Dict, Any, BinaryIO
-from datetime import datetime, timezone
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
-from azure.core.exceptions import AzureError, ResourceNotFoundError, ClientAuthenticationError
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, List, Dict, Any, AsyncIterator, BinaryIO, Iterable, Iterator, Tuple, Union
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from cachetools import LRUCache, TTLCache
+from azure.storage.blob import (
+    BlobServiceClient, BlobClient, ContainerClient, ContentSettings, BlobSasPermissions, generate_blob_sas
+)
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+from azure.core import MatchConditions
+from azure.core.exceptions import AzureError, ResourceNotFoundError, ResourceNotModifiedError, ClientAuthenticationError
+from azure.core.pipeline.transport import RequestsTransport
 from config.settings import settings
 from shared_code.interfaces import IBlobStorageService
+from shared_code.circuit_breaker import tracks_health
 
 logger = logging.getLogger(__name__)
 
+# Concurrency knobs for listing blobs together with their properties
+LIST_PROPERTIES_BATCH_SIZE = 100
+LIST_PROPERTIES_MAX_CONCURRENCY = 32
+
+# Maximum page size accepted by the List Blobs operation
+LIST_RESULTS_PER_PAGE = 5000
+
+# Exponential backoff used while polling server-side copies
+COPY_POLL_INITIAL_DELAY_SECONDS = 0.5
+COPY_POLL_MAX_DELAY_SECONDS = 8.0
+COPY_POLL_TIMEOUT_SECONDS = 300.0
+
+# Maximum number of sub-requests allowed in a single Blob Batch request
+DELETE_BATCH_SIZE = 256
+
+# Short-lived cache of blob_exists results
+BLOB_EXISTS_CACHE_MAXSIZE = 10_000
+BLOB_EXISTS_CACHE_TTL_SECONDS = 60
+
+# Downloads whose ETag is remembered for conditional re-downloads
+DOWNLOAD_ETAGS_CACHE_MAXSIZE = 10_000
+
+# Transfer tuning: 4 MiB blocks/ranges and parallel block PUTs / range GETs
+TRANSFER_CHUNK_SIZE = 4 * 1024 * 1024
+TRANSFER_MAX_CONCURRENCY = 8
+TRANSFER_CLIENT_OPTIONS: Dict[str, Any] = {
+    "max_block_size": TRANSFER_CHUNK_SIZE,
+    "max_single_put_size": TRANSFER_CHUNK_SIZE,
+    "max_single_get_size": TRANSFER_CHUNK_SIZE,
+    "max_chunk_get_size": TRANSFER_CHUNK_SIZE
+}
+
+# Exponential backoff for transient failures and HTTP connection pool size
+RETRY_OPTIONS: Dict[str, Any] = {
+    "retry_total": 5,
+    "retry_backoff_factor": 0.8,
+    "retry_backoff_max": 30
+}
+HTTP_POOL_SIZE = 64
+
+# Timeout for fetching a remote file streamed into a blob, in seconds
+SOURCE_DOWNLOAD_TIMEOUT_SECONDS = 60
+
+
+# HTTP session shared by every blob client so warm instances reuse pooled
+# keep-alive connections instead of paying a new TLS handshake. The pool is
+# sized for parallel block transfers instead of the default 10 connections.
+_shared_session = requests.Session()
+_shared_session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+)
+
+
+@lru_cache(maxsize=1)
+def _get_blob_service_client(connection_string: str) -> BlobServiceClient:
+    """Return the BlobServiceClient for a connection string, reusing it across instances."""
+    return BlobServiceClient.from_connection_string(
+        connection_string,
+        transport=RequestsTransport(session=_shared_session, session_owner=False),
+        **RETRY_OPTIONS,
+        **TRANSFER_CLIENT_OPTIONS
+    )
+
+
+def _content_settings(content_type: Optional[str]) -> Optional[ContentSettings]:
+    """Build the content settings for an upload from its content type."""
+    return ContentSettings(content_type=content_type) if content_type else None
+
+
+def _upload_metadata(base: Dict[str, str], metadata: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Merge caller metadata over the metadata recorded by an upload method."""
+    upload_metadata = dict(base)
+    if metadata:
+        upload_metadata.update(metadata)
+    return upload_metadata
+
+
+def _upload_options(
+    metadata: Dict[str, str],
+    content_type: Optional[str],
+    length: Optional[int]
+) -> Dict[str, Any]:
+    """Build the upload_blob keyword arguments shared by the sync and async services."""
+    return {
+        "length": length,
+        "metadata": metadata,
+        "overwrite": True,
+        "content_settings": _content_settings(content_type),
+        "max_concurrency": TRANSFER_MAX_CONCURRENCY
+    }
+
+
+def _download_conditions(etag: Optional[str]) -> Dict[str, Any]:
+    """Build the conditional GET arguments that skip an unchanged blob."""
+    return {"etag": etag, "match_condition": MatchConditions.IfModified} if etag else {}
+
+
+def _blob_to_dict(blob: Any, include_metadata: bool = True) -> Dict[str, Any]:
+    """Build the blob information dictionary returned by list_blobs."""
+    blob_info = {
+        "name": blob.name,
+        "size": blob.size,
+        "last_modified": blob.last_modified,
+        "content_type": blob.content_settings.content_type,
+        "etag": blob.etag
+    }
+    
+    if include_metadata and blob.metadata:
+        blob_info["metadata"] = blob.metadata
+    
+    return blob_info
+
+
+def _properties_to_dict(blob_name: str, properties: Any) -> Dict[str, Any]:
+    """Build the blob properties dictionary returned by get_blob_properties."""
+    return {
+        "name": blob_name,
+        "size": properties.size,
+        "last_modified": properties.last_modified,
+        "content_type": properties.content_settings.content_type,
+        "etag": properties.etag,
+        "metadata": properties.metadata or {},
+        "blob_type": properties.blob_type,
+        "lease_status": properties.lease.status if properties.lease else None
+    }
+
+
 class AzureBlobStorageService(IBlobStorageService):
     """Service class for Azure Blob Storage operations with production-grade features."""
     
@@ -26,6 +170,16 @@ class AzureBlobStorageService(IBlobStorageService):
             self.connection_string = settings.azure_storage_connection_string
             self.container_name = settings.blob_container_name
             self.account_name = settings.blob_account_name
+            self._exists_cache: TTLCache = TTLCache(
+                maxsize=BLOB_EXISTS_CACHE_MAXSIZE,
+                ttl=BLOB_EXISTS_CACHE_TTL_SECONDS
+            )
+            # TTLCache is not thread-safe and the batch helpers run transfers in worker threads
+            self._exists_cache_lock = threading.Lock()
+            # blob_name -> (etag, local path) of the last completed download,
+            # least recently used entries evicted first
+            self._download_etags: LRUCache = LRUCache(maxsize=DOWNLOAD_ETAGS_CACHE_MAXSIZE)
+            self._download_etags_lock = threading.Lock()
             
             # Initialize clients
             if not self.connection_string:
@@ -33,15 +187,15 @@ class AzureBlobStorageService(IBlobStorageService):
             if not self.container_name:
                 raise ValueError("Blob container name is required")
                 
-            self.blob_service_client = BlobServiceClient.from_connection_string(
-                self.connection_string
-            )
+            self.blob_service_client = _get_blob_service_client(self.connection_string)
             self.container_client = self.blob_service_client.get_container_client(
                 self.container_name
             )
             
-            # Validate connection and container
-            self._validate_connection()
+            # Validate connection and container only when requested; the first
+            # real operation surfaces connectivity errors anyway
+            if settings.blob_validate_on_init:
+                self._validate_connection()
             
             logger.info(f"Azure Blob Storage service initialized successfully for container: {self.container_name}")
             
@@ -70,6 +224,7 @@ class AzureBlobStorageService(IBlobStorageService):
     def upload_file(
         self, 
         file_path: str, 
+        container_name: str,
         blob_name: str, 
         metadata: Optional[Dict[str, str]] = None,
         content_type: Optional[str] = None
@@ -79,6 +234,8 @@ class AzureBlobStorageService(IBlobStorageService):
         
         Args:
             file_path: Local path to the file to upload
+            container_name: Target container (ignored; the service is bound to
+                the configured container)
             blob_name: Name to assign to the blob in storage
             metadata: Optional metadata to attach to the blob
             content_type: Optional content type for the blob
@@ -92,34 +249,23 @@ class AzureBlobStorageService(IBlobStorageService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate file exists
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"Source file not found: {file_path}")
-            
-            # Get file size for logging
-            file_size = os.path.getsize(file_path)
-            
-            # Prepare metadata
-            upload_metadata = {
-                "upload_date": datetime.now(timezone.utc).isoformat(),
-                "file_size": str(file_size),
-                "source_path": file_path
-            }
-            if metadata:
-                upload_metadata.update(metadata)
-            
             blob_client = self.container_client.get_blob_client(blob_name)
             
-            # Upload with content type if specified
+            # A single open + fstat replaces the exists/getsize lookups;
+            # open() raises FileNotFoundError for missing files
             with open(file_path, "rb") as data:
-                blob_client.upload_blob(
-                    data, 
-                    metadata=upload_metadata, 
-                    overwrite=True,
-                    content_settings=None if not content_type else 
-                        blob_client.get_blob_properties().content_settings
+                file_size = os.fstat(data.fileno()).st_size
+                
+                upload_metadata = _upload_metadata(
+                    {"file_size": str(file_size), "source_path": file_path}, metadata
                 )
+                
+                # Upload with content type if specified; a known length lets the
+                # SDK take the single-PUT path for small files
+                blob_client.upload_blob(data, **_upload_options(upload_metadata, content_type, file_size))
             
+            with self._exists_cache_lock:
+                self._exists_cache.pop(blob_name, None)
             blob_url = blob_client.url
             logger.info(f"File uploaded successfully: {blob_name} ({file_size} bytes) -> {blob_url}")
             return blob_url
@@ -136,19 +282,21 @@ class AzureBlobStorageService(IBlobStorageService):
 
     def upload_stream(
         self, 
-        data_stream: BinaryIO, 
+        data_stream: Union[BinaryIO, Iterable[bytes]], 
         blob_name: str, 
         metadata: Optional[Dict[str, str]] = None,
-        content_type: Optional[str] = None
+        content_type: Optional[str] = None,
+        length: Optional[int] = None
     ) -> str:
         """
         Upload data from a stream to Azure Blob Storage.
         
         Args:
-            data_stream: Binary stream containing the data to upload
+            data_stream: Binary stream, or iterable of byte chunks, with the data to upload
             blob_name: Name to assign to the blob in storage
             metadata: Optional metadata to attach to the blob
             content_type: Optional content type for the blob
+            length: Size of the data, if known; lets small uploads take the single-PUT path
             
         Returns:
             str: URL of the uploaded blob
@@ -158,22 +306,13 @@ class AzureBlobStorageService(IBlobStorageService):
             Exception: For other unexpected errors
         """
         try:
-            # Prepare metadata
-            upload_metadata = {
-                "upload_date": datetime.now(timezone.utc).isoformat(),
-                "upload_method": "stream"
-            }
-            if metadata:
-                upload_metadata.update(metadata)
-            
+            upload_metadata = _upload_metadata({"upload_method": "stream"}, metadata)
             blob_client = self.container_client.get_blob_client(blob_name)
             
-            blob_client.upload_blob(
-                data_stream, 
-                metadata=upload_metadata, 
-                overwrite=True
-            )
+            blob_client.upload_blob(data_stream, **_upload_options(upload_metadata, content_type, length))
             
+            with self._exists_cache_lock:
+                self._exists_cache.pop(blob_name, None)
             blob_url = blob_client.url
             logger.info(f"Stream uploaded successfully: {blob_name} -> {blob_url}")
             return blob_url
@@ -185,31 +324,64 @@ class AzureBlobStorageService(IBlobStorageService):
             logger.error(f"Unexpected error uploading stream {blob_name}: {e}")
             raise
 
-    def download_file(self, blob_name: str, destination_path: str) -> bool:
+    def download_file(
+        self,
+        container_name: str,
+        blob_name: str,
+        destination_path: str,
+        etag: Optional[str] = None,
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY
+    ) -> bool:
         """
         Download a file from Azure Blob Storage.
         
+        When the same blob was already downloaded to the same existing path (or
+        an etag is given), a conditional GET is sent and an unchanged blob is
+        not transferred again.
+        
         Args:
+            container_name: Source container (ignored; the service is bound to
+                the configured container)
             blob_name: Name of the blob to download
             destination_path: Local path where to save the file
+            etag: Optional ETag of the local copy
+            max_concurrency: Parallel range GETs used for blobs larger than one chunk
             
         Returns:
-            bool: True if download successful
+            bool: True if downloaded, False if the blob was not modified and
+                the local copy was kept
             
         Raises:
             ResourceNotFoundError: If blob doesn't exist
             AzureError: If download fails due to Azure service issues
             Exception: For other unexpected errors
         """
+        # Reuse the ETag of a previous download to the same destination
+        with self._download_etags_lock:
+            cached = self._download_etags.get(blob_name)
+        if etag is None and cached and cached[1] == destination_path and os.path.exists(destination_path):
+            etag = cached[0]
+        
         try:
             blob_client = self.container_client.get_blob_client(blob_name)
             
             # Ensure destination directory exists
             os.makedirs(os.path.dirname(destination_path), exist_ok=True)
             
+            try:
+                download_stream = blob_client.download_blob(
+                    max_concurrency=max_concurrency,
+                    **_download_conditions(etag)
+                )
+            except ResourceNotModifiedError:
+                logger.info(f"Blob not modified, keeping local copy: {blob_name} -> {destination_path}")
+                return False
+            
             with open(destination_path, "wb") as download_file:
-                download_stream = blob_client.download_blob()
-                download_file.write(download_stream.readall())
+                # Write range by range so memory stays bounded by the chunk size
+                download_stream.readinto(download_file)
+            with self._download_etags_lock:
+                self._download_etags[blob_name] = (download_stream.properties.etag, destination_path)
             
             file_size = os.path.getsize(destination_path)
             logger.info(f"File downloaded successfully: {blob_name} -> {destination_path} ({file_size} bytes)")
@@ -225,6 +397,80 @@ class AzureBlobStorageService(IBlobStorageService):
             logger.error(f"Failed to download blob {blob_name}: {e}")
             raise
 
+    def upload_files_batch(
+        self,
+        files: List[Tuple[str, str, str]],
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY
+    ) -> Dict[str, Optional[str]]:
+        """
+        Upload several local files concurrently.
+        
+        Small files are latency bound, so up to max_concurrency uploads run at
+        once over the shared connection pool (capped at its HTTP_POOL_SIZE
+        connections). Individual failures do not abort the batch.
+        
+        Args:
+            files: (file_path, container_name, blob_name) tuples, as for upload_file
+            max_concurrency: Maximum number of uploads in flight
+            
+        Returns:
+            Dict[str, Optional[str]]: Blob URL per blob name, or None if its upload failed
+        """
+        if not files:
+            return {}
+        
+        def upload(item: Tuple[str, str, str]) -> Tuple[str, Optional[str]]:
+            file_path, container_name, blob_name = item
+            try:
+                return blob_name, self.upload_file(file_path, container_name, blob_name)
+            except Exception:
+                # upload_file already logged the failure
+                return blob_name, None
+        
+        workers = max(1, min(max_concurrency, HTTP_POOL_SIZE, len(files)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blob-upload") as executor:
+            results = dict(executor.map(upload, files))
+        
+        uploaded_count = sum(url is not None for url in results.values())
+        logger.info(f"Batch uploaded {uploaded_count}/{len(results)} files")
+        return results
+
+    def download_files_batch(
+        self,
+        files: List[Tuple[str, str, str]],
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY
+    ) -> Dict[str, bool]:
+        """
+        Download several blobs concurrently.
+        
+        Args:
+            files: (container_name, blob_name, destination_path) tuples, as for download_file
+            max_concurrency: Maximum number of downloads in flight
+            
+        Returns:
+            Dict[str, bool]: Per blob name, True if the local copy is up to date
+                (downloaded or not modified), False if its download failed
+        """
+        if not files:
+            return {}
+        
+        def download(item: Tuple[str, str, str]) -> Tuple[str, bool]:
+            container_name, blob_name, destination_path = item
+            try:
+                # One range GET per blob: the batch already provides the parallelism
+                self.download_file(container_name, blob_name, destination_path, max_concurrency=1)
+                return blob_name, True
+            except Exception:
+                # download_file already logged the failure
+                return blob_name, False
+        
+        workers = max(1, min(max_concurrency, HTTP_POOL_SIZE, len(files)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blob-download") as executor:
+            results = dict(executor.map(download, files))
+        
+        logger.info(f"Batch downloaded {sum(results.values())}/{len(results)} files")
+        return results
+
     def download_stream(self, blob_name: str) -> Any:
         """
         Download a blob as a stream.
@@ -257,46 +503,116 @@ class AzureBlobStorageService(IBlobStorageService):
             logger.error(f"Failed to download blob stream {blob_name}: {e}")
             raise
 
-    def list_blobs(
+    def download_chunks(self, blob_name: str) -> Iterator[bytes]:
+        """
+        Download a blob as an iterator of byte chunks.
+        
+        Chunks are fetched as the iterator is consumed, so the blob can be
+        forwarded or processed without holding it in memory or on disk.
+        
+        Args:
+            blob_name: Name of the blob to download
+            
+        Returns:
+            Iterator[bytes]: Blob content in chunks of up to TRANSFER_CHUNK_SIZE bytes
+            
+        Raises:
+            ResourceNotFoundError: If blob doesn't exist
+            AzureError: If download fails due to Azure service issues
+        """
+        return self.download_stream(blob_name).chunks()
+
+    def upload_from_url(
+        self,
+        source_url: str,
+        blob_name: str,
+        headers: Optional[Dict[str, str]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None
+    ) -> str:
+        """
+        Stream a remote file (e.g. WhatsApp media) straight into a blob.
+        
+        The HTTP response body is piped into upload_stream chunk by chunk,
+        with no intermediate file.
+        
+        Args:
+            source_url: URL of the file to fetch
+            blob_name: Name to assign to the blob in storage
+            headers: Optional request headers (e.g. the Graph API bearer token)
+            metadata: Optional metadata to attach to the blob
+            content_type: Content type for the blob; defaults to the response's
+            
+        Returns:
+            str: URL of the uploaded blob
+            
+        Raises:
+            httpx.HTTPError: If the source cannot be fetched
+            AzureError: If upload fails due to Azure service issues
+        """
+        try:
+            with httpx.stream(
+                "GET",
+                source_url,
+                headers=headers,
+                timeout=SOURCE_DOWNLOAD_TIMEOUT_SECONDS,
+                follow_redirects=True
+            ) as response:
+                response.raise_for_status()
+                
+                # Content-Length is the size on the wire; it only matches the
+                # decoded bytes when the body is not content-encoded
+                content_length = response.headers.get("content-length")
+                length = (
+                    int(content_length)
+                    if content_length and "content-encoding" not in response.headers
+                    else None
+                )
+                
+                return self.upload_stream(
+                    response.iter_bytes(TRANSFER_CHUNK_SIZE),
+                    blob_name,
+                    metadata=metadata,
+                    content_type=content_type or response.headers.get("content-type"),
+                    length=length
+                )
+                
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch source for blob {blob_name}: {e}")
+            raise
+
+    def iter_blobs(
         self, 
         name_starts_with: Optional[str] = None,
         include_metadata: bool = True
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[Dict[str, Any]]:
         """
-        List blobs in the container with optional filtering.
+        Lazily iterate over blobs in the container with optional filtering.
+        
+        Blobs are requested in pages of LIST_RESULTS_PER_PAGE (the service
+        maximum) and yielded as each page arrives, so memory stays O(page) and
+        callers can start working before the last page is listed.
         
         Args:
             name_starts_with: Optional prefix to filter blob names
             include_metadata: Whether to include blob metadata in results
             
-        Returns:
-            List[Dict[str, Any]]: List of blob information dictionaries
+        Yields:
+            Dict[str, Any]: Blob information dictionary
             
         Raises:
             AzureError: If listing fails due to Azure service issues
             Exception: For other unexpected errors
         """
         try:
-            blobs = []
-            blob_list = self.container_client.list_blobs(name_starts_with=name_starts_with)
+            blob_list = self.container_client.list_blobs(
+                name_starts_with=name_starts_with,
+                results_per_page=LIST_RESULTS_PER_PAGE
+            )
             
             for blob in blob_list:
-                blob_info = {
-                    "name": blob.name,
-                    "size": blob.size,
-                    "last_modified": blob.last_modified,
-                    "content_type": blob.content_settings.content_type,
-                    "etag": blob.etag
-                }
+                yield _blob_to_dict(blob, include_metadata)
                 
-                if include_metadata and blob.metadata:
-                    blob_info["metadata"] = blob.metadata
-                
-                blobs.append(blob_info)
-            
-            logger.info(f"Listed {len(blobs)} blobs from container (filter: {name_starts_with or 'all'})")
-            return blobs
-            
         except AzureError as e:
             logger.error(f"Azure Blob Storage listing failed: {e}")
             raise
@@ -304,6 +620,29 @@ class AzureBlobStorageService(IBlobStorageService):
             logger.error(f"Failed to list blobs: {e}")
             raise
 
+    def list_blobs(
+        self, 
+        name_starts_with: Optional[str] = None,
+        include_metadata: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        List blobs in the container with optional filtering.
+        
+        Args:
+            name_starts_with: Optional prefix to filter blob names
+            include_metadata: Whether to include blob metadata in results
+            
+        Returns:
+            List[Dict[str, Any]]: List of blob information dictionaries
+            
+        Raises:
+            AzureError: If listing fails due to Azure service issues
+            Exception: For other unexpected errors
+        """
+        blobs = list(self.iter_blobs(name_starts_with, include_metadata))
+        logger.info(f"Listed {len(blobs)} blobs from container (filter: {name_starts_with or 'all'})")
+        return blobs
+
     def delete_blob(self, blob_name: str) -> bool:
         """
         Delete a blob from Azure Blob Storage.
@@ -322,6 +661,8 @@ class AzureBlobStorageService(IBlobStorageService):
         try:
             blob_client = self.container_client.get_blob_client(blob_name)
             blob_client.delete_blob()
+            with self._exists_cache_lock:
+                self._exists_cache.pop(blob_name, None)
             
             logger.info(f"Blob deleted successfully: {blob_name}")
             return True
@@ -336,6 +677,53 @@ class AzureBlobStorageService(IBlobStorageService):
             logger.error(f"Failed to delete blob {blob_name}: {e}")
             raise
 
+    def delete_blobs(self, blob_names: Iterable[str]) -> Dict[str, bool]:
+        """
+        Delete several blobs using Blob Batch requests.
+        
+        Names are sent in chunks of up to DELETE_BATCH_SIZE sub-requests per
+        batch call, so bulk cleanups pay one round-trip per chunk instead of one
+        per blob. Individual failures do not abort the batch.
+        
+        Args:
+            blob_names: Names of the blobs to delete
+            
+        Returns:
+            Dict[str, bool]: Deletion result per blob name
+            
+        Raises:
+            AzureError: If a batch request fails due to Azure service issues
+            Exception: For other unexpected errors
+        """
+        results: Dict[str, bool] = {}
+        names_iter = iter(blob_names)
+        
+        try:
+            while True:
+                chunk = list(islice(names_iter, DELETE_BATCH_SIZE))
+                if not chunk:
+                    break
+                
+                responses = self.container_client.delete_blobs(*chunk, raise_on_any_failure=False)
+                for blob_name, response in zip(chunk, responses):
+                    deleted = response.status_code == 202
+                    with self._exists_cache_lock:
+                        self._exists_cache.pop(blob_name, None)
+                    results[blob_name] = deleted
+                    if not deleted:
+                        logger.error(f"Batch deletion failed for {blob_name}: HTTP {response.status_code}")
+            
+            deleted_count = sum(results.values())
+            logger.info(f"Batch deleted {deleted_count}/{len(results)} blobs")
+            return results
+            
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage batch deletion failed: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to batch delete blobs: {e}")
+            raise
+
     def get_blob_metadata(self, blob_name: str) -> Dict[str, str]:
         """
         Get metadata for a specific blob.
@@ -373,6 +761,11 @@ class AzureBlobStorageService(IBlobStorageService):
         """
         Check if a blob exists in the container.
         
+        Results (positive and negative) are cached per instance for
+        BLOB_EXISTS_CACHE_TTL_SECONDS and invalidated by this instance's uploads,
+        copies and deletions. Changes made by other processes may therefore be
+        observed up to one TTL late.
+        
         Args:
             blob_name: Name of the blob to check
             
@@ -383,9 +776,16 @@ class AzureBlobStorageService(IBlobStorageService):
             AzureError: If check fails due to Azure service issues
             Exception: For other unexpected errors
         """
+        with self._exists_cache_lock:
+            cached = self._exists_cache.get(blob_name)
+        if cached is not None:
+            return cached
+        
         try:
             blob_client = self.container_client.get_blob_client(blob_name)
             exists = blob_client.exists()
+            with self._exists_cache_lock:
+                self._exists_cache[blob_name] = exists
             
             logger.debug(f"Blob existence check for {blob_name}: {exists}")
             return exists
@@ -416,16 +816,7 @@ class AzureBlobStorageService(IBlobStorageService):
             blob_client = self.container_client.get_blob_client(blob_name)
             properties = blob_client.get_blob_properties()
             
-            blob_properties = {
-                "name": blob_name,
-                "size": properties.size,
-                "last_modified": properties.last_modified,
-                "content_type": properties.content_settings.content_type,
-                "etag": properties.etag,
-                "metadata": properties.metadata or {},
-                "blob_type": properties.blob_type,
-                "lease_status": properties.lease.status if properties.lease else None
-            }
+            blob_properties = _properties_to_dict(blob_name, properties)
             
             logger.info(f"Retrieved properties for blob: {blob_name}")
             return blob_properties
@@ -440,71 +831,72 @@ class AzureBlobStorageService(IBlobStorageService):
             logger.error(f"Failed to get properties for blob {blob_name}: {e}")
             raise
 
-    # Cambiar nombre de los métodos internos para evitar conflicto
-    def _upload_file_internal(self, file_path: str, blob_name: str, metadata: Optional[Dict[str, str]] = None, content_type: Optional[str] = None) -> str:
-        # Copia el cuerpo de la función upload_file original aquí
+    def copy_blob(
+        self,
+        source_url: str,
+        dest_blob_name: str,
+        wait: bool = True,
+        timeout: float = COPY_POLL_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """
+        Copy a blob server-side into this container.
+        
+        The copy is executed by the storage service (start_copy_from_url), so the
+        bytes never traverse the Function host. When wait is True the copy status
+        is polled with exponential backoff instead of the SDK's fixed interval.
+        
+        Args:
+            source_url: URL of the source blob (must be readable by the service,
+                e.g. same account or including a SAS token)
+            dest_blob_name: Name of the destination blob in this container
+            wait: Whether to wait until the copy finishes
+            timeout: Maximum seconds to wait for a pending copy
+            
+        Returns:
+            Dict[str, Any]: Copy information (copy_id, status and destination url)
+            
+        Raises:
+            TimeoutError: If the copy is still pending after timeout seconds
+            AzureError: If the copy fails due to Azure service issues
+            Exception: For other unexpected errors
+        """
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"Source file not found: {file_path}")
-            file_size = os.path.getsize(file_path)
-            upload_metadata = {
-                "upload_date": datetime.now(timezone.utc).isoformat(),
-                "file_size": str(file_size),
-                "source_path": file_path
+            blob_client = self.container_client.get_blob_client(dest_blob_name)
+            copy = blob_client.start_copy_from_url(source_url, requires_sync=False)
+            copy_id = copy.get("copy_id")
+            status = copy.get("copy_status")
+            
+            delay = COPY_POLL_INITIAL_DELAY_SECONDS
+            deadline = time.monotonic() + timeout
+            while wait and status == "pending":
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Copy to {dest_blob_name} still pending after {timeout}s")
+                time.sleep(delay)
+                delay = min(delay * 2, COPY_POLL_MAX_DELAY_SECONDS)
+                status = blob_client.get_blob_properties().copy.status
+            
+            if status in ("failed", "aborted"):
+                raise AzureError(f"Copy to {dest_blob_name} ended with status: {status}")
+            
+            with self._exists_cache_lock:
+                self._exists_cache.pop(dest_blob_name, None)
+            logger.info(f"Blob copy {status}: {source_url} -> {dest_blob_name}")
+            return {
+                "copy_id": copy_id,
+                "status": status,
+                "url": blob_client.url
             }
-            if metadata:
-                upload_metadata.update(metadata)
-            blob_client = self.container_client.get_blob_client(blob_name)
-            with open(file_path, "rb") as data:
-                blob_client.upload_blob(
-                    data, 
-                    metadata=upload_metadata, 
-                    overwrite=True,
-                    content_settings=None if not content_type else 
-                        blob_client.get_blob_properties().content_settings
-                )
-            blob_url = blob_client.url
-            logger.info(f"File uploaded successfully: {blob_name} ({file_size} bytes) -> {blob_url}")
-            return blob_url
-        except FileNotFoundError as e:
-            logger.error(f"File not found: {file_path}")
-            raise
-        except AzureError as e:
-            logger.error(f"Azure Blob Storage upload failed for {blob_name}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error uploading {blob_name}: {e}")
-            raise
-
-    def upload_file(self, file_path: str, container_name: str, blob_name: str) -> str:
-        # Método de la interfaz
-        return self._upload_file_internal(file_path, blob_name)
-
-    def _download_file_internal(self, blob_name: str, destination_path: str) -> bool:
-        # Copia el cuerpo de la función download_file original aquí
-        try:
-            blob_client = self.container_client.get_blob_client(blob_name)
-            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
-            with open(destination_path, "wb") as download_file:
-                download_stream = blob_client.download_blob()
-                download_file.write(download_stream.readall())
-            file_size = os.path.getsize(destination_path)
-            logger.info(f"File downloaded successfully: {blob_name} -> {destination_path} ({file_size} bytes)")
-            return True
-        except ResourceNotFoundError as e:
-            logger.error(f"Blob not found: {blob_name}")
+            
+        except TimeoutError as e:
+            logger.error(f"Blob copy timed out for {dest_blob_name}: {e}")
             raise
         except AzureError as e:
-            logger.error(f"Azure Blob Storage download failed for {blob_name}: {e}")
+            logger.error(f"Azure Blob Storage copy failed for {dest_blob_name}: {e}")
             raise
         except Exception as e:
-            logger.error(f"Failed to download blob {blob_name}: {e}")
+            logger.error(f"Failed to copy blob to {dest_blob_name}: {e}")
             raise
 
-    def download_file(self, container_name: str, blob_name: str, destination_path: str) -> bool:
-        # Método de la interfaz
-        return self._download_file_internal(blob_name, destination_path)
-
     def delete_file(self, container_name: str, blob_name: str) -> bool:
         # Ignora container_name (ya está en self.container_name)
         return self.delete_blob(blob_name)
@@ -514,13 +906,78 @@ class AzureBlobStorageService(IBlobStorageService):
         blob_client = self.container_client.get_blob_client(blob_name)
         return blob_client.url
 
+    def get_file_urls(
+        self,
+        container_name: str,
+        blob_names: List[str],
+        expiry_minutes: int = 60
+    ) -> Dict[str, str]:
+        """
+        Build read-only SAS URLs for several blobs.
+        
+        Signatures are computed locally: with account key credentials no request
+        is made at all, otherwise a single user delegation key is fetched and
+        reused for every blob.
+        
+        Args:
+            container_name: Source container (ignored; the service is bound to
+                the configured container)
+            blob_names: Names of the blobs to sign
+            expiry_minutes: Lifetime of the SAS tokens
+            
+        Returns:
+            Dict[str, str]: SAS URL per blob name
+            
+        Raises:
+            AzureError: If the user delegation key cannot be obtained
+            Exception: For other unexpected errors
+        """
+        if not blob_names:
+            return {}
+        
+        try:
+            start = datetime.now(timezone.utc)
+            expiry = start + timedelta(minutes=expiry_minutes)
+            
+            account_key = getattr(self.blob_service_client.credential, "account_key", None)
+            if account_key:
+                signing_key: Dict[str, Any] = {"account_key": account_key}
+            else:
+                signing_key = {
+                    "user_delegation_key": self.blob_service_client.get_user_delegation_key(start, expiry)
+                }
+            
+            permission = BlobSasPermissions(read=True)
+            urls = {}
+            for blob_name in blob_names:
+                sas_token = generate_blob_sas(
+                    account_name=self.blob_service_client.account_name,
+                    container_name=self.container_name,
+                    blob_name=blob_name,
+                    permission=permission,
+                    expiry=expiry,
+                    **signing_key
+                )
+                urls[blob_name] = f"{self.container_client.get_blob_client(blob_name).url}?{sas_token}"
+            
+            logger.info(f"Generated SAS URLs for {len(urls)} blobs (expiry: {expiry_minutes} min)")
+            return urls
+            
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage SAS generation failed: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to generate SAS URLs: {e}")
+            raise
+
     # health_check ya existe y cumple con la interfaz
+    @tracks_health
     def health_check(self) -> bool:
         """
         Perform a health check for the Azure Blob Storage service.
         
         Returns:
-            bool: True if healthy, False otherwise
+            HealthStatus: Result, latency and failure history of the check
         """
         try:
             self._validate_connection()
@@ -530,5 +987,516 @@ class AzureBlobStorageService(IBlobStorageService):
             logger.error(f"Azure Blob Storage health check failed: {e}")
             return False
 
-# Global instance for easy access
-blob_storage_service = AzureBlobStorageService() 
\ No newline at end of file
+class AsyncAzureBlobStorageService:
+    """
+    Asynchronous counterpart of AzureBlobStorageService.
+    
+    Built on azure.storage.blob.aio so async callers (e.g. async Azure Functions)
+    can overlap storage I/O with other awaited work instead of blocking the
+    worker thread. Use it as an async context manager or call close() to
+    release the underlying transport.
+    """
+    
+    def __init__(self):
+        """Initialize the async Azure Blob Storage clients."""
+        try:
+            self.connection_string = settings.azure_storage_connection_string
+            self.container_name = settings.blob_container_name
+            self.account_name = settings.blob_account_name
+            
+            if not self.connection_string:
+                raise ValueError("Azure Storage connection string is required")
+            if not self.container_name:
+                raise ValueError("Blob container name is required")
+            
+            self.blob_service_client = AsyncBlobServiceClient.from_connection_string(
+                self.connection_string,
+                **RETRY_OPTIONS,
+                **TRANSFER_CLIENT_OPTIONS
+            )
+            self.container_client = self.blob_service_client.get_container_client(
+                self.container_name
+            )
+            
+            logger.info(f"Async Azure Blob Storage service initialized for container: {self.container_name}")
+            
+        except Exception as e:
+            logger.error(f"Failed to initialize async Azure Blob Storage service: {e}")
+            raise
+    
+    async def __aenter__(self) -> "AsyncAzureBlobStorageService":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP transport."""
+        await self.blob_service_client.close()
+    
+    async def upload_file(
+        self,
+        file_path: str,
+        container_name: str,
+        blob_name: str,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None
+    ) -> str:
+        """
+        Upload a local file to Azure Blob Storage.
+        
+        Args:
+            file_path: Local path to the file to upload
+            container_name: Target container (ignored; the service is bound to
+                the configured container)
+            blob_name: Name to assign to the blob in storage
+            metadata: Optional metadata to attach to the blob
+            content_type: Optional content type for the blob
+            
+        Returns:
+            str: URL of the uploaded blob
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            
+            with open(file_path, "rb") as data:
+                file_size = os.fstat(data.fileno()).st_size
+                upload_metadata = _upload_metadata(
+                    {"file_size": str(file_size), "source_path": file_path}, metadata
+                )
+                await blob_client.upload_blob(data, **_upload_options(upload_metadata, content_type, file_size))
+            
+            blob_url = blob_client.url
+            logger.info(f"File uploaded successfully: {blob_name} ({file_size} bytes) -> {blob_url}")
+            return blob_url
+            
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {file_path}")
+            raise
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage upload failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error uploading {blob_name}: {e}")
+            raise
+    
+    async def upload_stream(
+        self,
+        data_stream: Any,
+        blob_name: str,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None,
+        length: Optional[int] = None
+    ) -> str:
+        """
+        Upload data from a stream or bytes to Azure Blob Storage.
+        
+        Args:
+            data_stream: Binary stream or bytes containing the data to upload
+            blob_name: Name to assign to the blob in storage
+            metadata: Optional metadata to attach to the blob
+            content_type: Optional content type for the blob
+            length: Size of the data, if known; lets small uploads take the single-PUT path
+            
+        Returns:
+            str: URL of the uploaded blob
+        """
+        try:
+            upload_metadata = _upload_metadata({"upload_method": "stream"}, metadata)
+            blob_client = self.container_client.get_blob_client(blob_name)
+            
+            await blob_client.upload_blob(data_stream, **_upload_options(upload_metadata, content_type, length))
+            
+            blob_url = blob_client.url
+            logger.info(f"Stream uploaded successfully: {blob_name} -> {blob_url}")
+            return blob_url
+            
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage stream upload failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error uploading stream {blob_name}: {e}")
+            raise
+    
+    async def download_file(
+        self,
+        container_name: str,
+        blob_name: str,
+        destination_path: str,
+        etag: Optional[str] = None,
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY
+    ) -> bool:
+        """
+        Download a blob to a local file, writing it chunk by chunk.
+        
+        Args:
+            container_name: Source container (ignored; the service is bound to
+                the configured container)
+            blob_name: Name of the blob to download
+            destination_path: Local path where to save the file
+            etag: Optional ETag of the local copy; an unchanged blob is not transferred again
+            max_concurrency: Parallel range GETs used for blobs larger than one chunk
+            
+        Returns:
+            bool: True if downloaded, False if the blob was not modified and
+                the local copy was kept
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            
+            try:
+                download_stream = await blob_client.download_blob(
+                    max_concurrency=max_concurrency,
+                    **_download_conditions(etag)
+                )
+            except ResourceNotModifiedError:
+                logger.info(f"Blob not modified, keeping local copy: {blob_name} -> {destination_path}")
+                return False
+            with open(destination_path, "wb") as download_file:
+                async for chunk in download_stream.chunks():
+                    download_file.write(chunk)
+            
+            file_size = os.path.getsize(destination_path)
+            logger.info(f"File downloaded successfully: {blob_name} -> {destination_path} ({file_size} bytes)")
+            return True
+            
+        except ResourceNotFoundError as e:
+            logger.error(f"Blob not found: {blob_name}")
+            raise
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage download failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to download blob {blob_name}: {e}")
+            raise
+    
+    async def upload_files_batch(
+        self,
+        files: List[Tuple[str, str, str]],
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY
+    ) -> Dict[str, Optional[str]]:
+        """
+        Upload several local files concurrently, bounded by a semaphore.
+        
+        Args:
+            files: (file_path, container_name, blob_name) tuples, as for upload_file
+            max_concurrency: Maximum number of uploads in flight
+            
+        Returns:
+            Dict[str, Optional[str]]: Blob URL per blob name, or None if its upload failed
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def upload(file_path: str, container_name: str, blob_name: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self.upload_file(file_path, container_name, blob_name)
+                except Exception:
+                    # upload_file already logged the failure
+                    return None
+        
+        urls = await asyncio.gather(*(upload(*item) for item in files))
+        results = {blob_name: url for (_, _, blob_name), url in zip(files, urls)}
+        
+        uploaded_count = sum(url is not None for url in results.values())
+        logger.info(f"Batch uploaded {uploaded_count}/{len(results)} files")
+        return results
+    
+    async def download_files_batch(
+        self,
+        files: List[Tuple[str, str, str]],
+        max_concurrency: int = TRANSFER_MAX_CONCURRENCY
+    ) -> Dict[str, bool]:
+        """
+        Download several blobs concurrently, bounded by a semaphore.
+        
+        Args:
+            files: (container_name, blob_name, destination_path) tuples, as for download_file
+            max_concurrency: Maximum number of downloads in flight
+            
+        Returns:
+            Dict[str, bool]: Per blob name, True if the local copy is up to date
+                (downloaded or not modified), False if its download failed
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def download(container_name: str, blob_name: str, destination_path: str) -> bool:
+            async with semaphore:
+                try:
+                    # One range GET per blob: the batch already provides the parallelism
+                    await self.download_file(container_name, blob_name, destination_path, max_concurrency=1)
+                    return True
+                except Exception:
+                    # download_file already logged the failure
+                    return False
+        
+        downloaded = await asyncio.gather(*(download(*item) for item in files))
+        results = {blob_name: ok for (_, blob_name, _), ok in zip(files, downloaded)}
+        
+        logger.info(f"Batch downloaded {sum(results.values())}/{len(results)} files")
+        return results
+    
+    async def download_stream(self, blob_name: str) -> Any:
+        """
+        Download a blob as an async stream downloader.
+        
+        Args:
+            blob_name: Name of the blob to download
+            
+        Returns:
+            StorageStreamDownloader: Async downloader for the blob data
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            download_stream = await blob_client.download_blob()
+            
+            logger.info(f"Stream download initiated for blob: {blob_name}")
+            return download_stream
+            
+        except ResourceNotFoundError as e:
+            logger.error(f"Blob not found: {blob_name}")
+            raise
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage stream download failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to download blob stream {blob_name}: {e}")
+            raise
+    
+    async def list_blobs(
+        self,
+        name_starts_with: Optional[str] = None,
+        include_metadata: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        List blobs in the container with optional filtering.
+        
+        Args:
+            name_starts_with: Optional prefix to filter blob names
+            include_metadata: Whether to include blob metadata in results
+            
+        Returns:
+            List[Dict[str, Any]]: List of blob information dictionaries
+        """
+        try:
+            blobs = []
+            async for blob in self.container_client.list_blobs(name_starts_with=name_starts_with):
+                blobs.append(_blob_to_dict(blob, include_metadata))
+            
+            logger.info(f"Listed {len(blobs)} blobs from container (filter: {name_starts_with or 'all'})")
+            return blobs
+            
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage listing failed: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to list blobs: {e}")
+            raise
+    
+    async def iter_blobs_with_properties(
+        self,
+        name_starts_with: Optional[str] = None,
+        batch_size: int = LIST_PROPERTIES_BATCH_SIZE,
+        max_concurrency: int = LIST_PROPERTIES_MAX_CONCURRENCY
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        List blobs and fetch their full properties concurrently.
+        
+        Blob names are collected in batches and the get_blob_properties calls of
+        each batch run concurrently (bounded by a semaphore), so the per-blob
+        round-trips overlap instead of being paid one after another. Results are
+        yielded as each batch completes.
+        
+        Args:
+            name_starts_with: Optional prefix to filter blob names
+            batch_size: Number of blobs whose properties are fetched together
+            max_concurrency: Maximum number of in-flight properties requests
+            
+        Yields:
+            Dict[str, Any]: Blob properties dictionary (see get_blob_properties)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_properties(blob_name: str) -> Dict[str, Any]:
+            async with semaphore:
+                blob_client = self.container_client.get_blob_client(blob_name)
+                return _properties_to_dict(blob_name, await blob_client.get_blob_properties())
+        
+        async def fetch_batch(blob_names: List[str]) -> List[Dict[str, Any]]:
+            results = await asyncio.gather(
+                *(fetch_properties(blob_name) for blob_name in blob_names),
+                return_exceptions=True
+            )
+            batch = []
+            for blob_name, result in zip(blob_names, results):
+                # Cancellation is not a per-blob failure: propagate it
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to get properties for blob {blob_name}: {result}")
+                else:
+                    batch.append(result)
+            return batch
+        
+        try:
+            blob_names: List[str] = []
+            async for blob in self.container_client.list_blobs(name_starts_with=name_starts_with):
+                blob_names.append(blob.name)
+                if len(blob_names) >= batch_size:
+                    for blob_properties in await fetch_batch(blob_names):
+                        yield blob_properties
+                    blob_names = []
+            
+            if blob_names:
+                for blob_properties in await fetch_batch(blob_names):
+                    yield blob_properties
+                    
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage listing failed: {e}")
+            raise
+    
+    async def delete_blob(self, blob_name: str) -> bool:
+        """
+        Delete a blob from Azure Blob Storage.
+        
+        Args:
+            blob_name: Name of the blob to delete
+            
+        Returns:
+            bool: True if deletion successful
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            await blob_client.delete_blob()
+            
+            logger.info(f"Blob deleted successfully: {blob_name}")
+            return True
+            
+        except ResourceNotFoundError as e:
+            logger.error(f"Blob not found for deletion: {blob_name}")
+            raise
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage deletion failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to delete blob {blob_name}: {e}")
+            raise
+    
+    async def get_blob_metadata(self, blob_name: str) -> Dict[str, str]:
+        """
+        Get metadata for a specific blob.
+        
+        Args:
+            blob_name: Name of the blob
+            
+        Returns:
+            Dict[str, str]: Blob metadata dictionary
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            properties = await blob_client.get_blob_properties()
+            
+            logger.info(f"Retrieved metadata for blob: {blob_name}")
+            return properties.metadata or {}
+            
+        except ResourceNotFoundError as e:
+            logger.error(f"Blob not found: {blob_name}")
+            raise
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage metadata retrieval failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get metadata for blob {blob_name}: {e}")
+            raise
+    
+    async def blob_exists(self, blob_name: str) -> bool:
+        """
+        Check if a blob exists in the container.
+        
+        Args:
+            blob_name: Name of the blob to check
+            
+        Returns:
+            bool: True if blob exists, False otherwise
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            exists = await blob_client.exists()
+            
+            logger.debug(f"Blob existence check for {blob_name}: {exists}")
+            return exists
+            
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage existence check failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to check blob existence for {blob_name}: {e}")
+            raise
+    
+    async def get_blob_properties(self, blob_name: str) -> Dict[str, Any]:
+        """
+        Get comprehensive properties for a specific blob.
+        
+        Args:
+            blob_name: Name of the blob
+            
+        Returns:
+            Dict[str, Any]: Blob properties dictionary
+        """
+        try:
+            blob_client = self.container_client.get_blob_client(blob_name)
+            properties = await blob_client.get_blob_properties()
+            
+            logger.info(f"Retrieved properties for blob: {blob_name}")
+            return _properties_to_dict(blob_name, properties)
+            
+        except ResourceNotFoundError as e:
+            logger.error(f"Blob not found: {blob_name}")
+            raise
+        except AzureError as e:
+            logger.error(f"Azure Blob Storage properties retrieval failed for {blob_name}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to get properties for blob {blob_name}: {e}")
+            raise
+    
+    async def health_check(self) -> bool:
+        """
+        Perform a health check for the Azure Blob Storage service.
+        
+        Returns:
+            bool: True if healthy, False otherwise
+        """
+        try:
+            await self.container_client.get_container_properties()
+            logger.info("Async Azure Blob Storage health check passed.")
+            return True
+        except Exception as e:
+            logger.error(f"Async Azure Blob Storage health check failed: {e}")
+            return False
+
+
+# Global instance for easy access
+blob_storage_service = AzureBlobStorageService()
+
+# Async instance and the event loop its transport is bound to
+_async_blob_storage_service: Optional[AsyncAzureBlobStorageService] = None
+_async_blob_storage_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_async_blob_storage_service() -> AsyncAzureBlobStorageService:
+    """
+    Return the shared AsyncAzureBlobStorageService for the running event loop.
+    
+    The aio transport is bound to the loop that created it, so a new service is
+    created when called from another loop (e.g. a later asyncio.run). Creation
+    does not await, so no lock is needed within a loop.
+    """
+    global _async_blob_storage_service, _async_blob_storage_loop
+    loop = asyncio.get_running_loop()
+    if _async_blob_storage_service is None or _async_blob_storage_loop is not loop:
+        _async_blob_storage_service = AsyncAzureBlobStorageService()
+        _async_blob_storage_loop = loop
+    return _async_blob_storage_service 
\ No newline at end of file
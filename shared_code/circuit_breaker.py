@@ -0,0 +1,189 @@
+"""
+Circuit breaker y seguimiento de salud para el bot de WhatsApp VEA Connect.
+
+Este módulo proporciona el decorador tracks_health, que convierte los
+health_check de los servicios en un HealthStatus con latencia e historial, y
+CircuitBreaker, que guarda el estado de cada dependencia en Redis para que
+todos los workers compartan la misma vista de qué servicios están caídos.
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Concatenate, Dict, Optional, ParamSpec, TypeVar
+from shared_code.interfaces import HealthStatus, ICircuitBreaker, IRedisService
+
+
+logger = logging.getLogger(__name__)
+
+# Fallos consecutivos tras los que se abre el circuito
+CIRCUIT_FAILURE_THRESHOLD = 5
+
+# Segundos que el circuito permanece abierto antes de volver a probar
+CIRCUIT_OPEN_SECONDS = 30
+
+# Prefijo de las claves de estado en Redis y tiempo de vida de cada una
+CIRCUIT_KEY_PREFIX = "circuit_breaker:"
+CIRCUIT_STATE_TTL_SECONDS = 24 * 3600
+
+_Service = TypeVar("_Service")
+_Params = ParamSpec("_Params")
+
+
+def tracks_health(
+    health_check: Callable[Concatenate[_Service, _Params], bool]
+) -> Callable[Concatenate[_Service, _Params], HealthStatus]:
+    """
+    Decorar un health_check que devuelve bool para que devuelva HealthStatus.
+
+    Mide la latencia de la comprobación y lleva, por instancia, el último
+    éxito y los fallos consecutivos. Las excepciones se cuentan como fallo y
+    se propagan igual que antes.
+    """
+    @functools.wraps(health_check)
+    def wrapper(self: _Service, *args: _Params.args, **kwargs: _Params.kwargs) -> HealthStatus:
+        history = self.__dict__.setdefault(
+            "_health_history", {"last_success": None, "consecutive_failures": 0}
+        )
+        started = time.perf_counter()
+        try:
+            ok = bool(health_check(self, *args, **kwargs))
+        except Exception:
+            history["consecutive_failures"] += 1
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        if ok:
+            history["last_success"] = datetime.now(timezone.utc)
+            history["consecutive_failures"] = 0
+        else:
+            history["consecutive_failures"] += 1
+
+        return HealthStatus(
+            ok=ok,
+            latency_ms=latency_ms,
+            last_success=history["last_success"],
+            consecutive_failures=history["consecutive_failures"],
+        )
+
+    return wrapper
+
+
+class CircuitBreaker(ICircuitBreaker):
+    """
+    Circuit breaker con estado compartido en Redis.
+
+    El estado de cada dependencia se guarda como JSON con IRedisService.get/set;
+    sin servicio de Redis se mantiene en memoria del proceso. Si Redis falla,
+    get devuelve None y el circuito se considera cerrado, así que una caída de
+    Redis nunca bloquea al resto de dependencias.
+    """
+
+    def __init__(
+        self,
+        redis_service: Optional[IRedisService] = None,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS
+    ):
+        """
+        Inicializar el circuit breaker.
+
+        Args:
+            redis_service: Servicio de Redis donde compartir el estado
+            failure_threshold: Fallos consecutivos que abren el circuito
+            open_seconds: Segundos que el circuito permanece abierto
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold debe ser al menos 1")
+
+        self.redis_service = redis_service
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._local_state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, name: str) -> Dict[str, Any]:
+        """Leer el estado de una dependencia."""
+        if self.redis_service is None:
+            return dict(self._local_state.get(name, {}))
+
+        raw = self.redis_service.get(f"{CIRCUIT_KEY_PREFIX}{name}")
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning(f"Estado de circuit breaker inválido para {name}, se descarta")
+            return {}
+
+    def _save(self, name: str, state: Dict[str, Any]) -> None:
+        """Guardar el estado de una dependencia."""
+        if self.redis_service is None:
+            self._local_state[name] = state
+            return
+
+        self.redis_service.set(
+            f"{CIRCUIT_KEY_PREFIX}{name}",
+            json.dumps(state),
+            expiration=CIRCUIT_STATE_TTL_SECONDS
+        )
+
+    def allow(self, name: str) -> bool:
+        """
+        Indicar si se puede llamar a la dependencia.
+
+        Con el circuito abierto devuelve False; al expirar el enfriamiento
+        vuelve a permitir llamadas y el siguiente resultado decide si el
+        circuito se cierra o se abre de nuevo.
+        """
+        return time.time() >= self._load(name).get("open_until", 0)
+
+    def record(self, name: str, success: bool, latency_ms: float) -> None:
+        """
+        Registrar el resultado de una llamada a la dependencia.
+
+        Args:
+            name: Nombre de la dependencia
+            success: Si la llamada tuvo éxito
+            latency_ms: Latencia de la llamada en milisegundos
+        """
+        with self._lock:
+            state = self._load(name)
+            now = time.time()
+
+            if success:
+                state = {
+                    "consecutive_failures": 0,
+                    "last_success": now,
+                    "latency_ms": latency_ms,
+                    "open_until": 0,
+                }
+            else:
+                failures = state.get("consecutive_failures", 0) + 1
+                state["consecutive_failures"] = failures
+                state["latency_ms"] = latency_ms
+                if failures >= self.failure_threshold:
+                    state["open_until"] = now + self.open_seconds
+                    logger.warning(
+                        f"Circuito abierto para {name} tras {failures} fallos consecutivos"
+                    )
+
+            self._save(name, state)
+
+    def status(self, name: str) -> HealthStatus:
+        """Obtener el estado registrado de la dependencia."""
+        state = self._load(name)
+        last_success = state.get("last_success")
+
+        return HealthStatus(
+            ok=time.time() >= state.get("open_until", 0),
+            latency_ms=state.get("latency_ms", 0.0),
+            last_success=(
+                datetime.fromtimestamp(last_success, tz=timezone.utc)
+                if last_success else None
+            ),
+            consecutive_failures=state.get("consecutive_failures", 0),
+        )
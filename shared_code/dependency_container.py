@@ -7,21 +7,15 @@ el testing y la modularidad del código.
 """
 
 import logging
-from typing import Dict, Any, Optional, Type, TypeVar, Callable, cast
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Dict, Any, Optional, Type, TypeVar, Callable, Tuple, Union, cast
 from shared_code.interfaces import (
-    IWhatsAppService, IUserService, IOpenAIService, IVisionService,
+    ServiceType, IWhatsAppService, IUserService, IOpenAIService, IVisionService,
     IBlobStorageService, IRedisService, IMessageProcessor,
     IResponseGenerator, IErrorHandler
 )
-from shared_code.whatsapp_service import WhatsAppService
-from shared_code.user_service import UserService
-from shared_code.openai_service import OpenAIService
-from shared_code.vision_service import VisionService
-from shared_code.azure_blob_storage import AzureBlobStorageService
-from shared_code.redis_service import RedisService
-from shared_code.message_processor import MessageProcessor
-from shared_code.error_handler import ErrorHandler
 from shared_code.type_helpers import cast_service_safe
+from shared_code.utils import utc_now_iso
 from config.settings import get_settings
 
 
@@ -29,6 +23,39 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Servicios compuestos que capturan otras dependencias al construirse
+COMPOSITE_SERVICES = ("message_processor",)
+
+# Servicios verificados por health_check
+HEALTH_CHECK_MAIN_SERVICES = ("whatsapp", "user", "openai", "error_handler")
+HEALTH_CHECK_OPTIONAL_SERVICES = ("vision", "blob_storage", "redis")
+HEALTH_CHECK_MAX_WORKERS = 8
+HEALTH_CHECK_TIMEOUT_SECONDS = 5
+
+# Estado de cada entrada del registro
+_INSTANCE = 0   # instancia registrada directamente
+_FACTORY = 1    # factory pendiente de resolver
+_SINGLETON = 2  # factory ya resuelta (se conserva para poder reiniciarla)
+
+_STATE_NAMES = {_INSTANCE: "registered", _FACTORY: "factory", _SINGLETON: "singleton"}
+
+# Factories registradas al crear el contenedor: (tipo de servicio, método create_*)
+_DEFAULT_FACTORIES = (
+    ("whatsapp", "create_whatsapp_service"),
+    ("user", "create_user_service"),
+    ("openai", "create_openai_service"),
+    ("vision", "create_vision_service"),
+    ("blob_storage", "create_blob_storage_service"),
+    ("redis", "create_redis_service"),
+    ("error_handler", "create_error_handler"),
+    ("message_processor", "create_message_processor"),
+)
+
+# Nombre de registro de cada ServiceType, indexado por su valor
+_SERVICE_NAMES = tuple(service_type.service_name for service_type in ServiceType)
+
+ServiceKey = Union[str, ServiceType]
+
 
 class DependencyContainer:
     """
@@ -40,26 +67,28 @@ class DependencyContainer:
     
     def __init__(self):
         """Inicializar el contenedor de dependencias."""
-        self._services: Dict[str, Any] = {}
-        self._factories: Dict[str, Callable[[], Any]] = {}
-        self._singletons: Dict[str, Any] = {}
+        # service_type -> (estado, instancia o factory, factory de origen)
+        self._registry: Dict[str, Tuple[int, Any, Optional[Callable[[], Any]]]] = {}
         self._settings = get_settings()
         
         # Registrar factories por defecto
         self._register_default_factories()
     
-    def register_service(self, service_type: str, service_instance: Any) -> None:
+    def register_service(self, service_type: ServiceKey, service_instance: Any) -> None:
         """
         Registrar una instancia de servicio.
         
         Args:
-            service_type: Tipo de servicio (ej: 'whatsapp', 'user', etc.)
+            service_type: Tipo de servicio (ej: 'whatsapp', 'user' o ServiceType.WHATSAPP)
             service_instance: Instancia del servicio
         """
-        self._services[service_type] = service_instance
-        logger.info(f"Servicio registrado: {service_type}")
+        if isinstance(service_type, ServiceType):
+            service_type = _SERVICE_NAMES[service_type]
+        self._registry[service_type] = (_INSTANCE, service_instance, None)
+        self._invalidate_composites()
+        logger.info("Servicio registrado: %s", service_type)
     
-    def register_factory(self, service_type: str, factory: Callable[[], Any]) -> None:
+    def register_factory(self, service_type: ServiceKey, factory: Callable[[], Any]) -> None:
         """
         Registrar una factory para crear servicios.
         
@@ -67,10 +96,25 @@ class DependencyContainer:
             service_type: Tipo de servicio
             factory: Función factory que crea la instancia
         """
-        self._factories[service_type] = factory
-        logger.info(f"Factory registrada: {service_type}")
+        if isinstance(service_type, ServiceType):
+            service_type = _SERVICE_NAMES[service_type]
+        self._registry[service_type] = (_FACTORY, factory, factory)
+        self._invalidate_composites()
+        logger.info("Factory registrada: %s", service_type)
     
-    def get_service(self, service_type: str) -> Any:
+    def _invalidate_composites(self) -> None:
+        """
+        Volver a estado factory los servicios compuestos ya resueltos.
+        
+        Capturan las dependencias que tenían al construirse, así que deben
+        reconstruirse cuando se re-registra cualquier servicio.
+        """
+        for composite in COMPOSITE_SERVICES:
+            entry = self._registry.get(composite)
+            if entry is not None and entry[0] == _SINGLETON:
+                self._registry[composite] = (_FACTORY, entry[2], entry[2])
+    
+    def get_service(self, service_type: ServiceKey) -> Any:
         """
         Obtener un servicio del contenedor.
         
@@ -83,28 +127,28 @@ class DependencyContainer:
         Raises:
             KeyError: Si el servicio no está registrado
         """
-        # Verificar si ya existe una instancia singleton
-        if service_type in self._singletons:
-            return self._singletons[service_type]
+        # Un ServiceType se traduce a su nombre con un acceso por índice
+        if isinstance(service_type, ServiceType):
+            service_type = _SERVICE_NAMES[service_type]
+        try:
+            state, value, factory = self._registry[service_type]
+        except KeyError:
+            raise KeyError(f"Servicio no registrado: {service_type}") from None
         
-        # Verificar si existe una instancia registrada
-        if service_type in self._services:
-            return self._services[service_type]
+        if state != _FACTORY:
+            return value
         
-        # Verificar si existe una factory
-        if service_type in self._factories:
-            try:
-                instance = self._factories[service_type]()
-                # Crear como singleton
-                self._singletons[service_type] = instance
-                return instance
-            except Exception as e:
-                logger.error(f"Error creando servicio {service_type}: {e}")
-                raise
+        try:
+            instance = value()
+        except Exception as e:
+            logger.error("Error creando servicio %s: %s", service_type, e)
+            raise
         
-        raise KeyError(f"Servicio no registrado: {service_type}")
+        # Crear como singleton
+        self._registry[service_type] = (_SINGLETON, instance, factory)
+        return instance
     
-    def get_service_safe(self, service_type: str) -> Optional[Any]:
+    def get_service_safe(self, service_type: ServiceKey) -> Optional[Any]:
         """
         Obtener un servicio de forma segura (retorna None si no existe).
         
@@ -117,10 +161,10 @@ class DependencyContainer:
         try:
             return self.get_service(service_type)
         except KeyError:
-            logger.warning(f"Servicio no encontrado: {service_type}")
+            logger.warning("Servicio no encontrado: %s", service_type)
             return None
     
-    def has_service(self, service_type: str) -> bool:
+    def has_service(self, service_type: ServiceKey) -> bool:
         """
         Verificar si un servicio está registrado.
         
@@ -130,109 +174,125 @@ class DependencyContainer:
         Returns:
             bool: True si el servicio está registrado
         """
-        return (
-            service_type in self._services or 
-            service_type in self._factories or 
-            service_type in self._singletons
-        )
+        if isinstance(service_type, ServiceType):
+            service_type = _SERVICE_NAMES[service_type]
+        return service_type in self._registry
     
+    # Los módulos de cada servicio se importan dentro de su factory: arrastran
+    # SDKs pesados (openai, azure, redis...) y solo se cargan si se usan
     def create_whatsapp_service(self) -> IWhatsAppService:
         """Crear instancia del servicio de WhatsApp."""
         try:
+            from shared_code.whatsapp_service import WhatsAppService
             return WhatsAppService(skip_validation=True)
         except Exception as e:
-            logger.error(f"Error creando WhatsAppService: {e}")
+            logger.error("Error creando WhatsAppService: %s", e)
             raise
     
     def create_user_service(self) -> IUserService:
         """Crear instancia del servicio de usuarios."""
         try:
+            from shared_code.user_service import UserService
             redis_service = self.get_service("redis")
             return UserService(redis_service)
         except Exception as e:
-            logger.error(f"Error creando UserService: {e}")
+            logger.error("Error creando UserService: %s", e)
             raise
     
     def create_openai_service(self) -> IOpenAIService:
         """Crear instancia del servicio de OpenAI."""
         try:
-            service = OpenAIService()
+            from shared_code.openai_service import OpenAIService
+            from shared_code.semantic_cache import RedisSemanticCache
+            # Redis, si está disponible, sirve de caché de respuestas deterministas
+            # y de caché semántica, que compone respuestas con el propio servicio
+            redis_service = self.get_service_safe("redis")
+            semantic_cache = RedisSemanticCache(redis_service) if redis_service is not None else None
+            service = OpenAIService(cache_service=redis_service, semantic_cache=semantic_cache)
+            if semantic_cache is not None:
+                semantic_cache.composer = service.compose_cached_answers
             return cast(IOpenAIService, service)
         except Exception as e:
-            logger.error(f"Error creando OpenAIService: {e}")
+            logger.error("Error creando OpenAIService: %s", e)
             raise
     
     def create_vision_service(self) -> Optional[IVisionService]:
         """Crear instancia del servicio de visión."""
         try:
+            from shared_code.vision_service import VisionService
             service = VisionService(skip_validation=True)
             return cast_service_safe(service, IVisionService)
         except Exception as e:
-            logger.warning(f"Error creando VisionService (opcional): {e}")
+            logger.warning("Error creando VisionService (opcional): %s", e)
             return None
     
     def create_blob_storage_service(self) -> Optional[IBlobStorageService]:
         """Crear instancia del servicio de blob storage."""
         try:
+            from shared_code.azure_blob_storage import AzureBlobStorageService
             service = AzureBlobStorageService()
             return cast_service_safe(service, IBlobStorageService)
         except Exception as e:
-            logger.warning(f"Error creando AzureBlobStorageService (opcional): {e}")
+            logger.warning("Error creando AzureBlobStorageService (opcional): %s", e)
             return None
     
     def create_redis_service(self) -> Optional[IRedisService]:
         """Crear instancia del servicio de Redis."""
         try:
+            from shared_code.redis_service import RedisService
             return RedisService()
         except Exception as e:
-            logger.warning(f"Error creando RedisService (opcional): {e}")
+            logger.warning("Error creando RedisService (opcional): %s", e)
             return None
     
     def create_error_handler(self) -> IErrorHandler:
         """Crear instancia del manejador de errores."""
         try:
-            return ErrorHandler()
+            from shared_code.error_handler import get_error_handler
+            return get_error_handler()
         except Exception as e:
-            logger.error(f"Error creando ErrorHandler: {e}")
+            logger.error("Error creando ErrorHandler: %s", e)
             raise
     
     def create_message_processor(self) -> IMessageProcessor:
         """Crear instancia del procesador de mensajes."""
+        # Se invoca una sola vez vía get_service("message_processor"), que guarda
+        # el resultado como singleton; las siguientes obtenciones son un acceso al dict
         try:
-            whatsapp_service = self.get_service("whatsapp")
-            user_service = self.get_service("user")
-            openai_service = self.get_service("openai")
-            vision_service = self.get_service_safe("vision")
-            blob_storage_service = self.get_service_safe("blob_storage")
-            error_handler = self.get_service("error_handler")
-            
+            from shared_code.message_processor import MessageProcessor
+            from shared_code.semantic_cache import RedisSemanticCache
+            get = self.get_service
+            get_safe = self.get_service_safe
+            redis_service = get_safe("redis")
             return MessageProcessor(
-                whatsapp_service=whatsapp_service,
-                user_service=user_service,
-                openai_service=openai_service,
-                vision_service=vision_service,
-                blob_storage_service=blob_storage_service,
-                error_handler=error_handler
+                whatsapp_service=get("whatsapp"),
+                user_service=get("user"),
+                openai_service=get("openai"),
+                vision_service=get_safe("vision"),
+                blob_storage_service=get_safe("blob_storage"),
+                error_handler=get("error_handler"),
+                semantic_cache=RedisSemanticCache(redis_service) if redis_service is not None else None
             )
         except Exception as e:
-            logger.error(f"Error creando MessageProcessor: {e}")
+            logger.error("Error creando MessageProcessor: %s", e)
             raise
     
     def _register_default_factories(self) -> None:
         """Registrar factories por defecto."""
-        self.register_factory("whatsapp", self.create_whatsapp_service)
-        self.register_factory("user", self.create_user_service)
-        self.register_factory("openai", self.create_openai_service)
-        self.register_factory("vision", self.create_vision_service)
-        self.register_factory("blob_storage", self.create_blob_storage_service)
-        self.register_factory("redis", self.create_redis_service)
-        self.register_factory("error_handler", self.create_error_handler)
-        self.register_factory("message_processor", self.create_message_processor)
+        registry = self._registry
+        for service_type, method_name in _DEFAULT_FACTORIES:
+            factory = getattr(self, method_name)
+            registry[service_type] = (_FACTORY, factory, factory)
+        logger.info("Factories por defecto registradas: %d", len(_DEFAULT_FACTORIES))
     
     def health_check(self) -> Dict[str, Any]:
         """
         Verificar salud de todos los servicios registrados.
         
+        Los servicios se resuelven en el hilo actual y sus health_check (que
+        suelen ser llamadas de red) se ejecutan en paralelo, de modo que el
+        tiempo total es el del servicio más lento y no la suma de todos.
+        
         Returns:
             Dict[str, Any]: Estado de salud de los servicios
         """
@@ -241,49 +301,80 @@ class DependencyContainer:
             "services": {},
             "timestamp": None
         }
+        services_status = health_status["services"]
         
         try:
-            from datetime import datetime, timezone
-            health_status["timestamp"] = datetime.now(timezone.utc).isoformat()
+            health_status["timestamp"] = utc_now_iso()
             
-            # Verificar servicios principales
-            main_services = ["whatsapp", "user", "openai", "error_handler"]
-            for service_type in main_services:
+            # Resolver servicios; los opcionales no disponibles quedan en None
+            probes = {}
+            for service_type in HEALTH_CHECK_MAIN_SERVICES + HEALTH_CHECK_OPTIONAL_SERVICES:
+                optional = service_type in HEALTH_CHECK_OPTIONAL_SERVICES
                 try:
-                    service = self.get_service(service_type)
-                    if hasattr(service, 'health_check'):
-                        health_status["services"][service_type] = service.health_check()
-                    else:
-                        health_status["services"][service_type] = True
+                    service = self.get_service_safe(service_type) if optional else self.get_service(service_type)
                 except Exception as e:
-                    health_status["services"][service_type] = False
-                    health_status["container_healthy"] = False
-                    logger.error(f"Error en health check de {service_type}: {e}")
+                    self._record_probe_failure(health_status, service_type, e)
+                    continue
+                if service is None and optional:
+                    services_status[service_type] = None  # No disponible
+                elif hasattr(service, 'health_check'):
+                    probes[service_type] = service.health_check
+                else:
+                    services_status[service_type] = True
             
-            # Verificar servicios opcionales
-            optional_services = ["vision", "blob_storage", "redis"]
-            for service_type in optional_services:
+            if probes:
+                executor = ThreadPoolExecutor(
+                    max_workers=min(HEALTH_CHECK_MAX_WORKERS, len(probes)),
+                    thread_name_prefix="health-check"
+                )
+                futures = {executor.submit(probe): service_type for service_type, probe in probes.items()}
                 try:
-                    service = self.get_service_safe(service_type)
-                    if service and hasattr(service, 'health_check'):
-                        health_status["services"][service_type] = service.health_check()
-                    elif service:
-                        health_status["services"][service_type] = True
-                    else:
-                        health_status["services"][service_type] = None  # No disponible
-                except Exception as e:
-                    health_status["services"][service_type] = False
-                    logger.warning(f"Error en health check de {service_type}: {e}")
+                    for future in as_completed(futures, timeout=HEALTH_CHECK_TIMEOUT_SECONDS):
+                        service_type = futures[future]
+                        try:
+                            services_status[service_type] = future.result()
+                        except Exception as e:
+                            self._record_probe_failure(health_status, service_type, e)
+                except FuturesTimeoutError:
+                    for future, service_type in futures.items():
+                        if not future.done():
+                            self._record_probe_failure(
+                                health_status, service_type,
+                                TimeoutError(f"sin respuesta en {HEALTH_CHECK_TIMEOUT_SECONDS}s")
+                            )
+                finally:
+                    # No esperar a los health checks colgados
+                    executor.shutdown(wait=False, cancel_futures=True)
             
         except Exception as e:
             health_status["container_healthy"] = False
-            logger.error(f"Error en health check del contenedor: {e}")
+            logger.error("Error en health check del contenedor: %s", e)
         
         return health_status
     
+    def _record_probe_failure(self, health_status: Dict[str, Any], service_type: str, error: Exception) -> None:
+        """
+        Marcar un servicio como no saludable.
+        
+        Solo los servicios principales afectan a la salud del contenedor.
+        
+        Args:
+            health_status: Estado de salud en construcción
+            service_type: Tipo de servicio que falló
+            error: Error producido al resolverlo o verificarlo
+        """
+        health_status["services"][service_type] = False
+        if service_type in HEALTH_CHECK_OPTIONAL_SERVICES:
+            logger.warning("Error en health check de %s: %s", service_type, error)
+        else:
+            health_status["container_healthy"] = False
+            logger.error("Error en health check de %s: %s", service_type, error)
+    
     def reset(self) -> None:
         """Reiniciar el contenedor (limpiar singletons)."""
-        self._singletons.clear()
+        for service_type, (state, _, factory) in list(self._registry.items()):
+            if state == _SINGLETON:
+                self._registry[service_type] = (_FACTORY, factory, factory)
         logger.info("Contenedor de dependencias reiniciado")
     
     def get_registered_services(self) -> Dict[str, str]:
@@ -293,22 +384,10 @@ class DependencyContainer:
         Returns:
             Dict[str, str]: Diccionario con tipos de servicio y su estado
         """
-        services = {}
-        
-        # Servicios registrados directamente
-        for service_type in self._services:
-            services[service_type] = "registered"
-        
-        # Factories registradas
-        for service_type in self._factories:
-            if service_type not in services:
-                services[service_type] = "factory"
-        
-        # Singletons creados
-        for service_type in self._singletons:
-            services[service_type] = "singleton"
-        
-        return services
+        return {
+            service_type: _STATE_NAMES[state]
+            for service_type, (state, _, _) in self._registry.items()
+        }
 
 
 # Instancia global del contenedor
@@ -325,7 +404,7 @@ def get_dependency_container() -> DependencyContainer:
     return dependency_container
 
 
-def register_service(service_type: str, service_instance: Any) -> None:
+def register_service(service_type: ServiceKey, service_instance: Any) -> None:
     """
     Registrar un servicio en el contenedor global.
     
@@ -336,7 +415,7 @@ def register_service(service_type: str, service_instance: Any) -> None:
     dependency_container.register_service(service_type, service_instance)
 
 
-def get_service(service_type: str) -> Any:
+def get_service(service_type: ServiceKey) -> Any:
     """
     Obtener un servicio del contenedor global.
     
@@ -349,7 +428,7 @@ def get_service(service_type: str) -> Any:
     return dependency_container.get_service(service_type)
 
 
-def get_service_safe(service_type: str) -> Optional[Any]:
+def get_service_safe(service_type: ServiceKey) -> Optional[Any]:
     """
     Obtener un servicio del contenedor global de forma segura.
     
@@ -0,0 +1,59 @@
+"""
+In-process embedding cache.
+
+This module provides the first tier of the embedding lookup hierarchy used
+by OpenAIService: a bounded LRU held in process memory, consulted before
+Redis and the OpenAI API so hot prompts skip both round trips.
+"""
+
+import threading
+from typing import Optional
+import numpy as np
+from cachetools import LRUCache
+from shared_code.interfaces import IEmbeddingCache
+
+# Embeddings kept in process memory (about 6 KB each for 1536 float32 dimensions)
+EMBEDDING_CACHE_MAX_SIZE = 10_000
+
+
+class LRUEmbeddingCache(IEmbeddingCache):
+    """Thread-safe LRU cache of embeddings keyed by text hash."""
+
+    def __init__(self, maxsize: int = EMBEDDING_CACHE_MAX_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of embeddings kept before evicting the least recently used
+        """
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get_embedding(self, text_hash: str) -> Optional[np.ndarray]:
+        """
+        Get the cached embedding for a text hash.
+
+        Args:
+            text_hash: Hash of the embedded text
+
+        Returns:
+            Optional[np.ndarray]: Read-only embedding, or None on a miss
+        """
+        with self._lock:
+            return self._cache.get(text_hash)
+
+    def put_embedding(self, text_hash: str, embedding: np.ndarray) -> None:
+        """
+        Store an embedding for a text hash.
+
+        The vector is stored as a read-only float32 array so callers sharing
+        it cannot modify the cached copy.
+
+        Args:
+            text_hash: Hash of the embedded text
+            embedding: Embedding vector
+        """
+        vector = np.array(embedding, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._cache[text_hash] = vector
@@ -6,15 +6,56 @@ respuestas estructuradas y recuperación automática cuando sea posible.
 """
 
 import logging
+import re
 import traceback
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timezone
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Callable
 from shared_code.interfaces import IErrorHandler
-from shared_code.utils import sanitize_log_message
+from shared_code.utils import sanitize_log_message, utc_now_iso
 
 
 logger = logging.getLogger(__name__)
 
+# Palabras clave por tipo de error, en orden de prioridad
+_ERROR_KEYWORDS = (
+    ("RATE_LIMIT", ("rate limit", "429")),
+    ("NETWORK_ERROR", ("timeout", "connection")),
+    ("AUTHENTICATION_ERROR", ("authentication", "unauthorized", "401")),
+    ("VALIDATION_ERROR", ("validation", "invalid")),
+    ("OPENAI_ERROR", ("openai", "gpt")),
+    ("REDIS_ERROR", ("redis",)),
+    ("WHATSAPP_ERROR", ("whatsapp",)),
+    ("VISION_ERROR", ("vision", "image")),
+    ("BLOB_STORAGE_ERROR", ("blob", "storage")),
+)
+
+# Un único patrón compilado: cada alternativa es un lookahead anclado al inicio,
+# así que gana el primer tipo (por prioridad) cuyo keyword aparezca en el mensaje
+_ERROR_CLASSIFIER = re.compile(
+    "|".join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, keywords))}))(?P<{error_code}>)"
+        for error_code, keywords in _ERROR_KEYWORDS
+    ),
+    re.IGNORECASE | re.DOTALL
+)
+
+
+@lru_cache(maxsize=256)
+def _classify_message(message: str) -> str:
+    """
+    Clasificar un mensaje de error, memoizando los mensajes repetidos.
+    
+    Args:
+        message: Mensaje de la excepción
+        
+    Returns:
+        str: Tipo de error clasificado
+    """
+    match = _ERROR_CLASSIFIER.match(message)
+    return match.lastgroup if match else "UNKNOWN_ERROR"
+
 
 class ErrorHandler(IErrorHandler):
     """
@@ -26,19 +67,39 @@ class ErrorHandler(IErrorHandler):
     
     def __init__(self):
         """Inicializar el manejador de errores."""
-        self.error_counts = {}
-        self.recovery_strategies = {
-            "RATE_LIMIT": self._handle_rate_limit_error,
-            "NETWORK_ERROR": self._handle_network_error,
-            "AUTHENTICATION_ERROR": self._handle_auth_error,
-            "VALIDATION_ERROR": self._handle_validation_error,
-            "OPENAI_ERROR": self._handle_openai_error,
-            "REDIS_ERROR": self._handle_redis_error,
-            "WHATSAPP_ERROR": self._handle_whatsapp_error,
-            "VISION_ERROR": self._handle_vision_error,
-            "BLOB_STORAGE_ERROR": self._handle_blob_storage_error,
-            "UNKNOWN_ERROR": self._handle_unknown_error
+        self.error_counts: Counter = Counter()
+        self._total_errors = 0
+        # Clasificación por tipo de excepción; None indica que el nombre del
+        # tipo no es informativo y hay que clasificar por el mensaje
+        self._type_cache: Dict[type, Optional[str]] = {}
+        # Respuestas de cada estrategia, construidas una sola vez; solo se copian
+        # y se les añade el timestamp al usarlas
+        self._templates = {
+            "RATE_LIMIT": {
+                "message": "Demasiadas solicitudes. Por favor, espera un momento antes de enviar otro mensaje.",
+                "details": {"retry_after": 60}
+            },
+            "NETWORK_ERROR": {
+                "message": "Error de conexión. Por favor, intenta de nuevo en unos momentos.",
+                "details": {"retry_after": 30}
+            },
+            "AUTHENTICATION_ERROR": {"message": "Error de autenticación del servicio."},
+            "VALIDATION_ERROR": {"message": "Datos de entrada inválidos."},
+            "OPENAI_ERROR": {
+                "message": "Error en el servicio de inteligencia artificial. Por favor, intenta de nuevo."
+            },
+            "REDIS_ERROR": {"message": "Error en el almacenamiento de datos. Por favor, intenta de nuevo."},
+            "WHATSAPP_ERROR": {"message": "Error en el servicio de WhatsApp. Por favor, intenta de nuevo."},
+            "VISION_ERROR": {"message": "Error al procesar la imagen. Por favor, intenta con otra imagen."},
+            "BLOB_STORAGE_ERROR": {
+                "message": "Error en el almacenamiento de archivos. Por favor, intenta de nuevo."
+            },
+            "UNKNOWN_ERROR": {
+                "message": "Error interno del sistema. Por favor, intenta de nuevo más tarde."
+            }
         }
+        for error_code, template in self._templates.items():
+            template["code"] = error_code
     
     def handle_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """
@@ -62,10 +123,8 @@ class ErrorHandler(IErrorHandler):
             self._increment_error_count(error_type)
             
             # Aplicar estrategia de recuperación
-            if error_type in self.recovery_strategies:
-                return self.recovery_strategies[error_type](error, context)
-            else:
-                return self._handle_unknown_error(error, context)
+            strategy = self._RECOVERY_STRATEGIES.get(error_type, ErrorHandler._handle_unknown_error)
+            return strategy(self, error, context)
                 
         except Exception as e:
             logger.error(f"Error en el manejador de errores: {e}")
@@ -78,7 +137,8 @@ class ErrorHandler(IErrorHandler):
         self, 
         message: str, 
         error_code: str = "UNKNOWN_ERROR",
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        include_timestamp: bool = True
     ) -> Dict[str, Any]:
         """
         Crear respuesta de error estructurada.
@@ -87,23 +147,35 @@ class ErrorHandler(IErrorHandler):
             message: Mensaje de error para el usuario
             error_code: Código de error interno
             details: Detalles adicionales del error
+            include_timestamp: Si se añade el timestamp a la respuesta
             
         Returns:
             Dict[str, Any]: Respuesta estructurada
         """
-        response = {
-            "success": False,
-            "error": {
-                "code": error_code,
-                "message": message,
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
-        }
+        error: Dict[str, Any] = {"code": error_code, "message": message}
+        if include_timestamp:
+            error["timestamp"] = utc_now_iso()
         
         if details:
-            response["error"]["details"] = details
+            error["details"] = details
+            
+        return {"success": False, "error": error}
+    
+    def _response_from_template(self, error_code: str) -> Dict[str, Any]:
+        """
+        Crear la respuesta de una estrategia a partir de su plantilla.
+        
+        Args:
+            error_code: Código de error de la plantilla
             
-        return response
+        Returns:
+            Dict[str, Any]: Respuesta estructurada
+        """
+        error = self._templates[error_code].copy()
+        if "details" in error:
+            error["details"] = error["details"].copy()
+        error["timestamp"] = utc_now_iso()
+        return {"success": False, "error": error}
     
     def log_error(self, error: Exception, context: str) -> None:
         """
@@ -120,20 +192,18 @@ class ErrorHandler(IErrorHandler):
             # Sanitizar mensaje para logging
             sanitized_message = sanitize_log_message(error_message)
             
-            # Obtener stack trace
-            stack_trace = traceback.format_exc()
-            
-            # Log estructurado
-            log_data = {
-                "error_type": error_type,
-                "error_message": sanitized_message,
-                "context": context,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "stack_trace": stack_trace
-            }
+            logger.error("Error en %s: %s - %s", context, error_type, sanitized_message)
             
-            logger.error(f"Error en {context}: {error_type} - {sanitized_message}")
-            logger.debug(f"Error details: {log_data}")
+            # El stack trace y el log estructurado solo se construyen si se van a emitir
+            if logger.isEnabledFor(logging.DEBUG):
+                log_data = {
+                    "error_type": error_type,
+                    "error_message": sanitized_message,
+                    "context": context,
+                    "timestamp": utc_now_iso(),
+                    "stack_trace": traceback.format_exc()
+                }
+                logger.debug("Error details: %s", log_data)
             
         except Exception as e:
             logger.error(f"Error logging error: {e}")
@@ -148,30 +218,20 @@ class ErrorHandler(IErrorHandler):
         Returns:
             str: Tipo de error clasificado
         """
-        error_type = type(error).__name__
-        error_message = str(error).lower()
+        error_class = type(error)
+        try:
+            cached = self._type_cache[error_class]
+        except KeyError:
+            # Primera vez que se ve el tipo: si su nombre ya indica la categoría
+            # (ConnectTimeout, AuthenticationError...) se reutiliza para siempre
+            match = _ERROR_CLASSIFIER.match(error_class.__name__)
+            cached = self._type_cache[error_class] = match.lastgroup if match else None
         
-        # Clasificación basada en tipo de excepción y mensaje
-        if "rate limit" in error_message or "429" in error_message:
-            return "RATE_LIMIT"
-        elif "timeout" in error_message or "connection" in error_message:
-            return "NETWORK_ERROR"
-        elif "authentication" in error_message or "unauthorized" in error_message or "401" in error_message:
-            return "AUTHENTICATION_ERROR"
-        elif "validation" in error_message or "invalid" in error_message:
-            return "VALIDATION_ERROR"
-        elif "openai" in error_message or "gpt" in error_message:
-            return "OPENAI_ERROR"
-        elif "redis" in error_message:
-            return "REDIS_ERROR"
-        elif "whatsapp" in error_message:
-            return "WHATSAPP_ERROR"
-        elif "vision" in error_message or "image" in error_message:
-            return "VISION_ERROR"
-        elif "blob" in error_message or "storage" in error_message:
-            return "BLOB_STORAGE_ERROR"
-        else:
-            return "UNKNOWN_ERROR"
+        if cached is not None:
+            return cached
+        
+        # Tipos genéricos (Exception, ValueError...): clasificación basada en el mensaje
+        return _classify_message(str(error))
     
     def _increment_error_count(self, error_type: str) -> None:
         """
@@ -180,98 +240,82 @@ class ErrorHandler(IErrorHandler):
         Args:
             error_type: Tipo de error
         """
-        if error_type not in self.error_counts:
-            self.error_counts[error_type] = 0
         self.error_counts[error_type] += 1
+        self._total_errors += 1
     
     def _handle_rate_limit_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de rate limit."""
-        return self.create_error_response(
-            "Demasiadas solicitudes. Por favor, espera un momento antes de enviar otro mensaje.",
-            error_code="RATE_LIMIT",
-            details={"retry_after": 60}
-        )
+        return self._response_from_template("RATE_LIMIT")
     
     def _handle_network_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de red."""
-        return self.create_error_response(
-            "Error de conexión. Por favor, intenta de nuevo en unos momentos.",
-            error_code="NETWORK_ERROR",
-            details={"retry_after": 30}
-        )
+        return self._response_from_template("NETWORK_ERROR")
     
     def _handle_auth_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de autenticación."""
-        return self.create_error_response(
-            "Error de autenticación del servicio.",
-            error_code="AUTHENTICATION_ERROR"
-        )
+        return self._response_from_template("AUTHENTICATION_ERROR")
     
     def _handle_validation_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de validación."""
-        return self.create_error_response(
-            "Datos de entrada inválidos.",
-            error_code="VALIDATION_ERROR"
-        )
+        return self._response_from_template("VALIDATION_ERROR")
     
     def _handle_openai_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de OpenAI."""
-        return self.create_error_response(
-            "Error en el servicio de inteligencia artificial. Por favor, intenta de nuevo.",
-            error_code="OPENAI_ERROR"
-        )
+        return self._response_from_template("OPENAI_ERROR")
     
     def _handle_redis_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de Redis."""
-        return self.create_error_response(
-            "Error en el almacenamiento de datos. Por favor, intenta de nuevo.",
-            error_code="REDIS_ERROR"
-        )
+        return self._response_from_template("REDIS_ERROR")
     
     def _handle_whatsapp_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de WhatsApp."""
-        return self.create_error_response(
-            "Error en el servicio de WhatsApp. Por favor, intenta de nuevo.",
-            error_code="WHATSAPP_ERROR"
-        )
+        return self._response_from_template("WHATSAPP_ERROR")
     
     def _handle_vision_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de visión."""
-        return self.create_error_response(
-            "Error al procesar la imagen. Por favor, intenta con otra imagen.",
-            error_code="VISION_ERROR"
-        )
+        return self._response_from_template("VISION_ERROR")
     
     def _handle_blob_storage_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error de blob storage."""
-        return self.create_error_response(
-            "Error en el almacenamiento de archivos. Por favor, intenta de nuevo.",
-            error_code="BLOB_STORAGE_ERROR"
-        )
+        return self._response_from_template("BLOB_STORAGE_ERROR")
     
     def _handle_unknown_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Manejar error desconocido."""
-        return self.create_error_response(
-            "Error interno del sistema. Por favor, intenta de nuevo más tarde.",
-            error_code="UNKNOWN_ERROR"
-        )
+        return self._response_from_template("UNKNOWN_ERROR")
+    
+    # Estrategias de recuperación por tipo de error; se guardan las funciones sin
+    # enlazar a nivel de clase y se invocan pasando la instancia explícitamente
+    _RECOVERY_STRATEGIES: Dict[str, Callable[["ErrorHandler", Exception, str], Dict[str, Any]]] = {
+        "RATE_LIMIT": _handle_rate_limit_error,
+        "NETWORK_ERROR": _handle_network_error,
+        "AUTHENTICATION_ERROR": _handle_auth_error,
+        "VALIDATION_ERROR": _handle_validation_error,
+        "OPENAI_ERROR": _handle_openai_error,
+        "REDIS_ERROR": _handle_redis_error,
+        "WHATSAPP_ERROR": _handle_whatsapp_error,
+        "VISION_ERROR": _handle_vision_error,
+        "BLOB_STORAGE_ERROR": _handle_blob_storage_error,
+        "UNKNOWN_ERROR": _handle_unknown_error
+    }
     
     def get_error_stats(self) -> Dict[str, Any]:
         """
         Obtener estadísticas de errores.
         
         Returns:
-            Dict[str, Any]: Estadísticas de errores
+            Dict[str, Any]: Estadísticas de errores; error_counts es una vista
+            de solo lectura de los contadores, no una copia
         """
         return {
-            "error_counts": self.error_counts.copy(),
-            "total_errors": sum(self.error_counts.values()),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "error_counts": MappingProxyType(self.error_counts),
+            "total_errors": self._total_errors,
+            "timestamp": utc_now_iso()
         }
     
     def reset_error_stats(self) -> None:
         """Reiniciar estadísticas de errores."""
         self.error_counts.clear()
+        self._total_errors = 0
     
     def health_check(self) -> bool:
         """
@@ -282,7 +326,7 @@ class ErrorHandler(IErrorHandler):
         """
         try:
             # Verificar que las estrategias de recuperación estén disponibles
-            if not self.recovery_strategies:
+            if not self._RECOVERY_STRATEGIES:
                 return False
             
             # Verificar que se pueda crear una respuesta de error
@@ -293,4 +337,25 @@ class ErrorHandler(IErrorHandler):
             return True
         except Exception as e:
             logger.error(f"Error en health check del ErrorHandler: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+
+# Instancia global del manejador de errores; se crea en el primer uso
+_error_handler_singleton: Optional[ErrorHandler] = None
+
+
+def get_error_handler() -> ErrorHandler:
+    """
+    Obtener la instancia global del manejador de errores.
+    
+    Las estadísticas de errores se acumulan en esta instancia aunque el
+    contenedor de dependencias se reinicie; usar reset_error_stats() para
+    limpiarlas.
+    
+    Returns:
+        ErrorHandler: Instancia del manejador de errores
+    """
+    global _error_handler_singleton
+    if _error_handler_singleton is None:
+        _error_handler_singleton = ErrorHandler()
+    return _error_handler_singleton
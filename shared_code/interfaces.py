@@ -5,10 +5,135 @@ Este módulo define las interfaces abstractas que deben implementar
 todos los servicios para garantizar consistencia y facilitar testing.
 """
 
+import asyncio
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Union
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Any, Iterable, Iterator, Literal, Optional, List, Tuple, Union
 from datetime import datetime
-import azure.functions as func
+from shared_code.models import SearchHit, WebhookEvent
+
+# numpy solo aparece en anotaciones; lo importan los servicios que lo usan,
+# no todo módulo que dependa de las interfaces
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Vector de embedding: los servicios devuelven np.ndarray float32 y aceptan también listas
+EmbeddingVector = Union[List[float], "np.ndarray"]
+
+# Precisión con la que se almacenan los embeddings en Redis
+EmbeddingDType = Literal["float32", "float16", "int8"]
+
+# Algoritmo del índice vectorial de Redis
+VectorIndexAlgorithm = Literal["FLAT", "HNSW"]
+
+# Métrica de distancia del índice vectorial (coseno, euclídea o producto interno)
+DistanceMetric = Literal["cosine", "l2", "ip"]
+
+
+class ServiceType(IntEnum):
+    """Identificadores de los servicios registrados en el contenedor de dependencias."""
+    
+    WHATSAPP = 0
+    USER = 1
+    OPENAI = 2
+    VISION = 3
+    BLOB_STORAGE = 4
+    REDIS = 5
+    ERROR_HANDLER = 6
+    MESSAGE_PROCESSOR = 7
+    
+    @property
+    def service_name(self) -> str:
+        """Nombre con el que el servicio se registra en el contenedor."""
+        return self.name.lower()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Política de caché para respuestas de chat.
+    
+    Con exact=True y temperature 0 la respuesta se cachea por el hash exacto
+    de la petición; en otro caso se usa la caché semántica, si existe, con
+    semantic_threshold como similitud mínima. Con compose_threshold, si no hay
+    acierto se compone una respuesta a partir de los más cercanos.
+    """
+    
+    exact: bool = True
+    semantic_threshold: float = 0.95
+    ttl_seconds: int = 3600
+    # Similitud mínima para componer una respuesta a partir de aciertos cercanos;
+    # None desactiva la composición
+    compose_threshold: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class GeneratedResponse:
+    """
+    Respuesta generada junto con sus metadatos de caché.
+    
+    cache_key solo se informa cuando la respuesta es determinista (temperatura 0
+    y la misma información relevante); el llamador puede guardarla en Redis
+    durante ttl_seconds y servir con ella las consultas idénticas.
+    """
+    
+    text: str
+    cache_key: Optional[str] = None
+    ttl_seconds: int = 0
+    deterministic: bool = False
+    
+    @property
+    def cacheable(self) -> bool:
+        """Indica si la respuesta puede guardarse en caché."""
+        return self.cache_key is not None and self.ttl_seconds > 0
+    
+    @staticmethod
+    def build_cache_key(user_message: str, relevant_info: List[Dict[str, Any]]) -> str:
+        """Clave de caché para un mensaje y los documentos usados para responderlo."""
+        document_ids = ",".join(str(info.get("document_id", "")) for info in relevant_info)
+        digest = hashlib.sha256(f"{user_message}|{document_ids}".encode("utf-8")).hexdigest()
+        return f"generated_response:{digest}"
+
+
+@dataclass(frozen=True)
+class CachedAnswer:
+    """Respuesta cacheada junto con la consulta que la originó y su similitud."""
+    
+    query: str
+    response: str
+    score: float
+
+
+@dataclass(frozen=True)
+class HealthStatus:
+    """
+    Estado de salud de un servicio.
+    
+    Además del resultado incluye la latencia de la comprobación, el último
+    éxito y los fallos consecutivos, para que un ICircuitBreaker pueda decidir
+    si conviene seguir llamando al servicio. Se evalúa como ok en contextos
+    booleanos.
+    """
+    
+    ok: bool
+    latency_ms: float = 0.0
+    last_success: Optional[datetime] = None
+    consecutive_failures: int = 0
+    
+    def __bool__(self) -> bool:
+        return self.ok
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación serializable a JSON."""
+        return {
+            "ok": self.ok,
+            "latency_ms": round(self.latency_ms, 3),
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
 
 
 class IWhatsAppService(ABC):
@@ -71,6 +196,94 @@ class IWhatsAppService(ABC):
         """Marcar mensaje como leído."""
         pass
     
+    @abstractmethod
+    def send_bulk_text_messages(
+        self,
+        items: List[Dict[str, Any]],
+        recipient_ids: Optional[List[str]] = None,
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Enviar varios mensajes de texto en paralelo.
+        
+        Las implementaciones con requests deben dimensionar el pool del
+        HTTPAdapter (pool_connections/pool_maxsize) a max_concurrency; con el
+        tamaño por defecto de urllib3 (10) las conexiones sobrantes se abren y
+        descartan en cada petición.
+        """
+        pass
+    
+    @abstractmethod
+    def mark_messages_as_read(
+        self,
+        message_ids: List[str],
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Marcar varios mensajes como leídos en paralelo."""
+        pass
+    
+    @abstractmethod
+    async def send_text_message_async(
+        self,
+        message: str,
+        recipient_id: Optional[str] = None,
+        preview_url: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Enviar mensaje de texto sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def send_document_message_async(
+        self,
+        document_url: str,
+        filename: str,
+        caption: Optional[str] = None,
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Enviar documento sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def send_template_message_async(
+        self,
+        template_name: str,
+        template_variables: Optional[Dict[str, Any]] = None,
+        recipient_id: Optional[str] = None,
+        language_code: str = "es"
+    ) -> Dict[str, Any]:
+        """Enviar mensaje de plantilla sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def send_interactive_message_async(
+        self,
+        body_text: str,
+        buttons: List[Dict[str, str]],
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Enviar mensaje interactivo sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def send_quick_reply_message_async(
+        self,
+        body_text: str,
+        quick_replies: List[Dict[str, str]],
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Enviar mensaje de respuesta rápida sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def mark_message_as_read_async(self, message_id: str) -> Dict[str, Any]:
+        """Marcar mensaje como leído sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def send_typing_indicator_async(self, message_id: str) -> Dict[str, Any]:
+        """Marcar el mensaje como leído y mostrar al usuario que se está escribiendo."""
+        pass
+    
     @abstractmethod
     def get_message_status(self, message_id: str) -> Dict[str, Any]:
         """Obtener estado del mensaje."""
@@ -82,12 +295,12 @@ class IWhatsAppService(ABC):
         pass
     
     @abstractmethod
-    def process_webhook_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Procesar evento del webhook."""
+    def process_webhook_event(self, event: WebhookEvent) -> WebhookEvent:
+        """Procesar evento del webhook ya convertido con WebhookEvent.from_payload."""
         pass
     
     @abstractmethod
-    def health_check(self) -> bool:
+    def health_check(self) -> HealthStatus:
         """Verificar salud del servicio."""
         pass
 
@@ -126,6 +339,16 @@ class IUserService(ABC):
         """Actualizar última actividad del usuario."""
         pass
     
+    @abstractmethod
+    def schedule_last_activity(self, user_id: str) -> None:
+        """Encolar la actualización de última actividad sin esperar a Redis."""
+        pass
+    
+    @abstractmethod
+    def flush_activity_buffer(self) -> int:
+        """Escribir las actividades encoladas y retornar los usuarios actualizados."""
+        pass
+    
     @abstractmethod
     def create_user(self, user: 'User') -> bool:
         """Crear usuario desde modelo User."""
@@ -147,11 +370,91 @@ class IUserService(ABC):
         pass
     
     @abstractmethod
-    def health_check(self) -> bool:
+    def health_check(self) -> HealthStatus:
         """Verificar salud del servicio."""
         pass
 
 
+class ISemanticCache(ABC):
+    """
+    Interfaz para una caché de respuestas indexada por similitud de la consulta.
+    
+    Además del acierto directo permite recuperar los top_k aciertos cercanos y
+    componer con ellos una respuesta nueva mediante el hook composer, más
+    barato que una generación completa.
+    """
+    
+    top_k: int = 3
+    composer: Optional[Callable[[str, List[CachedAnswer]], Optional[str]]] = None
+    
+    @abstractmethod
+    def lookup(
+        self,
+        query_embedding: EmbeddingVector,
+        threshold: float,
+        namespace: Optional[str] = None,
+        context_embedding: Optional[EmbeddingVector] = None
+    ) -> Optional[str]:
+        """
+        Obtener la respuesta de la consulta más similar, si supera el umbral.
+        
+        Con namespace (p. ej. el teléfono del usuario) solo se consideran las
+        entradas guardadas en ese mismo namespace. Con context_embedding (el
+        turno anterior de la conversación) también el contexto guardado debe
+        superar el umbral, para no servir respuestas a mensajes de seguimiento
+        parecidos en conversaciones distintas.
+        """
+        pass
+    
+    @abstractmethod
+    def find_similar(
+        self,
+        query_embedding: EmbeddingVector,
+        threshold: float,
+        namespace: Optional[str] = None,
+        context_embedding: Optional[EmbeddingVector] = None
+    ) -> List[CachedAnswer]:
+        """Obtener hasta top_k respuestas cacheadas que superen el umbral."""
+        pass
+    
+    @abstractmethod
+    def compose(self, query: str, hits: List[CachedAnswer]) -> Optional[str]:
+        """Componer una respuesta a partir de aciertos cercanos, si hay composer."""
+        pass
+    
+    @abstractmethod
+    def store(
+        self,
+        query_embedding: EmbeddingVector,
+        query: str,
+        response: str,
+        ttl_seconds: int,
+        namespace: Optional[str] = None,
+        context_embedding: Optional[EmbeddingVector] = None
+    ) -> None:
+        """Guardar una respuesta asociada al embedding de su consulta y de su contexto."""
+        pass
+
+
+
+class IEmbeddingCache(ABC):
+    """
+    Interfaz para una caché de embeddings en memoria del proceso.
+    
+    Es el primer nivel de la jerarquía de embeddings: se consulta antes que
+    Redis y que la API de OpenAI, y se rellena con lo que estos devuelven.
+    """
+    
+    @abstractmethod
+    def get_embedding(self, text_hash: str) -> Optional['np.ndarray']:
+        """Obtener el embedding cacheado para el hash del texto."""
+        pass
+    
+    @abstractmethod
+    def put_embedding(self, text_hash: str, embedding: 'np.ndarray') -> None:
+        """Guardar el embedding asociado al hash del texto."""
+        pass
+
 class IOpenAIService(ABC):
     """Interfaz para el servicio de OpenAI."""
     
@@ -161,9 +464,26 @@ class IOpenAIService(ABC):
         messages: List[Dict[str, str]], 
         max_tokens: int = 1000,
         temperature: float = 0.7,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        cache_policy: Optional[CachePolicy] = None
     ) -> str:
-        """Generar respuesta de chat usando OpenAI."""
+        """Generar respuesta de chat usando OpenAI, opcionalmente desde caché."""
+        pass
+    
+    @abstractmethod
+    def generate_chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generar respuesta de chat en streaming.
+        
+        Las implementaciones son generadores asíncronos que entregan los
+        fragmentos de texto a medida que el modelo los genera.
+        """
         pass
     
     @abstractmethod
@@ -177,18 +497,39 @@ class IOpenAIService(ABC):
         pass
     
     @abstractmethod
-    def generate_embeddings(self, text: str) -> List[float]:
-        """Generar embeddings para texto."""
+    async def generate_response_async(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7
+    ) -> str:
+        """Generar respuesta usando el cliente asíncrono, sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    def generate_embeddings(self, text: str) -> 'np.ndarray':
+        """Generar embeddings para texto como vector float32 de forma (dim,)."""
         pass
     
     @abstractmethod
-    def generate_embedding(self, text: str) -> List[float]:
+    def generate_embedding(self, text: str) -> 'np.ndarray':
         """Generar embedding para texto (alias para compatibilidad)."""
         pass
     
     @abstractmethod
-    def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generar embeddings para múltiples textos."""
+    def generate_batch_embeddings(
+        self,
+        texts: List[str],
+        batch_size: int = 256,
+        max_concurrency: int = 8
+    ) -> 'np.ndarray':
+        """
+        Generar embeddings para múltiples textos como matriz float32 (n, dim).
+        
+        Las implementaciones deben enviar hasta batch_size textos por petición
+        (el endpoint de embeddings acepta listas) y como máximo max_concurrency
+        peticiones a la vez, conservando el orden de los textos.
+        """
         pass
     
     @abstractmethod
@@ -196,7 +537,8 @@ class IOpenAIService(ABC):
         self, 
         user_message: str, 
         context: Optional[str] = None,
-        user_name: Optional[str] = None
+        user_name: Optional[str] = None,
+        cache_policy: Optional[CachePolicy] = None
     ) -> str:
         """Generar respuesta específica para WhatsApp."""
         pass
@@ -207,7 +549,7 @@ class IOpenAIService(ABC):
         pass
     
     @abstractmethod
-    def health_check(self) -> bool:
+    def health_check(self) -> HealthStatus:
         """Verificar salud del servicio."""
         pass
 
@@ -226,7 +568,7 @@ class IVisionService(ABC):
         pass
     
     @abstractmethod
-    def health_check(self) -> bool:
+    def health_check(self) -> HealthStatus:
         """Verificar salud del servicio."""
         pass
 
@@ -244,6 +586,61 @@ class IBlobStorageService(ABC):
         """Descargar archivo del blob storage."""
         pass
     
+    @abstractmethod
+    def upload_stream(
+        self,
+        data_stream: Union[BinaryIO, Iterable[bytes]],
+        blob_name: str,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None,
+        length: Optional[int] = None
+    ) -> str:
+        """Subir un stream o iterable de bytes sin pasar por un archivo local."""
+        pass
+    
+    @abstractmethod
+    def download_chunks(self, blob_name: str) -> Iterator[bytes]:
+        """Descargar un blob como iterador de bloques de bytes."""
+        pass
+    
+    @abstractmethod
+    def upload_from_url(
+        self,
+        source_url: str,
+        blob_name: str,
+        headers: Optional[Dict[str, str]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: Optional[str] = None
+    ) -> str:
+        """Subir un archivo remoto (p. ej. media de WhatsApp) en streaming."""
+        pass
+    
+    @abstractmethod
+    def upload_files_batch(
+        self,
+        files: List[Tuple[str, str, str]],
+        max_concurrency: int = 8
+    ) -> Dict[str, Optional[str]]:
+        """
+        Subir varios archivos (file_path, container_name, blob_name) en paralelo.
+        
+        Devuelve la URL por nombre de blob, o None si su subida falló.
+        """
+        pass
+    
+    @abstractmethod
+    def download_files_batch(
+        self,
+        files: List[Tuple[str, str, str]],
+        max_concurrency: int = 8
+    ) -> Dict[str, bool]:
+        """
+        Descargar varios blobs (container_name, blob_name, destination_path) en paralelo.
+        
+        Devuelve por nombre de blob si la copia local quedó actualizada.
+        """
+        pass
+    
     @abstractmethod
     def delete_file(self, container_name: str, blob_name: str) -> bool:
         """Eliminar archivo del blob storage."""
@@ -255,7 +652,22 @@ class IBlobStorageService(ABC):
         pass
     
     @abstractmethod
-    def health_check(self) -> bool:
+    def get_file_urls(
+        self,
+        container_name: str,
+        blob_names: List[str],
+        expiry_minutes: int = 60
+    ) -> Dict[str, str]:
+        """
+        Obtener URLs firmadas (SAS de lectura) para varios blobs.
+        
+        Las firmas se calculan localmente reutilizando una única clave, sin una
+        petición por blob.
+        """
+        pass
+    
+    @abstractmethod
+    def health_check(self) -> HealthStatus:
         """Verificar salud del servicio."""
         pass
 
@@ -267,38 +679,107 @@ class IRedisService(ABC):
     def store_embedding(
         self, 
         document_id: str, 
-        embedding: List[float], 
+        embedding: EmbeddingVector, 
         metadata: Dict[str, Any],
         index_name: str = "document_embeddings",
-        expiration_days: int = 30
+        expiration_days: int = 30,
+        dtype: EmbeddingDType = "float32",
+        key_prefix: str = "doc:"
+    ) -> bool:
+        """
+        Almacenar embedding de documento con metadatos.
+        
+        dtype="float16" reduce a la mitad la memoria por vector e "int8" a la
+        cuarta parte (con escala por vector); debe coincidir con el del índice,
+        igual que key_prefix.
+        """
+        pass
+    
+    @abstractmethod
+    def store_embeddings_bulk(
+        self,
+        items: List[Tuple[str, EmbeddingVector, Dict[str, Any]]],
+        index_name: str = "document_embeddings",
+        chunk_size: int = 500,
+        expiration_days: int = 30,
+        dtype: EmbeddingDType = "float32",
+        key_prefix: str = "doc:"
+    ) -> int:
+        """
+        Almacenar muchos embeddings (document_id, embedding, metadatos).
+        
+        Las implementaciones deben agrupar las escrituras en lotes de chunk_size
+        por ida y vuelta a Redis. Las claves usan key_prefix, que debe coincidir
+        con el del índice. Devuelve el número de documentos almacenados.
+        """
+        pass
+    
+    @abstractmethod
+    def create_search_index(
+        self,
+        index_name: str = "document_embeddings",
+        dtype: EmbeddingDType = "float32",
+        algorithm: VectorIndexAlgorithm = "HNSW",
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_runtime: int = 10,
+        dim: int = 1536,
+        metric: DistanceMetric = "cosine",
+        key_prefix: str = "doc:",
+        tag_fields: Tuple[str, ...] = ()
     ) -> bool:
-        """Almacenar embedding de documento con metadatos."""
+        """
+        Crear índice de búsqueda en Redis.
+        
+        HNSW es sublineal en el tamaño del corpus; FLAT solo conviene para
+        colecciones pequeñas (menos de ~100k vectores). El índice solo cubre
+        las claves con key_prefix; los campos de tag_fields se indexan como
+        TAG para filtrar por valor exacto.
+        """
         pass
     
     @abstractmethod
-    def create_search_index(self, index_name: str = "document_embeddings") -> bool:
-        """Crear índice de búsqueda en Redis."""
+    def configure_index(
+        self,
+        index_name: str,
+        dim: int,
+        metric: DistanceMetric = "cosine",
+        key_prefix: str = "doc:",
+        tag_fields: Tuple[str, ...] = ()
+    ) -> bool:
+        """
+        Fijar la dimensión y la métrica de un índice.
+        
+        A partir de ese momento las implementaciones rechazan vectores de otra
+        dimensión en ese índice y pueden especializarse para la forma fija.
+        """
         pass
     
     @abstractmethod
     def semantic_search(
         self, 
-        query_embedding: List[float], 
+        query_embedding: EmbeddingVector, 
         top_k: int = 5,
         index_name: str = "document_embeddings",
-        similarity_threshold: float = 0.7
-    ) -> List[Dict[str, Any]]:
+        similarity_threshold: float = 0.7,
+        dtype: EmbeddingDType = "float32",
+        ef_runtime: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> List[SearchHit]:
         """Búsqueda semántica de documentos."""
         pass
     
     @abstractmethod
     def search_similar_documents(
         self, 
-        query_embedding: List[float], 
+        query_embedding: EmbeddingVector, 
         top_k: int = 5,
         index_name: str = "document_embeddings",
-        similarity_threshold: float = 0.7
-    ) -> List[Dict[str, Any]]:
+        similarity_threshold: float = 0.7,
+        dtype: EmbeddingDType = "float32",
+        ef_runtime: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> List[SearchHit]:
         """Buscar documentos similares."""
         pass
     
@@ -337,6 +818,16 @@ class IRedisService(ABC):
         """Obtener valor de Redis."""
         pass
     
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Obtener varios valores de Redis en una sola petición (MGET)."""
+        pass
+    
+    @abstractmethod
+    def set_many(self, mapping: Dict[str, str], expiration: Optional[int] = None) -> bool:
+        """Establecer varios valores en Redis en una sola ida y vuelta."""
+        pass
+    
     @abstractmethod
     def delete(self, key: str) -> bool:
         """Eliminar clave de Redis."""
@@ -348,9 +839,62 @@ class IRedisService(ABC):
         pass
     
     @abstractmethod
-    def health_check(self) -> bool:
+    def health_check(self) -> HealthStatus:
         """Verificar salud del servicio."""
         pass
+    
+    @abstractmethod
+    async def astore_embedding(
+        self,
+        document_id: str,
+        embedding: EmbeddingVector,
+        metadata: Dict[str, Any],
+        index_name: str = "document_embeddings",
+        expiration_days: int = 30,
+        dtype: EmbeddingDType = "float32",
+        key_prefix: str = "doc:"
+    ) -> bool:
+        """Almacenar embedding de documento sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def asemantic_search(
+        self,
+        query_embedding: EmbeddingVector,
+        top_k: int = 5,
+        index_name: str = "document_embeddings",
+        similarity_threshold: float = 0.7,
+        dtype: EmbeddingDType = "float32",
+        ef_runtime: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> List[SearchHit]:
+        """Búsqueda semántica de documentos sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def aset(self, key: str, value: str, expiration: Optional[int] = None) -> bool:
+        """Establecer valor en Redis sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def aget(self, key: str) -> Optional[str]:
+        """Obtener valor de Redis sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def adelete(self, key: str) -> bool:
+        """Eliminar clave de Redis sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def aexists(self, key: str) -> bool:
+        """Verificar si clave existe sin bloquear el event loop."""
+        pass
+    
+    @abstractmethod
+    async def ahealth_check(self) -> bool:
+        """Verificar salud del servicio sin bloquear el event loop."""
+        pass
 
 
 class IMessageProcessor(ABC):
@@ -366,6 +910,67 @@ class IMessageProcessor(ABC):
         """Procesar mensaje de texto."""
         pass
     
+    @abstractmethod
+    async def process_text_message_async(
+        self,
+        message: Dict[str, Any],
+        user: 'User',
+        session: 'UserSession'
+    ) -> Dict[str, Any]:
+        """
+        Procesar mensaje de texto sin bloquear el event loop.
+        
+        La búsqueda de información relevante y la generación de la respuesta
+        se ejecutan en paralelo.
+        """
+        pass
+    
+    @abstractmethod
+    async def stream_text_message_async(
+        self,
+        message: Dict[str, Any],
+        user: 'User',
+        session: 'UserSession'
+    ) -> Dict[str, Any]:
+        """
+        Procesar mensaje de texto enviando la respuesta por partes.
+        
+        La respuesta se genera en streaming y cada parte se envía a WhatsApp en
+        cuanto termina una frase, mientras el modelo sigue generando.
+        """
+        pass
+    
+    @abstractmethod
+    async def process_text_messages_async(
+        self,
+        messages: List[Dict[str, Any]],
+        users: List['User'],
+        sessions: List['UserSession'],
+        max_concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Procesar varios mensajes de texto como tareas del event loop.
+        
+        Como máximo max_concurrency mensajes están en curso a la vez (límite
+        de envío de WhatsApp); los de un mismo usuario se atienden en orden.
+        """
+        pass
+    
+    @abstractmethod
+    def process_text_messages_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        users: List['User'],
+        sessions: List['UserSession']
+    ) -> List[Dict[str, Any]]:
+        """
+        Procesar varios mensajes de texto de un mismo webhook.
+        
+        Las implementaciones deben resolver el trabajo compartido (embeddings,
+        búsqueda) una vez por lote y devolver las respuestas en el orden de entrada.
+        """
+        pass
+    
     @abstractmethod
     def process_media_message(
         self, 
@@ -396,9 +1001,17 @@ class IResponseGenerator(ABC):
         user_message: str, 
         user: 'User', 
         session: 'UserSession', 
-        relevant_info: List[Dict[str, Any]]
-    ) -> str:
-        """Generar respuesta para el usuario."""
+        relevant_info: List[Dict[str, Any]],
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> GeneratedResponse:
+        """
+        Generar respuesta para el usuario.
+        
+        Si se indica on_partial, se invoca con cada fragmento a medida que se
+        genera (p. ej. para que IWhatsAppService emita indicadores de escritura).
+        Las implementaciones informan cache_key (ver GeneratedResponse.build_cache_key)
+        solo si generan con temperatura 0; en otro caso lo dejan en None.
+        """
         pass
     
     @abstractmethod
@@ -439,6 +1052,51 @@ class IErrorHandler(ABC):
         pass
 
 
+
+class ICircuitBreaker(ABC):
+    """
+    Interfaz para un circuit breaker por dependencia.
+    
+    Tras varios fallos consecutivos el circuito de la dependencia se abre y
+    allow() devuelve False hasta que pasa el tiempo de enfriamiento, de modo
+    que el flujo de peticiones puede saltarse un servicio que se sabe caído.
+    """
+    
+    @abstractmethod
+    def allow(self, name: str) -> bool:
+        """Indicar si se puede llamar a la dependencia."""
+        pass
+    
+    @abstractmethod
+    def record(self, name: str, success: bool, latency_ms: float) -> None:
+        """Registrar el resultado de una llamada a la dependencia."""
+        pass
+    
+    @abstractmethod
+    def status(self, name: str) -> HealthStatus:
+        """Obtener el estado registrado de la dependencia."""
+        pass
+
+
+class IMessageSender(ABC):
+    """
+    Interfaz para una cola de envío de mensajes de texto.
+    
+    enqueue() devuelve en cuanto el mensaje queda encolado; un proceso en
+    segundo plano lo envía respetando el límite de la API y resuelve el
+    future con la respuesta (incluido el message_id).
+    """
+    
+    @abstractmethod
+    async def enqueue(self, recipient_id: str, message: str) -> "asyncio.Future[Dict[str, Any]]":
+        """Encolar un mensaje de texto y devolver el future de su envío."""
+        pass
+    
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Enviar los mensajes pendientes y detener el proceso de envío."""
+        pass
+
 # Importar modelos para evitar referencias circulares
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -6,15 +6,119 @@ Este módulo se encarga de procesar diferentes tipos de mensajes
 a los servicios apropiados.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from shared_code.interfaces import IMessageProcessor, IWhatsAppService, IUserService, IOpenAIService, IVisionService, IBlobStorageService, IErrorHandler
-from shared_code.user_service import User, UserSession
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, List, Tuple
+from cachetools import TTLCache
+from shared_code.interfaces import IMessageProcessor, IWhatsAppService, IUserService, IOpenAIService, IVisionService, IBlobStorageService, IErrorHandler, ISemanticCache, IMessageSender
+from shared_code.models import SendResult
 from shared_code.utils import extract_media_info, sanitize_text
 
+# user_service carga la configuración y el cliente de Redis, y numpy solo hace
+# falta con caché semántica; no se importan al cargar el módulo para reducir
+# el arranque en frío de la Function App
+if TYPE_CHECKING:
+    import numpy as np
+    from shared_code.user_service import User, UserSession
+
 
 logger = logging.getLogger(__name__)
 
+# Usuarios atendidos en paralelo al procesar un lote de mensajes
+BATCH_MAX_CONCURRENCY = 8
+
+# Turnos de conversación que se conservan en el contexto de la sesión
+SESSION_CONVERSATION_MAX_TURNS = 10
+
+# Ventana en la que se agrupan las escrituras de una misma sesión, en segundos
+SESSION_UPDATE_WINDOW_SECONDS = 0.05
+
+# Similitud mínima (distancia coseno < 0.15) para reutilizar una respuesta cacheada
+SEMANTIC_CACHE_THRESHOLD = 0.85
+
+# Vigencia de las respuestas cacheadas, en segundos
+SEMANTIC_CACHE_TTL_SECONDS = 3600
+
+# Entradas de la caché exacta de respuestas (texto repetido tal cual)
+EXACT_CACHE_MAX_ENTRIES = 10_000
+
+# Contexto del sistema para OpenAI; se conserva el texto (sangría incluida)
+# para que las claves de la caché de respuestas no cambien
+_SYSTEM_CONTEXT: str = """
+        Eres un asistente virtual pastoral para la comunidad cristiana VEA Connect. 
+        Tu propósito es servir con amor, compasión y sabiduría bíblica.
+        
+        RESPONSABILIDADES:
+        - Responder preguntas sobre ministerios y actividades de la iglesia
+        - Proporcionar información sobre eventos y horarios de servicios
+        - Ayudar con donaciones y ofrendas
+        - Ofrecer apoyo espiritual y oración
+        - Compartir recursos bíblicos y devocionales
+        
+        TONO Y ESTILO:
+        - Amoroso y acogedor como un pastor
+        - Respetuoso y compasivo
+        - Basado en principios bíblicos
+        - Alentador y edificante
+        - Profesional pero cálido
+        
+        RESPUESTAS:
+        - Siempre en español
+        - Incluir versículos bíblicos cuando sea apropiado
+        - Ofrecer oración cuando sea solicitado
+        - Conectar con líderes específicos cuando sea necesario
+        - Ser específico sobre eventos y horarios
+        - Mostrar el amor de Cristo en cada interacción
+        """
+
+# Mensaje de sistema compartido por todas las conversaciones; no se modifica.
+# Debe ser estático (sin fechas ni datos del usuario) para que el proveedor
+# pueda cachear el prefijo del prompt
+_SYSTEM_MESSAGE: Dict[str, str] = {"role": "system", "content": _SYSTEM_CONTEXT}
+
+# Respuestas fijas para los tipos de mensaje que aún no se procesan
+_UNSUPPORTED_MSG = (
+    "Lo siento, este tipo de mensaje no está soportado. "
+    "Puedes enviarme texto, imágenes, audio o documentos."
+)
+_AUDIO_MSG = (
+    "Gracias por el mensaje de audio. "
+    "Actualmente no puedo procesar audio, pero puedes enviarme un mensaje de texto."
+)
+_DOC_MSG = (
+    "Gracias por compartir este documento. "
+    "Actualmente no puedo procesar documentos, pero puedes enviarme un mensaje de texto."
+)
+_UNSUPPORTED_MEDIA_MSG = (
+    "Este tipo de medio no está soportado. "
+    "Puedes enviarme texto, imágenes, audio o documentos."
+)
+
+# Contexto, mensaje y código de error de cada respuesta fija si falla el envío
+_CANNED_RESPONSE_ERRORS = {
+    "unsupported": ("process_unsupported_message", "Error procesando mensaje", "PROCESSING_ERROR"),
+    "audio": ("process_audio_message", "Error procesando audio", "AUDIO_PROCESSING_ERROR"),
+    "document": ("process_document_message", "Error procesando documento", "DOCUMENT_PROCESSING_ERROR"),
+    "unsupported_media": ("process_unsupported_media", "Error procesando medio", "MEDIA_PROCESSING_ERROR"),
+}
+
+# Caracteres acumulados antes de enviar una parte de una respuesta en streaming
+STREAM_SEGMENT_MIN_CHARS = 400
+
+# Longitud máxima del cuerpo de un mensaje de texto de WhatsApp
+WHATSAPP_TEXT_MAX_CHARS = 4096
+
+# Fin de frase en el que se puede cortar una respuesta en streaming
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*\s+")
+
+# Separador entre el texto del usuario y la información relevante encontrada
+RELEVANT_INFO_HEADER = "\n\nInformación relevante:\n"
+
 
 class MessageProcessor(IMessageProcessor):
     """
@@ -31,7 +135,9 @@ class MessageProcessor(IMessageProcessor):
         openai_service: IOpenAIService,
         vision_service: Optional[IVisionService] = None,
         blob_storage_service: Optional[IBlobStorageService] = None,
-        error_handler: Optional[IErrorHandler] = None
+        error_handler: Optional[IErrorHandler] = None,
+        semantic_cache: Optional[ISemanticCache] = None,
+        sender: Optional[IMessageSender] = None
     ):
         """
         Inicializar el procesador de mensajes.
@@ -43,6 +149,8 @@ class MessageProcessor(IMessageProcessor):
             vision_service: Servicio de visión (opcional)
             blob_storage_service: Servicio de blob storage (opcional)
             error_handler: Manejador de errores (opcional)
+            semantic_cache: Caché semántica de respuestas por usuario (opcional)
+            sender: Cola de envío usada por los métodos asíncronos (opcional)
         """
         self.whatsapp_service = whatsapp_service
         self.user_service = user_service
@@ -50,16 +158,39 @@ class MessageProcessor(IMessageProcessor):
         self.vision_service = vision_service
         self.blob_storage_service = blob_storage_service
         self.error_handler = error_handler
+        self.semantic_cache = semantic_cache
+        self.sender = sender
+        # Caché exacta previa a la semántica, por (teléfono, texto, turno anterior)
+        self._exact_cache: TTLCache = TTLCache(
+            maxsize=EXACT_CACHE_MAX_ENTRIES,
+            ttl=SEMANTIC_CACHE_TTL_SECONDS
+        )
+        self._exact_cache_lock = threading.Lock()
+        # Escritor en segundo plano de las sesiones; un solo hilo conserva el orden
+        self._session_executor: Optional[ThreadPoolExecutor] = None
+        self._session_lock = threading.Lock()
+        # Última copia pendiente de guardar de cada sesión, por session_id
+        self._pending_sessions: Dict[str, UserSession] = {}
+        self._session_flush_scheduled = False
+        # Manejador de cada tipo de medio; los demás van a _process_unsupported_media
+        self._media_dispatch: Dict[str, Callable[..., Dict[str, Any]]] = {
+            "image": self._process_image_message,
+            "audio": self._process_audio_message,
+            "document": self._process_document_message,
+        }
     
     def process_text_message(
         self, 
         message: Dict[str, Any], 
-        user: User, 
-        session: UserSession
+        user: 'User', 
+        session: 'UserSession'
     ) -> Dict[str, Any]:
         """
         Procesar mensaje de texto.
         
+        Si el mensaje incluye "no_cache": True, la respuesta se genera siempre
+        con OpenAI sin consultar ni actualizar la caché semántica.
+        
         Args:
             message: Mensaje a procesar
             user: Usuario que envió el mensaje
@@ -80,14 +211,103 @@ class MessageProcessor(IMessageProcessor):
             # Buscar información relevante (si está disponible)
             relevant_info = self._search_relevant_info(sanitized_text)
             
-            # Generar respuesta usando OpenAI
-            response_text = self.openai_service.generate_response([
-                {"role": "system", "content": self._get_system_context()},
-                {"role": "user", "content": sanitized_text}
-            ])
+            return self._respond_to_text(
+                sanitized_text, user, session, relevant_info, use_cache=not message.get("no_cache")
+            )
             
-            # Actualizar contexto de la sesión
-            self._update_session_context(session, sanitized_text, response_text)
+        except Exception as e:
+            logger.error(f"Error procesando mensaje de texto: {e}")
+            if self.error_handler:
+                return self.error_handler.handle_error(e, "process_text_message")
+            else:
+                return self._create_error_response("Error procesando mensaje", "PROCESSING_ERROR")
+    
+    def process_text_messages_batch(
+        self,
+        messages: List[Dict[str, Any]],
+        users: List['User'],
+        sessions: List['UserSession']
+    ) -> List[Dict[str, Any]]:
+        """
+        Procesar varios mensajes de texto recibidos en un mismo webhook.
+        
+        La búsqueda de información relevante se hace una vez para todo el lote.
+        Los mensajes de un mismo usuario se atienden en orden y los de usuarios
+        distintos en paralelo.
+        
+        Args:
+            messages: Mensajes a procesar
+            users: Usuario de cada mensaje
+            sessions: Sesión de cada mensaje
+            
+        Returns:
+            List[Dict[str, Any]]: Respuesta de cada mensaje, en el orden de entrada
+        """
+        if not len(messages) == len(users) == len(sessions):
+            raise ValueError("messages, users y sessions deben tener la misma longitud")
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        texts: Dict[int, str] = {}
+        uncached: set = set()
+        for index, message in enumerate(messages):
+            try:
+                text = message.get("text", {}).get("body", "").strip()
+                if message.get("no_cache"):
+                    uncached.add(index)
+            except Exception as e:
+                logger.error(f"Error procesando mensaje de texto: {e}")
+                results[index] = self._create_error_response("Error procesando mensaje", "PROCESSING_ERROR")
+                continue
+            if text:
+                texts[index] = sanitize_text(text)
+            else:
+                results[index] = self._create_error_response("Mensaje de texto vacío", "EMPTY_MESSAGE")
+        
+        relevant_infos = dict(zip(texts, self._search_relevant_info_batch(list(texts.values()))))
+        
+        # Agrupar por usuario para conservar el orden de su conversación
+        groups: Dict[str, List[int]] = {}
+        for index in texts:
+            groups.setdefault(users[index].phone_number, []).append(index)
+        
+        def process_group(indices: List[int]) -> None:
+            for index in indices:
+                results[index] = self._respond_to_text(
+                    texts[index], users[index], sessions[index], relevant_infos[index],
+                    use_cache=index not in uncached
+                )
+        
+        if groups:
+            workers = min(BATCH_MAX_CONCURRENCY, len(groups))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="message-batch") as executor:
+                list(executor.map(process_group, groups.values()))
+        
+        logger.info(f"Lote de {len(messages)} mensajes procesado ({len(groups)} usuarios)")
+        return results  # type: ignore[return-value]
+    
+    def _respond_to_text(
+        self,
+        sanitized_text: str,
+        user: 'User',
+        session: 'UserSession',
+        relevant_info: List[Dict[str, Any]],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Generar, registrar y enviar la respuesta a un texto ya sanitizado.
+        
+        Args:
+            sanitized_text: Texto del usuario
+            user: Usuario que envió el mensaje
+            session: Sesión del usuario
+            relevant_info: Información relevante encontrada para el texto
+            use_cache: Consultar y actualizar la caché semántica
+            
+        Returns:
+            Dict[str, Any]: Respuesta procesada
+        """
+        try:
+            response_text = self._generate_text_response(sanitized_text, user, session, use_cache, relevant_info)
             
             # Enviar respuesta
             send_result = self.whatsapp_service.send_text_message(
@@ -95,17 +315,10 @@ class MessageProcessor(IMessageProcessor):
                 recipient_id=user.phone_number
             )
             
-            # Extraer success del resultado (puede ser booleano o diccionario)
-            success = send_result.get("success", True) if isinstance(send_result, dict) else bool(send_result)
-            message_id = send_result.get("message_id") if isinstance(send_result, dict) else None
+            # Actualizar contexto de la sesión (la escritura se hace en segundo plano)
+            self._update_session_context(session, sanitized_text, response_text)
             
-            return {
-                "success": success,
-                "response": response_text,
-                "message_type": "text",
-                "user_id": user.phone_number,
-                "message_id": message_id
-            }
+            return self._build_text_result(send_result, response_text, user)
             
         except Exception as e:
             logger.error(f"Error procesando mensaje de texto: {e}")
@@ -114,11 +327,451 @@ class MessageProcessor(IMessageProcessor):
             else:
                 return self._create_error_response("Error procesando mensaje", "PROCESSING_ERROR")
     
+    async def process_text_message_async(
+        self,
+        message: Dict[str, Any],
+        user: 'User',
+        session: 'UserSession'
+    ) -> Dict[str, Any]:
+        """
+        Procesar mensaje de texto sin bloquear el event loop.
+        
+        La búsqueda de información relevante se ejecuta en paralelo con la
+        consulta a la caché semántica; las llamadas que solo tienen versión
+        síncrona (caché, búsqueda) se delegan a un hilo.
+        
+        Con sender, la respuesta se encola y el método devuelve sin esperar al
+        envío: "delivery" contiene el future que se resuelve con la respuesta
+        de WhatsApp (y su message_id).
+        
+        Args:
+            message: Mensaje a procesar
+            user: Usuario que envió el mensaje
+            session: Sesión del usuario
+            
+        Returns:
+            Dict[str, Any]: Respuesta procesada
+        """
+        try:
+            text = message.get("text", {}).get("body", "").strip()
+            if not text:
+                return self._create_error_response("Mensaje de texto vacío", "EMPTY_MESSAGE")
+            
+            sanitized_text = sanitize_text(text)
+            response_text = await self._generate_text_response_async(
+                sanitized_text, user, session, use_cache=not message.get("no_cache")
+            )
+            
+            if self.sender is not None:
+                delivery = await self.sender.enqueue(user.phone_number, response_text)
+                self._update_session_context(session, sanitized_text, response_text)
+                result = self._build_text_result({"success": True}, response_text, user)
+                result["delivery"] = delivery
+                return result
+            
+            send_result = await self.whatsapp_service.send_text_message_async(
+                response_text,
+                recipient_id=user.phone_number
+            )
+            
+            self._update_session_context(session, sanitized_text, response_text)
+            return self._build_text_result(send_result, response_text, user)
+            
+        except Exception as e:
+            logger.error(f"Error procesando mensaje de texto: {e}")
+            if self.error_handler:
+                return self.error_handler.handle_error(e, "process_text_message")
+            else:
+                return self._create_error_response("Error procesando mensaje", "PROCESSING_ERROR")
+    
+    async def process_text_messages_async(
+        self,
+        messages: List[Dict[str, Any]],
+        users: List['User'],
+        sessions: List['UserSession'],
+        max_concurrency: int = BATCH_MAX_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Procesar varios mensajes de texto como tareas del event loop.
+        
+        Cada usuario es una tarea que atiende sus mensajes en orden; un
+        semáforo limita a max_concurrency los mensajes en curso para respetar
+        el límite de envío de WhatsApp.
+        
+        Args:
+            messages: Mensajes a procesar
+            users: Usuario de cada mensaje
+            sessions: Sesión de cada mensaje
+            max_concurrency: Máximo de mensajes en curso a la vez
+            
+        Returns:
+            List[Dict[str, Any]]: Respuesta de cada mensaje, en el orden de entrada
+        """
+        if not len(messages) == len(users) == len(sessions):
+            raise ValueError("messages, users y sessions deben tener la misma longitud")
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency debe ser mayor que 0")
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Agrupar por usuario para conservar el orden de su conversación
+        groups: Dict[str, List[int]] = {}
+        for index, user in enumerate(users):
+            groups.setdefault(user.phone_number, []).append(index)
+        
+        async def process_group(indices: List[int]) -> None:
+            for index in indices:
+                async with semaphore:
+                    results[index] = await self.process_text_message_async(
+                        messages[index], users[index], sessions[index]
+                    )
+        
+        await asyncio.gather(*(asyncio.create_task(process_group(indices)) for indices in groups.values()))
+        
+        logger.info(f"Lote de {len(messages)} mensajes procesado de forma asíncrona ({len(groups)} usuarios)")
+        return results  # type: ignore[return-value]
+    
+    async def stream_text_message_async(
+        self,
+        message: Dict[str, Any],
+        user: 'User',
+        session: 'UserSession'
+    ) -> Dict[str, Any]:
+        """
+        Procesar mensaje de texto enviando la respuesta por partes.
+        
+        Mientras se busca información relevante y se consulta la caché, se
+        muestra al usuario el indicador de escritura. La respuesta se genera
+        en streaming y, cada vez que se acumulan STREAM_SEGMENT_MIN_CHARS
+        caracteres, se envía hasta el último fin de frase; los envíos se
+        encadenan para conservar el orden sin detener la generación.
+        
+        Args:
+            message: Mensaje a procesar
+            user: Usuario que envió el mensaje
+            session: Sesión del usuario
+            
+        Returns:
+            Dict[str, Any]: Respuesta procesada; message_id es el de la primera parte
+        """
+        try:
+            text = message.get("text", {}).get("body", "").strip()
+            if not text:
+                return self._create_error_response("Mensaje de texto vacío", "EMPTY_MESSAGE")
+            
+            sanitized_text = sanitize_text(text)
+            use_cache = not message.get("no_cache")
+            
+            # La búsqueda y el indicador corren mientras se consulta la caché
+            search = asyncio.create_task(asyncio.to_thread(self._search_relevant_info, sanitized_text))
+            typing = asyncio.create_task(self._send_typing_indicator(message.get("id")))
+            cached: Optional[str] = None
+            embedding: Optional[Any] = None
+            context_embedding: Optional['np.ndarray'] = None
+            if use_cache:
+                cached, embedding, context_embedding = await asyncio.to_thread(
+                    self._lookup_cached_response, sanitized_text, user, session
+                )
+            relevant_info = await search
+            await typing
+            
+            send_results: List[Any] = []
+            
+            async def send(segment: str, previous: Optional["asyncio.Task[None]"]) -> None:
+                if previous is not None:
+                    await previous
+                send_results.append(
+                    await self.whatsapp_service.send_text_message_async(segment, recipient_id=user.phone_number)
+                )
+            
+            if cached is not None:
+                response_text = cached
+                await send(cached, None)
+            else:
+                parts: List[str] = []
+                buffer = ""
+                last_send: Optional["asyncio.Task[None]"] = None
+                try:
+                    async for chunk in self.openai_service.generate_chat_completion_stream(
+                        self._build_text_conversation(sanitized_text, relevant_info)
+                    ):
+                        parts.append(chunk)
+                        buffer += chunk
+                        segment, buffer = _split_ready_segment(buffer)
+                        if segment:
+                            last_send = asyncio.create_task(send(segment, last_send))
+                    for segment in _split_remaining_segments(buffer):
+                        last_send = asyncio.create_task(send(segment, last_send))
+                except Exception:
+                    if last_send is not None:
+                        await asyncio.gather(last_send, return_exceptions=True)
+                    raise
+                if last_send is not None:
+                    await last_send
+                
+                response_text = "".join(parts)
+                if use_cache:
+                    await asyncio.to_thread(
+                        self._store_cached_response, sanitized_text, response_text, user, session, embedding, context_embedding
+                    )
+            
+            self._update_session_context(session, sanitized_text, response_text)
+            
+            sent = [SendResult.from_response(result) for result in send_results]
+            result = self._build_text_result(sent[0] if sent else False, response_text, user)
+            result["success"] = bool(sent) and all(item.success for item in sent)
+            result["segments"] = len(sent)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error procesando mensaje de texto: {e}")
+            if self.error_handler:
+                return self.error_handler.handle_error(e, "process_text_message")
+            else:
+                return self._create_error_response("Error procesando mensaje", "PROCESSING_ERROR")
+    
+    async def _send_typing_indicator(self, message_id: Optional[str]) -> None:
+        """Mostrar el indicador de escritura; un fallo no impide responder."""
+        if not message_id:
+            return
+        try:
+            await self.whatsapp_service.send_typing_indicator_async(message_id)
+        except Exception as e:
+            logger.warning(f"Error enviando indicador de escritura: {e}")
+    
+    @staticmethod
+    def _build_text_result(send_result: Any, response_text: str, user: 'User') -> Dict[str, Any]:
+        """
+        Construir la respuesta procesada de un mensaje de texto.
+        
+        Args:
+            send_result: Resultado del envío (diccionario, SendResult o booleano)
+            response_text: Texto enviado
+            user: Usuario destinatario
+            
+        Returns:
+            Dict[str, Any]: Respuesta procesada
+        """
+        sent = SendResult.from_response(send_result)
+        return {
+            "success": sent.success,
+            "response": response_text,
+            "message_type": "text",
+            "user_id": user.phone_number,
+            "message_id": sent.message_id
+        }
+    
+    def _build_text_conversation(
+        self,
+        sanitized_text: str,
+        relevant_info: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Construir los mensajes enviados a OpenAI para un texto del usuario.
+        
+        El mensaje de sistema es idéntico en todas las peticiones y va primero,
+        de modo que el proveedor pueda reutilizar su caché de prompts para ese
+        prefijo. Todo dato variable (información relevante incluida) va en el
+        mensaje del usuario, después del prefijo.
+        
+        Args:
+            sanitized_text: Texto del usuario
+            relevant_info: Información relevante encontrada para el texto
+            
+        Returns:
+            List[Dict[str, str]]: Mensajes de la conversación
+        """
+        content = sanitized_text
+        snippets = [
+            str(item.get("text") or item.get("content") or "").strip()
+            for item in relevant_info or []
+        ]
+        snippets = [snippet for snippet in snippets if snippet]
+        if snippets:
+            content += RELEVANT_INFO_HEADER + "\n".join(f"- {snippet}" for snippet in snippets)
+        return [_SYSTEM_MESSAGE, {"role": "user", "content": content}]
+    
+    def _generate_text_response(
+        self,
+        sanitized_text: str,
+        user: 'User',
+        session: 'UserSession',
+        use_cache: bool,
+        relevant_info: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """
+        Obtener la respuesta a un texto, reutilizando la caché semántica.
+        
+        Args:
+            sanitized_text: Texto del usuario
+            user: Usuario que envió el mensaje
+            session: Sesión del usuario (de ella se toma el turno anterior)
+            use_cache: Consultar y actualizar la caché semántica
+            relevant_info: Información relevante que se añade al mensaje del usuario
+            
+        Returns:
+            str: Texto de la respuesta
+        """
+        cached, embedding, context_embedding = None, None, None
+        if use_cache:
+            cached, embedding, context_embedding = self._lookup_cached_response(sanitized_text, user, session)
+            if cached is not None:
+                return cached
+        
+        # Generar respuesta usando OpenAI
+        response_text = self.openai_service.generate_response(
+            self._build_text_conversation(sanitized_text, relevant_info)
+        )
+        
+        if use_cache:
+            self._store_cached_response(sanitized_text, response_text, user, session, embedding, context_embedding)
+        
+        return response_text
+    
+    async def _generate_text_response_async(
+        self,
+        sanitized_text: str,
+        user: 'User',
+        session: 'UserSession',
+        use_cache: bool
+    ) -> str:
+        """
+        Versión asíncrona de _generate_text_response.
+        
+        La búsqueda de información relevante y la consulta a la caché se
+        ejecutan en paralelo, cada una en un hilo.
+        """
+        search = asyncio.to_thread(self._search_relevant_info, sanitized_text)
+        if use_cache:
+            relevant_info, (cached, embedding, context_embedding) = await asyncio.gather(
+                search, asyncio.to_thread(self._lookup_cached_response, sanitized_text, user, session)
+            )
+            if cached is not None:
+                return cached
+        else:
+            relevant_info, embedding, context_embedding = await search, None, None
+        
+        response_text = await self.openai_service.generate_response_async(
+            self._build_text_conversation(sanitized_text, relevant_info)
+        )
+        
+        if use_cache:
+            await asyncio.to_thread(
+                self._store_cached_response, sanitized_text, response_text, user, session, embedding, context_embedding
+            )
+        
+        return response_text
+    
+    def _lookup_cached_response(
+        self,
+        sanitized_text: str,
+        user: 'User',
+        session: 'UserSession'
+    ) -> Tuple[Optional[str], Optional[Any], Optional['np.ndarray']]:
+        """
+        Buscar la respuesta a un texto en la caché exacta y luego en la semántica.
+        
+        La caché exacta responde a las repeticiones literales (tras normalizar
+        mayúsculas y espacios) sin calcular embeddings. La caché semántica se separa por número de teléfono para no compartir respuestas
+        entre usuarios, y cada entrada guarda además el embedding del turno
+        anterior: solo hay acierto si el mensaje y su contexto se parecen a los
+        cacheados. Un fallo de la caché no impide responder.
+        
+        Args:
+            sanitized_text: Texto del usuario
+            user: Usuario que envió el mensaje
+            session: Sesión del usuario (de ella se toma el turno anterior)
+            
+        Returns:
+            Tuple: Respuesta cacheada (o None), embedding del texto y del turno
+                anterior para guardar la respuesta; los embeddings son None si
+                no hay caché o falló
+        """
+        key = self._exact_cache_key(sanitized_text, user, session)
+        with self._exact_cache_lock:
+            cached = self._exact_cache.get(key)
+        if cached is not None:
+            logger.info(f"Respuesta obtenida de la caché exacta para {user.phone_number}")
+            return cached, None, None
+        
+        if self.semantic_cache is None:
+            return None, None, None
+        try:
+            embedding = self.openai_service.generate_embedding(sanitized_text)
+            context_embedding = self._previous_turn_embedding(session, embedding)
+            cached = self.semantic_cache.lookup(
+                embedding, SEMANTIC_CACHE_THRESHOLD,
+                namespace=user.phone_number, context_embedding=context_embedding
+            )
+            if cached is not None:
+                logger.info(f"Respuesta obtenida de la caché semántica para {user.phone_number}")
+            return cached, embedding, context_embedding
+        except Exception as e:
+            logger.warning(f"Error consultando la caché semántica: {e}")
+            return None, None, None
+    
+    def _store_cached_response(
+        self,
+        sanitized_text: str,
+        response_text: str,
+        user: 'User',
+        session: 'UserSession',
+        embedding: Optional[Any],
+        context_embedding: Optional['np.ndarray']
+    ) -> None:
+        """Guardar una respuesta generada en la caché exacta y, con embedding, en la semántica."""
+        key = self._exact_cache_key(sanitized_text, user, session)
+        with self._exact_cache_lock:
+            self._exact_cache[key] = response_text
+        
+        if embedding is None:
+            return
+        try:
+            self.semantic_cache.store(  # type: ignore[union-attr]
+                embedding, sanitized_text, response_text, SEMANTIC_CACHE_TTL_SECONDS,
+                namespace=user.phone_number, context_embedding=context_embedding
+            )
+        except Exception as e:
+            logger.warning(f"Error guardando en la caché semántica: {e}")
+    
+    @staticmethod
+    def _exact_cache_key(sanitized_text: str, user: 'User', session: 'UserSession') -> Tuple[str, str, str]:
+        """
+        Clave de la caché exacta de un texto.
+        
+        Incluye el turno anterior del usuario, como el contexto de la caché
+        semántica, para que respuestas como "sí" no se reutilicen entre
+        conversaciones distintas.
+        """
+        conversation = (session.context or {}).get("conversation") or []
+        previous = (conversation[-1].get("user") if conversation else None) or ""
+        return user.phone_number, sanitized_text.lower().strip(), previous.lower().strip()
+    
+    def _previous_turn_embedding(self, session: 'UserSession', embedding: Any) -> 'np.ndarray':
+        """
+        Obtener el embedding del mensaje anterior del usuario en la sesión.
+        
+        Args:
+            session: Sesión del usuario
+            embedding: Embedding del mensaje actual (define la dimensión)
+            
+        Returns:
+            np.ndarray: Embedding del turno anterior, o un vector nulo si no lo hay
+        """
+        import numpy as np
+        
+        conversation = (session.context or {}).get("conversation") or []
+        previous = conversation[-1].get("user") if conversation else None
+        if not previous:
+            return np.zeros(len(embedding), dtype=np.float32)
+        return np.asarray(self.openai_service.generate_embedding(previous), dtype=np.float32)
+    
     def process_media_message(
         self, 
         message: Dict[str, Any], 
-        user: User, 
-        session: UserSession
+        user: 'User', 
+        session: 'UserSession'
     ) -> Dict[str, Any]:
         """
         Procesar mensaje multimedia.
@@ -140,15 +793,9 @@ class MessageProcessor(IMessageProcessor):
             media_type = media_info.get("type")
             
             # Procesar según el tipo de medio
-            if media_type == "image":
-                return self._process_image_message(message, media_info, user, session)
-            elif media_type == "audio":
-                return self._process_audio_message(message, media_info, user, session)
-            elif media_type == "document":
-                return self._process_document_message(message, media_info, user, session)
-            else:
-                return self._process_unsupported_media(message, user, session)
-                
+            handler = self._media_dispatch.get(media_type, self._process_unsupported_media)
+            return handler(message, media_info, user, session)
+            
         except Exception as e:
             logger.error(f"Error procesando mensaje multimedia: {e}")
             if self.error_handler:
@@ -159,8 +806,8 @@ class MessageProcessor(IMessageProcessor):
     def process_unsupported_message(
         self, 
         message: Dict[str, Any], 
-        user: User, 
-        session: UserSession
+        user: 'User', 
+        session: 'UserSession'
     ) -> Dict[str, Any]:
         """
         Procesar mensaje no soportado.
@@ -173,41 +820,14 @@ class MessageProcessor(IMessageProcessor):
         Returns:
             Dict[str, Any]: Respuesta procesada
         """
-        try:
-            # Enviar mensaje de tipo no soportado
-            response_text = (
-                "Lo siento, este tipo de mensaje no está soportado. "
-                "Puedes enviarme texto, imágenes, audio o documentos."
-            )
-            
-            send_result = self.whatsapp_service.send_text_message(
-                response_text, 
-                recipient_id=user.phone_number
-            )
-            
-            # Extraer success del resultado (puede ser booleano o diccionario)
-            success = send_result.get("success", True) if isinstance(send_result, dict) else bool(send_result)
-            
-            return {
-                "success": success,
-                "response": response_text,
-                "message_type": "unsupported",
-                "user_id": user.phone_number
-            }
-            
-        except Exception as e:
-            logger.error(f"Error procesando mensaje no soportado: {e}")
-            if self.error_handler:
-                return self.error_handler.handle_error(e, "process_unsupported_message")
-            else:
-                return self._create_error_response("Error procesando mensaje", "PROCESSING_ERROR")
+        return self._send_canned_response(user, _UNSUPPORTED_MSG, "unsupported")
     
     def _process_image_message(
         self, 
         message: Dict[str, Any], 
         media_info: Dict[str, Any], 
-        user: User, 
-        session: UserSession
+        user: 'User', 
+        session: 'UserSession'
     ) -> Dict[str, Any]:
         """Procesar mensaje de imagen."""
         try:
@@ -231,11 +851,8 @@ class MessageProcessor(IMessageProcessor):
                 recipient_id=user.phone_number
             )
             
-            # Extraer success del resultado (puede ser booleano o diccionario)
-            success = send_result.get("success", True) if isinstance(send_result, dict) else bool(send_result)
-            
             return {
-                "success": success,
+                "success": SendResult.from_response(send_result).success,
                 "response": response_text,
                 "message_type": "image",
                 "user_id": user.phone_number,
@@ -253,108 +870,64 @@ class MessageProcessor(IMessageProcessor):
         self, 
         message: Dict[str, Any], 
         media_info: Dict[str, Any], 
-        user: User, 
-        session: UserSession
+        user: 'User', 
+        session: 'UserSession'
     ) -> Dict[str, Any]:
         """Procesar mensaje de audio."""
-        try:
-            response_text = (
-                "Gracias por el mensaje de audio. "
-                "Actualmente no puedo procesar audio, pero puedes enviarme un mensaje de texto."
-            )
-            
-            send_result = self.whatsapp_service.send_text_message(
-                response_text, 
-                recipient_id=user.phone_number
-            )
-            
-            # Extraer success del resultado (puede ser booleano o diccionario)
-            success = send_result.get("success", True) if isinstance(send_result, dict) else bool(send_result)
-            
-            return {
-                "success": success,
-                "response": response_text,
-                "message_type": "audio",
-                "user_id": user.phone_number
-            }
-            
-        except Exception as e:
-            logger.error(f"Error procesando audio: {e}")
-            if self.error_handler:
-                return self.error_handler.handle_error(e, "process_audio_message")
-            else:
-                return self._create_error_response("Error procesando audio", "AUDIO_PROCESSING_ERROR")
+        return self._send_canned_response(user, _AUDIO_MSG, "audio")
     
     def _process_document_message(
         self, 
         message: Dict[str, Any], 
         media_info: Dict[str, Any], 
-        user: User, 
-        session: UserSession
+        user: 'User', 
+        session: 'UserSession'
     ) -> Dict[str, Any]:
         """Procesar mensaje de documento."""
-        try:
-            response_text = (
-                "Gracias por compartir este documento. "
-                "Actualmente no puedo procesar documentos, pero puedes enviarme un mensaje de texto."
-            )
-            
-            send_result = self.whatsapp_service.send_text_message(
-                response_text, 
-                recipient_id=user.phone_number
-            )
-            
-            # Extraer success del resultado (puede ser booleano o diccionario)
-            success = send_result.get("success", True) if isinstance(send_result, dict) else bool(send_result)
-            
-            return {
-                "success": success,
-                "response": response_text,
-                "message_type": "document",
-                "user_id": user.phone_number
-            }
-            
-        except Exception as e:
-            logger.error(f"Error procesando documento: {e}")
-            if self.error_handler:
-                return self.error_handler.handle_error(e, "process_document_message")
-            else:
-                return self._create_error_response("Error procesando documento", "DOCUMENT_PROCESSING_ERROR")
+        return self._send_canned_response(user, _DOC_MSG, "document")
     
     def _process_unsupported_media(
         self, 
         message: Dict[str, Any], 
-        user: User, 
-        session: UserSession
+        media_info: Dict[str, Any], 
+        user: 'User', 
+        session: 'UserSession'
     ) -> Dict[str, Any]:
         """Procesar medio no soportado."""
-        try:
-            response_text = (
-                "Este tipo de medio no está soportado. "
-                "Puedes enviarme texto, imágenes, audio o documentos."
-            )
+        return self._send_canned_response(user, _UNSUPPORTED_MEDIA_MSG, "unsupported_media")
+    
+    def _send_canned_response(self, user: 'User', response_text: str, message_type: str) -> Dict[str, Any]:
+        """
+        Enviar una respuesta fija (tipos no soportados o aún no procesados).
+        
+        Args:
+            user: Usuario destinatario
+            response_text: Texto de la respuesta
+            message_type: Tipo de mensaje que se informa en el resultado
             
+        Returns:
+            Dict[str, Any]: Respuesta procesada
+        """
+        try:
             send_result = self.whatsapp_service.send_text_message(
                 response_text, 
                 recipient_id=user.phone_number
             )
             
-            # Extraer success del resultado (puede ser booleano o diccionario)
-            success = send_result.get("success", True) if isinstance(send_result, dict) else bool(send_result)
-            
             return {
-                "success": success,
+                "success": SendResult.from_response(send_result).success,
                 "response": response_text,
-                "message_type": "unsupported_media",
+                "message_type": message_type,
                 "user_id": user.phone_number
             }
             
         except Exception as e:
-            logger.error(f"Error procesando medio no soportado: {e}")
+            context, error_message, error_code = _CANNED_RESPONSE_ERRORS[message_type]
+            logger.error(f"Error en {context}: {e}")
             if self.error_handler:
-                return self.error_handler.handle_error(e, "process_unsupported_media")
+                return self.error_handler.handle_error(e, context)
             else:
-                return self._create_error_response("Error procesando medio", "MEDIA_PROCESSING_ERROR")
+                return self._create_error_response(error_message, error_code)
     
     def _search_relevant_info(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -370,7 +943,19 @@ class MessageProcessor(IMessageProcessor):
         # Por ahora retornar lista vacía
         return []
     
-    def _generate_image_response(self, image_analysis: Dict[str, Any], user: User) -> str:
+    def _search_relevant_info_batch(self, queries: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Buscar información relevante para varias consultas.
+        
+        Args:
+            queries: Consultas de los usuarios
+            
+        Returns:
+            List[List[Dict[str, Any]]]: Información relevante de cada consulta
+        """
+        return [self._search_relevant_info(query) for query in queries]
+    
+    def _generate_image_response(self, image_analysis: Dict[str, Any], user: 'User') -> str:
         """
         Generar respuesta para análisis de imagen.
         
@@ -402,13 +987,19 @@ class MessageProcessor(IMessageProcessor):
     
     def _update_session_context(
         self, 
-        session: UserSession, 
+        session: 'UserSession', 
         user_message: str, 
         bot_response: str
     ) -> None:
         """
         Actualizar contexto de la sesión.
         
+        La conversación es un deque acotado a SESSION_CONVERSATION_MAX_TURNS
+        turnos. La sesión se guarda en segundo plano a partir de una copia,
+        fuera del camino de la respuesta; las actualizaciones de una misma
+        sesión dentro de SESSION_UPDATE_WINDOW_SECONDS se agrupan en una sola
+        escritura.
+        
         Args:
             session: Sesión del usuario
             user_message: Mensaje del usuario
@@ -418,26 +1009,74 @@ class MessageProcessor(IMessageProcessor):
             if not session.context:
                 session.context = {}
             
-            # Agregar mensajes al contexto
-            if "conversation" not in session.context:
-                session.context["conversation"] = []
+            # Las sesiones leídas de Redis traen la conversación como lista
+            conversation = session.context.get("conversation")
+            if not isinstance(conversation, deque) or conversation.maxlen != SESSION_CONVERSATION_MAX_TURNS:
+                conversation = deque(conversation or (), maxlen=SESSION_CONVERSATION_MAX_TURNS)
+                session.context["conversation"] = conversation
             
-            session.context["conversation"].append({
+            conversation.append({
                 "user": user_message,
                 "bot": bot_response,
                 "timestamp": session.created_at.isoformat() if session.created_at else None
             })
             
-            # Mantener solo los últimos 10 mensajes
-            if len(session.context["conversation"]) > 10:
-                session.context["conversation"] = session.context["conversation"][-10:]
-            
-            # Actualizar sesión
-            self.user_service.update_session(session)
+            # Copia serializable: el hilo de escritura no debe ver cambios posteriores
+            snapshot = session.model_copy(update={
+                "context": {**session.context, "conversation": list(conversation)}
+            })
+            self._schedule_session_write(snapshot)
             
         except Exception as e:
             logger.error(f"Error actualizando contexto de sesión: {e}")
     
+    def _schedule_session_write(self, snapshot: 'UserSession') -> None:
+        """
+        Dejar pendiente la escritura de una sesión.
+        
+        Solo se guarda la última copia de cada sesión; la primera sesión
+        pendiente programa el vaciado tras la ventana de agrupación.
+        """
+        with self._session_lock:
+            self._pending_sessions[snapshot.session_id] = snapshot
+            if self._session_flush_scheduled:
+                return
+            self._session_flush_scheduled = True
+            if self._session_executor is None:
+                self._session_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-update")
+            executor = self._session_executor
+        executor.submit(self._flush_pending_sessions)
+    
+    def _flush_pending_sessions(self) -> None:
+        """Esperar la ventana de agrupación y guardar las sesiones pendientes."""
+        time.sleep(SESSION_UPDATE_WINDOW_SECONDS)
+        with self._session_lock:
+            pending = self._pending_sessions
+            self._pending_sessions = {}
+            self._session_flush_scheduled = False
+        for session in pending.values():
+            self._write_session(session)
+    
+    def _write_session(self, session: 'UserSession') -> None:
+        """Guardar la sesión; los errores solo se registran."""
+        try:
+            self.user_service.update_session(session)
+        except Exception as e:
+            logger.error(f"Error guardando sesión: {e}")
+    
+    def flush_session_updates(self, timeout: Optional[float] = None) -> None:
+        """
+        Esperar a que terminen las escrituras de sesión pendientes.
+        
+        Args:
+            timeout: Segundos máximos de espera (None espera indefinidamente)
+        """
+        if self._session_executor is None:
+            return
+        # Con un solo hilo, una tarea vacía termina después de todas las anteriores
+        marker: Future = self._session_executor.submit(lambda: None)
+        marker.result(timeout=timeout)
+    
     def _get_system_context(self) -> str:
         """
         Obtener contexto del sistema para OpenAI.
@@ -445,32 +1084,7 @@ class MessageProcessor(IMessageProcessor):
         Returns:
             str: Contexto del sistema
         """
-        return """
-        Eres un asistente virtual pastoral para la comunidad cristiana VEA Connect. 
-        Tu propósito es servir con amor, compasión y sabiduría bíblica.
-        
-        RESPONSABILIDADES:
-        - Responder preguntas sobre ministerios y actividades de la iglesia
-        - Proporcionar información sobre eventos y horarios de servicios
-        - Ayudar con donaciones y ofrendas
-        - Ofrecer apoyo espiritual y oración
-        - Compartir recursos bíblicos y devocionales
-        
-        TONO Y ESTILO:
-        - Amoroso y acogedor como un pastor
-        - Respetuoso y compasivo
-        - Basado en principios bíblicos
-        - Alentador y edificante
-        - Profesional pero cálido
-        
-        RESPUESTAS:
-        - Siempre en español
-        - Incluir versículos bíblicos cuando sea apropiado
-        - Ofrecer oración cuando sea solicitado
-        - Conectar con líderes específicos cuando sea necesario
-        - Ser específico sobre eventos y horarios
-        - Mostrar el amor de Cristo en cada interacción
-        """
+        return _SYSTEM_CONTEXT
     
     def _create_error_response(self, message: str, error_code: str) -> Dict[str, Any]:
         """
@@ -492,4 +1106,52 @@ class MessageProcessor(IMessageProcessor):
                     "code": error_code,
                     "message": message
                 }
-            } 
\ No newline at end of file
+            } 
+
+
+def _split_ready_segment(buffer: str) -> Tuple[str, str]:
+    """
+    Separar la parte de una respuesta en streaming que ya se puede enviar.
+    
+    Con al menos STREAM_SEGMENT_MIN_CHARS caracteres se corta en el último fin
+    de frase; si no hay ninguno y el texto llega al máximo de WhatsApp, se
+    corta en el último espacio.
+    
+    Args:
+        buffer: Texto generado y aún no enviado
+        
+    Returns:
+        Tuple[str, str]: Parte lista para enviar (vacía si no hay) y resto
+    """
+    if len(buffer) < STREAM_SEGMENT_MIN_CHARS:
+        return "", buffer
+    
+    cut = None
+    for match in _SENTENCE_END.finditer(buffer, 0, WHATSAPP_TEXT_MAX_CHARS):
+        cut = match.end()
+    if cut is None:
+        if len(buffer) < WHATSAPP_TEXT_MAX_CHARS:
+            return "", buffer
+        cut = buffer.rfind(" ", 0, WHATSAPP_TEXT_MAX_CHARS) + 1 or WHATSAPP_TEXT_MAX_CHARS
+    
+    return buffer[:cut].strip(), buffer[cut:]
+
+
+def _split_remaining_segments(buffer: str) -> List[str]:
+    """
+    Dividir el final de una respuesta en streaming en partes enviables.
+    
+    Args:
+        buffer: Texto generado y aún no enviado
+        
+    Returns:
+        List[str]: Partes no vacías de como máximo WHATSAPP_TEXT_MAX_CHARS caracteres
+    """
+    segments = []
+    while len(buffer) > WHATSAPP_TEXT_MAX_CHARS:
+        segment, buffer = _split_ready_segment(buffer)
+        if segment:
+            segments.append(segment)
+    if buffer.strip():
+        segments.append(buffer.strip())
+    return segments
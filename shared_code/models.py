@@ -0,0 +1,160 @@
+"""
+Modelos de datos tipados para el bot de WhatsApp VEA Connect.
+
+Este módulo define los resultados que los servicios devuelven en el camino
+caliente como dataclasses congeladas con __slots__, en lugar de Dict[str, Any]:
+el acceso a campos es un atributo y no una búsqueda en diccionario, y cada
+instancia ocupa menos memoria. orjson serializa estas dataclasses de forma
+nativa en los límites HTTP.
+"""
+
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+class _MappingCompat:
+    """
+    Acceso de solo lectura estilo diccionario para los modelos.
+
+    Permite migrar gradualmente a los llamadores que aún usan
+    resultado["campo"] o resultado.get("campo"); el código nuevo debe usar
+    los atributos directamente.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__dataclass_fields__:  # type: ignore[attr-defined]
+            return getattr(self, key)
+        extra = getattr(self, "extra", None)
+        if extra is not None and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Obtener un campo por nombre o default si no existe."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterator[str]:
+        """Nombres de los campos, incluidos los extra."""
+        yield from self.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación como diccionario plano."""
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "extra"}  # type: ignore[arg-type]
+        data.update(getattr(self, "extra", None) or {})
+        return data
+
+
+@dataclass(slots=True, frozen=True)
+class SearchHit(_MappingCompat):
+    """Documento devuelto por una búsqueda semántica con su puntuación."""
+
+    document_id: str
+    score: float
+    text: str = ""
+    filename: str = ""
+    content_type: str = ""
+    upload_date: Optional[str] = None
+    # Campos adicionales del índice (p. ej. metadatos personalizados)
+    extra: Mapping[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SearchHit":
+        """Construir un SearchHit a partir de un diccionario con los mismos campos."""
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name != "extra" and name in data}
+        extra = {key: value for key, value in data.items() if key not in cls.__dataclass_fields__}
+        return cls(**known, extra=extra)
+
+
+@dataclass(slots=True, frozen=True)
+class WebhookEvent(_MappingCompat):
+    """Evento del webhook de WhatsApp reducido al primer mensaje que contiene."""
+
+    event_type: str = "unknown"
+    message_id: Optional[str] = None
+    sender_id: Optional[str] = None
+    message_type: Optional[str] = None
+    # Texto del mensaje, o datos del archivo para documentos e imágenes
+    message_content: Any = None
+    timestamp: Optional[str] = None
+    processed_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "WebhookEvent":
+        """Construir el evento a partir del payload decodificado del webhook."""
+        entries = payload.get("entry") or [{}]
+        changes = entries[0].get("changes") or [{}]
+        value = changes[0].get("value") or {}
+        messages = value.get("messages")
+        if not messages:
+            return cls()
+
+        message = messages[0]
+        message_type = message.get("type")
+        content: Any = None
+        if message_type == "text":
+            content = message.get("text", {}).get("body")
+        elif message_type == "document":
+            document = message.get("document", {})
+            content = {
+                "filename": document.get("filename"),
+                "url": document.get("url"),
+                "mime_type": document.get("mime_type"),
+                "file_size": document.get("file_size")
+            }
+        elif message_type == "image":
+            image = message.get("image", {})
+            content = {
+                "url": image.get("url"),
+                "mime_type": image.get("mime_type"),
+                "file_size": image.get("file_size")
+            }
+
+        return cls(
+            event_type="message",
+            message_id=message.get("id"),
+            sender_id=message.get("from"),
+            message_type=message_type,
+            message_content=content,
+            timestamp=message.get("timestamp")
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class SendResult(_MappingCompat):
+    """Resultado de enviar un mensaje por WhatsApp."""
+
+    success: bool = True
+    message_id: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, response: Any) -> "SendResult":
+        """
+        Normalizar la respuesta de un envío.
+
+        Acepta la respuesta de la Graph API ({"messages": [{"id": ...}]}), las
+        respuestas de error de create_error_response ({"success": False, ...}),
+        un SendResult o un booleano.
+        """
+        if isinstance(response, SendResult):
+            return response
+        if not isinstance(response, Mapping):
+            return cls(success=bool(response))
+        message_id = response.get("message_id")
+        if message_id is None:
+            messages = response.get("messages")
+            if messages:
+                message_id = messages[0].get("id")
+        return cls(success=bool(response.get("success", True)), message_id=message_id)
@@ -6,25 +6,68 @@ for both chat completions and text embeddings with production-grade features
 and optimized prompts for Christian community support.
 """
 
+import base64
+import hashlib
 import logging
 import json
-from typing import List, Dict, Any, Optional, Union, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union, cast
 from datetime import datetime
+import numpy as np
 import openai
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
 from openai.types.chat import ChatCompletion
 from openai.types.chat.chat_completion_message_param import ChatCompletionMessageParam
 from config.settings import settings
-from shared_code.interfaces import IOpenAIService
+from shared_code.interfaces import IOpenAIService, IRedisService, ISemanticCache, IEmbeddingCache, CachePolicy, CachedAnswer, EmbeddingVector
+from shared_code.circuit_breaker import tracks_health
+from shared_code.embedding_cache import LRUEmbeddingCache
 
 logger = logging.getLogger(__name__)
 
+# Prefix of the exact-match chat completion cache keys
+COMPLETION_CACHE_PREFIX = "chat_completion:"
+
+# Prefix and lifetime of the embedding cache keys shared through Redis
+EMBEDDING_CACHE_PREFIX = "embedding:"
+EMBEDDING_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# System prompt and token budget for composing an answer from cached near hits
+COMPOSE_SYSTEM_PROMPT = (
+    "Responde la pregunta del usuario en español combinando únicamente la información "
+    "de las respuestas previas a preguntas similares. No añadas datos nuevos; si no "
+    "bastan para responder, contesta exactamente: NO_DISPONIBLE"
+)
+COMPOSE_MAX_TOKENS = 300
+COMPOSE_UNAVAILABLE = "NO_DISPONIBLE"
+
+# Texts sent per embeddings request, and requests in flight, for batch embeddings
+EMBEDDINGS_BATCH_SIZE = 256
+EMBEDDINGS_MAX_CONCURRENCY = 8
+
 class OpenAIService(IOpenAIService):
     """Service class for OpenAI operations with production-grade features."""
     
-    def __init__(self):
-        """Initialize the OpenAI service with connection validation."""
+    def __init__(
+        self,
+        cache_service: Optional[IRedisService] = None,
+        semantic_cache: Optional[ISemanticCache] = None,
+        embedding_cache: Optional[IEmbeddingCache] = None
+    ):
+        """
+        Initialize the OpenAI service with connection validation.
+        
+        Args:
+            cache_service: Key-value store for exact-match completion caching
+            semantic_cache: Similarity cache for non-deterministic completions
+            embedding_cache: In-process embedding cache checked before cache_service;
+                defaults to an LRUEmbeddingCache
+        """
         try:
+            self.cache_service = cache_service
+            self.semantic_cache = semantic_cache
+            self.embedding_cache = embedding_cache if embedding_cache is not None else LRUEmbeddingCache()
+            
             # Configurar cliente Azure OpenAI
             self.chat_deployment = settings.azure_openai_chat_deployment
             self.embeddings_deployment = settings.openai_embeddings_engine_doc
@@ -42,12 +85,15 @@ class OpenAIService(IOpenAIService):
                 raise ValueError("Azure OpenAI embeddings deployment is required")
 
             # Crear cliente Azure OpenAI
-            self.chat_client = AzureOpenAI(
-                azure_endpoint=settings.azure_openai_endpoint,
-                api_key=settings.azure_openai_api_key,
-                api_version=settings.azure_openai_chat_api_version
-            )
+            self._client_options = {
+                "azure_endpoint": settings.azure_openai_endpoint,
+                "api_key": settings.azure_openai_api_key,
+                "api_version": settings.azure_openai_chat_api_version
+            }
+            self.chat_client = AzureOpenAI(**self._client_options)
             self.embeddings_client = self.chat_client
+            # Cliente asíncrono para streaming, creado en el primer uso
+            self._async_chat_client: Optional[AsyncAzureOpenAI] = None
 
             # Validate connections
             self._validate_connections()
@@ -87,7 +133,8 @@ class OpenAIService(IOpenAIService):
         messages: List[Dict[str, str]], 
         max_tokens: int = 1000,
         temperature: float = 0.7,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        cache_policy: Optional[CachePolicy] = None
     ) -> str:
         """
         Generate a chat completion response with enhanced error handling.
@@ -97,6 +144,7 @@ class OpenAIService(IOpenAIService):
             max_tokens: Maximum number of tokens to generate
             temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
             system_prompt: Optional system prompt to prepend to messages
+            cache_policy: Optional caching policy; None disables caching
             
         Returns:
             str: Generated response text
@@ -116,6 +164,14 @@ class OpenAIService(IOpenAIService):
             if system_prompt:
                 messages = [{"role": "system", "content": system_prompt}] + messages
             
+            cache_key = query_embedding = None
+            if cache_policy is not None:
+                cached, cache_key, query_embedding = self._lookup_cached_completion(
+                    messages, max_tokens, temperature, cache_policy
+                )
+                if cached is not None:
+                    return cached
+            
             response = self.chat_client.chat.completions.create(
                 model=self.chat_deployment,
                 messages=cast(List[ChatCompletionMessageParam], messages),
@@ -132,6 +188,10 @@ class OpenAIService(IOpenAIService):
                     f"Tokens used: {usage.total_tokens} "
                     f"(prompt: {usage.prompt_tokens}, completion: {usage.completion_tokens})"
                 )
+                if cache_policy is not None:
+                    self._store_cached_completion(
+                        messages, response_text, cache_policy, cache_key, query_embedding
+                    )
                 return response_text
             else:
                 raise ValueError("Invalid response from OpenAI API")
@@ -149,7 +209,259 @@ class OpenAIService(IOpenAIService):
             logger.error(f"Chat completion failed: {e}")
             raise
 
-    def generate_embeddings(self, text: str) -> List[float]:
+    async def generate_chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding text fragments as they are generated.
+        
+        Callers can forward the first fragments (or a typing indicator) while
+        the rest of the completion is still being decoded.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            system_prompt: Optional system prompt to prepend to messages
+            
+        Yields:
+            str: Non-empty fragments of the generated response text
+            
+        Raises:
+            openai.BadRequestError: If request is malformed
+            openai.AuthenticationError: If authentication fails
+            openai.RateLimitError: If rate limit is exceeded
+            Exception: For other unexpected errors
+        """
+        try:
+            if not self.chat_deployment:
+                raise ValueError("Chat deployment is not configured")
+            
+            if system_prompt:
+                messages = [{"role": "system", "content": system_prompt}] + messages
+            
+            stream = await self._get_async_chat_client().chat.completions.create(
+                model=self.chat_deployment,
+                messages=cast(List[ChatCompletionMessageParam], messages),
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            
+            chunk_count = 0
+            async for chunk in stream:
+                # Azure envía primero un chunk sin choices con los resultados del filtro de contenido
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    chunk_count += 1
+                    yield content
+            
+            logger.info(f"Chat completion streamed successfully ({chunk_count} chunks)")
+            
+        except openai.BadRequestError as e:
+            logger.error(f"OpenAI bad request error: {e}")
+            raise
+        except openai.AuthenticationError as e:
+            logger.error(f"OpenAI authentication error: {e}")
+            raise
+        except openai.RateLimitError as e:
+            logger.error(f"OpenAI rate limit exceeded: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Chat completion stream failed: {e}")
+            raise
+
+    def _get_async_chat_client(self) -> AsyncAzureOpenAI:
+        """Get the async chat client, creating it on first use."""
+        if self._async_chat_client is None:
+            self._async_chat_client = AsyncAzureOpenAI(**self._client_options)
+        return self._async_chat_client
+
+    def _completion_cache_key(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> str:
+        """Build the exact-match cache key: SHA-256 of everything that shapes the completion."""
+        request = json.dumps(
+            {
+                "model": self.chat_deployment,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return COMPLETION_CACHE_PREFIX + hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def _lookup_cached_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        cache_policy: CachePolicy
+    ) -> Tuple[Optional[str], Optional[str], Optional[EmbeddingVector]]:
+        """
+        Look up a cached completion for the request.
+        
+        Deterministic requests (temperature 0) with an exact policy use the
+        request hash; other requests use the semantic cache, if configured.
+        Cache failures are logged and treated as misses.
+        
+        Returns:
+            Tuple: (cached response or None, exact cache key, query embedding);
+            the key and embedding are reused to store the response on a miss
+        """
+        cache_key = query_embedding = None
+        try:
+            if cache_policy.exact and temperature == 0:
+                if self.cache_service is not None:
+                    cache_key = self._completion_cache_key(messages, max_tokens, temperature)
+                    cached = self.cache_service.get(cache_key)
+                    if cached is not None:
+                        logger.info("Chat completion served from exact cache")
+                        return cached, cache_key, None
+            elif self.semantic_cache is not None:
+                query = self._cache_query_text(messages)
+                if query:
+                    query_embedding = self.generate_embeddings(query)
+                    namespace = self._completion_cache_namespace(messages)
+                    cached = self.semantic_cache.lookup(
+                        query_embedding, cache_policy.semantic_threshold, namespace=namespace
+                    )
+                    if cached is not None:
+                        logger.info("Chat completion served from semantic cache")
+                        return cached, None, query_embedding
+                    if cache_policy.compose_threshold is not None:
+                        composed = self._compose_cached_completion(
+                            query, query_embedding, cache_policy, namespace
+                        )
+                        if composed is not None:
+                            return composed, None, query_embedding
+        except Exception as e:
+            logger.warning(f"Chat completion cache lookup failed: {e}")
+        return None, cache_key, query_embedding
+
+    def _compose_cached_completion(
+        self,
+        query: str,
+        query_embedding: EmbeddingVector,
+        cache_policy: CachePolicy,
+        namespace: str
+    ) -> Optional[str]:
+        """
+        Compose a completion from the semantic cache's near hits in the namespace.
+        
+        The composed answer is cached for the query so the next similar
+        request is a direct hit; failing to cache it is only logged.
+        """
+        hits = self.semantic_cache.find_similar(
+            query_embedding, cast(float, cache_policy.compose_threshold), namespace=namespace
+        )
+        composed = self.semantic_cache.compose(query, hits) if hits else None
+        if composed is None:
+            return None
+        
+        logger.info(f"Chat completion composed from {len(hits)} cached answers")
+        try:
+            self.semantic_cache.store(
+                query_embedding, query, composed, cache_policy.ttl_seconds, namespace=namespace
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache composed completion: {e}")
+        return composed
+
+    def compose_cached_answers(self, query: str, hits: List[CachedAnswer]) -> Optional[str]:
+        """
+        Merge cached answers to similar questions into an answer for the query.
+        
+        Intended as the composer of an ISemanticCache: a short, deterministic
+        completion over the cached answers instead of a full generation.
+        
+        Args:
+            query: The user's question
+            hits: Cached answers to similar questions
+            
+        Returns:
+            Optional[str]: Composed answer, or None if the hits do not answer the query
+        """
+        previous = "\n\n".join(
+            f"Pregunta: {hit.query}\nRespuesta: {hit.response}" for hit in hits
+        )
+        response = self.generate_chat_completion(
+            messages=[
+                {"role": "system", "content": COMPOSE_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Respuestas previas:\n{previous}\n\nPregunta: {query}"}
+            ],
+            max_tokens=COMPOSE_MAX_TOKENS,
+            temperature=0
+        )
+        if not response or COMPOSE_UNAVAILABLE in response:
+            return None
+        return response
+
+    def _store_cached_completion(
+        self,
+        messages: List[Dict[str, str]],
+        response_text: str,
+        cache_policy: CachePolicy,
+        cache_key: Optional[str],
+        query_embedding: Optional[EmbeddingVector]
+    ) -> None:
+        """Store a fresh completion in the cache chosen by the lookup; failures are only logged."""
+        try:
+            if cache_key is not None and self.cache_service is not None:
+                self.cache_service.set(cache_key, response_text, expiration=cache_policy.ttl_seconds)
+            elif query_embedding is not None and self.semantic_cache is not None:
+                self.semantic_cache.store(
+                    query_embedding,
+                    self._cache_query_text(messages),
+                    response_text,
+                    cache_policy.ttl_seconds,
+                    namespace=self._completion_cache_namespace(messages)
+                )
+        except Exception as e:
+            logger.warning(f"Failed to cache chat completion: {e}")
+
+    def _completion_cache_namespace(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Build the semantic cache namespace: SHA-256 of the model and every message but the query.
+        
+        The system prompt (which may carry the user's name) and the context
+        messages shape the answer as much as the query does, so completions
+        are only shared between requests where they are identical.
+        """
+        query_index = next(
+            (index for index in range(len(messages) - 1, -1, -1) if messages[index].get("role") == "user"),
+            len(messages)
+        )
+        context = json.dumps(
+            {
+                "model": self.chat_deployment,
+                "messages": messages[:query_index] + messages[query_index + 1:]
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _cache_query_text(messages: List[Dict[str, str]]) -> str:
+        """Return the text the semantic cache is keyed on: the last user message."""
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                return message.get("content") or ""
+        return ""
+
+    def generate_embeddings(self, text: str) -> np.ndarray:
         """
         Generate embeddings for a given text with validation.
         
@@ -157,7 +469,7 @@ class OpenAIService(IOpenAIService):
             text: Input text to generate embeddings for
             
         Returns:
-            List[float]: Embedding vector
+            np.ndarray: float32 embedding vector of shape (dim,)
             
         Raises:
             ValueError: If text is empty or too long
@@ -177,13 +489,19 @@ class OpenAIService(IOpenAIService):
             if not self.embeddings_deployment:
                 raise ValueError("Embeddings deployment is not configured")
             
+            cache_key = self._embedding_cache_key(text)
+            cached = self._lookup_cached_embedding(cache_key)
+            if cached is not None:
+                return cached
+            
             response = self.embeddings_client.embeddings.create(
                 model=self.embeddings_deployment,
                 input=text
             )
             
-            embedding = response.data[0].embedding
+            embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
             logger.info(f"Embeddings generated successfully for text of length: {len(text)}")
+            self._store_cached_embedding(cache_key, embedding)
             return embedding
             
         except ValueError as e:
@@ -196,7 +514,52 @@ class OpenAIService(IOpenAIService):
             logger.error(f"Embedding generation failed: {e}")
             raise
 
-    def generate_embedding(self, text: str) -> List[float]:
+    def _embedding_cache_key(self, text: str) -> str:
+        """Build the embedding cache key: SHA-256 of the deployment and the text."""
+        digest = hashlib.sha256(f"{self.embeddings_deployment}|{text}".encode("utf-8")).hexdigest()
+        return f"{EMBEDDING_CACHE_PREFIX}{digest}"
+
+    def _lookup_cached_embedding(self, cache_key: str) -> Optional[np.ndarray]:
+        """
+        Look up an embedding in process memory, then in Redis.
+        
+        Redis hits are promoted to the in-process cache. Redis failures are
+        logged and treated as misses.
+        """
+        embedding = self.embedding_cache.get_embedding(cache_key)
+        if embedding is not None:
+            return embedding
+        if self.cache_service is None:
+            return None
+        
+        try:
+            cached = self.cache_service.get(cache_key)
+            if cached is None:
+                return None
+            embedding = np.frombuffer(base64.b64decode(cached), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return None
+        
+        self.embedding_cache.put_embedding(cache_key, embedding)
+        return embedding
+
+    def _store_cached_embedding(self, cache_key: str, embedding: np.ndarray) -> None:
+        """Store a fresh embedding in process memory and in Redis; Redis failures are only logged."""
+        self.embedding_cache.put_embedding(cache_key, embedding)
+        if self.cache_service is None:
+            return
+        
+        try:
+            self.cache_service.set(
+                cache_key,
+                base64.b64encode(embedding.tobytes()).decode("ascii"),
+                expiration=EMBEDDING_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache embedding: {e}")
+
+    def generate_embedding(self, text: str) -> np.ndarray:
         """
         Alias for generate_embeddings for backward compatibility.
         
@@ -204,7 +567,7 @@ class OpenAIService(IOpenAIService):
             text: Input text to generate embeddings for
             
         Returns:
-            List[float]: Embedding vector
+            np.ndarray: float32 embedding vector of shape (dim,)
         """
         return self.generate_embeddings(text)
     
@@ -227,15 +590,65 @@ class OpenAIService(IOpenAIService):
         """
         return self.generate_chat_completion(messages, max_tokens, temperature)
 
-    def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def generate_response_async(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7
+    ) -> str:
+        """
+        Generate a response with the async client, without blocking the event loop.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            max_tokens: Maximum number of tokens to generate
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            
+        Returns:
+            str: Generated response text
+        """
+        try:
+            if not self.chat_deployment:
+                raise ValueError("Chat deployment is not configured")
+            
+            response = await self._get_async_chat_client().chat.completions.create(
+                model=self.chat_deployment,
+                messages=cast(List[ChatCompletionMessageParam], messages),
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+            
+            response_text = response.choices[0].message.content
+            if not response_text:
+                raise ValueError("Invalid response from OpenAI API")
+            
+            if response.usage:
+                logger.info(f"Async chat completion generated successfully. Tokens used: {response.usage.total_tokens}")
+            return response_text
+            
+        except Exception as e:
+            logger.error(f"Async chat completion failed: {e}")
+            raise
+
+    def generate_batch_embeddings(
+        self,
+        texts: List[str],
+        batch_size: int = EMBEDDINGS_BATCH_SIZE,
+        max_concurrency: int = EMBEDDINGS_MAX_CONCURRENCY
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batch with validation.
         
+        Texts are sent batch_size at a time in a single embeddings request, and
+        up to max_concurrency of those requests run in parallel.
+        
         Args:
             texts: List of input texts
+            batch_size: Maximum number of texts per embeddings request
+            max_concurrency: Maximum number of requests in flight
             
         Returns:
-            List[List[float]]: List of embedding vectors
+            np.ndarray: float32 matrix of shape (n, dim), one row per valid text
             
         Raises:
             ValueError: If texts list is empty or contains invalid items
@@ -259,17 +672,33 @@ class OpenAIService(IOpenAIService):
             if not valid_texts:
                 raise ValueError("No valid texts found in input list")
             
+            if batch_size < 1:
+                raise ValueError("batch_size must be greater than 0")
+            
             # Ensure embeddings deployment is configured
             if not self.embeddings_deployment:
                 raise ValueError("Embeddings deployment is not configured")
             
-            response = self.embeddings_client.embeddings.create(
-                model=self.embeddings_deployment,
-                input=valid_texts
-            )
+            def embed(batch: List[str]) -> np.ndarray:
+                response = self.embeddings_client.embeddings.create(
+                    model=self.embeddings_deployment,
+                    input=batch
+                )
+                return np.asarray([data.embedding for data in response.data], dtype=np.float32)
             
-            embeddings = [data.embedding for data in response.data]
-            logger.info(f"Batch embeddings generated successfully for {len(valid_texts)} texts")
+            batches = [valid_texts[i:i + batch_size] for i in range(0, len(valid_texts), batch_size)]
+            if len(batches) == 1:
+                embeddings = embed(batches[0])
+            else:
+                # executor.map conserva el orden de los lotes
+                workers = max(1, min(max_concurrency, len(batches)))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embeddings") as executor:
+                    embeddings = np.concatenate(list(executor.map(embed, batches)))
+            
+            logger.info(
+                f"Batch embeddings generated successfully for {len(valid_texts)} texts "
+                f"in {len(batches)} requests"
+            )
             return embeddings
             
         except ValueError as e:
@@ -286,7 +715,8 @@ class OpenAIService(IOpenAIService):
         self, 
         user_message: str, 
         context: Optional[str] = None,
-        user_name: Optional[str] = None
+        user_name: Optional[str] = None,
+        cache_policy: Optional[CachePolicy] = None
     ) -> str:
         """
         Generate a WhatsApp response optimized for Christian community support.
@@ -295,6 +725,7 @@ class OpenAIService(IOpenAIService):
             user_message: The user's message
             context: Optional context from semantic search
             user_name: Optional user's name for personalization
+            cache_policy: Optional caching policy for the completion
             
         Returns:
             str: Generated response in Spanish
@@ -320,7 +751,8 @@ class OpenAIService(IOpenAIService):
             response = self.generate_chat_completion(
                 messages=messages,
                 max_tokens=500,
-                temperature=0.7
+                temperature=0.7,
+                cache_policy=cache_policy
             )
             
             logger.info(f"WhatsApp response generated successfully for user: {user_name or 'unknown'}")
@@ -510,12 +942,13 @@ Responde en español."""
             logger.error(f"Chat history summary generation failed: {e}")
             raise
     
+    @tracks_health
     def health_check(self) -> bool:
         """
         Perform a health check on the OpenAI service.
         
         Returns:
-            bool: True if the service is healthy
+            HealthStatus: Result, latency and failure history of the check
         """
         try:
             # Ensure chat deployment is configured
@@ -6,26 +6,105 @@ from Redis Stack for semantic search capabilities with production-grade
 features and enhanced error handling.
 """
 
+import asyncio
 import logging
 import json
 import pickle
-from typing import List, Dict, Any, Optional, Tuple, Mapping
+from typing import Awaitable, List, Dict, Any, Optional, Tuple, Mapping, cast
 from datetime import datetime, timezone, timedelta
+import numpy as np
 import redis
-from redis.commands.search.field import TextField, VectorField
-# from redis.commands.search.indexDefinition import IndexDefinition, IndexType  # Comentado por compatibilidad
+import redis.asyncio as aioredis
+from redis.commands.search.field import Field, TagField, TextField, VectorField
+from redis.commands.search.indexDefinition import IndexDefinition, IndexType
 from redis.exceptions import RedisError, ConnectionError, TimeoutError
 from config.settings import settings
-from shared_code.interfaces import IRedisService
+from shared_code.interfaces import IRedisService, EmbeddingVector, EmbeddingDType, VectorIndexAlgorithm, DistanceMetric
+from shared_code.circuit_breaker import tracks_health
+from shared_code.models import SearchHit
 import os
 
 logger = logging.getLogger(__name__)
 
+# RediSearch vector type for each supported embedding storage precision
+EMBEDDING_VECTOR_TYPES = {"float32": "FLOAT32", "float16": "FLOAT16", "int8": "INT8"}
+
+# RediSearch name of each supported distance metric
+DISTANCE_METRICS = {"cosine": "COSINE", "l2": "L2", "ip": "IP"}
+
+# Documents sent per pipeline round trip in store_embeddings_bulk
+BULK_STORE_CHUNK_SIZE = 500
+
+# Key prefix of document hashes; an index only covers hashes with its prefix
+DOCUMENT_KEY_PREFIX = "doc:"
+
+# Connection pool size of the async client
+ASYNC_MAX_CONNECTIONS = 32
+
+# Search result fields mapped to SearchHit attributes; the rest go to extra
+_SEARCH_HIT_FIELDS = frozenset(("document_id", "score", "text", "filename", "content_type", "upload_date"))
+
+
+def _distance_to_similarity(distance: float, metric: str) -> float:
+    """
+    Convert a RediSearch KNN distance into a similarity comparable across metrics.
+    
+    COSINE and IP report 1 - similarity (cosine similarity, inner product).
+    L2 reports the squared Euclidean distance, which for unit-length
+    embeddings (as returned by OpenAI) equals 2 - 2 * cosine similarity.
+    """
+    if metric == "l2":
+        return 1.0 - distance / 2.0
+    return 1.0 - distance
+
+
+def _pack_embedding(embedding: EmbeddingVector, dtype: str) -> Tuple[bytes, Optional[float]]:
+    """
+    Serialize an embedding at the given precision.
+    
+    Vectors are packed as raw bytes, the layout RediSearch vector fields
+    expect (4 * dim bytes for FLOAT32). int8 uses a per-vector scale of
+    max(|v|) / 127, which is returned so the vector can be dequantized later.
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    if dtype == "float32":
+        return vector.tobytes(), None
+    if dtype == "float16":
+        return vector.astype(np.float16).tobytes(), None
+    
+    peak = float(np.max(np.abs(vector)))
+    scale = peak / 127 if peak > 0 else 1.0
+    return np.round(vector / scale).astype(np.int8).tobytes(), scale
+
+
+def _unpack_embedding(data: bytes, dtype: Optional[str], scale: Optional[float]) -> Any:
+    """
+    Deserialize an embedding written by _pack_embedding.
+    
+    Documents without embedding_dtype (dtype None) predate raw packing and
+    hold a pickled float list.
+    """
+    if dtype == "float32":
+        return np.frombuffer(data, dtype=np.float32)
+    if dtype == "float16":
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32)
+    if dtype == "int8":
+        return np.frombuffer(data, dtype=np.int8).astype(np.float32) * np.float32(scale or 1.0)
+    return pickle.loads(data)
+
+
 class RedisService(IRedisService):
     """Service class for Redis operations with production-grade features."""
     
+    _async_client: Optional[aioredis.Redis] = None
+    _async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def __init__(self):
         """Initialize the Redis service with connection validation."""
+        # index_name -> (dimension, distance metric) fixed by configure_index
+        self._index_configs: Dict[str, Tuple[int, str]] = {}
+        # index_name -> distance metric the index was created with
+        self._index_metrics: Dict[str, str] = {}
         try:
             # Build connection parameters
             connection_params = {
@@ -54,6 +133,9 @@ class RedisService(IRedisService):
             else:
                 self.redis_client = redis.Redis(**connection_params)
             
+            # The async client is created lazily, per event loop, from the same parameters
+            self._connection_params = connection_params
+            
             # Test connection
             self._validate_connection()
             
@@ -92,13 +174,68 @@ class RedisService(IRedisService):
             logger.error(f"Redis connection validation failed: {e}")
             raise
 
+    def _build_document_data(
+        self,
+        document_id: str,
+        embedding: EmbeddingVector,
+        metadata: Dict[str, Any],
+        dtype: str,
+        index_name: str = "document_embeddings"
+    ) -> Dict[str, Any]:
+        """
+        Validate a document and build the hash stored for it.
+        
+        Raises:
+            ValueError: If input parameters are invalid
+        """
+        # Validate input parameters
+        if not document_id or embedding is None or len(embedding) == 0:
+            raise ValueError("Document ID and embedding cannot be empty")
+        
+        if not isinstance(embedding, (list, np.ndarray)):
+            raise ValueError("Embedding must be a non-empty list or array")
+        
+        if dtype not in EMBEDDING_VECTOR_TYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        
+        self._check_dimension(index_name, embedding)
+        
+        embedding_bytes, embedding_scale = _pack_embedding(embedding, dtype)
+        
+        # Create document data with enhanced metadata
+        document_data = {
+            "document_id": document_id,
+            "embedding": embedding_bytes,  # Serialize embedding
+            "text": metadata.get("text", ""),
+            "filename": metadata.get("filename", ""),
+            "content_type": metadata.get("content_type", ""),
+            "upload_date": metadata.get("upload_date", datetime.now(timezone.utc).isoformat()),
+            "file_size": metadata.get("file_size", 0),
+            "processed_date": datetime.now(timezone.utc).isoformat(),
+            "embedding_dimension": len(embedding)
+        }
+        
+        # Record how to decode the vector; legacy pickled documents have no dtype
+        document_data["embedding_dtype"] = dtype
+        if embedding_scale is not None:
+            document_data["embedding_scale"] = embedding_scale
+        
+        # Add additional metadata if provided
+        for key, value in metadata.items():
+            if key not in document_data and isinstance(value, (str, int, float)):
+                document_data[key] = str(value)
+        
+        return document_data
+
     def store_embedding(
         self, 
         document_id: str, 
-        embedding: List[float], 
+        embedding: EmbeddingVector, 
         metadata: Dict[str, Any],
         index_name: str = "document_embeddings",
-        expiration_days: int = 30
+        expiration_days: int = 30,
+        dtype: EmbeddingDType = "float32",
+        key_prefix: str = DOCUMENT_KEY_PREFIX
     ) -> bool:
         """
         Store document embedding with metadata in Redis with enhanced features.
@@ -109,6 +246,8 @@ class RedisService(IRedisService):
             metadata: Document metadata (text, filename, etc.)
             index_name: Name of the Redis search index
             expiration_days: Number of days before document expires
+            dtype: Storage precision ("float32", "float16" or "int8")
+            key_prefix: Prefix of the hash key; must match the index's prefix
             
         Returns:
             bool: True if storage successful
@@ -119,33 +258,10 @@ class RedisService(IRedisService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input parameters
-            if not document_id or not embedding:
-                raise ValueError("Document ID and embedding cannot be empty")
-            
-            if not isinstance(embedding, list) or len(embedding) == 0:
-                raise ValueError("Embedding must be a non-empty list")
-            
-            # Create document data with enhanced metadata
-            document_data = {
-                "document_id": document_id,
-                "embedding": pickle.dumps(embedding),  # Serialize embedding
-                "text": metadata.get("text", ""),
-                "filename": metadata.get("filename", ""),
-                "content_type": metadata.get("content_type", ""),
-                "upload_date": metadata.get("upload_date", datetime.now(timezone.utc).isoformat()),
-                "file_size": metadata.get("file_size", 0),
-                "processed_date": datetime.now(timezone.utc).isoformat(),
-                "embedding_dimension": len(embedding)
-            }
-            
-            # Add additional metadata if provided
-            for key, value in metadata.items():
-                if key not in document_data and isinstance(value, (str, int, float)):
-                    document_data[key] = str(value)
+            document_data = self._build_document_data(document_id, embedding, metadata, dtype, index_name)
             
             # Store in Redis Hash
-            key = f"doc:{document_id}"
+            key = f"{key_prefix}{document_id}"
             self.redis_client.hset(key, mapping=document_data)
             
             # Set expiration
@@ -165,12 +281,152 @@ class RedisService(IRedisService):
             logger.error(f"Failed to store embedding for document {document_id}: {e}")
             raise
 
-    def create_search_index(self, index_name: str = "document_embeddings") -> bool:
+    def store_embeddings_bulk(
+        self,
+        items: List[Tuple[str, EmbeddingVector, Dict[str, Any]]],
+        index_name: str = "document_embeddings",
+        chunk_size: int = BULK_STORE_CHUNK_SIZE,
+        expiration_days: int = 30,
+        dtype: EmbeddingDType = "float32",
+        key_prefix: str = DOCUMENT_KEY_PREFIX
+    ) -> int:
+        """
+        Store many document embeddings using a pipeline flushed every chunk_size documents.
+        
+        Each flush is a single round trip, and bounding it keeps a large
+        ingestion from building one huge request in memory.
+        
+        Args:
+            items: (document_id, embedding, metadata) tuples
+            index_name: Name of the Redis search index
+            chunk_size: Documents sent per pipeline execution
+            expiration_days: Number of days before documents expire
+            dtype: Storage precision ("float32", "float16" or "int8")
+            key_prefix: Prefix of the hash keys; must match the index's prefix
+            
+        Returns:
+            int: Number of documents stored
+            
+        Raises:
+            ValueError: If input parameters are invalid
+            RedisError: If a pipeline execution fails
+            Exception: For other unexpected errors
+        """
+        try:
+            if chunk_size < 1:
+                raise ValueError("chunk_size must be greater than 0")
+            
+            stored = 0
+            pending = 0
+            pipe = self.redis_client.pipeline(transaction=False)
+            for document_id, embedding, metadata in items:
+                document_data = self._build_document_data(document_id, embedding, metadata, dtype, index_name)
+                key = f"{key_prefix}{document_id}"
+                pipe.hset(key, mapping=document_data)
+                if expiration_days > 0:
+                    pipe.expire(key, expiration_days * 24 * 60 * 60)
+                pending += 1
+                
+                if pending == chunk_size:
+                    pipe.execute()
+                    stored += pending
+                    pending = 0
+            
+            if pending:
+                pipe.execute()
+                stored += pending
+            
+            logger.info(f"Bulk stored {stored} embeddings")
+            return stored
+            
+        except ValueError as e:
+            logger.error(f"Invalid input for bulk storing embeddings: {e}")
+            raise
+        except RedisError as e:
+            logger.error(f"Redis error bulk storing embeddings: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to bulk store embeddings: {e}")
+            raise
+
+    def configure_index(
+        self,
+        index_name: str,
+        dim: int,
+        metric: DistanceMetric = "cosine",
+        key_prefix: str = DOCUMENT_KEY_PREFIX,
+        tag_fields: Tuple[str, ...] = ()
+    ) -> bool:
+        """
+        Fix the embedding dimension and distance metric of an index.
+        
+        The index is created with them if it does not exist yet, and every
+        later store or search on it rejects vectors of another dimension
+        before they reach Redis.
+        
+        Args:
+            index_name: Name of the search index
+            dim: Embedding dimension
+            metric: Distance metric, "cosine", "l2" or "ip" (inner product)
+            key_prefix: Prefix of the hashes the index covers
+            tag_fields: Metadata fields indexed as TAG instead of TEXT
+            
+        Returns:
+            bool: True if the index is configured
+            
+        Raises:
+            ValueError: If dim or metric are invalid
+            RedisError: If index creation fails
+        """
+        if dim <= 0:
+            raise ValueError("dim must be greater than 0")
+        if metric not in DISTANCE_METRICS:
+            raise ValueError(f"Unsupported distance metric: {metric}")
+        
+        self._index_configs[index_name] = (dim, metric)
+        return self.create_search_index(
+            index_name, dim=dim, metric=metric, key_prefix=key_prefix, tag_fields=tag_fields
+        )
+
+    def _check_dimension(self, index_name: str, embedding: EmbeddingVector) -> None:
+        """Raise ValueError if the embedding does not match the configured index dimension."""
+        config = self._index_configs.get(index_name)
+        if config is not None and len(embedding) != config[0]:
+            raise ValueError(
+                f"Embedding dimension {len(embedding)} does not match index {index_name} ({config[0]})"
+            )
+
+    def create_search_index(
+        self,
+        index_name: str = "document_embeddings",
+        dtype: EmbeddingDType = "float32",
+        algorithm: VectorIndexAlgorithm = "HNSW",
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_runtime: int = 10,
+        dim: int = 1536,
+        metric: DistanceMetric = "cosine",
+        key_prefix: str = DOCUMENT_KEY_PREFIX,
+        tag_fields: Tuple[str, ...] = ()
+    ) -> bool:
         """
         Create a Redis search index for semantic search with enhanced schema.
         
+        The index only covers hashes whose key starts with key_prefix, so
+        indexes with different prefixes never see each other's documents.
+        
         Args:
             index_name: Name of the search index
+            dtype: Precision of the stored vectors ("float32", "float16" or "int8")
+            algorithm: Vector index algorithm, "HNSW" (approximate) or "FLAT" (exact)
+            m: HNSW maximum outgoing edges per node
+            ef_construction: HNSW candidate list size while building the graph
+            ef_runtime: HNSW candidate list size at query time
+            dim: Embedding dimension (1536 for OpenAI ada-002)
+            metric: Distance metric, "cosine", "l2" or "ip" (inner product)
+            key_prefix: Prefix of the hashes the index covers
+            tag_fields: Metadata fields indexed as TAG (exact-match filters)
+                instead of TEXT
             
         Returns:
             bool: True if index creation successful
@@ -180,6 +436,28 @@ class RedisService(IRedisService):
             Exception: For other unexpected errors
         """
         try:
+            if dtype not in EMBEDDING_VECTOR_TYPES:
+                raise ValueError(f"Unsupported embedding dtype: {dtype}")
+            
+            if algorithm not in ("FLAT", "HNSW"):
+                raise ValueError(f"Unsupported vector index algorithm: {algorithm}")
+            
+            if metric not in DISTANCE_METRICS:
+                raise ValueError(f"Unsupported distance metric: {metric}")
+            self._index_metrics[index_name] = metric
+            
+            vector_attributes: Dict[str, Any] = {
+                "TYPE": EMBEDDING_VECTOR_TYPES[dtype],
+                "DIM": dim,
+                "DISTANCE_METRIC": DISTANCE_METRICS[metric]
+            }
+            if algorithm == "HNSW":
+                vector_attributes.update({
+                    "M": m,
+                    "EF_CONSTRUCTION": ef_construction,
+                    "EF_RUNTIME": ef_runtime
+                })
+            
             # Check if index already exists
             try:
                 info = self.redis_client.ft(index_name).info()
@@ -189,26 +467,26 @@ class RedisService(IRedisService):
                 pass  # Index doesn't exist, create it
             
             # Define enhanced schema for the index
-            schema = [
-                TextField("document_id", weight=1.0),
-                TextField("text", weight=0.8),
-                TextField("filename", weight=0.6),
-                TextField("content_type", weight=0.4),
-                TextField("upload_date", weight=0.2),
-                VectorField(
-                    "embedding",
-                    "FLAT",
-                    {"TYPE": "FLOAT32", "DIM": 1536}  # OpenAI ada-002 embedding dimension
-                )
+            text_fields = [
+                ("document_id", 1.0),
+                ("text", 0.8),
+                ("filename", 0.6),
+                ("content_type", 0.4),
+                ("upload_date", 0.2)
+            ]
+            schema: List[Field] = [
+                TagField(name) if name in tag_fields else TextField(name, weight=weight)
+                for name, weight in text_fields
             ]
+            schema.append(VectorField("embedding", algorithm, vector_attributes))
             
-            # Create the index
+            # Create the index over the hashes with the given prefix only
             self.redis_client.ft(index_name).create_index(
                 schema,
-                definition=None
+                definition=IndexDefinition(prefix=[key_prefix], index_type=IndexType.HASH)
             )
             
-            logger.info(f"Search index created successfully: {index_name}")
+            logger.info(f"Search index created successfully: {index_name} ({algorithm}, dim={dim})")
             return True
             
         except RedisError as e:
@@ -218,13 +496,104 @@ class RedisService(IRedisService):
             logger.error(f"Failed to create search index {index_name}: {e}")
             raise
 
+    def _build_search_query(
+        self,
+        query_embedding: EmbeddingVector,
+        top_k: int,
+        similarity_threshold: float,
+        dtype: str,
+        index_name: str = "document_embeddings",
+        ef_runtime: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> Tuple[str, Mapping[str, bytes]]:
+        """
+        Validate search parameters and build the KNN query and its parameters.
+        
+        Raises:
+            ValueError: If input parameters are invalid
+        """
+        # Validate input parameters
+        if not isinstance(query_embedding, (list, np.ndarray)) or len(query_embedding) == 0:
+            raise ValueError("Query embedding must be a non-empty list or array")
+        
+        if dtype not in EMBEDDING_VECTOR_TYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        
+        if top_k <= 0:
+            raise ValueError("top_k must be greater than 0")
+        
+        if not (0.0 <= similarity_threshold <= 1.0):
+            raise ValueError("similarity_threshold must be between 0.0 and 1.0")
+        
+        if ef_runtime is not None and ef_runtime < top_k:
+            raise ValueError("ef_runtime must be at least top_k")
+        
+        self._check_dimension(index_name, query_embedding)
+        
+        # Convert embedding to bytes for Redis, at the precision of the index
+        embedding_bytes, _ = _pack_embedding(query_embedding, dtype)
+        
+        # Build search query with vector similarity
+        # EF_RUNTIME overrides the HNSW candidate list size for this query only
+        ef_clause = f" EF_RUNTIME {ef_runtime}" if ef_runtime is not None else ""
+        # A filter restricts the KNN to the matching documents (hybrid query)
+        prefilter = f"({filter_query})" if filter_query else "*"
+        query = f"{prefilter}=>[KNN {top_k} @embedding $embedding{ef_clause} AS score]"
+        # Pass bytes directly for vector search
+        query_params: Mapping[str, bytes] = {
+            "embedding": embedding_bytes
+        }
+        return query, query_params
+
+    @staticmethod
+    def _parse_search_results(
+        results: Any,
+        similarity_threshold: float,
+        metric: str = "cosine"
+    ) -> List[SearchHit]:
+        """
+        Turn search results into SearchHits, dropping those below the threshold.
+        
+        The KNN "score" is a distance in the index's metric, so it is converted
+        to a similarity (see _distance_to_similarity) before filtering and
+        stored as SearchHit.score.
+        """
+        similar_documents = []
+        for doc in results.docs:  # type: ignore
+            score = _distance_to_similarity(float(doc.score), metric)
+            
+            # Keep hits at least as similar as the threshold
+            if score < similarity_threshold:
+                continue
+            
+            # Additional index fields go to extra
+            extra = {
+                field_name: field_value
+                for field_name, field_value in doc.__dict__.items()
+                if field_name not in _SEARCH_HIT_FIELDS and not field_name.startswith('_')
+            }
+            
+            similar_documents.append(SearchHit(
+                document_id=doc.document_id,
+                score=score,
+                text=doc.text,
+                filename=doc.filename,
+                content_type=doc.content_type,
+                upload_date=doc.upload_date,
+                extra=extra
+            ))
+        return similar_documents
+
     def semantic_search(
         self, 
-        query_embedding: List[float], 
+        query_embedding: EmbeddingVector, 
         top_k: int = 5,
         index_name: str = "document_embeddings",
-        similarity_threshold: float = 0.7
-    ) -> List[Dict[str, Any]]:
+        similarity_threshold: float = 0.7,
+        dtype: EmbeddingDType = "float32",
+        ef_runtime: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> List[SearchHit]:
         """
         Perform semantic search using vector similarity with enhanced features.
         
@@ -232,10 +601,15 @@ class RedisService(IRedisService):
             query_embedding: Query embedding vector
             top_k: Number of top results to return
             index_name: Name of the search index
-            similarity_threshold: Minimum similarity score (0.0 to 1.0)
+            similarity_threshold: Minimum similarity (0.0 to 1.0, converted from the index metric)
+            dtype: Precision of the indexed vectors the query is encoded to
+            ef_runtime: HNSW candidate list size for this query; higher trades
+                latency for recall. None uses the index default. HNSW indexes only
+            filter_query: Optional RediSearch filter (e.g. "@content_type:faq")
+                applied before the KNN
             
         Returns:
-            List[Dict[str, Any]]: List of similar documents with metadata
+            List[SearchHit]: Similar documents with their score and metadata
             
         Raises:
             ValueError: If input parameters are invalid
@@ -243,25 +617,9 @@ class RedisService(IRedisService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input parameters
-            if not query_embedding or not isinstance(query_embedding, list):
-                raise ValueError("Query embedding must be a non-empty list")
-            
-            if top_k <= 0:
-                raise ValueError("top_k must be greater than 0")
-            
-            if not (0.0 <= similarity_threshold <= 1.0):
-                raise ValueError("similarity_threshold must be between 0.0 and 1.0")
-            
-            # Convert embedding to bytes for Redis
-            embedding_bytes = pickle.dumps(query_embedding)
-            
-            # Build search query with vector similarity
-            query = f"*=>[KNN {top_k} @embedding $embedding AS score]"
-            # Pass bytes directly for vector search
-            query_params: Mapping[str, bytes] = {
-                "embedding": embedding_bytes
-            }
+            query, query_params = self._build_search_query(
+                query_embedding, top_k, similarity_threshold, dtype, index_name, ef_runtime, filter_query
+            )
             
             # Execute search
             results = self.redis_client.ft(index_name).search(
@@ -269,32 +627,9 @@ class RedisService(IRedisService):
                 query_params=query_params  # type: ignore
             )
             
-            # Process and filter results
-            similar_documents = []
-            for doc in results.docs:  # type: ignore
-                score = float(doc.score)
-                
-                # Filter by similarity threshold
-                if score < similarity_threshold:
-                    continue
-                
-                # Extract document data
-                document_data = {
-                    "document_id": doc.document_id,
-                    "score": score,
-                    "text": doc.text,
-                    "filename": doc.filename,
-                    "content_type": doc.content_type,
-                    "upload_date": doc.upload_date
-                }
-                
-                # Add additional fields if present
-                for field_name, field_value in doc.__dict__.items():
-                    if field_name not in document_data and not field_name.startswith('_'):
-                        document_data[field_name] = field_value
-                
-                similar_documents.append(document_data)
-            
+            similar_documents = self._parse_search_results(
+                results, similarity_threshold, self._index_metrics.get(index_name, "cosine")
+            )
             logger.info(f"Semantic search completed. Found {len(similar_documents)} similar documents")
             return similar_documents
             
@@ -310,11 +645,14 @@ class RedisService(IRedisService):
 
     def search_similar_documents(
         self, 
-        query_embedding: List[float], 
+        query_embedding: EmbeddingVector, 
         top_k: int = 5,
         index_name: str = "document_embeddings",
-        similarity_threshold: float = 0.7
-    ) -> List[Dict[str, Any]]:
+        similarity_threshold: float = 0.7,
+        dtype: EmbeddingDType = "float32",
+        ef_runtime: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> List[SearchHit]:
         """
         Alias for semantic_search for backward compatibility.
         
@@ -322,12 +660,19 @@ class RedisService(IRedisService):
             query_embedding: Query embedding vector
             top_k: Number of top results to return
             index_name: Name of the search index
-            similarity_threshold: Minimum similarity score (0.0 to 1.0)
+            similarity_threshold: Minimum similarity (0.0 to 1.0, converted from the index metric)
+            dtype: Precision of the indexed vectors the query is encoded to
+            ef_runtime: HNSW candidate list size for this query; higher trades
+                latency for recall. None uses the index default. HNSW indexes only
+            filter_query: Optional RediSearch filter (e.g. "@content_type:faq")
+                applied before the KNN
             
         Returns:
-            List[Dict[str, Any]]: List of similar documents with metadata
+            List[SearchHit]: Similar documents with their score and metadata
         """
-        return self.semantic_search(query_embedding, top_k, index_name, similarity_threshold)
+        return self.semantic_search(
+            query_embedding, top_k, index_name, similarity_threshold, dtype, ef_runtime, filter_query
+        )
 
     def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -354,7 +699,13 @@ class RedisService(IRedisService):
             # Deserialize embedding
             if b"embedding" in document_data:  # type: ignore
                 try:
-                    document_data[b"embedding"] = pickle.loads(document_data[b"embedding"])  # type: ignore
+                    embedding_dtype = document_data.get(b"embedding_dtype")  # type: ignore
+                    embedding_scale = document_data.get(b"embedding_scale")  # type: ignore
+                    document_data[b"embedding"] = _unpack_embedding(  # type: ignore
+                        document_data[b"embedding"],  # type: ignore
+                        embedding_dtype.decode("utf-8") if embedding_dtype is not None else None,
+                        float(embedding_scale) if embedding_scale is not None else None
+                    )
                 except Exception as e:
                     logger.warning(f"Failed to deserialize embedding for document {document_id}: {e}")
                     document_data[b"embedding"] = None  # type: ignore
@@ -561,6 +912,57 @@ class RedisService(IRedisService):
             logger.error(f"Error getting key {key}: {e}")
             return None
     
+    def get_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Get several values from Redis with a single MGET.
+        
+        Args:
+            keys: Redis keys
+            
+        Returns:
+            Dict[str, Optional[str]]: Value per key, in the order of keys; None if not found
+        """
+        if not keys:
+            return {}
+        try:
+            values = self.redis_client.mget(keys)
+            return {
+                key: value.decode('utf-8') if isinstance(value, bytes) else (None if value is None else str(value))
+                for key, value in zip(keys, values)  # type: ignore
+            }
+        except Exception as e:
+            logger.error(f"Error getting {len(keys)} keys: {e}")
+            return {key: None for key in keys}
+    
+    def set_many(self, mapping: Dict[str, str], expiration: Optional[int] = None) -> bool:
+        """
+        Set several key-value pairs in Redis in one round trip.
+        
+        Without expiration a single MSET is sent; with it, one SET ... EX per
+        key goes through a pipeline.
+        
+        Args:
+            mapping: Values to store by key
+            expiration: Optional expiration time in seconds, applied to every key
+            
+        Returns:
+            bool: True if operation successful
+        """
+        if not mapping:
+            return True
+        try:
+            if expiration:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=expiration)
+                pipe.execute()
+            else:
+                self.redis_client.mset(mapping)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting {len(mapping)} keys: {e}")
+            return False
+    
     def delete(self, key: str) -> bool:
         """
         Delete a key from Redis.
@@ -594,12 +996,13 @@ class RedisService(IRedisService):
             logger.error(f"Error checking existence of key {key}: {e}")
             return False
 
+    @tracks_health
     def health_check(self) -> bool:
         """
         Perform a health check on the Redis connection.
         
         Returns:
-            bool: True if Redis is healthy
+            HealthStatus: Result, latency and failure history of the check
             
         Raises:
             RedisError: If health check fails
@@ -620,6 +1023,169 @@ class RedisService(IRedisService):
             logger.error(f"Redis health check failed: {e}")
             raise
 
+    def _get_async_client(self) -> aioredis.Redis:
+        """
+        Return the shared async Redis client for the running event loop.
+        
+        redis.asyncio connection pools are bound to the loop that created
+        them, so a new client is created if the service is used from another loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_client
+        if client is None or self._async_client_loop is not loop:
+            params = dict(self._connection_params, max_connections=ASYNC_MAX_CONNECTIONS)
+            if settings.redis_connection_string:
+                client = aioredis.from_url(settings.redis_connection_string, **params)
+            else:
+                client = aioredis.Redis(**params)
+            self._async_client = client
+            self._async_client_loop = loop
+        return client
+
+    async def aclose(self) -> None:
+        """Close the async client and its connection pool, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+
+    async def astore_embedding(
+        self,
+        document_id: str,
+        embedding: EmbeddingVector,
+        metadata: Dict[str, Any],
+        index_name: str = "document_embeddings",
+        expiration_days: int = 30,
+        dtype: EmbeddingDType = "float32",
+        key_prefix: str = DOCUMENT_KEY_PREFIX
+    ) -> bool:
+        """
+        Async variant of store_embedding.
+        
+        Raises:
+            ValueError: If input parameters are invalid
+            RedisError: If Redis operation fails
+        """
+        try:
+            document_data = self._build_document_data(document_id, embedding, metadata, dtype, index_name)
+            
+            key = f"{key_prefix}{document_id}"
+            client = self._get_async_client()
+            # redis-py types hset as sync-or-async; on the asyncio client it is awaitable
+            await cast(Awaitable[int], client.hset(key, mapping=document_data))
+            if expiration_days > 0:
+                await client.expire(key, expiration_days * 24 * 60 * 60)
+            
+            logger.info(f"Embedding stored successfully for document: {document_id} (dimension: {len(embedding)})")
+            return True
+            
+        except ValueError as e:
+            logger.error(f"Invalid input for storing embedding: {e}")
+            raise
+        except RedisError as e:
+            logger.error(f"Redis error storing embedding for document {document_id}: {e}")
+            raise
+
+    async def asemantic_search(
+        self,
+        query_embedding: EmbeddingVector,
+        top_k: int = 5,
+        index_name: str = "document_embeddings",
+        similarity_threshold: float = 0.7,
+        dtype: EmbeddingDType = "float32",
+        ef_runtime: Optional[int] = None,
+        filter_query: Optional[str] = None
+    ) -> List[SearchHit]:
+        """
+        Async variant of semantic_search.
+        
+        Raises:
+            ValueError: If input parameters are invalid
+            RedisError: If search operation fails
+        """
+        try:
+            query, query_params = self._build_search_query(
+                query_embedding, top_k, similarity_threshold, dtype, index_name, ef_runtime, filter_query
+            )
+            results = await self._get_async_client().ft(index_name).search(
+                query,
+                query_params=query_params  # type: ignore
+            )
+            
+            similar_documents = self._parse_search_results(
+                results, similarity_threshold, self._index_metrics.get(index_name, "cosine")
+            )
+            logger.info(f"Semantic search completed. Found {len(similar_documents)} similar documents")
+            return similar_documents
+            
+        except ValueError as e:
+            logger.error(f"Invalid input for semantic search: {e}")
+            raise
+        except RedisError as e:
+            logger.error(f"Redis error during semantic search: {e}")
+            raise
+
+    async def aset(self, key: str, value: str, expiration: Optional[int] = None) -> bool:
+        """Async variant of set."""
+        try:
+            if expiration:
+                await self._get_async_client().set(key, value, ex=expiration)
+            else:
+                await self._get_async_client().set(key, value)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting key {key}: {e}")
+            return False
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Async variant of get."""
+        try:
+            value = await self._get_async_client().get(key)
+            if value is None:
+                return None
+            return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+        except Exception as e:
+            logger.error(f"Error getting key {key}: {e}")
+            return None
+
+    async def adelete(self, key: str) -> bool:
+        """Async variant of delete."""
+        try:
+            return bool(await self._get_async_client().delete(key))
+        except Exception as e:
+            logger.error(f"Error deleting key {key}: {e}")
+            return False
+
+    async def aexists(self, key: str) -> bool:
+        """Async variant of exists."""
+        try:
+            return bool(await self._get_async_client().exists(key))
+        except Exception as e:
+            logger.error(f"Error checking existence of key {key}: {e}")
+            return False
+
+    async def ahealth_check(self) -> bool:
+        """
+        Async variant of health_check.
+        
+        Raises:
+            RedisError: If health check fails
+        """
+        try:
+            client = self._get_async_client()
+            await client.set("health_check", "ok", ex=10)
+            value = await client.get("health_check")
+            
+            if value != b"ok":
+                raise RedisError("Health check failed - basic operations not working")
+            
+            logger.debug("Redis health check passed")
+            return True
+            
+        except RedisError as e:
+            logger.error(f"Redis health check failed: {e}")
+            raise
+
 # Instancia global protegida para evitar inicialización en tests
 if not os.environ.get("PYTEST_CURRENT_TEST"):
     redis_service = RedisService() 
\ No newline at end of file
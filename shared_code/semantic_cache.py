@@ -0,0 +1,299 @@
+"""
+Redis-backed semantic cache for chat completions.
+
+This module provides RedisSemanticCache, which indexes cached answers by the
+embedding of the query that produced them. Besides direct hits it returns the
+top-K near hits so a composer (typically OpenAIService.compose_cached_answers)
+can merge them into a new answer for a fraction of a full generation.
+
+Entries may also carry the embedding of the previous conversation turn.
+Lookups that pass a context embedding only match when both the query and the
+context are similar (MeanCache-style context chain), so short follow-ups
+such as "cámbialo a rojo" are not served across unrelated conversations.
+"""
+
+import base64
+import hashlib
+import logging
+import math
+from typing import Callable, List, Optional
+import numpy as np
+from shared_code.interfaces import CachedAnswer, EmbeddingVector, IRedisService, ISemanticCache
+
+logger = logging.getLogger(__name__)
+
+# Vector index holding the cached queries
+SEMANTIC_CACHE_INDEX = "semantic_cache"
+
+# content_type that tags cache entries in the vector index
+SEMANTIC_CACHE_CONTENT_TYPE = "semantic_cache"
+
+# Prefix of the vector hashes of the cache; keeps them out of the document index
+SEMANTIC_CACHE_KEY_PREFIX = "semantic_cache_entry:"
+
+# Prefix of the keys holding the cached answers
+SEMANTIC_CACHE_RESPONSE_PREFIX = "semantic_cache:"
+
+# Near hits handed to the composer
+SEMANTIC_CACHE_TOP_K = 3
+
+# Hex digits of the namespace hash used in the content_type tag
+NAMESPACE_DIGEST_LENGTH = 16
+
+# Prefix of the keys holding the context (previous turn) embedding of each entry
+SEMANTIC_CACHE_CONTEXT_PREFIX = "semantic_cache_context:"
+
+
+class RedisSemanticCache(ISemanticCache):
+    """
+    Semantic cache storing query vectors through IRedisService.
+
+    Each entry is a vector document under SEMANTIC_CACHE_KEY_PREFIX (the
+    query embedding, tagged with SEMANTIC_CACHE_CONTENT_TYPE) plus a plain
+    key holding the answer. The answer key carries the exact TTL, so expired
+    answers drop out of results even while their vector, which only expires
+    in whole days, is still indexed. Hits are ranked by similarity, highest
+    first.
+
+    The vector index is created on the first store or lookup, once the
+    embedding dimension is known.
+    """
+
+    def __init__(
+        self,
+        redis_service: IRedisService,
+        composer: Optional[Callable[[str, List[CachedAnswer]], Optional[str]]] = None,
+        index_name: str = SEMANTIC_CACHE_INDEX,
+        top_k: int = SEMANTIC_CACHE_TOP_K
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            redis_service: Redis service used for vector search and storage
+            composer: Callable merging near hits into an answer for a query
+            index_name: Vector index holding the cached queries
+            top_k: Near hits returned by find_similar
+        """
+        if top_k <= 0:
+            raise ValueError("top_k must be greater than 0")
+
+        self.redis_service = redis_service
+        self.composer = composer
+        self.index_name = index_name
+        self.top_k = top_k
+        self._index_ready = False
+
+    def _ensure_index(self, query_embedding: EmbeddingVector) -> None:
+        """Create the vector index, sized for the embedding, if not done yet."""
+        if self._index_ready:
+            return
+        self.redis_service.configure_index(
+            self.index_name,
+            dim=len(query_embedding),
+            key_prefix=SEMANTIC_CACHE_KEY_PREFIX,
+            tag_fields=("content_type",)
+        )
+        self._index_ready = True
+
+    @staticmethod
+    def _entry_id(query: str, namespace: Optional[str] = None, context: Optional[bytes] = None) -> str:
+        """Build the cache entry ID: SHA-256 of the namespace, the query and the context."""
+        key = f"{namespace}|{query}" if namespace else query
+        digest = hashlib.sha256(key.encode("utf-8"))
+        if context is not None:
+            digest.update(context)
+        return f"semantic_cache_{digest.hexdigest()}"
+
+    @staticmethod
+    def _context_similarity(current: np.ndarray, cached: Optional[np.ndarray]) -> float:
+        """
+        Cosine similarity between two context embeddings.
+
+        A zero vector (or a missing one) stands for "no previous turn": two of
+        them match, while one against a real turn never does.
+        """
+        current_norm = float(np.linalg.norm(current))
+        if cached is None or cached.shape != current.shape:
+            return 1.0 if current_norm == 0.0 else 0.0
+        cached_norm = float(np.linalg.norm(cached))
+        if current_norm == 0.0 or cached_norm == 0.0:
+            return 1.0 if current_norm == cached_norm else 0.0
+        return float(np.dot(current, cached) / (current_norm * cached_norm))
+
+    @staticmethod
+    def _content_type(namespace: Optional[str] = None) -> str:
+        """
+        Build the content_type tag of the entries of a namespace.
+
+        The namespace is hashed so arbitrary values (e.g. phone numbers with
+        "+") stay valid RediSearch tag values.
+        """
+        if not namespace:
+            return SEMANTIC_CACHE_CONTENT_TYPE
+        digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:NAMESPACE_DIGEST_LENGTH]
+        return f"{SEMANTIC_CACHE_CONTENT_TYPE}_{digest}"
+
+    def lookup(
+        self,
+        query_embedding: EmbeddingVector,
+        threshold: float,
+        namespace: Optional[str] = None,
+        context_embedding: Optional[EmbeddingVector] = None
+    ) -> Optional[str]:
+        """
+        Get the answer of the most similar cached query.
+
+        Args:
+            query_embedding: Embedding of the query
+            threshold: Minimum similarity
+            namespace: Only match entries stored under this namespace
+            context_embedding: Embedding of the previous turn; when given, the
+                cached context must be above the threshold too
+
+        Returns:
+            Optional[str]: Cached answer, or None on a miss
+        """
+        # With a context check the best query match may be rejected, so look
+        # at every near hit instead of only the first one
+        top_k = 1 if context_embedding is None else self.top_k
+        hits = self._search(query_embedding, threshold, top_k, namespace, context_embedding)
+        return hits[0].response if hits else None
+
+    def find_similar(
+        self,
+        query_embedding: EmbeddingVector,
+        threshold: float,
+        namespace: Optional[str] = None,
+        context_embedding: Optional[EmbeddingVector] = None
+    ) -> List[CachedAnswer]:
+        """
+        Get up to top_k cached answers above the similarity threshold.
+
+        Args:
+            query_embedding: Embedding of the query
+            threshold: Minimum similarity
+            namespace: Only match entries stored under this namespace
+            context_embedding: Embedding of the previous turn; when given, the
+                cached context must be above the threshold too
+
+        Returns:
+            List[CachedAnswer]: Near hits, most similar first
+        """
+        return self._search(query_embedding, threshold, self.top_k, namespace, context_embedding)
+
+    def _search(
+        self,
+        query_embedding: EmbeddingVector,
+        threshold: float,
+        top_k: int,
+        namespace: Optional[str] = None,
+        context_embedding: Optional[EmbeddingVector] = None
+    ) -> List[CachedAnswer]:
+        """
+        Search the vector index and fetch the answers of the hits with one MGET.
+
+        With a context embedding the stored contexts are fetched in the same
+        MGET; hits whose context is below the threshold are dropped and the
+        rest are ranked by the mean of both similarities. Hit scores are
+        already similarities (1 - KNN cosine distance), on the same scale as
+        the context cosine similarity.
+        """
+        self._ensure_index(query_embedding)
+        content_type = self._content_type(namespace)
+        hits = [
+            hit for hit in self.redis_service.semantic_search(
+                query_embedding,
+                top_k=top_k,
+                index_name=self.index_name,
+                similarity_threshold=threshold,
+                filter_query=f"@content_type:{{{content_type}}}"
+            )
+            if hit.content_type == content_type
+        ]
+        if not hits:
+            return []
+
+        keys = [f"{SEMANTIC_CACHE_RESPONSE_PREFIX}{hit.document_id}" for hit in hits]
+        if context_embedding is None:
+            responses = self.redis_service.get_many(keys)
+            answers = []
+            for hit, key in zip(hits, keys):
+                response = responses.get(key)
+                if response is not None:
+                    answers.append(CachedAnswer(query=hit.text, response=response, score=hit.score))
+            answers.sort(key=lambda answer: answer.score, reverse=True)
+            return answers
+
+        context_keys = [f"{SEMANTIC_CACHE_CONTEXT_PREFIX}{hit.document_id}" for hit in hits]
+        values = self.redis_service.get_many(keys + context_keys)
+        current = np.asarray(context_embedding, dtype=np.float32)
+        answers = []
+        for hit, key, context_key in zip(hits, keys, context_keys):
+            response = values.get(key)
+            if response is None:
+                continue
+            cached = values.get(context_key)
+            cached_context = np.frombuffer(base64.b64decode(cached), dtype=np.float32) if cached else None
+            context_score = self._context_similarity(current, cached_context)
+            if context_score < threshold:
+                continue
+            answers.append(CachedAnswer(query=hit.text, response=response, score=(hit.score + context_score) / 2))
+        answers.sort(key=lambda answer: answer.score, reverse=True)
+        return answers
+
+    def store(
+        self,
+        query_embedding: EmbeddingVector,
+        query: str,
+        response: str,
+        ttl_seconds: int,
+        namespace: Optional[str] = None,
+        context_embedding: Optional[EmbeddingVector] = None
+    ) -> None:
+        """
+        Store an answer indexed by the embedding of its query.
+
+        Args:
+            query_embedding: Embedding of the query
+            query: Query text
+            response: Answer to cache
+            ttl_seconds: Lifetime of the answer
+            namespace: Namespace isolating the entry (e.g. the user's phone number)
+            context_embedding: Embedding of the previous turn of the conversation
+        """
+        self._ensure_index(query_embedding)
+        context = None
+        if context_embedding is not None:
+            context = np.asarray(context_embedding, dtype=np.float32).tobytes()
+        entry_id = self._entry_id(query, namespace, context)
+        self.redis_service.set(f"{SEMANTIC_CACHE_RESPONSE_PREFIX}{entry_id}", response, expiration=ttl_seconds)
+        if context is not None:
+            self.redis_service.set(
+                f"{SEMANTIC_CACHE_CONTEXT_PREFIX}{entry_id}",
+                base64.b64encode(context).decode("ascii"),
+                expiration=ttl_seconds
+            )
+        self.redis_service.store_embedding(
+            entry_id,
+            query_embedding,
+            {"text": query, "content_type": self._content_type(namespace)},
+            index_name=self.index_name,
+            expiration_days=max(1, math.ceil(ttl_seconds / 86400)),
+            key_prefix=SEMANTIC_CACHE_KEY_PREFIX
+        )
+
+    def compose(self, query: str, hits: List[CachedAnswer]) -> Optional[str]:
+        """
+        Compose an answer for the query from near hits.
+
+        Args:
+            query: Query text
+            hits: Near hits returned by find_similar
+
+        Returns:
+            Optional[str]: Composed answer, or None without composer or hits
+        """
+        if self.composer is None or not hits:
+            return None
+        return self.composer(query, hits) or None
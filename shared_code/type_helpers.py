@@ -39,6 +39,11 @@ def validate_service_interface(service: Any, interface_type: type) -> bool:
     """
     Validar que un servicio implementa correctamente una interfaz.
     
+    Las interfaces son ABCs: una subclase solo puede instanciarse si
+    implementa todos los métodos abstractos, así que basta con isinstance
+    (que ABCMeta ya cachea por clase). Las subclases virtuales registradas
+    con register() se aceptan sin revisar sus métodos.
+    
     Args:
         service: Servicio a validar
         interface_type: Tipo de interfaz esperado
@@ -47,18 +52,9 @@ def validate_service_interface(service: Any, interface_type: type) -> bool:
         bool: True si el servicio implementa la interfaz correctamente
     """
     try:
-        # Verificar que el servicio es una instancia del tipo esperado
-        if not isinstance(service, interface_type):
-            return False
-        
-        # Verificar que tiene los métodos requeridos
-        required_methods = getattr(interface_type, '__abstractmethods__', set())
-        for method in required_methods:
-            if not hasattr(service, method):
-                return False
-        
-        return True
-    except Exception:
+        return isinstance(service, interface_type)
+    except TypeError:
+        # interface_type no es una clase
         return False
 
 def cast_service_safe(service: Any, interface_type: type) -> Optional[Any]:
@@ -72,42 +68,37 @@ def cast_service_safe(service: Any, interface_type: type) -> Optional[Any]:
     Returns:
         Optional[Any]: Servicio cast a la interfaz o None si falla
     """
-    try:
-        if validate_service_interface(service, interface_type):
-            return service
-        return None
-    except Exception:
-        return None
+    return service if validate_service_interface(service, interface_type) else None
 
 # Type guards para verificar tipos de servicios
 def is_whatsapp_service(service: Any) -> bool:
     """Verificar si un servicio es un IWhatsAppService."""
-    return validate_service_interface(service, IWhatsAppService)
+    return isinstance(service, IWhatsAppService)
 
 def is_user_service(service: Any) -> bool:
     """Verificar si un servicio es un IUserService."""
-    return validate_service_interface(service, IUserService)
+    return isinstance(service, IUserService)
 
 def is_openai_service(service: Any) -> bool:
     """Verificar si un servicio es un IOpenAIService."""
-    return validate_service_interface(service, IOpenAIService)
+    return isinstance(service, IOpenAIService)
 
 def is_vision_service(service: Any) -> bool:
     """Verificar si un servicio es un IVisionService."""
-    return validate_service_interface(service, IVisionService)
+    return isinstance(service, IVisionService)
 
 def is_blob_storage_service(service: Any) -> bool:
     """Verificar si un servicio es un IBlobStorageService."""
-    return validate_service_interface(service, IBlobStorageService)
+    return isinstance(service, IBlobStorageService)
 
 def is_redis_service(service: Any) -> bool:
     """Verificar si un servicio es un IRedisService."""
-    return validate_service_interface(service, IRedisService)
+    return isinstance(service, IRedisService)
 
 def is_message_processor(service: Any) -> bool:
     """Verificar si un servicio es un IMessageProcessor."""
-    return validate_service_interface(service, IMessageProcessor)
+    return isinstance(service, IMessageProcessor)
 
 def is_error_handler(service: Any) -> bool:
     """Verificar si un servicio es un IErrorHandler."""
-    return validate_service_interface(service, IErrorHandler) 
\ No newline at end of file
+    return isinstance(service, IErrorHandler) 
\ No newline at end of file
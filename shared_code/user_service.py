@@ -8,7 +8,9 @@ and management with production-grade features and enhanced error handling.
 import logging
 import json
 import os
-from typing import Optional, Dict, Any, List
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta, timezone
 from redis.exceptions import RedisError, ConnectionError
 # Importación removida para evitar circular import
@@ -22,9 +24,16 @@ from shared_code.utils import (
     sanitize_session_id
 )
 from shared_code.interfaces import IUserService
+from shared_code.circuit_breaker import tracks_health
 
 logger = logging.getLogger(__name__)
 
+# Seconds between background flushes of buffered last-activity updates
+ACTIVITY_FLUSH_INTERVAL_SECONDS = 2.0
+
+# Buffered users that trigger a flush before the interval elapses
+ACTIVITY_FLUSH_MAX_PENDING = 1000
+
 class User(BaseModel):
     phone_number: str
     name: str
@@ -71,6 +80,12 @@ class User(BaseModel):
             updated_at=updated_at
         )
 
+def _serializable_context(context: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convert deque values (e.g. the bounded conversation) to lists for JSON."""
+    if not context:
+        return context
+    return {key: list(value) if isinstance(value, deque) else value for key, value in context.items()}
+
 class UserSession(BaseModel):
     session_id: str
     user_phone: str
@@ -83,7 +98,7 @@ class UserSession(BaseModel):
         return {
             "session_id": self.session_id,
             "user_phone": self.user_phone,
-            "context": self.context,
+            "context": _serializable_context(self.context),
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "is_active": self.is_active
         }
@@ -125,6 +140,11 @@ class UserService(IUserService):
             redis_service: Redis service instance (required)
         """
         self.redis_service = redis_service
+        # user_id -> (last activity timestamp, messages since the last flush)
+        self._activity_buffer: Dict[str, Tuple[str, int]] = {}
+        self._activity_lock = threading.Lock()
+        self._activity_wakeup = threading.Event()
+        self._activity_flusher: Optional[threading.Thread] = None
 
     def register_user(
         self, 
@@ -378,6 +398,120 @@ class UserService(IUserService):
             logger.error(f"Error updating activity for user {sanitize_user_id(user_id)}: {e}")
             raise
 
+    def schedule_last_activity(self, user_id: str) -> None:
+        """
+        Buffer a last-activity update instead of writing it to Redis now.
+        
+        Updates are coalesced per user and written by a background thread
+        every ACTIVITY_FLUSH_INTERVAL_SECONDS, or as soon as
+        ACTIVITY_FLUSH_MAX_PENDING users are pending, so a burst of messages
+        costs one pipelined write instead of four round trips per message.
+        
+        Args:
+            user_id: Unique user ID
+            
+        Raises:
+            ValueError: If user_id is empty
+        """
+        if not user_id:
+            raise ValueError("User ID cannot be empty")
+        
+        timestamp = datetime.now(timezone.utc).isoformat()
+        with self._activity_lock:
+            _, message_count = self._activity_buffer.get(user_id, (timestamp, 0))
+            self._activity_buffer[user_id] = (timestamp, message_count + 1)
+            pending = len(self._activity_buffer)
+            
+            if self._activity_flusher is None:
+                self._activity_flusher = threading.Thread(
+                    target=self._run_activity_flusher,
+                    name="user-activity-flusher",
+                    daemon=True
+                )
+                self._activity_flusher.start()
+        
+        if pending >= ACTIVITY_FLUSH_MAX_PENDING:
+            self._activity_wakeup.set()
+
+    def _run_activity_flusher(self) -> None:
+        """Background loop that flushes the activity buffer."""
+        while True:
+            self._activity_wakeup.wait(ACTIVITY_FLUSH_INTERVAL_SECONDS)
+            self._activity_wakeup.clear()
+            try:
+                self.flush_activity_buffer()
+            except Exception as e:
+                logger.warning(f"Background activity flush failed: {e}")
+
+    def flush_activity_buffer(self) -> int:
+        """
+        Write all buffered last-activity updates to Redis.
+        
+        Reads the affected users and stats with one MGET and writes them back
+        with one pipeline. Users that no longer exist are skipped. If Redis
+        fails, the updates are put back in the buffer for the next flush.
+        
+        Returns:
+            int: Number of users updated
+            
+        Raises:
+            RedisError: If Redis operation fails
+        """
+        with self._activity_lock:
+            pending, self._activity_buffer = self._activity_buffer, {}
+        
+        if not pending:
+            return 0
+        
+        user_ids = list(pending)
+        user_keys = [self.USER_KEY_PATTERN.format(user_id) for user_id in user_ids]
+        stats_keys = [self.USER_STATS_PATTERN.format(user_id) for user_id in user_ids]
+        
+        try:
+            client = self.redis_service.redis_client
+            values = client.mget(user_keys + stats_keys)
+            users_json, stats_json = values[:len(user_ids)], values[len(user_ids):]
+            
+            now = datetime.now(timezone.utc).isoformat()
+            pipe = client.pipeline(transaction=False)
+            updated = 0
+            for user_id, user_key, stats_key, user_json, user_stats_json in zip(
+                user_ids, user_keys, stats_keys, users_json, stats_json
+            ):
+                if user_json is None:
+                    continue
+                
+                timestamp, message_count = pending[user_id]
+                user_data = json.loads(user_json)
+                user_data["last_activity"] = timestamp
+                user_data["last_updated"] = now
+                pipe.set(user_key, json.dumps(user_data, ensure_ascii=False))
+                
+                if user_stats_json is not None:
+                    stats = json.loads(user_stats_json)
+                    stats["message_count"] = stats.get("message_count", 0) + message_count
+                    pipe.set(stats_key, json.dumps(stats))
+                
+                updated += 1
+            
+            if updated:
+                pipe.execute()
+            
+            logger.debug(f"Flushed last activity for {updated} users")
+            return updated
+            
+        except Exception as e:
+            logger.error(f"Error flushing activity buffer for {len(pending)} users: {e}")
+            self._requeue_activity(pending)
+            raise
+
+    def _requeue_activity(self, pending: Dict[str, Tuple[str, int]]) -> None:
+        """Merge unflushed updates back into the buffer, keeping newer timestamps."""
+        with self._activity_lock:
+            for user_id, (timestamp, message_count) in pending.items():
+                newer_timestamp, newer_count = self._activity_buffer.get(user_id, (timestamp, 0))
+                self._activity_buffer[user_id] = (max(timestamp, newer_timestamp), message_count + newer_count)
+
     def delete_user(self, user_id: str) -> bool:
         """
         Delete a user from Redis.
@@ -564,12 +698,13 @@ class UserService(IUserService):
         except Exception as e:
             logger.warning(f"Failed to cleanup user data for {sanitize_user_id(user_id)}: {e}")
 
+    @tracks_health
     def health_check(self) -> bool:
         """
         Perform a health check on the user service.
         
         Returns:
-            bool: True if service is healthy
+            HealthStatus: Result, latency and failure history of the check
             
         Raises:
             RedisError: If health check fails
@@ -662,17 +797,14 @@ class UserService(IUserService):
                 else:
                     cursor, keys = scan_result  # type: ignore
                 
-                for key in keys:
-                    session_json = self.redis_service.redis_client.get(key)
+                # Una sola petición MGET por página del SCAN
+                session_keys = [key.decode() if isinstance(key, bytes) else key for key in keys]
+                session_values = self.redis_service.get_many(session_keys) if session_keys else {}
+                
+                for key, session_json in session_values.items():
                     if session_json:
                         try:
-                            # Validación de tipo para evitar errores de Awaitable
-                            if hasattr(session_json, '__await__'):
-                                # Si es Awaitable (por un mock mal configurado), lo resolvemos o lanzamos excepción clara
-                                raise TypeError("session_json es Awaitable, revisa el mock de Redis en los tests")
-                            if isinstance(session_json, bytes):
-                                session_json = session_json.decode()
-                            session_data = json.loads(session_json)  # type: ignore
+                            session_data = json.loads(session_json)
                             session = UserSession.from_dict(session_data)
                             if session.is_active:
                                 sessions.append(session)
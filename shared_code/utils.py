@@ -379,6 +379,25 @@ def format_timestamp(timestamp: Union[datetime, str, float], format_str: str = "
         logger.error(f"Failed to format timestamp: {e}")
         return str(timestamp)
 
+# [epoch second, formatted timestamp] of the last utc_now_iso() call
+_now_iso_cache: List[Any] = [-1, ""]
+
+def utc_now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string, at second resolution.
+    
+    Calls within the same second reuse the already formatted string, so
+    bursts of errors or health checks do not rebuild a datetime each time.
+    
+    Returns:
+        str: Current UTC timestamp in ISO 8601 format
+    """
+    now = int(time.time())
+    if now != _now_iso_cache[0]:
+        _now_iso_cache[1] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        _now_iso_cache[0] = now
+    return _now_iso_cache[1]
+
 def sanitize_phone_number(phone: str) -> str:
     """
     Sanitiza un número de teléfono para logs, mostrando solo los últimos 4 dígitos.
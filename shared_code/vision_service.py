@@ -17,6 +17,7 @@ from msrest.authentication import CognitiveServicesCredentials
 from msrest.exceptions import ClientRequestError, HttpOperationError
 from config.settings import settings
 from shared_code.interfaces import IVisionService
+from shared_code.circuit_breaker import tracks_health
 
 logger = logging.getLogger(__name__)
 
@@ -489,12 +490,13 @@ class VisionService(IVisionService):
             logger.error(f"Failed to extract text from result: {e}")
             return ""
 
+    @tracks_health
     def health_check(self) -> bool:
         """
         Perform a health check on the Computer Vision service.
         
         Returns:
-            bool: True if service is healthy
+            HealthStatus: Result, latency and failure history of the check
             
         Raises:
             Exception: If health check fails
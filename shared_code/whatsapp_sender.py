@@ -0,0 +1,237 @@
+"""
+Rate-limited outbound queue for WhatsApp text messages.
+
+This module provides WhatsAppSender, which lets callers enqueue replies and
+return immediately. A background task drains the queue with a bounded number
+of concurrent sends, paced by a token bucket so the Graph API throughput cap
+is respected, and retries throttled (429) or failed (5xx) sends with
+exponential backoff.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+import httpx
+from shared_code.interfaces import IMessageSender, IWhatsAppService
+
+logger = logging.getLogger(__name__)
+
+# Sustained sends per second allowed by the token bucket
+WHATSAPP_SEND_RATE = 200
+
+# Sends allowed at once when the bucket is full
+WHATSAPP_SEND_BURST = 50
+
+# Queued messages sent concurrently
+WHATSAPP_BATCH_SIZE = 50
+
+# Retries of a send after a 429, a 5xx or a transport error
+WHATSAPP_SEND_MAX_RETRIES = 3
+
+# Delay before the first retry, doubled on each attempt
+WHATSAPP_RETRY_BASE_DELAY_SECONDS = 0.5
+
+# Upper bound of a single retry delay, including Retry-After
+WHATSAPP_RETRY_MAX_DELAY_SECONDS = 30.0
+
+_QueueItem = Tuple[str, str, "asyncio.Future[Dict[str, Any]]"]
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, rate: float = WHATSAPP_SEND_RATE, burst: int = WHATSAPP_SEND_BURST):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be greater than 0")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class WhatsAppSender(IMessageSender):
+    """
+    Background sender draining a queue of text messages.
+
+    The queue and drain task are created on the first enqueue, on the running
+    event loop, and recreated if the sender is used from another loop. Each
+    message is sent by its own task, so a throttled recipient waiting out
+    Retry-After does not hold back the rest of the queue. Each message gets a
+    future resolved with the API response (so callers can still read the
+    message_id) or with the final exception.
+    """
+
+    def __init__(
+        self,
+        whatsapp_service: IWhatsAppService,
+        rate: float = WHATSAPP_SEND_RATE,
+        burst: int = WHATSAPP_SEND_BURST,
+        batch_size: int = WHATSAPP_BATCH_SIZE,
+        max_retries: int = WHATSAPP_SEND_MAX_RETRIES
+    ):
+        """
+        Initialize the sender.
+
+        Args:
+            whatsapp_service: Service used for the actual sends
+            rate: Sustained sends per second
+            burst: Sends allowed at once
+            batch_size: Maximum number of messages sent concurrently
+            max_retries: Retries of a throttled or failed send
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+
+        self.whatsapp_service = whatsapp_service
+        self.bucket = TokenBucket(rate, burst)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self._queue: Optional["asyncio.Queue[_QueueItem]"] = None
+        self._queue_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._drain_task: Optional["asyncio.Task[None]"] = None
+
+    async def enqueue(self, recipient_id: str, message: str) -> "asyncio.Future[Dict[str, Any]]":
+        """
+        Queue a text message for sending.
+
+        Args:
+            recipient_id: WhatsApp ID of the recipient
+            message: Text message to send
+
+        Returns:
+            asyncio.Future: Resolved with the API response once sent
+        """
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._queue_loop is not loop:
+            # asyncio queues and tasks are bound to the loop that uses them
+            self._queue = asyncio.Queue()
+            self._queue_loop = loop
+            self._drain_task = None
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = loop.create_task(self._drain(self._queue), name="whatsapp-sender")
+
+        future: "asyncio.Future[Dict[str, Any]]" = loop.create_future()
+        await self._queue.put((recipient_id, message, future))
+        return future
+
+    async def aclose(self) -> None:
+        """Wait for the queued messages to be sent and stop the drain task."""
+        if self._queue is not None:
+            await self._queue.join()
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+
+    async def _drain(self, queue: "asyncio.Queue[_QueueItem]") -> None:
+        """Start one send task per queued message, at most batch_size at a time, until cancelled."""
+        semaphore = asyncio.Semaphore(self.batch_size)
+        in_flight: Set["asyncio.Task[None]"] = set()
+
+        def finished(task: "asyncio.Task[None]") -> None:
+            in_flight.discard(task)
+            semaphore.release()
+            queue.task_done()
+
+        try:
+            while True:
+                await semaphore.acquire()
+                try:
+                    item = await queue.get()
+                except BaseException:
+                    semaphore.release()
+                    raise
+                task = asyncio.create_task(self._deliver(*item))
+                in_flight.add(task)
+                task.add_done_callback(finished)
+        finally:
+            for task in list(in_flight):
+                task.cancel()
+
+    async def _deliver(self, recipient_id: str, message: str, future: "asyncio.Future[Dict[str, Any]]") -> None:
+        """Send one message and resolve its future."""
+        try:
+            result = await self._send_with_retry(recipient_id, message)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Failed sending queued text message to {recipient_id}: {e}")
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def _send_with_retry(self, recipient_id: str, message: str) -> Dict[str, Any]:
+        """
+        Send a message, retrying 429, 5xx and transport errors with backoff.
+
+        Raises:
+            httpx.HTTPStatusError: If the API rejects the message or retries run out
+            httpx.TransportError: If the request keeps failing
+        """
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                return await self.whatsapp_service.send_text_message_async(message, recipient_id=recipient_id)
+            except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._retry_delay(e, attempt)
+                attempt += 1
+                logger.warning(
+                    f"Retrying text message to {recipient_id} in {delay:.2f}s "
+                    f"(attempt {attempt}/{self.max_retries}): {e}"
+                )
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Throttling, server errors and transport errors are worth retrying."""
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return True
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Honour Retry-After when given, else exponential backoff with jitter."""
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), WHATSAPP_RETRY_MAX_DELAY_SECONDS)
+                except ValueError:
+                    pass
+        delay = WHATSAPP_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)
+        return min(delay * random.uniform(0.5, 1.0), WHATSAPP_RETRY_MAX_DELAY_SECONDS)
@@ -5,25 +5,51 @@ This module provides functions for sending messages and handling
 WhatsApp webhook events with production-grade features and enhanced error handling.
 """
 
+import asyncio
+import functools
 import logging
 import json
+import httpx
 import requests
-from typing import Dict, Any, Optional, List, Union
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Any, Optional, List, Union
 from datetime import datetime, timezone
 from requests.exceptions import RequestException, HTTPError, Timeout, ConnectionError
 from config.settings import settings
 from shared_code.utils import (
     setup_logging, 
     sanitize_token,
-    sanitize_log_message
+    sanitize_log_message,
+    create_error_response
 )
 from shared_code.interfaces import IWhatsAppService
+from shared_code.models import WebhookEvent
+from shared_code.circuit_breaker import tracks_health
 
 logger = logging.getLogger(__name__)
 
+# Timeout for Graph API calls, in seconds
+REQUEST_TIMEOUT_SECONDS = 30
+# Connection pool size of the async client; bounds the number of in-flight sends
+ASYNC_MAX_CONNECTIONS = 100
+# Default number of parallel requests for the bulk send methods
+BULK_MAX_CONCURRENCY = 8
+
+
 class WhatsAppService(IWhatsAppService):
     """Service class for WhatsApp operations with production-grade features."""
     
+    # Async HTTP client, created on first use of a *_async method
+    _async_client: Optional[httpx.AsyncClient] = None
+    _async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+    # requests session for the bulk send methods, created on first use
+    _bulk_session: Optional[requests.Session] = None
+    _bulk_pool_size = 0
+    _bulk_session_lock = threading.Lock()
+    
     def __init__(self, skip_validation=False):
         """Initialize the WhatsApp service with connection validation."""
         try:
@@ -59,6 +85,139 @@ class WhatsAppService(IWhatsAppService):
             if not getattr(self, field):
                 raise ValueError(f"WhatsApp configuration missing: {field}")
 
+    def _build_text_payload(
+        self,
+        message: str,
+        recipient_id: Optional[str] = None,
+        preview_url: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Validate input and build the payload for a text message."""
+        if not message or not message.strip():
+            raise ValueError("Message cannot be empty")
+        
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": recipient_id or self.recipient_waid,
+            "type": "text",
+            "text": {"body": message}
+        }
+        
+        # Add preview URL setting if specified
+        if preview_url is not None:
+            payload["text"]["preview_url"] = preview_url
+        return payload
+
+    def _build_document_payload(
+        self,
+        document_url: str,
+        filename: str,
+        caption: Optional[str] = None,
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Validate input and build the payload for a document message."""
+        if not document_url or not filename:
+            raise ValueError("Document URL and filename cannot be empty")
+        
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": recipient_id or self.recipient_waid,
+            "type": "document",
+            "document": {
+                "link": document_url,
+                "filename": filename
+            }
+        }
+        
+        if caption:
+            payload["document"]["caption"] = caption
+        return payload
+
+    def _build_template_payload(
+        self,
+        template_name: str,
+        template_variables: Optional[Dict[str, Any]] = None,
+        recipient_id: Optional[str] = None,
+        language_code: str = "es"
+    ) -> Dict[str, Any]:
+        """Validate input and build the payload for a template message."""
+        if not template_name:
+            raise ValueError("Template name cannot be empty")
+        
+        payload = {
+            "messaging_product": "whatsapp",
+            "to": recipient_id or self.recipient_waid,
+            "type": "template",
+            "template": {
+                "name": template_name,
+                "language": {"code": language_code}
+            }
+        }
+        
+        if template_variables:
+            payload["template"]["components"] = [
+                {
+                    "type": "body",
+                    "parameters": [
+                        {"type": "text", "text": str(value)}
+                        for value in template_variables.values()
+                    ]
+                }
+            ]
+        return payload
+
+    def _build_buttons_payload(
+        self,
+        body_text: str,
+        buttons: List[Dict[str, str]],
+        recipient_id: Optional[str] = None,
+        kind: str = "buttons"
+    ) -> Dict[str, Any]:
+        """Validate input and build the payload for a reply-button message (max 3 buttons)."""
+        if not body_text or not buttons:
+            raise ValueError(f"Body text and {kind} cannot be empty")
+        
+        if len(buttons) > 3:
+            logger.warning(f"Too many {kind} provided ({len(buttons)}), limiting to 3")
+            buttons = buttons[:3]
+        
+        return {
+            "messaging_product": "whatsapp",
+            "to": recipient_id or self.recipient_waid,
+            "type": "interactive",
+            "interactive": {
+                "type": "button",
+                "body": {"text": body_text},
+                "action": {
+                    "buttons": [
+                        {
+                            "type": "reply",
+                            "reply": {"id": btn["id"], "title": btn["title"]}
+                        }
+                        for btn in buttons
+                    ]
+                }
+            }
+        }
+
+    def _build_read_payload(self, message_id: str, typing: bool = False) -> Dict[str, Any]:
+        """
+        Validate input and build the payload that marks a message as read.
+        
+        With typing=True the payload also shows the typing indicator, which
+        WhatsApp hides when the reply arrives (or after 25 seconds).
+        """
+        if not message_id:
+            raise ValueError("Message ID cannot be empty")
+        
+        payload: Dict[str, Any] = {
+            "messaging_product": "whatsapp",
+            "status": "read",
+            "message_id": message_id
+        }
+        if typing:
+            payload["typing_indicator"] = {"type": "text"}
+        return payload
+
     def send_text_message(
         self, 
         message: str, 
@@ -83,22 +242,8 @@ class WhatsAppService(IWhatsAppService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input
-            if not message or not message.strip():
-                raise ValueError("Message cannot be empty")
-            
-            recipient = recipient_id or self.recipient_waid
-            
-            payload = {
-                "messaging_product": "whatsapp",
-                "to": recipient,
-                "type": "text",
-                "text": {"body": message}
-            }
-            
-            # Add preview URL setting if specified
-            if preview_url is not None:
-                payload["text"]["preview_url"] = preview_url
+            payload = self._build_text_payload(message, recipient_id, preview_url)
+            recipient = payload["to"]
             
             response = requests.post(
                 f"{self.base_url}/messages",
@@ -152,24 +297,8 @@ class WhatsAppService(IWhatsAppService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input
-            if not document_url or not filename:
-                raise ValueError("Document URL and filename cannot be empty")
-            
-            recipient = recipient_id or self.recipient_waid
-            
-            payload = {
-                "messaging_product": "whatsapp",
-                "to": recipient,
-                "type": "document",
-                "document": {
-                    "link": document_url,
-                    "filename": filename
-                }
-            }
-            
-            if caption:
-                payload["document"]["caption"] = caption
+            payload = self._build_document_payload(document_url, filename, caption, recipient_id)
+            recipient = payload["to"]
             
             response = requests.post(
                 f"{self.base_url}/messages",
@@ -223,32 +352,10 @@ class WhatsAppService(IWhatsAppService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input
-            if not template_name:
-                raise ValueError("Template name cannot be empty")
-            
-            recipient = recipient_id or self.recipient_waid
-            
-            payload = {
-                "messaging_product": "whatsapp",
-                "to": recipient,
-                "type": "template",
-                "template": {
-                    "name": template_name,
-                    "language": {"code": language_code}
-                }
-            }
-            
-            if template_variables:
-                payload["template"]["components"] = [
-                    {
-                        "type": "body",
-                        "parameters": [
-                            {"type": "text", "text": str(value)}
-                            for value in template_variables.values()
-                        ]
-                    }
-                ]
+            payload = self._build_template_payload(
+                template_name, template_variables, recipient_id, language_code
+            )
+            recipient = payload["to"]
             
             response = requests.post(
                 f"{self.base_url}/messages",
@@ -311,74 +418,39 @@ class WhatsAppService(IWhatsAppService):
             logger.error(f"Webhook verification error: {e}")
             raise
 
-    def process_webhook_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    def process_webhook_event(self, event: Union[WebhookEvent, Dict[str, Any]]) -> WebhookEvent:
         """
-        Process incoming webhook events from WhatsApp with enhanced parsing.
+        Process an incoming webhook event from WhatsApp.
+        
+        The event is expected to be built with WebhookEvent.from_payload.
+        Decoded dict payloads are still accepted for now but are deprecated.
         
         Args:
-            event_data: Raw webhook event data
+            event: Parsed webhook event (or, deprecated, the decoded payload)
             
         Returns:
-            Dict[str, Any]: Processed event information
+            WebhookEvent: Processed event information
             
         Raises:
-            ValueError: If event_data is invalid
+            ValueError: If event is invalid
             Exception: For other unexpected errors
         """
         try:
+            if isinstance(event, dict) and event:
+                warnings.warn(
+                    "Passing a dict to process_webhook_event is deprecated; "
+                    "build the event with WebhookEvent.from_payload instead",
+                    DeprecationWarning,
+                    stacklevel=2
+                )
+                event = WebhookEvent.from_payload(event)
+            
             # Validate input
-            if not event_data or not isinstance(event_data, dict):
-                raise ValueError("Event data must be a non-empty dictionary")
-            
-            processed_event = {
-                "event_type": "unknown",
-                "message_id": None,
-                "sender_id": None,
-                "message_type": None,
-                "message_content": None,
-                "timestamp": None,
-                "processed_at": datetime.now(timezone.utc).isoformat()
-            }
+            if not isinstance(event, WebhookEvent):
+                raise ValueError("Event must be a WebhookEvent or a non-empty dictionary")
             
-            # Extract entry and messaging data
-            if "entry" in event_data and event_data["entry"]:
-                entry = event_data["entry"][0]
-                
-                if "changes" in entry and entry["changes"]:
-                    change = entry["changes"][0]
-                    
-                    if "value" in change and "messages" in change["value"]:
-                        message = change["value"]["messages"][0]
-                        
-                        processed_event.update({
-                            "event_type": "message",
-                            "message_id": message.get("id"),
-                            "sender_id": message.get("from"),
-                            "message_type": message.get("type"),
-                            "timestamp": message.get("timestamp")
-                        })
-                        
-                        # Extract message content based on type
-                        if message.get("type") == "text":
-                            processed_event["message_content"] = message.get("text", {}).get("body")
-                        elif message.get("type") == "document":
-                            document = message.get("document", {})
-                            processed_event["message_content"] = {
-                                "filename": document.get("filename"),
-                                "url": document.get("url"),
-                                "mime_type": document.get("mime_type"),
-                                "file_size": document.get("file_size")
-                            }
-                        elif message.get("type") == "image":
-                            image = message.get("image", {})
-                            processed_event["message_content"] = {
-                                "url": image.get("url"),
-                                "mime_type": image.get("mime_type"),
-                                "file_size": image.get("file_size")
-                            }
-            
-            logger.info(f"Webhook event processed: {processed_event['event_type']} from {processed_event['sender_id']}")
-            return processed_event
+            logger.info(f"Webhook event processed: {event.event_type} from {event.sender_id}")
+            return event
             
         except ValueError as e:
             logger.error(f"Invalid input for webhook event processing: {e}")
@@ -457,34 +529,9 @@ class WhatsAppService(IWhatsAppService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input
-            if not body_text or not buttons:
-                raise ValueError("Body text and buttons cannot be empty")
-            
-            if len(buttons) > 3:
-                logger.warning(f"Too many buttons provided ({len(buttons)}), limiting to 3")
-                buttons = buttons[:3]
-            
-            recipient = recipient_id or self.recipient_waid
-            
-            payload = {
-                "messaging_product": "whatsapp",
-                "to": recipient,
-                "type": "interactive",
-                "interactive": {
-                    "type": "button",
-                    "body": {"text": body_text},
-                    "action": {
-                        "buttons": [
-                            {
-                                "type": "reply",
-                                "reply": {"id": btn["id"], "title": btn["title"]}
-                            }
-                            for btn in buttons
-                        ]
-                    }
-                }
-            }
+            payload = self._build_buttons_payload(body_text, buttons, recipient_id, "buttons")
+            recipient = payload["to"]
+            button_count = len(payload["interactive"]["action"]["buttons"])
             
             response = requests.post(
                 f"{self.base_url}/messages",
@@ -496,7 +543,7 @@ class WhatsAppService(IWhatsAppService):
             response.raise_for_status()
             result = response.json()
             
-            logger.info(f"Interactive message sent successfully to {recipient} with {len(buttons)} buttons")
+            logger.info(f"Interactive message sent successfully to {recipient} with {button_count} buttons")
             return result
             
         except ValueError as e:
@@ -529,15 +576,7 @@ class WhatsAppService(IWhatsAppService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input
-            if not message_id:
-                raise ValueError("Message ID cannot be empty")
-            
-            payload = {
-                "messaging_product": "whatsapp",
-                "status": "read",
-                "message_id": message_id
-            }
+            payload = self._build_read_payload(message_id)
             
             response = requests.post(
                 f"{self.base_url}/messages",
@@ -589,34 +628,9 @@ class WhatsAppService(IWhatsAppService):
             Exception: For other unexpected errors
         """
         try:
-            # Validate input
-            if not body_text or not quick_replies:
-                raise ValueError("Body text and quick replies cannot be empty")
-            
-            if len(quick_replies) > 3:
-                logger.warning(f"Too many quick replies provided ({len(quick_replies)}), limiting to 3")
-                quick_replies = quick_replies[:3]
-            
-            recipient = recipient_id or self.recipient_waid
-            
-            payload = {
-                "messaging_product": "whatsapp",
-                "to": recipient,
-                "type": "interactive",
-                "interactive": {
-                    "type": "button",
-                    "body": {"text": body_text},
-                    "action": {
-                        "buttons": [
-                            {
-                                "type": "reply",
-                                "reply": {"id": reply["id"], "title": reply["title"]}
-                            }
-                            for reply in quick_replies
-                        ]
-                    }
-                }
-            }
+            payload = self._build_buttons_payload(body_text, quick_replies, recipient_id, "quick replies")
+            recipient = payload["to"]
+            reply_count = len(payload["interactive"]["action"]["buttons"])
             
             response = requests.post(
                 f"{self.base_url}/messages",
@@ -628,7 +642,7 @@ class WhatsAppService(IWhatsAppService):
             response.raise_for_status()
             result = response.json()
             
-            logger.info(f"Quick reply message sent successfully to {recipient} with {len(quick_replies)} options")
+            logger.info(f"Quick reply message sent successfully to {recipient} with {reply_count} options")
             return result
             
         except ValueError as e:
@@ -644,12 +658,279 @@ class WhatsAppService(IWhatsAppService):
             logger.error(f"Unexpected error sending quick reply message: {e}")
             raise
 
+    def _get_bulk_session(self, pool_size: int) -> requests.Session:
+        """
+        Return the session used by the bulk send methods.
+        
+        urllib3 keeps only 10 connections per host by default, so with more
+        workers than that the extra connections are opened and thrown away on
+        every request. The adapter pool is sized to the requested concurrency;
+        a smaller session is closed when a larger one replaces it.
+        """
+        with self._bulk_session_lock:
+            session = self._bulk_session
+            if session is None or self._bulk_pool_size < pool_size:
+                previous = session
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._bulk_session = session
+                self._bulk_pool_size = pool_size
+                if previous is not None:
+                    previous.close()
+            return session
+
+    def _send_bulk(
+        self,
+        build_payloads: List[Callable[[], Dict[str, Any]]],
+        max_concurrency: int,
+        description: str
+    ) -> List[Dict[str, Any]]:
+        """
+        POST several message payloads in parallel over one pooled session.
+        
+        A failed item does not stop the others: its slot in the result holds
+        an error response instead of the API response.
+        
+        Args:
+            build_payloads: Callables that validate input and build each payload
+            max_concurrency: Maximum number of requests in flight
+            description: Message kind, used in log messages
+            
+        Returns:
+            List[Dict[str, Any]]: One result per payload, in input order
+        """
+        if not build_payloads:
+            return []
+        
+        workers = max(1, min(max_concurrency, len(build_payloads)))
+        session = self._get_bulk_session(workers)
+        url = f"{self.base_url}/messages"
+        
+        def send(build_payload: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+            payload = None
+            try:
+                payload = build_payload()
+                response = session.post(url, headers=self.headers, json=payload, timeout=REQUEST_TIMEOUT_SECONDS)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                logger.error(f"Failed sending {description} in bulk: {e}")
+                details = {"recipient_id": payload.get("to")} if payload and "to" in payload else None
+                return create_error_response(str(e), "SEND_FAILED", details)
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whatsapp-bulk") as executor:
+            results = list(executor.map(send, build_payloads))
+        
+        failed = sum(1 for result in results if result.get("success") is False)
+        logger.info(f"Bulk {description}: {len(results) - failed} sent, {failed} failed")
+        return results
+
+    def send_bulk_text_messages(
+        self,
+        items: List[Dict[str, Any]],
+        recipient_ids: Optional[List[str]] = None,
+        max_concurrency: int = BULK_MAX_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Send several text messages in parallel.
+        
+        The Graph API has no multi-message endpoint, so the messages are sent
+        as concurrent requests that reuse pooled connections.
+        
+        Args:
+            items: Messages to send, each with "message" and optional
+                "recipient_id" and "preview_url" keys
+            recipient_ids: Recipients aligned with items; overrides each
+                item's "recipient_id" when given
+            max_concurrency: Maximum number of requests in flight
+            
+        Returns:
+            List[Dict[str, Any]]: API response (or error response) per item, in order
+            
+        Raises:
+            ValueError: If recipient_ids does not match the number of items
+        """
+        if recipient_ids is not None and len(recipient_ids) != len(items):
+            raise ValueError("recipient_ids must have one entry per item")
+        
+        build_payloads: List[Callable[[], Dict[str, Any]]] = [
+            functools.partial(
+                self._build_text_payload,
+                item.get("message", ""),
+                recipient_ids[index] if recipient_ids is not None else item.get("recipient_id"),
+                item.get("preview_url")
+            )
+            for index, item in enumerate(items)
+        ]
+        return self._send_bulk(build_payloads, max_concurrency, "text messages")
+
+    def mark_messages_as_read(
+        self,
+        message_ids: List[str],
+        max_concurrency: int = BULK_MAX_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Mark several messages as read in parallel.
+        
+        Args:
+            message_ids: IDs of the messages to mark as read
+            max_concurrency: Maximum number of requests in flight
+            
+        Returns:
+            List[Dict[str, Any]]: API response (or error response) per message, in order
+        """
+        build_payloads: List[Callable[[], Dict[str, Any]]] = [
+            functools.partial(self._build_read_payload, message_id)
+            for message_id in message_ids
+        ]
+        return self._send_bulk(build_payloads, max_concurrency, "read receipts")
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared async HTTP client for the running event loop.
+        
+        httpx connection pools are bound to the loop that created them, so a
+        new client is created if the service is used from another loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_client
+        if client is None or client.is_closed or self._async_client_loop is not loop:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=REQUEST_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=ASYNC_MAX_CONNECTIONS,
+                    max_keepalive_connections=ASYNC_MAX_CONNECTIONS
+                )
+            )
+            self._async_client = client
+            self._async_client_loop = loop
+        return client
+
+    async def _post_message_async(self, payload: Dict[str, Any], description: str) -> Dict[str, Any]:
+        """
+        POST a message payload with the async client.
+        
+        Args:
+            payload: Graph API message payload
+            description: Message kind, used in log messages
+            
+        Returns:
+            Dict[str, Any]: API response from WhatsApp
+            
+        Raises:
+            httpx.HTTPStatusError: If WhatsApp API returns an error
+            httpx.RequestError: If request fails
+        """
+        try:
+            response = await self._get_async_client().post("/messages", json=payload)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"WhatsApp API error sending {description}: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"Request failed sending {description}: {e}")
+            raise
+
+    async def send_text_message_async(
+        self,
+        message: str,
+        recipient_id: Optional[str] = None,
+        preview_url: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of send_text_message.
+        
+        Several sends can be awaited together with asyncio.gather and share
+        the client's connection pool instead of running one after another.
+        """
+        payload = self._build_text_payload(message, recipient_id, preview_url)
+        result = await self._post_message_async(payload, "text message")
+        logger.info(f"Text message sent successfully to {payload['to']} (length: {len(message)})")
+        return result
+
+    async def send_document_message_async(
+        self,
+        document_url: str,
+        filename: str,
+        caption: Optional[str] = None,
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async variant of send_document_message."""
+        payload = self._build_document_payload(document_url, filename, caption, recipient_id)
+        result = await self._post_message_async(payload, "document message")
+        logger.info(f"Document message sent successfully to {payload['to']} (file: {filename})")
+        return result
+
+    async def send_template_message_async(
+        self,
+        template_name: str,
+        template_variables: Optional[Dict[str, Any]] = None,
+        recipient_id: Optional[str] = None,
+        language_code: str = "es"
+    ) -> Dict[str, Any]:
+        """Async variant of send_template_message."""
+        payload = self._build_template_payload(template_name, template_variables, recipient_id, language_code)
+        result = await self._post_message_async(payload, "template message")
+        logger.info(f"Template message sent successfully to {payload['to']} (template: {template_name})")
+        return result
+
+    async def send_interactive_message_async(
+        self,
+        body_text: str,
+        buttons: List[Dict[str, str]],
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async variant of send_interactive_message."""
+        payload = self._build_buttons_payload(body_text, buttons, recipient_id, "buttons")
+        result = await self._post_message_async(payload, "interactive message")
+        logger.info(f"Interactive message sent successfully to {payload['to']}")
+        return result
+
+    async def send_quick_reply_message_async(
+        self,
+        body_text: str,
+        quick_replies: List[Dict[str, str]],
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async variant of send_quick_reply_message."""
+        payload = self._build_buttons_payload(body_text, quick_replies, recipient_id, "quick replies")
+        result = await self._post_message_async(payload, "quick reply message")
+        logger.info(f"Quick reply message sent successfully to {payload['to']}")
+        return result
+
+    async def mark_message_as_read_async(self, message_id: str) -> Dict[str, Any]:
+        """Async variant of mark_message_as_read."""
+        payload = self._build_read_payload(message_id)
+        result = await self._post_message_async(payload, "read receipt")
+        logger.info(f"Message marked as read: {message_id}")
+        return result
+
+    async def send_typing_indicator_async(self, message_id: str) -> Dict[str, Any]:
+        """Mark a received message as read and show the typing indicator."""
+        payload = self._build_read_payload(message_id, typing=True)
+        result = await self._post_message_async(payload, "typing indicator")
+        logger.debug(f"Typing indicator sent for message: {message_id}")
+        return result
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+
+    @tracks_health
     def health_check(self) -> bool:
         """
         Perform a health check on the WhatsApp service.
         
         Returns:
-            bool: True if service is healthy
+            HealthStatus: Result, latency and failure history of the check
             
         Raises:
             Exception: If health check fails
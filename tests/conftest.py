@@ -157,6 +157,22 @@ def mock_redis_global():
         mock_instance.scan.return_value = (0, [])
         yield mock_instance
 
+@pytest.fixture(autouse=True)
+def reset_blob_service_client_cache():
+    """Evita reutilizar clientes de Blob Storage cacheados entre tests"""
+    blob_module = sys.modules.get('shared_code.azure_blob_storage')
+    if blob_module is not None:
+        blob_module._get_blob_service_client.cache_clear()
+    yield
+
+@pytest.fixture(autouse=True)
+def reset_error_handler_stats():
+    """Evita que las estadísticas del ErrorHandler global pasen de un test a otro"""
+    yield
+    error_handler_module = sys.modules.get('shared_code.error_handler')
+    if error_handler_module is not None and error_handler_module._error_handler_singleton is not None:
+        error_handler_module._error_handler_singleton.reset_error_stats()
+
 @pytest.fixture(autouse=True)
 def reload_config():
     """Recarga la configuración después de aplicar los mocks de entorno"""
@@ -130,6 +130,7 @@ class TestMessageProcessingIntegration:
         # Type: ignore para mocks de unittest
         message_processor_with_mocks.openai_service.generate_response.assert_called_once()  # type: ignore
         message_processor_with_mocks.whatsapp_service.send_text_message.assert_called_once()  # type: ignore
+        message_processor_with_mocks.flush_session_updates(timeout=5)
         message_processor_with_mocks.user_service.update_session.assert_called_once()  # type: ignore
     
     def test_image_message_processing_flow(self, message_processor_with_mocks: MessageProcessor):
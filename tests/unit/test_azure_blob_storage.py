@@ -5,11 +5,13 @@ This module contains comprehensive tests for the AzureBlobStorageService class
 with mocked external dependencies and full coverage of all methods.
 """
 
+import asyncio
 import pytest
 import os
-from unittest.mock import Mock, patch, MagicMock, mock_open
+from unittest.mock import Mock, patch, MagicMock, AsyncMock, mock_open
 from datetime import datetime
-from azure.core.exceptions import AzureError, ResourceNotFoundError, ClientAuthenticationError
+from azure.core import MatchConditions
+from azure.core.exceptions import AzureError, ResourceNotFoundError, ResourceNotModifiedError, ClientAuthenticationError
 from azure.storage.blob import BlobServiceClient, ContainerClient, BlobClient
 
 # Mock settings ANTES de importar el servicio
@@ -17,7 +19,7 @@ with patch('shared_code.azure_blob_storage.settings') as mock_settings:
     mock_settings.azure_storage_connection_string = "test_connection_string"
     mock_settings.blob_container_name = "test-container"
     mock_settings.blob_account_name = "testaccount"
-    from shared_code.azure_blob_storage import AzureBlobStorageService
+    from shared_code.azure_blob_storage import AzureBlobStorageService, AsyncAzureBlobStorageService
     from shared_code.azure_blob_storage import blob_storage_service
 
 
@@ -80,6 +82,21 @@ class TestAzureBlobStorageService:
             with pytest.raises(Exception):
                 AzureBlobStorageService()
 
+    def test_init_reuses_client_and_skips_validation(self, mock_settings, mock_blob_service_client):
+        """Test instances share the cached client and skip validation by default."""
+        mock_settings.blob_validate_on_init = False
+        
+        first = AzureBlobStorageService()
+        second = AzureBlobStorageService()
+        
+        assert first.blob_service_client is second.blob_service_client
+        mock_blob_service_client.from_connection_string.assert_called_once()
+        options = mock_blob_service_client.from_connection_string.call_args.kwargs
+        assert options["retry_total"] == 5
+        assert options["retry_backoff_max"] == 30
+        assert options["transport"].session.get_adapter("https://").poolmanager.connection_pool_kw["maxsize"] == 64
+        first.container_client.get_container_properties.assert_not_called()
+
     def test_validate_connection_success(self, blob_storage_service):
         """Test successful connection validation."""
         blob_storage_service._validate_connection()
@@ -99,19 +116,35 @@ class TestAzureBlobStorageService:
         blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
         
         with patch('builtins.open', mock_open(read_data=b"test content")), \
-             patch('os.path.exists', return_value=True), \
-             patch('os.path.getsize', return_value=12):
+             patch('os.fstat', return_value=Mock(st_size=12)):
             
-            result = blob_storage_service._upload_file_internal("test.txt", "test-blob.txt")
+            result = blob_storage_service.upload_file("test.txt", "test-container", "test-blob.txt")
             
             assert result == "https://test.blob.core.windows.net/test-container/test.txt"
             mock_blob_client.upload_blob.assert_called_once()
+            assert mock_blob_client.upload_blob.call_args.kwargs["length"] == 12
+            assert "upload_date" not in mock_blob_client.upload_blob.call_args.kwargs["metadata"]
+
+    def test_upload_file_with_content_type(self, blob_storage_service):
+        """Test file upload builds content settings without reading the old blob."""
+        mock_blob_client = Mock(spec=BlobClient)
+        mock_blob_client.url = "https://test.blob.core.windows.net/test-container/test.pdf"
+        blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        with patch('builtins.open', mock_open(read_data=b"test content")), \
+             patch('os.fstat', return_value=Mock(st_size=12)):
+            
+            blob_storage_service.upload_file("test.pdf", "test-container", "test.pdf", content_type="application/pdf")
+            
+            content_settings = mock_blob_client.upload_blob.call_args.kwargs["content_settings"]
+            assert content_settings.content_type == "application/pdf"
+            mock_blob_client.get_blob_properties.assert_not_called()
 
     def test_upload_file_file_not_found(self, blob_storage_service):
         """Test file upload with non-existent file."""
         with patch('os.path.exists', return_value=False):
             with pytest.raises(FileNotFoundError):
-                blob_storage_service._upload_file_internal("nonexistent.txt", "test-blob.txt")
+                blob_storage_service.upload_file("nonexistent.txt", "test-container", "test-blob.txt")
 
     def test_upload_file_azure_error(self, blob_storage_service):
         """Test file upload with Azure error."""
@@ -120,11 +153,10 @@ class TestAzureBlobStorageService:
         blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
         
         with patch('builtins.open', mock_open(read_data=b"test content")), \
-             patch('os.path.exists', return_value=True), \
-             patch('os.path.getsize', return_value=12):
+             patch('os.fstat', return_value=Mock(st_size=12)):
             
             with pytest.raises(AzureError):
-                blob_storage_service._upload_file_internal("test.txt", "test-blob.txt")
+                blob_storage_service.upload_file("test.txt", "test-container", "test-blob.txt")
 
     def test_upload_stream_success(self, blob_storage_service):
         """Test successful stream upload."""
@@ -139,6 +171,7 @@ class TestAzureBlobStorageService:
         
         assert result == "https://test.blob.core.windows.net/test-container/test-stream.txt"
         mock_blob_client.upload_blob.assert_called_once()
+        assert mock_blob_client.upload_blob.call_args.kwargs["max_concurrency"] == 8
 
     def test_upload_stream_azure_error(self, blob_storage_service):
         """Test stream upload with Azure error."""
@@ -151,22 +184,95 @@ class TestAzureBlobStorageService:
         with pytest.raises(AzureError):
             blob_storage_service.upload_stream(mock_stream, "test-stream.txt")
 
+    def test_upload_stream_passes_known_length(self, blob_storage_service):
+        """Test that a known stream length reaches the SDK."""
+        mock_blob_client = Mock(spec=BlobClient)
+        blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        blob_storage_service.upload_stream(iter([b"abc", b"def"]), "chunks.bin", length=6)
+        
+        assert mock_blob_client.upload_blob.call_args.kwargs["length"] == 6
+
+    def test_download_chunks(self, blob_storage_service):
+        """Test downloading a blob as an iterator of chunks."""
+        mock_blob_client = Mock(spec=BlobClient)
+        mock_blob_client.download_blob.return_value.chunks.return_value = iter([b"abc", b"def"])
+        blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        assert b"".join(blob_storage_service.download_chunks("test-blob.txt")) == b"abcdef"
+
+    def test_upload_from_url_streams_response_into_blob(self, blob_storage_service):
+        """Test that a remote file is piped into the blob without a temp file."""
+        response = MagicMock()
+        response.headers = {"content-length": "6", "content-type": "image/jpeg"}
+        response.iter_bytes.return_value = iter([b"abc", b"def"])
+        
+        with patch('shared_code.azure_blob_storage.httpx.stream') as mock_stream, \
+             patch.object(blob_storage_service, 'upload_stream', return_value="https://blob/url") as mock_upload:
+            mock_stream.return_value.__enter__.return_value = response
+            
+            result = blob_storage_service.upload_from_url(
+                "https://media.example/1", "media/1.jpg", headers={"Authorization": "Bearer token"}
+            )
+        
+        assert result == "https://blob/url"
+        assert mock_stream.call_args.kwargs["headers"] == {"Authorization": "Bearer token"}
+        response.raise_for_status.assert_called_once()
+        args, kwargs = mock_upload.call_args
+        assert args[1] == "media/1.jpg"
+        assert kwargs["length"] == 6
+        assert kwargs["content_type"] == "image/jpeg"
+
+    def test_upload_from_url_skips_length_for_encoded_body(self, blob_storage_service):
+        """Test that an encoded response is uploaded without a length."""
+        response = MagicMock()
+        response.headers = {"content-length": "3", "content-encoding": "gzip"}
+        
+        with patch('shared_code.azure_blob_storage.httpx.stream') as mock_stream, \
+             patch.object(blob_storage_service, 'upload_stream', return_value="https://blob/url") as mock_upload:
+            mock_stream.return_value.__enter__.return_value = response
+            blob_storage_service.upload_from_url("https://media.example/1", "media/1.bin")
+        
+        assert mock_upload.call_args.kwargs["length"] is None
+
     def test_download_file_success(self, blob_storage_service):
         """Test successful file download."""
         mock_blob_client = Mock(spec=BlobClient)
         mock_download_stream = Mock()
-        mock_download_stream.readall.return_value = b"test content"
         mock_blob_client.download_blob.return_value = mock_download_stream
         blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
         
-        with patch('builtins.open', mock_open()), \
+        with patch('builtins.open', mock_open()) as mocked_file, \
              patch('os.makedirs'), \
              patch('os.path.getsize', return_value=12):
             
-            result = blob_storage_service._download_file_internal("test-blob.txt", "local-test.txt")
+            result = blob_storage_service.download_file("test-container", "test-blob.txt", "local-test.txt")
             
             assert result is True
-            mock_blob_client.download_blob.assert_called_once()
+            mock_blob_client.download_blob.assert_called_once_with(max_concurrency=8)
+            mock_download_stream.readinto.assert_called_once_with(mocked_file.return_value)
+            mock_download_stream.readall.assert_not_called()
+
+    def test_download_file_conditional_get_not_modified(self, blob_storage_service):
+        """Test repeated download to the same path sends If-None-Match and keeps the local file."""
+        mock_blob_client = Mock(spec=BlobClient)
+        mock_download_stream = Mock()
+        mock_download_stream.properties.etag = '"0x1"'
+        mock_blob_client.download_blob.side_effect = [mock_download_stream, ResourceNotModifiedError("Not modified")]
+        blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        with patch('builtins.open', mock_open()) as mocked_file, \
+             patch('os.makedirs'), \
+             patch('os.path.exists', return_value=True), \
+             patch('os.path.getsize', return_value=12):
+            
+            assert blob_storage_service.download_file("test-container", "test-blob.txt", "local/test.txt") is True
+            assert blob_storage_service.download_file("test-container", "test-blob.txt", "local/test.txt") is False
+            
+            second_call = mock_blob_client.download_blob.call_args_list[1]
+            assert second_call.kwargs["etag"] == '"0x1"'
+            assert second_call.kwargs["match_condition"] == MatchConditions.IfModified
+            mocked_file.assert_called_once()
 
     def test_download_file_resource_not_found(self, blob_storage_service):
         """Test file download with non-existent blob."""
@@ -177,7 +283,7 @@ class TestAzureBlobStorageService:
         with patch('os.makedirs'), \
              patch('builtins.open', mock_open()), \
              pytest.raises(ResourceNotFoundError):
-            blob_storage_service._download_file_internal("nonexistent.txt", "/tmp/local.txt")
+            blob_storage_service.download_file("test-container", "nonexistent.txt", "/tmp/local.txt")
 
     def test_download_stream_success(self, blob_storage_service):
         """Test successful stream download."""
@@ -228,6 +334,21 @@ class TestAzureBlobStorageService:
         assert result[1]["name"] == "test2.txt"
         assert "metadata" not in result[1]
 
+    def test_iter_blobs_is_lazy_and_paged(self, blob_storage_service):
+        """Test iter_blobs requests full pages and yields blobs on demand."""
+        mock_blob = Mock()
+        mock_blob.name = "file1.txt"
+        mock_blob.metadata = None
+        blob_storage_service.container_client.list_blobs.return_value = iter([mock_blob])
+        
+        blobs = blob_storage_service.iter_blobs(name_starts_with="file")
+        blob_storage_service.container_client.list_blobs.assert_not_called()
+        
+        assert [blob["name"] for blob in blobs] == ["file1.txt"]
+        blob_storage_service.container_client.list_blobs.assert_called_once_with(
+            name_starts_with="file", results_per_page=5000
+        )
+
     def test_list_blobs_azure_error(self, blob_storage_service):
         """Test blob listing with Azure error."""
         blob_storage_service.container_client.list_blobs.side_effect = AzureError("List failed")
@@ -254,6 +375,24 @@ class TestAzureBlobStorageService:
         with pytest.raises(ResourceNotFoundError):
             blob_storage_service.delete_blob("nonexistent.txt")
 
+    def test_delete_blobs_batches(self, blob_storage_service):
+        """Test batch deletion splits names into 256-operation chunks."""
+        blob_names = [f"file{i}.txt" for i in range(300)]
+        
+        def delete_blobs(*names, **kwargs):
+            return [Mock(status_code=404 if name == "file5.txt" else 202) for name in names]
+        
+        blob_storage_service.container_client.delete_blobs = Mock(side_effect=delete_blobs)
+        
+        result = blob_storage_service.delete_blobs(name for name in blob_names)
+        
+        calls = blob_storage_service.container_client.delete_blobs.call_args_list
+        assert [len(call.args) for call in calls] == [256, 44]
+        assert all(call.kwargs == {"raise_on_any_failure": False} for call in calls)
+        assert len(result) == 300
+        assert result["file5.txt"] is False
+        assert result["file6.txt"] is True
+
     def test_get_blob_metadata_success(self, blob_storage_service):
         """Test successful metadata retrieval."""
         mock_blob_client = Mock(spec=BlobClient)
@@ -298,6 +437,22 @@ class TestAzureBlobStorageService:
         assert result is False
         mock_blob_client.exists.assert_called_once()
 
+    def test_blob_exists_cached_until_delete(self, blob_storage_service):
+        """Test existence checks are cached and invalidated on deletion."""
+        mock_blob_client = Mock(spec=BlobClient)
+        mock_blob_client.exists.return_value = True
+        blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        assert blob_storage_service.blob_exists("test.txt") is True
+        assert blob_storage_service.blob_exists("test.txt") is True
+        mock_blob_client.exists.assert_called_once()
+        
+        blob_storage_service.delete_blob("test.txt")
+        mock_blob_client.exists.return_value = False
+        
+        assert blob_storage_service.blob_exists("test.txt") is False
+        assert mock_blob_client.exists.call_count == 2
+
     def test_blob_exists_azure_error(self, blob_storage_service):
         """Test blob existence check with Azure error."""
         mock_blob_client = Mock(spec=BlobClient)
@@ -340,6 +495,289 @@ class TestAzureBlobStorageService:
         with pytest.raises(ResourceNotFoundError):
             blob_storage_service.get_blob_properties("nonexistent.txt")
 
+    @patch('shared_code.azure_blob_storage.time.sleep')
+    def test_copy_blob_polls_until_success(self, mock_sleep, blob_storage_service):
+        """Test server-side copy polling with exponential backoff."""
+        mock_blob_client = Mock(spec=BlobClient)
+        mock_blob_client.url = "https://test.blob.core.windows.net/test-container/copy.txt"
+        mock_blob_client.start_copy_from_url.return_value = {"copy_id": "id-1", "copy_status": "pending"}
+        pending = Mock()
+        pending.copy.status = "pending"
+        done = Mock()
+        done.copy.status = "success"
+        mock_blob_client.get_blob_properties.side_effect = [pending, done]
+        blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        result = blob_storage_service.copy_blob("https://source/blob.txt", "copy.txt")
+        
+        assert result == {"copy_id": "id-1", "status": "success", "url": mock_blob_client.url}
+        mock_blob_client.start_copy_from_url.assert_called_once_with("https://source/blob.txt", requires_sync=False)
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 1.0]
+
+    def test_copy_blob_failed_status(self, blob_storage_service):
+        """Test server-side copy that the service reports as failed."""
+        mock_blob_client = Mock(spec=BlobClient)
+        mock_blob_client.start_copy_from_url.return_value = {"copy_id": "id-1", "copy_status": "failed"}
+        blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        with pytest.raises(AzureError):
+            blob_storage_service.copy_blob("https://source/blob.txt", "copy.txt")
+
+    def test_get_file_urls_with_account_key(self, blob_storage_service):
+        """Test SAS URLs signed locally with the account key."""
+        blob_storage_service.blob_service_client = Mock()
+        blob_storage_service.blob_service_client.credential.account_key = "dGVzdGtleQ=="
+        blob_storage_service.blob_service_client.account_name = "testaccount"
+        blob_storage_service.container_client.get_blob_client.side_effect = (
+            lambda name: Mock(url=f"https://testaccount.blob.core.windows.net/test-container/{name}")
+        )
+        
+        result = blob_storage_service.get_file_urls("test-container", ["a.pdf", "b.pdf"])
+        
+        assert set(result) == {"a.pdf", "b.pdf"}
+        assert result["a.pdf"].startswith("https://testaccount.blob.core.windows.net/test-container/a.pdf?")
+        assert "sig=" in result["a.pdf"] and "sp=r" in result["a.pdf"]
+        blob_storage_service.blob_service_client.get_user_delegation_key.assert_not_called()
+
+    def test_get_file_urls_reuses_user_delegation_key(self, blob_storage_service):
+        """Test that a single user delegation key signs every blob."""
+        blob_storage_service.blob_service_client = Mock()
+        blob_storage_service.blob_service_client.credential = object()
+        blob_storage_service.container_client.get_blob_client.return_value = Mock(url="https://test/blob")
+        
+        with patch('shared_code.azure_blob_storage.generate_blob_sas', return_value="sig=abc") as mock_sas:
+            result = blob_storage_service.get_file_urls("test-container", ["a.pdf", "b.pdf", "c.pdf"])
+        
+        assert result["c.pdf"] == "https://test/blob?sig=abc"
+        blob_storage_service.blob_service_client.get_user_delegation_key.assert_called_once()
+        udk = blob_storage_service.blob_service_client.get_user_delegation_key.return_value
+        assert all(call.kwargs["user_delegation_key"] is udk for call in mock_sas.call_args_list)
+        assert blob_storage_service.get_file_urls("test-container", []) == {}
+
+    def test_upload_files_batch(self, blob_storage_service):
+        """Test concurrent upload of several files with per-file failures."""
+        def upload_file(file_path, container_name, blob_name):
+            if blob_name == "b.txt":
+                raise AzureError("Upload failed")
+            return f"https://test/{blob_name}"
+        
+        files = [("/tmp/a.txt", "c", "a.txt"), ("/tmp/b.txt", "c", "b.txt"), ("/tmp/c.txt", "c", "c.txt")]
+        with patch.object(blob_storage_service, 'upload_file', side_effect=upload_file) as mock_upload:
+            result = blob_storage_service.upload_files_batch(files, max_concurrency=2)
+        
+        assert result == {"a.txt": "https://test/a.txt", "b.txt": None, "c.txt": "https://test/c.txt"}
+        assert mock_upload.call_count == 3
+
+    def test_download_files_batch(self, blob_storage_service):
+        """Test concurrent download of several blobs with per-blob failures."""
+        def download_file(container_name, blob_name, destination_path, max_concurrency):
+            if blob_name == "missing.txt":
+                raise ResourceNotFoundError("Blob not found")
+            return blob_name == "new.txt"
+        
+        files = [("c", "new.txt", "/tmp/new.txt"), ("c", "same.txt", "/tmp/same.txt"), ("c", "missing.txt", "/tmp/m.txt")]
+        with patch.object(blob_storage_service, 'download_file', side_effect=download_file):
+            result = blob_storage_service.download_files_batch(files)
+        
+        assert result == {"new.txt": True, "same.txt": True, "missing.txt": False}
+        assert blob_storage_service.upload_files_batch([]) == {}
+
+
+class TestAsyncAzureBlobStorageService:
+    """Test cases for AsyncAzureBlobStorageService class."""
+
+    @pytest.fixture
+    def mock_settings(self):
+        """Mock settings for testing."""
+        with patch('shared_code.azure_blob_storage.settings') as mock_settings:
+            mock_settings.azure_storage_connection_string = "test_connection_string"
+            mock_settings.blob_container_name = "test-container"
+            mock_settings.blob_account_name = "testaccount"
+            yield mock_settings
+
+    @pytest.fixture
+    def async_blob_storage_service(self, mock_settings):
+        """Create AsyncAzureBlobStorageService instance with mocked async clients."""
+        with patch('shared_code.azure_blob_storage.AsyncBlobServiceClient') as mock_client:
+            mock_client.from_connection_string.return_value.close = AsyncMock()
+            service = AsyncAzureBlobStorageService()
+            service.container_client = MagicMock()
+            return service
+
+    @pytest.mark.asyncio
+    async def test_download_file_writes_chunks(self, async_blob_storage_service):
+        """Test that download_file writes the blob chunk by chunk."""
+        async def chunks():
+            yield b"chunk-1"
+            yield b"chunk-2"
+        
+        mock_download_stream = MagicMock()
+        mock_download_stream.chunks.return_value = chunks()
+        mock_blob_client = MagicMock()
+        mock_blob_client.download_blob = AsyncMock(return_value=mock_download_stream)
+        async_blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        file_handle = mock_open()
+        with patch('builtins.open', file_handle), \
+             patch('os.makedirs'), \
+             patch('os.path.getsize', return_value=14):
+            result = await async_blob_storage_service.download_file(
+                "test-container", "test-blob.txt", "/tmp/local.txt"
+            )
+        
+        assert result is True
+        file_handle().write.assert_any_call(b"chunk-1")
+        file_handle().write.assert_any_call(b"chunk-2")
+
+    @pytest.mark.asyncio
+    async def test_download_file_not_modified(self, async_blob_storage_service):
+        """Test that a matching etag keeps the local copy."""
+        mock_blob_client = MagicMock()
+        mock_blob_client.download_blob = AsyncMock(side_effect=ResourceNotModifiedError("Not modified"))
+        async_blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        with patch('os.makedirs'):
+            result = await async_blob_storage_service.download_file(
+                "test-container", "test-blob.txt", "/tmp/local.txt", etag="0x1"
+            )
+        
+        assert result is False
+        assert mock_blob_client.download_blob.call_args.kwargs["etag"] == "0x1"
+
+    @pytest.mark.asyncio
+    async def test_upload_files_batch_bounded_by_semaphore(self, async_blob_storage_service):
+        """Test that batch uploads never exceed max_concurrency in flight."""
+        in_flight = 0
+        peak = 0
+        
+        async def upload_file(file_path, container_name, blob_name):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if blob_name == "bad.txt":
+                raise AzureError("Upload failed")
+            return f"https://test/{blob_name}"
+        
+        files = [(f"/tmp/{i}.txt", "test-container", f"{i}.txt") for i in range(5)]
+        files.append(("/tmp/bad.txt", "test-container", "bad.txt"))
+        with patch.object(async_blob_storage_service, 'upload_file', side_effect=upload_file):
+            result = await async_blob_storage_service.upload_files_batch(files, max_concurrency=2)
+        
+        assert peak <= 2
+        assert result["bad.txt"] is None
+        assert result["0.txt"] == "https://test/0.txt"
+        assert len(result) == 6
+
+    @pytest.mark.asyncio
+    async def test_download_files_batch(self, async_blob_storage_service):
+        """Test concurrent async download of several blobs with per-blob failures."""
+        async def download_file(container_name, blob_name, destination_path, max_concurrency):
+            if blob_name == "missing.txt":
+                raise ResourceNotFoundError("Blob not found")
+            return True
+        
+        with patch.object(async_blob_storage_service, 'download_file', side_effect=download_file):
+            result = await async_blob_storage_service.download_files_batch(
+                [("test-container", "a.txt", "/tmp/a.txt"), ("test-container", "missing.txt", "/tmp/m.txt")]
+            )
+        
+        assert result == {"a.txt": True, "missing.txt": False}
+
+    @pytest.mark.asyncio
+    async def test_delete_blob_success(self, async_blob_storage_service):
+        """Test successful async blob deletion."""
+        mock_blob_client = MagicMock()
+        mock_blob_client.delete_blob = AsyncMock()
+        async_blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        result = await async_blob_storage_service.delete_blob("test-blob.txt")
+        
+        assert result is True
+        mock_blob_client.delete_blob.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_blob_resource_not_found(self, async_blob_storage_service):
+        """Test async blob deletion with non-existent blob."""
+        mock_blob_client = MagicMock()
+        mock_blob_client.delete_blob = AsyncMock(side_effect=ResourceNotFoundError("Blob not found"))
+        async_blob_storage_service.container_client.get_blob_client.return_value = mock_blob_client
+        
+        with pytest.raises(ResourceNotFoundError):
+            await async_blob_storage_service.delete_blob("nonexistent.txt")
+
+    @pytest.mark.asyncio
+    async def test_iter_blobs_with_properties(self, async_blob_storage_service):
+        """Test listing blobs with properties fetched in concurrent batches."""
+        async def list_blobs(**kwargs):
+            for name in ["a.txt", "b.txt", "c.txt"]:
+                blob = Mock()
+                blob.name = name
+                yield blob
+        
+        def make_blob_client(name):
+            properties = Mock()
+            properties.size = 10
+            properties.content_settings.content_type = "text/plain"
+            properties.metadata = None
+            properties.lease = None
+            blob_client = MagicMock()
+            if name == "b.txt":
+                blob_client.get_blob_properties = AsyncMock(side_effect=ResourceNotFoundError("gone"))
+            else:
+                blob_client.get_blob_properties = AsyncMock(return_value=properties)
+            return blob_client
+        
+        async_blob_storage_service.container_client.list_blobs = list_blobs
+        async_blob_storage_service.container_client.get_blob_client.side_effect = make_blob_client
+        
+        results = [
+            blob async for blob in async_blob_storage_service.iter_blobs_with_properties(batch_size=2)
+        ]
+        
+        assert [blob["name"] for blob in results] == ["a.txt", "c.txt"]
+        assert results[0]["metadata"] == {}
+
+    @pytest.mark.asyncio
+    async def test_iter_blobs_with_properties_propagates_cancellation(self, async_blob_storage_service):
+        """Test that a cancelled properties request is not yielded as a blob."""
+        async def list_blobs(**kwargs):
+            blob = Mock()
+            blob.name = "a.txt"
+            yield blob
+        
+        blob_client = MagicMock()
+        blob_client.get_blob_properties = AsyncMock(side_effect=asyncio.CancelledError())
+        async_blob_storage_service.container_client.list_blobs = list_blobs
+        async_blob_storage_service.container_client.get_blob_client.return_value = blob_client
+        
+        with pytest.raises(asyncio.CancelledError):
+            async for _ in async_blob_storage_service.iter_blobs_with_properties():
+                pass
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_client(self, async_blob_storage_service):
+        """Test that leaving the async context closes the underlying client."""
+        async with async_blob_storage_service as service:
+            assert service is async_blob_storage_service
+        
+        async_blob_storage_service.blob_service_client.close.assert_awaited_once()
+
+    def test_shared_instance_per_event_loop(self, mock_settings):
+        """Test that the shared async service is recreated for a new event loop."""
+        from shared_code import azure_blob_storage
+        
+        with patch('shared_code.azure_blob_storage.AsyncBlobServiceClient'), \
+             patch.object(azure_blob_storage, '_async_blob_storage_service', None), \
+             patch.object(azure_blob_storage, '_async_blob_storage_loop', None):
+            async def get_twice():
+                first = await azure_blob_storage.get_async_blob_storage_service()
+                assert await azure_blob_storage.get_async_blob_storage_service() is first
+                return first
+            
+            assert asyncio.run(get_twice()) is not asyncio.run(get_twice())
+
 
 class TestAzureBlobStorageServiceGlobal:
     """Test cases for global AzureBlobStorageService instance."""
@@ -118,7 +118,9 @@ class TestBatchPushResults:
         main(mock_queue_message)
         
         # Assert
-        mock_blob_service.download_file.assert_called_once_with("test_document.pdf", "/tmp/test_file.pdf")
+        mock_blob_service.download_file.assert_called_once_with(
+            mock_blob_service.container_name, "test_document.pdf", "/tmp/test_file.pdf"
+        )
         mock_blob_service.get_blob_metadata.assert_called_once_with("test_document.pdf")
         mock_calculate_hash.assert_called_once()
         mock_generate_id.assert_called_once_with("test_document.pdf", "abc123hash")
@@ -0,0 +1,161 @@
+"""
+Tests unitarios para el CircuitBreaker y el decorador tracks_health.
+
+ESTE ARCHIVO CONTIENE TESTS UNITARIOS (100% MOCKEADOS)
+Estos tests validan que el estado de cada dependencia se comparte a través
+de IRedisService y que los health checks devuelven HealthStatus.
+"""
+
+import json
+from typing import Any, Dict, Optional
+import pytest
+from unittest.mock import Mock, patch
+
+from shared_code.circuit_breaker import (
+    CircuitBreaker,
+    tracks_health,
+    CIRCUIT_KEY_PREFIX,
+    CIRCUIT_STATE_TTL_SECONDS,
+)
+from shared_code.interfaces import HealthStatus, ICircuitBreaker, IRedisService
+
+
+class TestCircuitBreaker:
+    """Tests para el CircuitBreaker."""
+
+    @pytest.fixture
+    def redis_service(self) -> Mock:
+        """Servicio de Redis respaldado por un diccionario."""
+        store: Dict[str, Any] = {}
+
+        def fake_set(key: str, value: Any, expiration: Optional[int] = None) -> bool:
+            store[key] = value
+            return True
+
+        service = Mock(spec=IRedisService)
+        service.get.side_effect = store.get
+        service.set.side_effect = fake_set
+        service.store = store
+        return service
+
+    def test_circuit_breaker_implements_interface(self):
+        """Test que CircuitBreaker implementa ICircuitBreaker."""
+        assert isinstance(CircuitBreaker(), ICircuitBreaker)
+
+    def test_circuit_opens_after_threshold(self, redis_service: Mock):
+        """Test que el circuito se abre tras los fallos consecutivos configurados."""
+        breaker = CircuitBreaker(redis_service, failure_threshold=3, open_seconds=30)
+
+        for _ in range(2):
+            breaker.record("openai", success=False, latency_ms=100.0)
+        assert breaker.allow("openai") is True
+
+        breaker.record("openai", success=False, latency_ms=100.0)
+
+        assert breaker.allow("openai") is False
+        status = breaker.status("openai")
+        assert status.ok is False
+        assert status.consecutive_failures == 3
+        assert breaker.allow("redis") is True
+
+    def test_state_is_shared_through_redis(self, redis_service: Mock):
+        """Test que dos instancias (workers) comparten el estado."""
+        CircuitBreaker(redis_service, failure_threshold=1).record("vision", False, 50.0)
+
+        assert CircuitBreaker(redis_service).allow("vision") is False
+        stored = json.loads(redis_service.store[f"{CIRCUIT_KEY_PREFIX}vision"])
+        assert stored["consecutive_failures"] == 1
+        assert redis_service.set.call_args.kwargs["expiration"] == CIRCUIT_STATE_TTL_SECONDS
+
+    def test_half_open_after_cooldown(self, redis_service: Mock):
+        """Test que tras el enfriamiento se permite probar y un éxito cierra el circuito."""
+        breaker = CircuitBreaker(redis_service, failure_threshold=1, open_seconds=30)
+
+        with patch('shared_code.circuit_breaker.time.time', return_value=1000.0):
+            breaker.record("whatsapp", success=False, latency_ms=10.0)
+            assert breaker.allow("whatsapp") is False
+
+        with patch('shared_code.circuit_breaker.time.time', return_value=1031.0):
+            assert breaker.allow("whatsapp") is True
+            breaker.record("whatsapp", success=True, latency_ms=12.5)
+
+        status = breaker.status("whatsapp")
+        assert status.ok is True
+        assert status.consecutive_failures == 0
+        assert status.latency_ms == 12.5
+        assert status.last_success is not None
+
+    def test_redis_unavailable_keeps_circuit_closed(self, redis_service: Mock):
+        """Test que una caída de Redis no bloquea las dependencias."""
+        redis_service.get.side_effect = None
+        redis_service.get.return_value = None
+        breaker = CircuitBreaker(redis_service, failure_threshold=1)
+
+        breaker.record("openai", success=False, latency_ms=10.0)
+
+        assert breaker.allow("openai") is True
+
+    def test_in_memory_state_without_redis(self):
+        """Test que sin Redis el estado se mantiene en el proceso."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record("blob_storage", success=False, latency_ms=10.0)
+        breaker.record("blob_storage", success=False, latency_ms=10.0)
+
+        assert breaker.allow("blob_storage") is False
+
+    def test_invalid_threshold(self):
+        """Test que el umbral debe ser positivo."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+
+
+class TestTracksHealth:
+    """Tests para el decorador tracks_health."""
+
+    class _Service:
+        def __init__(self):
+            self.healthy = True
+
+        @tracks_health
+        def health_check(self) -> bool:
+            if self.healthy is None:
+                raise ConnectionError("caído")
+            return self.healthy
+
+    def test_returns_health_status(self):
+        """Test que el health check devuelve HealthStatus evaluable como bool."""
+        result = self._Service().health_check()
+
+        assert isinstance(result, HealthStatus)
+        assert result
+        assert result.ok is True
+        assert result.latency_ms >= 0
+        assert result.last_success is not None
+
+    def test_counts_failures_and_exceptions(self):
+        """Test que los fallos y las excepciones se acumulan hasta el siguiente éxito."""
+        service = self._Service()
+        first = service.health_check()
+
+        service.healthy = None
+        with pytest.raises(ConnectionError):
+            service.health_check()
+        service.healthy = False
+        failed = service.health_check()
+
+        assert not failed
+        assert failed.consecutive_failures == 2
+        assert failed.last_success == first.last_success
+
+        service.healthy = True
+        assert service.health_check().consecutive_failures == 0
+
+    def test_to_dict_is_serializable(self):
+        """Test que HealthStatus se serializa a JSON."""
+        status = self._Service().health_check()
+
+        data = json.loads(json.dumps(status.to_dict()))
+
+        assert data["ok"] is True
+        assert data["consecutive_failures"] == 0
@@ -6,13 +6,14 @@ Estos tests validan que el contenedor de dependencias funciona correctamente
 y que la inyección de dependencias se realiza de manera apropiada.
 """
 
+import time
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from typing import Dict, Any, Optional
 
 from shared_code.dependency_container import DependencyContainer
 from shared_code.interfaces import (
-    IWhatsAppService, IUserService, IOpenAIService, IVisionService,
+    ServiceType, IWhatsAppService, IUserService, IOpenAIService, IVisionService,
     IBlobStorageService, IRedisService, IErrorHandler, IMessageProcessor
 )
 from shared_code.whatsapp_service import WhatsAppService
@@ -100,6 +101,16 @@ class TestDependencyContainer:
         assert container.has_service('test_service') is True
         assert container.has_service('nonexistent_service') is False
     
+    def test_service_type_enum_matches_string_names(self, container: DependencyContainer):
+        """Test que ServiceType y el nombre en texto apuntan al mismo servicio."""
+        mock_service = Mock()
+        container.register_service(ServiceType.WHATSAPP, mock_service)
+        
+        assert container.get_service("whatsapp") is mock_service
+        assert container.get_service(ServiceType.WHATSAPP) is mock_service
+        assert container.has_service(ServiceType.MESSAGE_PROCESSOR)
+        assert container.get_registered_services()["whatsapp"] == "registered"
+    
     def test_register_service_twice(self, container: DependencyContainer):
         """Test registrar el mismo servicio dos veces."""
         test_service = Mock()
@@ -291,11 +302,91 @@ class TestDependencyContainerMessageProcessor:
         assert processor.vision_service is not None
         assert processor.blob_storage_service is not None
         assert processor.error_handler is not None
+    
+    def test_message_processor_cached_until_dependency_reregistered(self):
+        """Test el MessageProcessor se resuelve una vez y se reconstruye al re-registrar dependencias."""
+        container = DependencyContainer()
+        for service_type, interface in [
+            ('whatsapp', IWhatsAppService), ('user', IUserService), ('openai', IOpenAIService),
+            ('vision', IVisionService), ('blob_storage', IBlobStorageService), ('error_handler', IErrorHandler)
+        ]:
+            container.register_service(service_type, Mock(spec=interface))
+        
+        processor = container.get_service('message_processor')
+        assert container.get_service('message_processor') is processor
+        
+        new_whatsapp = Mock(spec=IWhatsAppService)
+        container.register_service('whatsapp', new_whatsapp)
+        rebuilt = container.get_service('message_processor')
+        
+        assert rebuilt is not processor
+        assert rebuilt.whatsapp_service is new_whatsapp
 
 
 
 
 
+class TestDependencyContainerHealthCheck:
+    """Tests para el health check del contenedor."""
+    
+    @pytest.fixture
+    def container(self) -> DependencyContainer:
+        """Crear contenedor con servicios mock saludables."""
+        container = DependencyContainer()
+        for service_type in ['whatsapp', 'user', 'openai', 'error_handler', 'vision', 'blob_storage']:
+            service = Mock()
+            service.health_check.return_value = True
+            container.register_service(service_type, service)
+        container.register_service('redis', None)
+        return container
+    
+    def test_health_check_runs_probes_concurrently(self, container: DependencyContainer):
+        """Test que los health checks se ejecutan en paralelo."""
+        def slow_probe():
+            time.sleep(0.3)
+            return True
+        for service_type in ['whatsapp', 'user', 'openai']:
+            container.get_service(service_type).health_check.side_effect = slow_probe
+        
+        start = time.perf_counter()
+        result = container.health_check()
+        elapsed = time.perf_counter() - start
+        
+        assert result["container_healthy"] is True
+        assert result["services"]["whatsapp"] is True
+        assert result["services"]["redis"] is None
+        assert elapsed < 0.8
+    
+    def test_health_check_failures(self, container: DependencyContainer):
+        """Test que solo los servicios principales afectan a la salud del contenedor."""
+        container.get_service('vision').health_check.side_effect = Exception("Vision down")
+        
+        result = container.health_check()
+        assert result["services"]["vision"] is False
+        assert result["container_healthy"] is True
+        
+        container.get_service('openai').health_check.side_effect = Exception("OpenAI down")
+        
+        result = container.health_check()
+        assert result["services"]["openai"] is False
+        assert result["container_healthy"] is False
+    
+    def test_health_check_timeout(self, container: DependencyContainer):
+        """Test que un health check colgado se marca como fallido sin bloquear."""
+        def slow_probe() -> bool:
+            time.sleep(0.5)
+            return True
+        
+        container.get_service('whatsapp').health_check.side_effect = slow_probe
+        
+        with patch('shared_code.dependency_container.HEALTH_CHECK_TIMEOUT_SECONDS', 0.1):
+            result = container.health_check()
+        
+        assert result["services"]["whatsapp"] is False
+        assert result["services"]["user"] is True
+        assert result["container_healthy"] is False
+
+
 class TestDependencyContainerErrorHandling:
     """Tests para el manejo de errores en el contenedor."""
     
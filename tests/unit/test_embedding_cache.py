@@ -0,0 +1,39 @@
+"""
+Unit tests for the in-process embedding cache.
+"""
+
+import numpy as np
+import pytest
+from shared_code.embedding_cache import LRUEmbeddingCache
+from shared_code.interfaces import IEmbeddingCache
+
+
+class TestLRUEmbeddingCache:
+    """Test cases for LRUEmbeddingCache."""
+
+    def test_implements_interface(self):
+        assert isinstance(LRUEmbeddingCache(), IEmbeddingCache)
+
+    def test_put_and_get_returns_read_only_float32(self):
+        cache = LRUEmbeddingCache()
+        cache.put_embedding("key", [0.1, 0.2])
+
+        result = cache.get_embedding("key")
+
+        assert result.dtype == np.float32
+        np.testing.assert_allclose(result, [0.1, 0.2], rtol=1e-6)
+        with pytest.raises(ValueError):
+            result[0] = 1.0
+        assert cache.get_embedding("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUEmbeddingCache(maxsize=2)
+        cache.put_embedding("a", [1.0])
+        cache.put_embedding("b", [2.0])
+        cache.get_embedding("a")
+
+        cache.put_embedding("c", [3.0])
+
+        assert cache.get_embedding("b") is None
+        assert cache.get_embedding("a") is not None
+        assert cache.get_embedding("c") is not None
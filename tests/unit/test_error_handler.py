@@ -11,7 +11,7 @@ import logging
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, Any, Optional
 
-from shared_code.error_handler import ErrorHandler
+from shared_code.error_handler import ErrorHandler, get_error_handler, _classify_message
 from shared_code.interfaces import IErrorHandler
 
 
@@ -29,6 +29,13 @@ class TestErrorHandler:
         assert isinstance(error_handler, ErrorHandler)
         assert isinstance(error_handler, IErrorHandler)
     
+    def test_get_error_handler_returns_singleton(self):
+        """Test que get_error_handler devuelve siempre la misma instancia."""
+        handler = get_error_handler()
+        
+        assert isinstance(handler, ErrorHandler)
+        assert get_error_handler() is handler
+    
     def test_create_error_response_basic(self, error_handler: ErrorHandler):
         """Test creación de respuesta de error básica."""
         # Act
@@ -65,6 +72,44 @@ class TestErrorHandler:
         assert result["error"]["message"] == "Error con detalles"
         assert result["error"]["details"] == details
 
+    def test_create_error_response_without_timestamp(self, error_handler: ErrorHandler):
+        """Test creación de respuesta de error sin timestamp."""
+        # Act
+        result = error_handler.create_error_response("Error", "TEST_ERROR", include_timestamp=False)
+        
+        # Assert
+        assert "timestamp" not in result["error"]
+
+    def test_template_responses_are_independent(self, error_handler: ErrorHandler):
+        """Test que las respuestas de las estrategias no comparten estado con la plantilla."""
+        # Act
+        first = error_handler.handle_error(Exception("Rate limit exceeded"), "test_context")
+        first["error"]["details"]["retry_after"] = 0
+        second = error_handler.handle_error(Exception("Rate limit exceeded"), "test_context")
+        
+        # Assert
+        assert second["error"]["code"] == "RATE_LIMIT"
+        assert second["error"]["details"] == {"retry_after": 60}
+        assert "timestamp" in second["error"]
+
+    def test_error_stats_count_by_type(self, error_handler: ErrorHandler):
+        """Test conteo de errores por tipo en las estadísticas."""
+        # Act
+        error_handler.handle_error(Exception("Rate limit exceeded"), "test_context")
+        error_handler.handle_error(Exception("Rate limit exceeded"), "test_context")
+        error_handler.handle_error(Exception("Connection timeout"), "test_context")
+        stats = error_handler.get_error_stats()
+        
+        # Assert
+        assert stats["error_counts"] == {"RATE_LIMIT": 2, "NETWORK_ERROR": 1}
+        assert stats["total_errors"] == 3
+        
+        with pytest.raises(TypeError):
+            stats["error_counts"]["RATE_LIMIT"] = 0
+        
+        error_handler.reset_error_stats()
+        assert error_handler.get_error_stats()["total_errors"] == 0
+
 
 class TestErrorHandlerLogging:
     """Tests para el logging de errores."""
@@ -85,7 +130,7 @@ class TestErrorHandlerLogging:
         
         # Assert
         mock_logger.error.assert_called_once()
-        call_args = mock_logger.error.call_args[0][0]
+        call_args = mock_logger.error.call_args[0][0] % mock_logger.error.call_args[0][1:]
         assert "test_context" in call_args
         assert "ValueError" in call_args
         assert "Error de prueba" in call_args
@@ -101,11 +146,26 @@ class TestErrorHandlerLogging:
         
         # Assert
         mock_logger.error.assert_called_once()
-        call_args = mock_logger.error.call_args[0][0]
+        call_args = mock_logger.error.call_args[0][0] % mock_logger.error.call_args[0][1:]
         assert "runtime_context" in call_args
         assert "RuntimeError" in call_args
         assert "Error de runtime" in call_args
 
+    @patch('shared_code.error_handler.traceback')
+    @patch('shared_code.error_handler.logger')
+    def test_log_error_skips_stack_trace_without_debug(self, mock_logger, mock_traceback, error_handler: ErrorHandler):
+        """Test que el stack trace no se calcula si DEBUG está deshabilitado."""
+        # Arrange
+        mock_logger.isEnabledFor.return_value = False
+        
+        # Act
+        error_handler.log_error(ValueError("Error de prueba"), "test_context")
+        
+        # Assert
+        mock_traceback.format_exc.assert_not_called()
+        mock_logger.debug.assert_not_called()
+        mock_logger.error.assert_called_once()
+
 
 class TestErrorHandlerIntegration:
     """Tests de integración del ErrorHandler."""
@@ -209,6 +269,43 @@ class TestErrorHandlerErrorClassification:
         
         # Assert
         assert result["error"]["code"] == "NETWORK_ERROR"
+
+    def test_classification_respects_priority(self, error_handler: ErrorHandler):
+        """Test que el tipo de mayor prioridad gana aunque aparezca después en el mensaje."""
+        # Act & Assert
+        assert error_handler._classify_error(Exception("Redis connection timeout")) == "NETWORK_ERROR"
+        assert error_handler._classify_error(Exception("Invalid OpenAI key")) == "VALIDATION_ERROR"
+        assert error_handler._classify_error(Exception("GPT\nrate limit")) == "RATE_LIMIT"
+        assert error_handler._classify_error(Exception("boom")) == "UNKNOWN_ERROR"
+
+    def test_classification_cached_by_informative_type(self, error_handler: ErrorHandler):
+        """Test que los tipos con nombre informativo se clasifican una sola vez."""
+        # Arrange
+        class ConnectTimeout(Exception):
+            pass
+        
+        # Act & Assert
+        assert error_handler._classify_error(ConnectTimeout("rate limit")) == "NETWORK_ERROR"
+        assert error_handler._type_cache[ConnectTimeout] == "NETWORK_ERROR"
+        assert error_handler._classify_error(ConnectTimeout("")) == "NETWORK_ERROR"
+        
+        # Los tipos genéricos siguen dependiendo del mensaje
+        assert error_handler._classify_error(Exception("Rate limit exceeded")) == "RATE_LIMIT"
+        assert error_handler._classify_error(Exception("Redis down")) == "REDIS_ERROR"
+        assert error_handler._type_cache[Exception] is None
+
+    def test_repeated_message_classified_once(self, error_handler: ErrorHandler):
+        """Test que los mensajes repetidos reutilizan la clasificación memoizada."""
+        # Arrange
+        _classify_message.cache_clear()
+        
+        # Act
+        first = error_handler.handle_error(Exception("Redis unavailable"), "test_context")
+        second = error_handler.handle_error(Exception("Redis unavailable"), "test_context")
+        
+        # Assert
+        assert first["error"]["code"] == second["error"]["code"] == "REDIS_ERROR"
+        assert _classify_message.cache_info().hits == 1
     
     def test_openai_error_classification(self, error_handler: ErrorHandler):
         """Test clasificación de error de OpenAI."""
@@ -0,0 +1,50 @@
+"""
+Unit tests for the Event Grid queue handler Azure Function.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, patch
+import azure.functions as func
+
+from event_grid_queue_handler.event_grid_queue_handler import main
+
+
+def _queue_message(event: dict) -> func.QueueMessage:
+    return func.QueueMessage(body=json.dumps(event).encode("utf-8"))
+
+
+class TestEventGridQueueHandler:
+    """Test cases for event_grid_queue_handler."""
+
+    @pytest.fixture
+    def event(self):
+        return {
+            "id": "event-1",
+            "topic": "/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Communication/communicationServices/acs",
+            "subject": "advancedMessage/sender/+1234567890",
+            "eventType": "Microsoft.Communication.AdvancedMessageReceived",
+            "eventTime": "2024-01-01T12:00:00Z",
+            "dataVersion": "1.0",
+            "data": {"from": "+1234567890", "content": "Hola"}
+        }
+
+    def test_dispatches_event_to_bot(self, event):
+        """Test the queued event is rebuilt and passed to the bot."""
+        with patch('event_grid_queue_handler.event_grid_queue_handler.WhatsAppBot') as mock_bot_class:
+            mock_bot_class.return_value.process_event_grid_event.return_value = func.HttpResponse("ok", status_code=200)
+            
+            main(_queue_message(event))
+            
+            dispatched = mock_bot_class.return_value.process_event_grid_event.call_args.args[0]
+            assert dispatched.id == "event-1"
+            assert dispatched.event_type == "Microsoft.Communication.AdvancedMessageReceived"
+            assert dispatched.get_json() == event["data"]
+
+    def test_server_error_raises_for_retry(self, event):
+        """Test a 5xx bot response raises so the host retries the message."""
+        with patch('event_grid_queue_handler.event_grid_queue_handler.WhatsAppBot') as mock_bot_class:
+            mock_bot_class.return_value.process_event_grid_event.return_value = func.HttpResponse("error", status_code=500)
+            
+            with pytest.raises(RuntimeError):
+                main(_queue_message(event))
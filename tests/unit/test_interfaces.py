@@ -13,7 +13,8 @@ from unittest.mock import Mock, MagicMock, patch
 
 from shared_code.interfaces import (
     IWhatsAppService, IUserService, IOpenAIService, IVisionService,
-    IBlobStorageService, IRedisService, IErrorHandler, IMessageProcessor
+    IBlobStorageService, IRedisService, IErrorHandler, IMessageProcessor,
+    GeneratedResponse
 )
 from shared_code.whatsapp_service import WhatsAppService
 from shared_code.user_service import UserService
@@ -364,6 +365,25 @@ class TestIMessageProcessor:
             assert callable(getattr(processor, method_name)), f"El método {method_name} no es callable"
 
 
+class TestGeneratedResponse:
+    """Tests para los metadatos de caché de GeneratedResponse."""
+    
+    def test_cache_key_depends_on_message_and_documents(self):
+        """Verificar que la clave cambia con el mensaje o los documentos usados."""
+        info = [{"document_id": "doc1"}, {"document_id": "doc2"}]
+        key = GeneratedResponse.build_cache_key("Horarios", info)
+        
+        assert key == GeneratedResponse.build_cache_key("Horarios", [dict(d) for d in info])
+        assert key != GeneratedResponse.build_cache_key("Horarios", info[:1])
+        assert key != GeneratedResponse.build_cache_key("Eventos", info)
+    
+    def test_cacheable_requires_key_and_ttl(self):
+        """Verificar que solo las respuestas con clave y TTL son cacheables."""
+        assert GeneratedResponse("Hola", cache_key="k", ttl_seconds=60, deterministic=True).cacheable
+        assert not GeneratedResponse("Hola").cacheable
+        assert not GeneratedResponse("Hola", cache_key="k").cacheable
+
+
 class TestInterfaceCompatibility:
     """Tests para verificar compatibilidad entre interfaces."""
     
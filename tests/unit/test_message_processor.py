@@ -6,13 +6,17 @@ Estos tests demuestran la facilidad de testing con la nueva arquitectura
 que utiliza inyección de dependencias e interfaces.
 """
 
+import asyncio
+import json
+import subprocess
+import sys
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 from typing import Dict, Any
 from datetime import datetime, timezone
 
-from shared_code.message_processor import MessageProcessor
-from shared_code.interfaces import IWhatsAppService, IUserService, IOpenAIService, IVisionService, IBlobStorageService, IErrorHandler
+from shared_code.message_processor import MessageProcessor, WHATSAPP_TEXT_MAX_CHARS, _split_ready_segment, _split_remaining_segments
+from shared_code.interfaces import IWhatsAppService, IUserService, IOpenAIService, IVisionService, IBlobStorageService, IErrorHandler, ISemanticCache, IMessageSender
 from shared_code.user_service import User, UserSession
 
 
@@ -119,6 +123,7 @@ class TestMessageProcessor:
         # Verificar que se llamaron los servicios
         message_processor.openai_service.generate_response.assert_called_once()  # type: ignore
         message_processor.whatsapp_service.send_text_message.assert_called_once()  # type: ignore
+        message_processor.flush_session_updates(timeout=5)
         message_processor.user_service.update_session.assert_called_once()  # type: ignore
     
     def test_process_text_message_empty_text(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
@@ -138,6 +143,376 @@ class TestMessageProcessor:
         assert "error" in result
         assert result["error"]["code"] == "TEST_ERROR"
     
+    def test_process_text_messages_batch(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test procesamiento de un lote de mensajes conservando el orden."""
+        # Arrange
+        other_user = User(phone_number="+1987654321", name="Otro Usuario", created_at=datetime.now(timezone.utc))
+        other_session = UserSession(session_id="other_session", user_phone="+1987654321", created_at=datetime.now(timezone.utc))
+        messages = [
+            {"text": {"body": "Primero"}},
+            {"text": {"body": ""}},
+            {"text": {"body": "Hola"}},
+            {"text": {"body": "Segundo"}}
+        ]
+        message_processor.openai_service.generate_response.side_effect = (  # type: ignore
+            lambda conversation: f"Respuesta a {conversation[-1]['content']}"
+        )
+        
+        # Act
+        results = message_processor.process_text_messages_batch(
+            messages,
+            [sample_user, sample_user, other_user, sample_user],
+            [sample_session, sample_session, other_session, sample_session]
+        )
+        
+        # Assert
+        assert [result.get("response") for result in results] == [
+            "Respuesta a Primero", None, "Respuesta a Hola", "Respuesta a Segundo"
+        ]
+        assert results[1]["success"] is False
+        assert [turn["user"] for turn in sample_session.context["conversation"]] == ["Primero", "Segundo"]
+        assert message_processor.whatsapp_service.send_text_message.call_count == 3  # type: ignore
+    
+    def test_process_text_message_semantic_cache_hit(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que una respuesta cacheada del mismo usuario evita llamar a OpenAI."""
+        # Arrange
+        cache = Mock(spec=ISemanticCache)
+        cache.lookup.return_value = "Respuesta cacheada"
+        message_processor.semantic_cache = cache
+        message_processor.openai_service.generate_embedding.return_value = [0.1, 0.2]  # type: ignore
+        
+        # Act
+        result = message_processor.process_text_message({"text": {"body": "Hola"}}, sample_user, sample_session)
+        
+        # Assert
+        assert result["response"] == "Respuesta cacheada"
+        assert cache.lookup.call_args.kwargs["namespace"] == sample_user.phone_number
+        message_processor.openai_service.generate_response.assert_not_called()  # type: ignore
+        cache.store.assert_not_called()
+    
+    def test_process_text_message_semantic_cache_miss_stores(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que una respuesta generada se guarda en la caché del usuario."""
+        # Arrange
+        cache = Mock(spec=ISemanticCache)
+        cache.lookup.return_value = None
+        message_processor.semantic_cache = cache
+        message_processor.openai_service.generate_embedding.return_value = [0.1, 0.2]  # type: ignore
+        
+        # Act
+        result = message_processor.process_text_message({"text": {"body": "Hola"}}, sample_user, sample_session)
+        
+        # Assert
+        assert result["response"] == "Respuesta generada por IA"
+        cache.store.assert_called_once()
+        assert cache.store.call_args.args == ([0.1, 0.2], "Hola", "Respuesta generada por IA", 3600)
+        assert cache.store.call_args.kwargs["namespace"] == sample_user.phone_number
+        # Sin turno anterior el contexto es un vector nulo
+        assert not cache.store.call_args.kwargs["context_embedding"].any()
+    
+    def test_process_text_message_semantic_cache_uses_previous_turn(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que la búsqueda en caché incluye el embedding del turno anterior."""
+        # Arrange
+        cache = Mock(spec=ISemanticCache)
+        cache.lookup.return_value = None
+        message_processor.semantic_cache = cache
+        sample_session.context = {"conversation": [{"user": "Quiero una camiseta", "bot": "¿De qué color?"}]}
+        embeddings = {"cámbialo a rojo": [0.1, 0.2], "Quiero una camiseta": [0.3, 0.4]}
+        message_processor.openai_service.generate_embedding.side_effect = embeddings.get  # type: ignore
+        
+        # Act
+        message_processor.process_text_message({"text": {"body": "cámbialo a rojo"}}, sample_user, sample_session)
+        
+        # Assert
+        context = cache.lookup.call_args.kwargs["context_embedding"]
+        assert context.tolist() == pytest.approx([0.3, 0.4])
+    
+    def test_process_text_message_exact_cache_skips_embedding(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que una repetición literal se responde sin embeddings ni OpenAI."""
+        # Arrange
+        cache = Mock(spec=ISemanticCache)
+        cache.lookup.return_value = None
+        message_processor.semantic_cache = cache
+        message_processor.openai_service.generate_embedding.return_value = [0.1, 0.2]  # type: ignore
+        other_session = UserSession(
+            session_id="other_session",
+            user_phone=sample_user.phone_number,
+            created_at=datetime.now(timezone.utc)
+        )
+        message_processor.process_text_message({"text": {"body": "Gracias"}}, sample_user, sample_session)
+        message_processor.openai_service.reset_mock()  # type: ignore
+        cache.reset_mock()
+        
+        # Act
+        result = message_processor.process_text_message({"text": {"body": "  gracias "}}, sample_user, other_session)
+        
+        # Assert
+        assert result["response"] == "Respuesta generada por IA"
+        message_processor.openai_service.generate_embedding.assert_not_called()  # type: ignore
+        message_processor.openai_service.generate_response.assert_not_called()  # type: ignore
+        cache.lookup.assert_not_called()
+    
+    def test_process_text_message_exact_cache_depends_on_previous_turn(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que la caché exacta no reutiliza respuestas de otro contexto ni de otro usuario."""
+        # Arrange
+        message_processor.process_text_message({"text": {"body": "Sí"}}, sample_user, sample_session)
+        other_user = User(phone_number="+1999999999", name="Otro", created_at=datetime.now(timezone.utc))
+        
+        # Act
+        message_processor.process_text_message({"text": {"body": "Sí"}}, sample_user, sample_session)
+        message_processor.process_text_message({"text": {"body": "Sí"}}, other_user, sample_session)
+        
+        # Assert
+        assert message_processor.openai_service.generate_response.call_count == 3  # type: ignore
+    
+    def test_process_text_message_no_cache_bypasses_cache(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que no_cache omite la caché semántica."""
+        # Arrange
+        cache = Mock(spec=ISemanticCache)
+        message_processor.semantic_cache = cache
+        
+        # Act
+        result = message_processor.process_text_message(
+            {"text": {"body": "Hola"}, "no_cache": True}, sample_user, sample_session
+        )
+        
+        # Assert
+        assert result["response"] == "Respuesta generada por IA"
+        cache.lookup.assert_not_called()
+        cache.store.assert_not_called()
+        message_processor.openai_service.generate_embedding.assert_not_called()  # type: ignore
+    
+    @pytest.mark.asyncio
+    async def test_process_text_message_async(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test procesamiento asíncrono de un mensaje de texto."""
+        # Arrange
+        message_processor.openai_service.generate_response_async.return_value = "Respuesta asíncrona"  # type: ignore
+        message_processor.whatsapp_service.send_text_message_async.return_value = {"success": True, "message_id": "async_id"}  # type: ignore
+        
+        # Act
+        result = await message_processor.process_text_message_async({"text": {"body": "Hola"}}, sample_user, sample_session)
+        
+        # Assert
+        assert result["success"] is True
+        assert result["response"] == "Respuesta asíncrona"
+        assert result["message_id"] == "async_id"
+        message_processor.openai_service.generate_response.assert_not_called()  # type: ignore
+        message_processor.whatsapp_service.send_text_message.assert_not_called()  # type: ignore
+        assert sample_session.context["conversation"][-1]["bot"] == "Respuesta asíncrona"
+    
+    @pytest.mark.asyncio
+    async def test_process_text_message_async_enqueues_reply(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que con sender la respuesta se encola en lugar de enviarse."""
+        # Arrange
+        delivery = asyncio.get_running_loop().create_future()
+        message_processor.sender = Mock(spec=IMessageSender)
+        message_processor.sender.enqueue.return_value = delivery  # type: ignore
+        message_processor.openai_service.generate_response_async.return_value = "Respuesta encolada"  # type: ignore
+        
+        # Act
+        result = await message_processor.process_text_message_async({"text": {"body": "Hola"}}, sample_user, sample_session)
+        
+        # Assert
+        assert result["success"] is True
+        assert result["delivery"] is delivery
+        message_processor.sender.enqueue.assert_awaited_once_with(sample_user.phone_number, "Respuesta encolada")  # type: ignore
+        message_processor.whatsapp_service.send_text_message_async.assert_not_called()  # type: ignore
+    
+    @pytest.mark.asyncio
+    async def test_stream_text_message_async_sends_segments(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que la respuesta en streaming se envía por frases y en orden."""
+        # Arrange
+        chunks = ["Primera frase ", "completa. Segunda ", "frase. Fin", " del texto"]
+        sent = []
+        
+        async def stream(conversation):
+            for chunk in chunks:
+                await asyncio.sleep(0)
+                yield chunk
+        
+        async def send(message, recipient_id=None, preview_url=None):
+            await asyncio.sleep(0.01)
+            sent.append(message)
+            return {"messages": [{"id": f"wamid.{len(sent)}"}]}
+        
+        message_processor.openai_service.generate_chat_completion_stream.side_effect = stream  # type: ignore
+        message_processor.whatsapp_service.send_text_message_async.side_effect = send  # type: ignore
+        
+        # Act
+        with patch("shared_code.message_processor.STREAM_SEGMENT_MIN_CHARS", 20):
+            result = await message_processor.stream_text_message_async(
+                {"id": "wamid.in", "text": {"body": "Hola"}}, sample_user, sample_session
+            )
+        
+        # Assert
+        assert sent == ["Primera frase completa.", "Segunda frase.", "Fin del texto"]
+        assert result["success"] is True
+        assert result["segments"] == 3
+        assert result["message_id"] == "wamid.1"
+        assert result["response"] == "".join(chunks)
+        message_processor.whatsapp_service.send_typing_indicator_async.assert_awaited_once_with("wamid.in")  # type: ignore
+        message_processor.openai_service.generate_response_async.assert_not_called()  # type: ignore
+        assert sample_session.context["conversation"][-1]["bot"] == "".join(chunks)
+    
+    @pytest.mark.asyncio
+    async def test_stream_text_message_async_ignores_typing_errors(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que un fallo del indicador de escritura no impide responder."""
+        # Arrange
+        async def stream(conversation):
+            yield "Respuesta corta"
+        
+        message_processor.whatsapp_service.send_typing_indicator_async.side_effect = RuntimeError("Graph API caída")  # type: ignore
+        message_processor.openai_service.generate_chat_completion_stream.side_effect = stream  # type: ignore
+        message_processor.whatsapp_service.send_text_message_async.return_value = {"messages": [{"id": "wamid.ok"}]}  # type: ignore
+        
+        # Act
+        result = await message_processor.stream_text_message_async(
+            {"id": "wamid.in", "text": {"body": "Hola"}}, sample_user, sample_session
+        )
+        
+        # Assert
+        assert result["success"] is True
+        assert result["segments"] == 1
+        message_processor.whatsapp_service.send_text_message_async.assert_awaited_once_with(  # type: ignore
+            "Respuesta corta", recipient_id=sample_user.phone_number
+        )
+    
+    def test_split_ready_segment_forces_cut_at_whatsapp_limit(self):
+        """Test que un texto sin fin de frase se corta antes del límite de WhatsApp."""
+        # Arrange
+        buffer = "palabra " * 600
+        
+        # Act
+        segment, rest = _split_ready_segment(buffer)
+        
+        # Assert
+        assert 0 < len(segment) <= WHATSAPP_TEXT_MAX_CHARS
+        assert segment + " " + rest == buffer
+        assert _split_ready_segment("Corta. Frase") == ("", "Corta. Frase")
+    
+    def test_split_remaining_segments_fit_whatsapp_limit(self):
+        """Test que el resto final de una respuesta larga se envía en partes válidas."""
+        # Arrange
+        buffer = "palabra " * 1200
+        
+        # Act
+        segments = _split_remaining_segments(buffer)
+        
+        # Assert
+        assert len(segments) == 3
+        assert all(0 < len(segment) <= WHATSAPP_TEXT_MAX_CHARS for segment in segments)
+        assert " ".join(segments) == buffer.strip()
+        assert _split_remaining_segments("  Fin  ") == ["Fin"]
+        assert _split_remaining_segments("   ") == []
+    
+    @pytest.mark.asyncio
+    async def test_process_text_messages_async_bounded_concurrency(self, message_processor: MessageProcessor, sample_session: UserSession):
+        """Test que el lote asíncrono respeta el límite de concurrencia y el orden."""
+        # Arrange
+        in_flight = 0
+        peak = 0
+        
+        async def generate(conversation):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"Respuesta a {conversation[-1]['content']}"
+        
+        message_processor.openai_service.generate_response_async.side_effect = generate  # type: ignore
+        message_processor.whatsapp_service.send_text_message_async.return_value = {"success": True}  # type: ignore
+        users = [
+            User(phone_number=f"+1000000000{index}", name="Usuario", created_at=datetime.now(timezone.utc))
+            for index in range(5)
+        ]
+        sessions = [
+            UserSession(session_id=f"s{index}", user_phone=user.phone_number, created_at=datetime.now(timezone.utc))
+            for index, user in enumerate(users)
+        ]
+        messages = [{"text": {"body": f"Mensaje {index}"}} for index in range(5)]
+        
+        # Act
+        results = await message_processor.process_text_messages_async(messages, users, sessions, max_concurrency=2)
+        
+        # Assert
+        assert [result["response"] for result in results] == [f"Respuesta a Mensaje {index}" for index in range(5)]
+        assert peak == 2
+    
+    def test_system_message_is_shared(self, message_processor: MessageProcessor):
+        """Test que el mensaje de sistema se reutiliza entre conversaciones."""
+        first = message_processor._build_text_conversation("Hola")
+        second = message_processor._build_text_conversation("Adiós")
+        
+        assert first[0] is second[0]
+        assert first[0]["content"] == message_processor._get_system_context()
+        assert second[1] == {"role": "user", "content": "Adiós"}
+    
+    def test_relevant_info_goes_after_static_prefix(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que la información relevante va en el mensaje del usuario y no en el de sistema."""
+        # Arrange
+        message_processor._search_relevant_info = Mock(return_value=[  # type: ignore
+            {"text": "El culto es el domingo a las 10"}, {"content": ""}
+        ])
+        
+        # Act
+        message_processor.process_text_message({"text": {"body": "¿Cuándo es el culto?"}}, sample_user, sample_session)
+        
+        # Assert
+        system, user_turn = message_processor.openai_service.generate_response.call_args.args[0]  # type: ignore
+        assert system is message_processor._build_text_conversation("")[0]
+        assert user_turn["content"] == (
+            "¿Cuándo es el culto?\n\nInformación relevante:\n- El culto es el domingo a las 10"
+        )
+    
+    def test_session_conversation_is_bounded(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que la conversación se acota y se guarda como lista serializable."""
+        # Arrange
+        sample_session.context = {"conversation": [{"user": "Anterior", "bot": "Respuesta"}]}
+        
+        # Act
+        for index in range(12):
+            message_processor.process_text_message({"text": {"body": f"Mensaje {index}"}}, sample_user, sample_session)
+        message_processor.flush_session_updates(timeout=5)
+        
+        # Assert
+        conversation = sample_session.context["conversation"]
+        assert len(conversation) == 10
+        assert conversation[0]["user"] == "Mensaje 2"
+        saved = message_processor.user_service.update_session.call_args.args[0]  # type: ignore
+        assert isinstance(saved.context["conversation"], list)
+        assert saved.context["conversation"][-1]["user"] == "Mensaje 11"
+        assert '"Mensaje 11"' in json.dumps(sample_session.to_dict())
+    
+    def test_canned_response_send_error(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que un fallo al enviar una respuesta fija se delega con su contexto."""
+        # Arrange
+        message_processor.whatsapp_service.send_text_message.side_effect = ConnectionError("caído")  # type: ignore
+        message_processor.error_handler.handle_error.return_value = {"success": False}  # type: ignore
+        
+        # Act
+        result = message_processor.process_unsupported_message({"type": "sticker"}, sample_user, sample_session)
+        
+        # Assert
+        assert result == {"success": False}
+        assert message_processor.error_handler.handle_error.call_args.args[1] == "process_unsupported_message"  # type: ignore
+    
+    def test_session_updates_are_coalesced(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
+        """Test que las actualizaciones seguidas de una sesión se guardan en una sola escritura."""
+        # Act
+        message_processor.process_text_message({"text": {"body": "Primero"}}, sample_user, sample_session)
+        message_processor.process_text_message({"text": {"body": "Segundo"}}, sample_user, sample_session)
+        message_processor.flush_session_updates(timeout=5)
+        
+        # Assert
+        message_processor.user_service.update_session.assert_called_once()  # type: ignore
+        saved = message_processor.user_service.update_session.call_args.args[0]  # type: ignore
+        assert [turn["user"] for turn in saved.context["conversation"]] == ["Primero", "Segundo"]
+    
+    def test_process_text_messages_batch_length_mismatch(self, message_processor: MessageProcessor, sample_user: User):
+        """Test que las listas del lote deben tener la misma longitud."""
+        with pytest.raises(ValueError):
+            message_processor.process_text_messages_batch([{"text": {"body": "Hola"}}], [sample_user], [])
+    
     def test_process_media_message_image_success(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession):
         """Test procesamiento exitoso de mensaje de imagen."""
         # Arrange
@@ -187,6 +562,20 @@ class TestMessageProcessor:
         message_processor.whatsapp_service.send_text_message.assert_called_once()  # type: ignore
 
 
+    @pytest.mark.parametrize("media_key, message_type", [
+        ("audio", "audio"),
+        ("video", "unsupported_media"),
+    ])
+    def test_process_media_message_dispatch(self, message_processor: MessageProcessor, sample_user: User, sample_session: UserSession, media_key: str, message_type: str):
+        """Test que cada tipo de medio llega a su manejador."""
+        message = {media_key: {"id": "media_123", "mime_type": "application/octet-stream"}}
+        
+        result = message_processor.process_media_message(message, sample_user, sample_session)
+        
+        assert result["message_type"] == message_type
+        message_processor.whatsapp_service.send_text_message.assert_called_once()  # type: ignore
+
+
 class TestMessageProcessorErrorHandling:
     """Tests para el manejo de errores en MessageProcessor."""
     
@@ -357,4 +746,16 @@ class TestMessageProcessorValidation:
         
         # Assert
         assert result["success"] is True
-        assert result["message_type"] == "unsupported_media" 
\ No newline at end of file
+        assert result["message_type"] == "unsupported_media" 
+
+
+def test_import_does_not_load_heavy_modules():
+    """Test que importar el procesador no carga user_service, numpy ni el SDK de Functions."""
+    code = (
+        "import sys, shared_code.message_processor; "
+        "print(sorted(m for m in ('shared_code.user_service', 'numpy', 'azure.functions') if m in sys.modules))"
+    )
+    
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    
+    assert output.strip() == "[]"
@@ -0,0 +1,75 @@
+"""
+Tests unitarios para los modelos tipados.
+
+ESTE ARCHIVO CONTIENE TESTS UNITARIOS (100% MOCKEADOS)
+Estos tests validan que los modelos son inmutables, usan __slots__ y
+mantienen el acceso estilo diccionario para los llamadores antiguos.
+"""
+
+import dataclasses
+import orjson
+import pytest
+
+from shared_code.models import SearchHit, SendResult
+
+
+class TestSearchHit:
+    """Tests para SearchHit."""
+
+    @pytest.fixture
+    def hit(self) -> SearchHit:
+        """Crear un resultado de búsqueda con un campo adicional."""
+        return SearchHit(document_id="doc1", score=0.91, text="Culto el domingo", extra={"category": "culto"})
+
+    def test_slots_and_frozen(self, hit: SearchHit):
+        """Test que el modelo no tiene __dict__ y no se puede modificar."""
+        assert not hasattr(hit, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            hit.score = 0.5  # type: ignore[misc]
+
+    def test_mapping_compat(self, hit: SearchHit):
+        """Test del acceso estilo diccionario, incluidos los campos extra."""
+        assert hit["document_id"] == "doc1"
+        assert hit["category"] == "culto"
+        assert hit.get("missing", "default") == "default"
+        assert "text" in hit
+        assert "missing" not in hit
+        with pytest.raises(KeyError):
+            hit["missing"]
+
+    def test_to_dict_and_from_dict_roundtrip(self, hit: SearchHit):
+        """Test de la conversión desde y hacia diccionario."""
+        data = hit.to_dict()
+
+        assert data["category"] == "culto"
+        assert dict(hit) == data
+        assert SearchHit.from_dict(data) == hit
+
+    def test_orjson_serialization(self, hit: SearchHit):
+        """Test que orjson serializa el modelo de forma nativa."""
+        data = orjson.loads(orjson.dumps(hit))
+
+        assert data["document_id"] == "doc1"
+        assert data["extra"] == {"category": "culto"}
+
+
+class TestSendResult:
+    """Tests para SendResult."""
+
+    @pytest.mark.parametrize("response, expected", [
+        ({"messages": [{"id": "wamid.1"}]}, SendResult(True, "wamid.1")),
+        ({"success": True, "message_id": "test_id"}, SendResult(True, "test_id")),
+        ({"success": False, "error": {"code": "SEND_FAILED"}}, SendResult(False, None)),
+        (True, SendResult(True, None)),
+        (None, SendResult(False, None)),
+    ])
+    def test_from_response(self, response, expected: SendResult):
+        """Test que se normalizan las distintas formas de respuesta de un envío."""
+        assert SendResult.from_response(response) == expected
+
+    def test_from_response_keeps_instances(self):
+        """Test que un SendResult se devuelve tal cual."""
+        result = SendResult(message_id="wamid.1")
+
+        assert SendResult.from_response(result) is result
+        assert not hasattr(result, "__dict__")
@@ -5,10 +5,13 @@ This module contains comprehensive tests for the OpenAIService class
 with mocked AzureOpenAI client and full coverage of all methods.
 """
 
+import asyncio
+import numpy as np
 import pytest
-from unittest.mock import patch, Mock, MagicMock
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
 from openai import BadRequestError, AuthenticationError, RateLimitError
 from shared_code.openai_service import OpenAIService
+from shared_code.interfaces import CachePolicy, CachedAnswer
 
 class TestOpenAIService:
     """Test cases for OpenAIService class."""
@@ -141,4 +144,232 @@ class TestOpenAIService:
     def test_get_chat_history_summary_empty(self, openai_service):
         openai_service.get_chat_history_summary.return_value = ""
         result = openai_service.get_chat_history_summary([])
-        assert result == "" 
\ No newline at end of file
+        assert result == ""
+
+
+class TestOpenAIServiceCompletionCache:
+    """Test cases for chat completion caching."""
+
+    @pytest.fixture
+    def cache_service(self):
+        store = {}
+        cache = Mock()
+        cache.get.side_effect = store.get
+        cache.set.side_effect = lambda key, value, expiration=None: store.__setitem__(key, value) or True
+        return cache
+
+    @pytest.fixture
+    def service_factory(self):
+        with patch('shared_code.openai_service.settings') as mock_settings, \
+             patch('shared_code.openai_service.AzureOpenAI') as mock_client_class, \
+             patch.object(OpenAIService, '_validate_connections'):
+            mock_settings.azure_openai_endpoint = "https://test.openai.azure.com/"
+            mock_settings.azure_openai_api_key = "test-key"
+            mock_settings.azure_openai_chat_api_version = "2024-02-15-preview"
+            mock_settings.azure_openai_chat_deployment = "gpt-4"
+            mock_settings.openai_embeddings_engine_doc = "embedding-model"
+
+            client = mock_client_class.return_value
+            response = Mock()
+            response.choices = [Mock(message=Mock(content="Respuesta generada"))]
+            response.usage = Mock(total_tokens=10, prompt_tokens=5, completion_tokens=5)
+            client.chat.completions.create.return_value = response
+            client.embeddings.create.return_value = Mock(data=[Mock(embedding=[0.1, 0.2])])
+
+            yield lambda **kwargs: OpenAIService(**kwargs)
+
+    def test_exact_cache_hit_skips_api_call(self, service_factory, cache_service):
+        service = service_factory(cache_service=cache_service)
+        messages = [{"role": "user", "content": "Hola"}]
+        policy = CachePolicy(ttl_seconds=60)
+
+        first = service.generate_chat_completion(messages, temperature=0, cache_policy=policy)
+        second = service.generate_chat_completion(messages, temperature=0, cache_policy=policy)
+
+        assert first == second == "Respuesta generada"
+        assert service.chat_client.chat.completions.create.call_count == 1
+        assert cache_service.set.call_args.kwargs["expiration"] == 60
+
+    def test_no_cache_without_policy_or_for_sampled_requests(self, service_factory, cache_service):
+        service = service_factory(cache_service=cache_service)
+        messages = [{"role": "user", "content": "Hola"}]
+
+        service.generate_chat_completion(messages, temperature=0)
+        service.generate_chat_completion(messages, temperature=0.7, cache_policy=CachePolicy())
+
+        cache_service.get.assert_not_called()
+        assert service.chat_client.chat.completions.create.call_count == 2
+
+    def test_semantic_cache_for_sampled_requests(self, service_factory):
+        semantic_cache = Mock()
+        semantic_cache.lookup.side_effect = [None, "Respuesta similar"]
+        service = service_factory(semantic_cache=semantic_cache)
+        policy = CachePolicy(semantic_threshold=0.9, ttl_seconds=120)
+
+        first = service.generate_chat_completion([{"role": "user", "content": "Hola"}], cache_policy=policy)
+        second = service.generate_chat_completion([{"role": "user", "content": "Hola!"}], cache_policy=policy)
+
+        assert first == "Respuesta generada"
+        assert second == "Respuesta similar"
+        lookup_embedding, threshold = semantic_cache.lookup.call_args[0]
+        np.testing.assert_allclose(lookup_embedding, [0.1, 0.2], rtol=1e-6)
+        assert threshold == 0.9
+        stored_embedding, *stored_args = semantic_cache.store.call_args[0]
+        np.testing.assert_allclose(stored_embedding, [0.1, 0.2], rtol=1e-6)
+        assert stored_args == ["Hola", "Respuesta generada", 120]
+        assert service.chat_client.chat.completions.create.call_count == 1
+
+    def test_semantic_cache_namespaced_by_system_prompt(self, service_factory):
+        semantic_cache = Mock()
+        semantic_cache.lookup.return_value = None
+        service = service_factory(semantic_cache=semantic_cache)
+        policy = CachePolicy(semantic_threshold=0.9)
+        messages = [{"role": "user", "content": "Hola"}]
+
+        service.generate_chat_completion(messages, system_prompt="Responde a Ana", cache_policy=policy)
+        service.generate_chat_completion(messages, system_prompt="Responde a Luis", cache_policy=policy)
+        service.generate_chat_completion(messages, system_prompt="Responde a Ana", cache_policy=policy)
+
+        namespaces = [call.kwargs["namespace"] for call in semantic_cache.lookup.call_args_list]
+        assert namespaces[0] != namespaces[1]
+        assert namespaces[0] == namespaces[2]
+        assert semantic_cache.store.call_args.kwargs["namespace"] == namespaces[2]
+
+    def test_cache_failure_falls_back_to_api(self, service_factory, cache_service):
+        cache_service.get.side_effect = ConnectionError("redis down")
+        service = service_factory(cache_service=cache_service)
+
+        result = service.generate_chat_completion(
+            [{"role": "user", "content": "Hola"}], temperature=0, cache_policy=CachePolicy()
+        )
+
+        assert result == "Respuesta generada"
+
+    def test_generate_chat_completion_stream(self, service_factory):
+        def chunk(content):
+            return Mock(choices=[Mock(delta=Mock(content=content))])
+
+        async def fake_stream():
+            for item in [Mock(choices=[]), chunk("Hola"), chunk(None), chunk(" mundo")]:
+                yield item
+
+        service = service_factory()
+        with patch('shared_code.openai_service.AsyncAzureOpenAI') as mock_async_client_class:
+            create = mock_async_client_class.return_value.chat.completions.create
+            create.side_effect = AsyncMock(return_value=fake_stream())
+
+            async def collect():
+                return [part async for part in service.generate_chat_completion_stream(
+                    [{"role": "user", "content": "Hola"}], system_prompt="Eres amable"
+                )]
+
+            parts = asyncio.run(collect())
+
+        assert parts == ["Hola", " mundo"]
+        assert create.call_args.kwargs["stream"] is True
+        assert create.call_args.kwargs["messages"][0] == {"role": "system", "content": "Eres amable"}
+
+    def test_generate_response_async(self, service_factory):
+        service = service_factory()
+        response = Mock(choices=[Mock(message=Mock(content="Respuesta asíncrona"))], usage=Mock(total_tokens=7))
+        with patch('shared_code.openai_service.AsyncAzureOpenAI') as mock_async_client_class:
+            create = mock_async_client_class.return_value.chat.completions.create
+            create.side_effect = AsyncMock(return_value=response)
+
+            result = asyncio.run(service.generate_response_async([{"role": "user", "content": "Hola"}]))
+
+        assert result == "Respuesta asíncrona"
+        assert create.call_args.kwargs["model"] == "gpt-4"
+        mock_async_client_class.assert_called_once()
+
+
+    def test_generate_batch_embeddings_in_parallel_batches(self, service_factory):
+        service = service_factory()
+
+        def create(model, input):
+            return Mock(data=[Mock(embedding=[float(text)]) for text in input])
+
+        service.embeddings_client.embeddings.create.side_effect = create
+        texts = [str(i) for i in range(10)]
+
+        result = service.generate_batch_embeddings(texts, batch_size=3, max_concurrency=2)
+
+        assert result.dtype == np.float32
+        assert result.shape == (10, 1)
+        assert result[:, 0].tolist() == [float(i) for i in range(10)]
+        batches = [call.kwargs["input"] for call in service.embeddings_client.embeddings.create.call_args_list]
+        assert sorted(len(batch) for batch in batches) == [1, 3, 3, 3]
+
+    def test_generate_embeddings_returns_float32_vector(self, service_factory):
+        service = service_factory()
+
+        result = service.generate_embeddings("texto")
+
+        assert isinstance(result, np.ndarray)
+        assert result.dtype == np.float32
+        assert result.shape == (2,)
+
+    def test_embeddings_served_from_process_cache(self, service_factory):
+        service = service_factory()
+
+        first = service.generate_embeddings("Horario del culto")
+        second = service.generate_embedding("Horario del culto")
+
+        np.testing.assert_array_equal(first, second)
+        assert service.embeddings_client.embeddings.create.call_count == 1
+
+    def test_embeddings_shared_through_redis_tier(self, service_factory, cache_service):
+        writer = service_factory(cache_service=cache_service)
+        reader = service_factory(cache_service=cache_service)
+
+        expected = writer.generate_embeddings("Horario del culto")
+        reader.embeddings_client.embeddings.create.reset_mock()
+        first = reader.generate_embeddings("Horario del culto")
+        second = reader.generate_embeddings("Horario del culto")
+
+        np.testing.assert_array_equal(first, expected)
+        np.testing.assert_array_equal(second, expected)
+        reader.embeddings_client.embeddings.create.assert_not_called()
+        assert cache_service.get.call_count == 2
+        assert cache_service.set.call_args.kwargs["expiration"] > 0
+
+    def test_embedding_cache_failure_falls_back_to_api(self, service_factory, cache_service):
+        cache_service.get.side_effect = ConnectionError("redis down")
+        cache_service.set.side_effect = ConnectionError("redis down")
+        service = service_factory(cache_service=cache_service)
+
+        result = service.generate_embeddings("Horario del culto")
+
+        np.testing.assert_allclose(result, [0.1, 0.2], rtol=1e-6)
+        assert service.embeddings_client.embeddings.create.call_count == 1
+
+    def test_semantic_cache_composes_from_near_hits(self, service_factory):
+        hits = [CachedAnswer(query="¿Cuándo es el culto?", response="El domingo a las 10", score=0.85)]
+        semantic_cache = Mock()
+        semantic_cache.lookup.return_value = None
+        semantic_cache.find_similar.return_value = hits
+        semantic_cache.compose.return_value = "El culto es el domingo a las 10"
+        service = service_factory(semantic_cache=semantic_cache)
+        policy = CachePolicy(semantic_threshold=0.95, compose_threshold=0.8, ttl_seconds=120)
+
+        result = service.generate_chat_completion([{"role": "user", "content": "Horario del culto"}], cache_policy=policy)
+
+        assert result == "El culto es el domingo a las 10"
+        assert semantic_cache.find_similar.call_args[0][1] == 0.8
+        semantic_cache.compose.assert_called_once_with("Horario del culto", hits)
+        assert semantic_cache.store.call_args[0][1:] == ("Horario del culto", "El culto es el domingo a las 10", 120)
+        service.chat_client.chat.completions.create.assert_not_called()
+
+    def test_compose_cached_answers_merges_with_short_completion(self, service_factory):
+        service = service_factory()
+        hits = [CachedAnswer(query="¿Cuándo es el culto?", response="El domingo", score=0.85)]
+
+        result = service.compose_cached_answers("Horario del culto", hits)
+
+        assert result == "Respuesta generada"
+        kwargs = service.chat_client.chat.completions.create.call_args.kwargs
+        assert kwargs["temperature"] == 0
+        assert "El domingo" in kwargs["messages"][1]["content"]
+
+        service.chat_client.chat.completions.create.return_value.choices[0].message.content = "NO_DISPONIBLE"
+        assert service.compose_cached_answers("Horario del culto", hits) is None
@@ -5,10 +5,15 @@ This module contains comprehensive tests for the RedisService class
 with mocked Redis client and full coverage of all methods.
 """
 
+import asyncio
+import pickle
+import numpy as np
 import pytest
-from unittest.mock import patch, Mock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, Mock, MagicMock, AsyncMock
 from redis.exceptions import RedisError, ConnectionError, TimeoutError
 from shared_code.redis_service import RedisService
+from shared_code.models import SearchHit
 
 class TestRedisService:
     """Test cases for RedisService class."""
@@ -56,6 +61,65 @@ class TestRedisService:
         )
         assert result is True
 
+    def test_store_embedding_accepts_ndarray(self, redis_service):
+        redis_service.redis_client.hset.return_value = True
+        result = redis_service.store_embedding(
+            document_id="doc1",
+            embedding=np.array([0.5, 0.25], dtype=np.float32),
+            metadata={"text": "test"}
+        )
+        assert result is True
+        mapping = redis_service.redis_client.hset.call_args[1]["mapping"]
+        assert mapping["embedding"] == np.array([0.5, 0.25], dtype=np.float32).tobytes()
+        assert mapping["embedding_dtype"] == "float32"
+
+    def test_get_document_reads_legacy_pickled_embedding(self, redis_service):
+        redis_service.redis_client.hgetall.return_value = {
+            b"document_id": b"doc1",
+            b"embedding": pickle.dumps([0.5, 0.25]),
+        }
+        result = redis_service.get_document("doc1")
+        assert result["embedding"] == [0.5, 0.25]
+
+    @pytest.mark.parametrize("dtype,itemsize", [("float32", 4), ("float16", 2), ("int8", 1)])
+    def test_store_embedding_quantized_roundtrip(self, redis_service, dtype, itemsize):
+        redis_service.redis_client.hset.return_value = True
+        embedding = np.array([0.5, -0.25, 0.125, 0.0], dtype=np.float32)
+        redis_service.store_embedding("doc1", embedding, {"text": "test"}, dtype=dtype)
+        mapping = redis_service.redis_client.hset.call_args[1]["mapping"]
+        assert len(mapping["embedding"]) == embedding.size * itemsize
+        assert mapping["embedding_dtype"] == dtype
+
+        redis_service.redis_client.hgetall.return_value = {
+            k.encode(): v if isinstance(v, bytes) else str(v).encode() for k, v in mapping.items()
+        }
+        result = redis_service.get_document("doc1")
+        np.testing.assert_allclose(result["embedding"], embedding, atol=0.005)
+
+    def test_store_embedding_invalid_dtype(self, redis_service):
+        with pytest.raises(ValueError):
+            redis_service.store_embedding("doc1", [0.1], {}, dtype="float64")
+
+    def test_store_embeddings_bulk_flushes_per_chunk(self, redis_service):
+        pipe = redis_service.redis_client.pipeline.return_value
+        items = [(f"doc{i}", np.ones(4, dtype=np.float32), {"text": str(i)}) for i in range(5)]
+        stored = redis_service.store_embeddings_bulk(items, chunk_size=2)
+        assert stored == 5
+        redis_service.redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.hset.call_count == 5
+        assert pipe.execute.call_count == 3
+        redis_service.redis_client.hset.assert_not_called()
+
+    def test_store_embeddings_bulk_key_prefix(self, redis_service):
+        pipe = redis_service.redis_client.pipeline.return_value
+        items = [("q1", np.ones(4, dtype=np.float32), {"text": "hola"})]
+        redis_service.store_embeddings_bulk(items, key_prefix="semantic_cache_entry:")
+        assert pipe.hset.call_args[0][0] == "semantic_cache_entry:q1"
+
+    def test_store_embeddings_bulk_invalid_item(self, redis_service):
+        with pytest.raises(ValueError):
+            redis_service.store_embeddings_bulk([("", [0.1], {})])
+
     def test_store_embedding_invalid_input(self, redis_service):
         with pytest.raises(ValueError):
             redis_service.store_embedding(document_id="", embedding=[], metadata={})
@@ -71,6 +135,55 @@ class TestRedisService:
         result = redis_service.create_search_index(index_name="test_index")
         assert result is True
 
+    def test_create_search_index_defaults_to_hnsw(self, redis_service):
+        redis_service.redis_client.ft.return_value.info.side_effect = Exception()
+        redis_service.create_search_index(index_name="test_index", m=32, dim=8)
+        schema = redis_service.redis_client.ft.return_value.create_index.call_args[0][0]
+        args = schema[-1].args
+        assert args[:2] == ["VECTOR", "HNSW"]
+        assert args[args.index("M") + 1] == 32
+        assert args[args.index("DIM") + 1] == 8
+        assert args[args.index("DISTANCE_METRIC") + 1] == "COSINE"
+
+    def test_create_search_index_prefix_and_tag_fields(self, redis_service):
+        redis_service.redis_client.ft.return_value.info.side_effect = Exception()
+        redis_service.create_search_index(index_name="cache", key_prefix="cache:", tag_fields=("content_type",))
+        call = redis_service.redis_client.ft.return_value.create_index.call_args
+        content_type = next(field for field in call[0][0] if field.name == "content_type")
+        assert "TAG" in content_type.args
+        assert call[1]["definition"].args[:4] == ["ON", "HASH", "PREFIX", 1]
+        assert "cache:" in call[1]["definition"].args
+
+    def test_store_embedding_key_prefix(self, redis_service):
+        redis_service.store_embedding("entry1", [0.1, 0.2], {}, key_prefix="cache:")
+        assert redis_service.redis_client.hset.call_args[0][0] == "cache:entry1"
+
+    def test_create_search_index_flat(self, redis_service):
+        redis_service.redis_client.ft.return_value.info.side_effect = Exception()
+        redis_service.create_search_index(index_name="test_index", algorithm="FLAT")
+        schema = redis_service.redis_client.ft.return_value.create_index.call_args[0][0]
+        args = schema[-1].args
+        assert args[1] == "FLAT"
+        assert "EF_RUNTIME" not in args
+
+    def test_configure_index_enforces_dimension(self, redis_service):
+        redis_service.redis_client.ft.return_value.info.side_effect = Exception()
+        assert redis_service.configure_index("small_index", dim=3, metric="ip") is True
+        args = redis_service.redis_client.ft.return_value.create_index.call_args[0][0][-1].args
+        assert args[args.index("DISTANCE_METRIC") + 1] == "IP"
+
+        with pytest.raises(ValueError):
+            redis_service.store_embedding("doc1", [0.1, 0.2], {}, index_name="small_index")
+        with pytest.raises(ValueError):
+            redis_service.semantic_search([0.1, 0.2], index_name="small_index")
+        assert redis_service.store_embedding("doc1", [0.1, 0.2, 0.3], {}, index_name="small_index") is True
+        # Other indexes are not constrained
+        assert redis_service.store_embedding("doc2", [0.1, 0.2], {}) is True
+
+    def test_configure_index_invalid_metric(self, redis_service):
+        with pytest.raises(ValueError):
+            redis_service.configure_index("idx", dim=3, metric="hamming")
+
     def test_create_search_index_already_exists(self, redis_service):
         redis_service.redis_client.ft.return_value.info.return_value = {"num_docs": 1}
         result = redis_service.create_search_index(index_name="test_index")
@@ -88,13 +201,75 @@ class TestRedisService:
         mock_doc.text = "test"
         mock_doc.filename = "file.txt"
         mock_doc.content_type = "text/plain"
-        mock_doc.score = 0.9
+        mock_doc.score = 0.1
         mock_doc.upload_date = "2024-01-01"
         redis_service.redis_client.ft.return_value.search.return_value.docs = [mock_doc]
         result = redis_service.semantic_search([0.1, 0.2, 0.3], top_k=1, similarity_threshold=0.7)
         assert isinstance(result, list)
         assert result[0]["document_id"] == "doc1"
 
+    def test_semantic_search_returns_search_hits(self, redis_service):
+        mock_doc = SimpleNamespace(
+            document_id="doc1", text="test", filename="file.txt", content_type="text/plain",
+            score="0.1", upload_date="2024-01-01", category="culto", _private="x"
+        )
+        redis_service.redis_client.ft.return_value.search.return_value.docs = [mock_doc]
+
+        result = redis_service.semantic_search([0.1, 0.2, 0.3], top_k=1, similarity_threshold=0.7)
+
+        assert isinstance(result[0], SearchHit)
+        assert result[0].score == pytest.approx(0.9)
+        assert result[0].extra == {"category": "culto"}
+        assert result[0].get("category") == "culto"
+
+    def test_semantic_search_filters_by_similarity(self, redis_service):
+        docs = [
+            SimpleNamespace(document_id=document_id, text="t", filename="", content_type="", score=distance, upload_date="")
+            for document_id, distance in (("near", "0.05"), ("edge", "0.2"), ("far", "0.9"))
+        ]
+        redis_service.redis_client.ft.return_value.search.return_value.docs = docs
+
+        result = redis_service.semantic_search([0.1, 0.2, 0.3], top_k=3, similarity_threshold=0.8)
+
+        assert [hit.document_id for hit in result] == ["near", "edge"]
+        assert [hit.score for hit in result] == pytest.approx([0.95, 0.8])
+
+    def test_semantic_search_converts_l2_distance(self, redis_service):
+        redis_service.redis_client.ft.return_value.info.side_effect = Exception()
+        redis_service.configure_index("l2_index", dim=3, metric="l2")
+        docs = [
+            SimpleNamespace(document_id=document_id, text="t", filename="", content_type="", score=distance, upload_date="")
+            for document_id, distance in (("near", "0.1"), ("far", "1.0"))
+        ]
+        redis_service.redis_client.ft.return_value.search.return_value.docs = docs
+
+        result = redis_service.semantic_search([0.1, 0.2, 0.3], index_name="l2_index", similarity_threshold=0.8)
+
+        # Squared L2 distance between unit vectors is 2 - 2 * cosine similarity
+        assert [hit.document_id for hit in result] == ["near"]
+        assert result[0].score == pytest.approx(0.95)
+
+    def test_semantic_search_ef_runtime_override(self, redis_service):
+        redis_service.redis_client.ft.return_value.search.return_value.docs = []
+
+        redis_service.semantic_search([0.1, 0.2, 0.3], top_k=5)
+        default_query = redis_service.redis_client.ft.return_value.search.call_args[0][0]
+        redis_service.search_similar_documents([0.1, 0.2, 0.3], top_k=5, ef_runtime=64)
+        tuned_query = redis_service.redis_client.ft.return_value.search.call_args[0][0]
+
+        assert "EF_RUNTIME" not in default_query
+        assert tuned_query == "*=>[KNN 5 @embedding $embedding EF_RUNTIME 64 AS score]"
+        with pytest.raises(ValueError):
+            redis_service.semantic_search([0.1, 0.2, 0.3], top_k=5, ef_runtime=4)
+
+    def test_semantic_search_filter_query(self, redis_service):
+        redis_service.redis_client.ft.return_value.search.return_value.docs = []
+
+        redis_service.semantic_search([0.1, 0.2, 0.3], top_k=2, filter_query="@content_type:faq")
+        query = redis_service.redis_client.ft.return_value.search.call_args[0][0]
+
+        assert query == "(@content_type:faq)=>[KNN 2 @embedding $embedding AS score]"
+
     def test_semantic_search_invalid_input(self, redis_service):
         with pytest.raises(ValueError):
             redis_service.semantic_search([], top_k=1)
@@ -106,6 +281,68 @@ class TestRedisService:
         with pytest.raises(RedisError):
             redis_service.semantic_search([0.1, 0.2, 0.3], top_k=1)
 
+    def test_async_key_value_operations(self, redis_service):
+        client = AsyncMock()
+        client.get.return_value = b"value"
+        client.exists.return_value = 1
+        client.delete.return_value = 0
+        with patch.object(redis_service, "_get_async_client", return_value=client):
+            async def run():
+                return await asyncio.gather(
+                    redis_service.aset("key", "value", expiration=5),
+                    redis_service.aget("key"),
+                    redis_service.aexists("key"),
+                    redis_service.adelete("key")
+                )
+            assert asyncio.run(run()) == [True, "value", True, False]
+        client.set.assert_awaited_once_with("key", "value", ex=5)
+
+    def test_asemantic_search(self, redis_service):
+        mock_doc = Mock()
+        mock_doc.document_id = "doc1"
+        mock_doc.text = "test"
+        mock_doc.filename = "file.txt"
+        mock_doc.content_type = "text/plain"
+        mock_doc.score = 0.1
+        mock_doc.upload_date = "2024-01-01"
+        client = Mock()
+        client.ft.return_value.search = AsyncMock(return_value=Mock(docs=[mock_doc]))
+        with patch.object(redis_service, "_get_async_client", return_value=client):
+            result = asyncio.run(redis_service.asemantic_search(np.ones(3, dtype=np.float32), top_k=1))
+        assert result[0]["document_id"] == "doc1"
+        with pytest.raises(ValueError):
+            asyncio.run(redis_service.asemantic_search([], top_k=1))
+
+    def test_async_client_created_per_loop(self, redis_service):
+        with patch('shared_code.redis_service.aioredis.from_url') as mock_from_url:
+            async def get_client():
+                return redis_service._get_async_client(), redis_service._get_async_client()
+            first, again = asyncio.run(get_client())
+            asyncio.run(get_client())
+        assert first is again
+        assert mock_from_url.call_count == 2
+        assert mock_from_url.call_args[1]["max_connections"] == 32
+
+    def test_get_many(self, redis_service):
+        redis_service.redis_client.mget.return_value = [b"one", None]
+        assert redis_service.get_many(["a", "b"]) == {"a": "one", "b": None}
+        redis_service.redis_client.mget.assert_called_once_with(["a", "b"])
+        assert redis_service.get_many([]) == {}
+
+    def test_get_many_error_returns_none_values(self, redis_service):
+        redis_service.redis_client.mget.side_effect = RedisError("Redis error")
+        assert redis_service.get_many(["a"]) == {"a": None}
+
+    def test_set_many(self, redis_service):
+        assert redis_service.set_many({"a": "1", "b": "2"}) is True
+        redis_service.redis_client.mset.assert_called_once_with({"a": "1", "b": "2"})
+
+        pipe = redis_service.redis_client.pipeline.return_value
+        assert redis_service.set_many({"a": "1", "b": "2"}, expiration=60) is True
+        assert pipe.set.call_count == 2
+        pipe.set.assert_called_with("b", "2", ex=60)
+        pipe.execute.assert_called_once()
+
     def test_get_document_success(self, redis_service):
         redis_service.redis_client.hgetall.return_value = {
             b"document_id": b"doc1",
@@ -181,7 +418,23 @@ class TestRedisService:
         redis_service.redis_client.set.return_value = True
         redis_service.redis_client.get.return_value = b"ok"
         result = redis_service.health_check()
-        assert result is True
+        assert result.ok is True
+        assert result.consecutive_failures == 0
+        assert result.last_success is not None
+        assert result.latency_ms >= 0
+
+    def test_health_check_tracks_consecutive_failures(self, redis_service):
+        redis_service.redis_client.get.return_value = None
+        for _ in range(2):
+            with pytest.raises(RedisError):
+                redis_service.health_check()
+
+        redis_service.redis_client.get.return_value = b"ok"
+        result = redis_service.health_check()
+
+        assert result.ok is True
+        assert result.consecutive_failures == 0
+        assert redis_service._health_history["last_success"] == result.last_success
 
     def test_health_check_fail(self, redis_service):
         redis_service.redis_client.set.return_value = True
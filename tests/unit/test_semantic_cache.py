@@ -0,0 +1,167 @@
+"""
+Unit tests for the Redis-backed semantic cache.
+"""
+
+import base64
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock
+from shared_code.interfaces import CachedAnswer, IRedisService, ISemanticCache
+from shared_code.redis_service import RedisService
+from shared_code.semantic_cache import (
+    RedisSemanticCache,
+    SEMANTIC_CACHE_CONTENT_TYPE,
+    SEMANTIC_CACHE_CONTEXT_PREFIX,
+    SEMANTIC_CACHE_KEY_PREFIX,
+    SEMANTIC_CACHE_RESPONSE_PREFIX,
+)
+
+
+def _knn_results(*docs):
+    """Build raw KNN results; the score of each document is a cosine distance."""
+    return SimpleNamespace(docs=[
+        SimpleNamespace(document_id=document_id, score=str(distance), text=text,
+                        filename="", content_type=content_type, upload_date="")
+        for document_id, distance, text, content_type in docs
+    ])
+
+
+class TestRedisSemanticCache:
+    """Test cases for RedisSemanticCache."""
+
+    @pytest.fixture
+    def redis_service(self):
+        service = Mock(spec=IRedisService)
+        # Real KNN distances, turned into similarities by the real parser
+        results = _knn_results(
+            ("q2", 0.12, "¿A qué hora es el culto?", SEMANTIC_CACHE_CONTENT_TYPE),
+            ("q1", 0.07, "¿Cuándo es el culto?", SEMANTIC_CACHE_CONTENT_TYPE),
+            ("doc7", 0.09, "Documento", "application/pdf"),
+            ("q3", 0.15, "Horario", SEMANTIC_CACHE_CONTENT_TYPE),
+        )
+        service.semantic_search.side_effect = lambda query_embedding, similarity_threshold, **kwargs: (
+            RedisService._parse_search_results(results, similarity_threshold)
+        )
+        service.get_many.return_value = {
+            f"{SEMANTIC_CACHE_RESPONSE_PREFIX}q1": "El domingo",
+            f"{SEMANTIC_CACHE_RESPONSE_PREFIX}q2": "A las 10",
+            f"{SEMANTIC_CACHE_RESPONSE_PREFIX}q3": None,
+        }
+        return service
+
+    def test_implements_interface(self, redis_service):
+        assert isinstance(RedisSemanticCache(redis_service), ISemanticCache)
+
+    def test_find_similar_returns_live_cache_entries(self, redis_service):
+        cache = RedisSemanticCache(redis_service, top_k=3)
+
+        hits = cache.find_similar([0.1, 0.2], 0.8)
+
+        assert hits == [
+            CachedAnswer(query="¿Cuándo es el culto?", response="El domingo", score=pytest.approx(0.93)),
+            CachedAnswer(query="¿A qué hora es el culto?", response="A las 10", score=pytest.approx(0.88)),
+        ]
+        assert redis_service.semantic_search.call_args.kwargs["top_k"] == 3
+        assert redis_service.semantic_search.call_args.kwargs["index_name"] == "semantic_cache"
+        redis_service.get_many.assert_called_once()
+
+    def test_lookup_returns_best_answer(self, redis_service):
+        cache = RedisSemanticCache(redis_service)
+
+        assert cache.lookup([0.1, 0.2], 0.9) == "El domingo"
+        assert redis_service.semantic_search.call_args.kwargs["top_k"] == 1
+
+    def test_lookup_ignores_distant_entries(self, redis_service):
+        assert RedisSemanticCache(redis_service).lookup([0.1, 0.2], 0.95) is None
+        redis_service.get_many.assert_not_called()
+
+    def test_lookup_miss(self, redis_service):
+        redis_service.semantic_search.side_effect = None
+        redis_service.semantic_search.return_value = []
+
+        assert RedisSemanticCache(redis_service).lookup([0.1, 0.2], 0.9) is None
+        redis_service.get_many.assert_not_called()
+
+    def test_store_sets_answer_ttl_and_indexes_query(self, redis_service):
+        cache = RedisSemanticCache(redis_service)
+
+        cache.store([0.1, 0.2], "¿Cuándo es el culto?", "El domingo", 3600)
+
+        key, value = redis_service.set.call_args.args
+        assert key.startswith(SEMANTIC_CACHE_RESPONSE_PREFIX)
+        assert value == "El domingo"
+        assert redis_service.set.call_args.kwargs["expiration"] == 3600
+        entry_id, _, metadata = redis_service.store_embedding.call_args.args
+        assert key == f"{SEMANTIC_CACHE_RESPONSE_PREFIX}{entry_id}"
+        assert metadata == {"text": "¿Cuándo es el culto?", "content_type": SEMANTIC_CACHE_CONTENT_TYPE}
+        assert redis_service.store_embedding.call_args.kwargs["expiration_days"] == 1
+        assert redis_service.store_embedding.call_args.kwargs["key_prefix"] == SEMANTIC_CACHE_KEY_PREFIX
+
+    def test_index_created_once_before_first_use(self, redis_service):
+        cache = RedisSemanticCache(redis_service)
+
+        cache.lookup([0.1, 0.2], 0.9)
+        cache.store([0.1, 0.2], "¿Cuándo es el culto?", "El domingo", 3600)
+
+        redis_service.configure_index.assert_called_once_with(
+            "semantic_cache", dim=2, key_prefix=SEMANTIC_CACHE_KEY_PREFIX, tag_fields=("content_type",)
+        )
+
+    def test_namespace_isolates_entries(self, redis_service):
+        cache = RedisSemanticCache(redis_service)
+
+        cache.store([0.1, 0.2], "¿Cuándo es el culto?", "El domingo", 3600, namespace="+1234567890")
+        entry_id, _, metadata = redis_service.store_embedding.call_args.args
+
+        assert entry_id != RedisSemanticCache._entry_id("¿Cuándo es el culto?")
+        assert metadata["content_type"] != SEMANTIC_CACHE_CONTENT_TYPE
+        assert cache.lookup([0.1, 0.2], 0.85, namespace="+1234567890") is None
+        assert redis_service.semantic_search.call_args.kwargs["filter_query"] == (
+            f"@content_type:{{{metadata['content_type']}}}"
+        )
+
+    def test_context_chain_rejects_other_conversations(self, redis_service):
+        def context(vector):
+            return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+        redis_service.get_many.side_effect = lambda keys: {
+            f"{SEMANTIC_CACHE_RESPONSE_PREFIX}q1": "El domingo",
+            f"{SEMANTIC_CACHE_RESPONSE_PREFIX}q2": "A las 10",
+            f"{SEMANTIC_CACHE_CONTEXT_PREFIX}q1": context([1.0, 0.0]),
+            f"{SEMANTIC_CACHE_CONTEXT_PREFIX}q2": context([0.0, 1.0]),
+        }
+        cache = RedisSemanticCache(redis_service)
+
+        assert cache.lookup([0.1, 0.2], 0.85, context_embedding=[0.0, 1.0]) == "A las 10"
+        assert cache.lookup([0.1, 0.2], 0.85, context_embedding=[0.0, 0.0]) is None
+        hits = cache.find_similar([0.1, 0.2], 0.85, context_embedding=[1.0, 0.1])
+        assert [hit.response for hit in hits] == ["El domingo"]
+        # q1 is at KNN distance 0.07: its query similarity is 0.93
+        assert hits[0].score == pytest.approx((0.93 + 1.0 / np.hypot(1.0, 0.1)) / 2)
+
+    def test_store_keeps_context_with_answer_ttl(self, redis_service):
+        cache = RedisSemanticCache(redis_service)
+
+        cache.store([0.1, 0.2], "cámbialo a rojo", "Hecho", 600, context_embedding=[0.5, 0.5])
+        cache.store([0.1, 0.2], "cámbialo a rojo", "Hecho", 600, context_embedding=[0.0, 1.0])
+
+        first, second = [call.args[0] for call in redis_service.store_embedding.call_args_list]
+        assert first != second
+        context_key, value = redis_service.set.call_args_list[1].args
+        assert context_key == f"{SEMANTIC_CACHE_CONTEXT_PREFIX}{first}"
+        assert np.frombuffer(base64.b64decode(value), dtype=np.float32).tolist() == [0.5, 0.5]
+        assert redis_service.set.call_args_list[1].kwargs["expiration"] == 600
+
+    def test_compose_uses_composer_hook(self, redis_service):
+        hits = [CachedAnswer(query="q", response="r", score=0.9)]
+        composer = Mock(return_value="Respuesta compuesta")
+
+        assert RedisSemanticCache(redis_service).compose("q", hits) is None
+        assert RedisSemanticCache(redis_service, composer=composer).compose("q", []) is None
+        assert RedisSemanticCache(redis_service, composer=composer).compose("q", hits) == "Respuesta compuesta"
+        composer.assert_called_once_with("q", hits)
+
+    def test_invalid_top_k(self, redis_service):
+        with pytest.raises(ValueError):
+            RedisSemanticCache(redis_service, top_k=0)
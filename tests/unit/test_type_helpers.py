@@ -0,0 +1,58 @@
+"""
+Tests unitarios para los helpers de tipos.
+
+ESTE ARCHIVO CONTIENE TESTS UNITARIOS (100% MOCKEADOS)
+Estos tests validan que la verificación de interfaces se apoya en isinstance.
+"""
+
+from unittest.mock import Mock
+
+from shared_code.interfaces import IErrorHandler, IWhatsAppService
+from shared_code.type_helpers import cast_service_safe, is_error_handler, validate_service_interface
+
+
+class _ErrorHandler(IErrorHandler):
+    def handle_error(self, error, context=""):
+        return {}
+
+    def create_error_response(self, message, error_code, details=None):
+        return {}
+
+    def log_error(self, error, context="", details=None):
+        pass
+
+
+class TestValidateServiceInterface:
+    """Tests para validate_service_interface."""
+
+    def test_subclass_is_valid(self):
+        """Test que una subclase real de la interfaz es válida."""
+        handler = _ErrorHandler()
+
+        assert validate_service_interface(handler, IErrorHandler) is True
+        assert is_error_handler(handler) is True
+        assert cast_service_safe(handler, IErrorHandler) is handler
+
+    def test_unrelated_object_is_invalid(self):
+        """Test que un objeto que no implementa la interfaz no es válido."""
+        assert validate_service_interface(object(), IErrorHandler) is False
+        assert is_error_handler("no es un servicio") is False
+        assert cast_service_safe(object(), IErrorHandler) is None
+
+    def test_virtual_subclass_is_trusted(self):
+        """Test que una subclase virtual registrada se acepta como la interfaz."""
+        class Registered:
+            pass
+
+        IWhatsAppService.register(Registered)
+
+        assert validate_service_interface(Registered(), IWhatsAppService) is True
+
+    def test_mocks_with_spec(self):
+        """Test que los mocks con spec se validan contra su interfaz."""
+        assert validate_service_interface(Mock(spec=IErrorHandler), IErrorHandler) is True
+        assert validate_service_interface(Mock(spec=IWhatsAppService), IErrorHandler) is False
+
+    def test_non_class_interface_is_invalid(self):
+        """Test que un tipo de interfaz no válido no lanza excepción."""
+        assert validate_service_interface(_ErrorHandler(), "IErrorHandler") is False  # type: ignore[arg-type]
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 import json
 from typing import Dict, Any, Optional
 
+from redis.exceptions import RedisError
 from shared_code.user_service import UserService, User, UserSession
 
 
@@ -261,10 +262,68 @@ class TestUserService:
                     assert hasattr(session, "session_id")
                     assert session.session_id in ["abc123", "def456"]
 
+    def test_get_user_sessions_reads_page_with_get_many(self, mock_redis_service):
+        active = UserSession(session_id="abc123", user_phone="+1234567890").to_dict()
+        inactive = dict(UserSession(session_id="def456", user_phone="+1234567890").to_dict(), is_active=False)
+        mock_redis_service.redis_client.scan.return_value = (0, [b"session:abc123", b"session:def456"])
+        mock_redis_service.get_many.return_value = {
+            "session:abc123": json.dumps(active),
+            "session:def456": json.dumps(inactive)
+        }
+        user_service = UserService(mock_redis_service)
+        result = user_service.get_user_sessions("+1234567890")
+        assert [session.session_id for session in result] == ["abc123"]
+        mock_redis_service.get_many.assert_called_once_with(["session:abc123", "session:def456"])
+        mock_redis_service.redis_client.get.assert_not_called()
+
     def test_get_user_sessions_redis_error(self, mock_redis_service):
         mock_redis_service.redis_client.keys.side_effect = Exception("Redis error")
         user_service = UserService(mock_redis_service)
         result = user_service.get_user_sessions("+1234567890")
         assert result == []
     
- 
\ No newline at end of file
+ 
+    def test_schedule_last_activity_coalesces_into_one_pipeline(self, mock_redis_service):
+        user = json.dumps({"phone_number": "+1234567890", "last_activity": "2024-01-01T00:00:00"})
+        stats = json.dumps({"message_count": 5})
+        mock_redis_service.redis_client.mget.return_value = [user.encode(), None, stats.encode(), None]
+        pipe = mock_redis_service.redis_client.pipeline.return_value
+        with patch('shared_code.user_service.threading.Thread') as mock_thread:
+            user_service = UserService(mock_redis_service)
+            for _ in range(3):
+                user_service.schedule_last_activity("+1234567890")
+            user_service.schedule_last_activity("+1999999999")
+        mock_thread.return_value.start.assert_called_once()
+        mock_redis_service.redis_client.set.assert_not_called()
+
+        assert user_service.flush_activity_buffer() == 1
+
+        mock_redis_service.redis_client.mget.assert_called_once_with(
+            ["user:+1234567890", "user:+1999999999", "stats:+1234567890", "stats:+1999999999"]
+        )
+        written = {call.args[0]: json.loads(call.args[1]) for call in pipe.set.call_args_list}
+        assert written["user:+1234567890"]["last_activity"] != "2024-01-01T00:00:00"
+        assert written["stats:+1234567890"]["message_count"] == 8
+        pipe.execute.assert_called_once()
+        assert user_service.flush_activity_buffer() == 0
+
+    def test_flush_activity_buffer_requeues_on_redis_error(self, mock_redis_service):
+        mock_redis_service.redis_client.mget.side_effect = RedisError("Redis error")
+        with patch('shared_code.user_service.threading.Thread'):
+            user_service = UserService(mock_redis_service)
+            user_service.schedule_last_activity("+1234567890")
+            with pytest.raises(RedisError):
+                user_service.flush_activity_buffer()
+            user_service.schedule_last_activity("+1234567890")
+        assert user_service._activity_buffer["+1234567890"][1] == 2
+
+    def test_schedule_last_activity_wakes_flusher_when_buffer_is_full(self, mock_redis_service):
+        with patch('shared_code.user_service.threading.Thread'), \
+             patch('shared_code.user_service.ACTIVITY_FLUSH_MAX_PENDING', 2):
+            user_service = UserService(mock_redis_service)
+            user_service.schedule_last_activity("+1234567890")
+            assert not user_service._activity_wakeup.is_set()
+            user_service.schedule_last_activity("+1999999999")
+        assert user_service._activity_wakeup.is_set()
+        with pytest.raises(ValueError):
+            user_service.schedule_last_activity("")
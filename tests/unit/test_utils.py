@@ -20,7 +20,8 @@ from shared_code.utils import (
     retry_with_backoff,
     rate_limit_check,
     generate_session_id,
-    validate_json_schema
+    validate_json_schema,
+    utc_now_iso
 )
 
 
@@ -563,6 +564,21 @@ class TestGenerateSessionId:
             session_ids.add(session_id)
 
 
+class TestUtcNowIso:
+    """Tests para utc_now_iso"""
+    
+    def test_utc_now_iso_reused_within_same_second(self):
+        """Test que el timestamp se reutiliza dentro del mismo segundo"""
+        with patch('shared_code.utils.time.time', side_effect=[1700000000.1, 1700000000.9, 1700000001.0]):
+            first = utc_now_iso()
+            second = utc_now_iso()
+            third = utc_now_iso()
+        
+        assert first == "2023-11-14T22:13:20+00:00"
+        assert second is first
+        assert third == "2023-11-14T22:13:21+00:00"
+
+
 class TestValidateJsonSchema:
     """Tests para validate_json_schema"""
     
@@ -0,0 +1,159 @@
+"""
+Unit tests for the rate-limited WhatsApp sender.
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import Mock, patch
+from shared_code.interfaces import IMessageSender, IWhatsAppService
+from shared_code.whatsapp_sender import TokenBucket, WhatsAppSender
+
+
+def _status_error(status: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://graph.facebook.com/messages")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status}", request=request, response=response)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_paces_after_burst(self):
+        bucket = TokenBucket(rate=100, burst=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.015
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestWhatsAppSender:
+    """Test cases for WhatsAppSender."""
+
+    @pytest.fixture
+    def whatsapp_service(self):
+        service = Mock(spec=IWhatsAppService)
+
+        async def send(message, recipient_id=None, preview_url=None):
+            await asyncio.sleep(0.01)
+            return {"messages": [{"id": f"wamid.{recipient_id}"}]}
+
+        service.send_text_message_async.side_effect = send
+        return service
+
+    def test_implements_interface(self, whatsapp_service):
+        assert isinstance(WhatsAppSender(whatsapp_service), IMessageSender)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_returns_before_sending(self, whatsapp_service):
+        sender = WhatsAppSender(whatsapp_service)
+
+        futures = [await sender.enqueue(f"+10{index}", "Hola") for index in range(5)]
+
+        assert not any(future.done() for future in futures)
+        results = await asyncio.gather(*futures)
+        assert [result["messages"][0]["id"] for result in results] == [f"wamid.+10{index}" for index in range(5)]
+        await sender.aclose()
+
+    @pytest.mark.asyncio
+    async def test_batches_are_sent_concurrently(self, whatsapp_service):
+        in_flight = 0
+        peak = 0
+
+        async def send(message, recipient_id=None, preview_url=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+        whatsapp_service.send_text_message_async.side_effect = send
+        sender = WhatsAppSender(whatsapp_service, batch_size=3)
+
+        for index in range(7):
+            await sender.enqueue(f"+10{index}", "Hola")
+        await sender.aclose()
+
+        assert whatsapp_service.send_text_message_async.call_count == 7
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_retries_throttled_sends(self, whatsapp_service):
+        whatsapp_service.send_text_message_async.side_effect = [
+            _status_error(429, {"Retry-After": "0"}),
+            _status_error(503),
+            {"messages": [{"id": "wamid.ok"}]},
+        ]
+        sender = WhatsAppSender(whatsapp_service)
+
+        with patch("shared_code.whatsapp_sender.WHATSAPP_RETRY_BASE_DELAY_SECONDS", 0.001):
+            result = await (await sender.enqueue("+1000", "Hola"))
+
+        assert result["messages"][0]["id"] == "wamid.ok"
+        assert whatsapp_service.send_text_message_async.call_count == 3
+        await sender.aclose()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, whatsapp_service):
+        whatsapp_service.send_text_message_async.side_effect = _status_error(400)
+        sender = WhatsAppSender(whatsapp_service)
+
+        future = await sender.enqueue("+1000", "Hola")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await future
+        assert whatsapp_service.send_text_message_async.call_count == 1
+        await sender.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, whatsapp_service):
+        whatsapp_service.send_text_message_async.side_effect = httpx.ConnectError("down")
+        sender = WhatsAppSender(whatsapp_service, max_retries=2)
+
+        with patch("shared_code.whatsapp_sender.WHATSAPP_RETRY_BASE_DELAY_SECONDS", 0.001):
+            future = await sender.enqueue("+1000", "Hola")
+            with pytest.raises(httpx.ConnectError):
+                await future
+
+        assert whatsapp_service.send_text_message_async.call_count == 3
+        await sender.aclose()
+
+    @pytest.mark.asyncio
+    async def test_throttled_send_does_not_block_queue(self, whatsapp_service):
+        throttled = asyncio.Event()
+
+        async def send(message, recipient_id=None, preview_url=None):
+            if recipient_id == "+1000":
+                await throttled.wait()
+            return {"messages": [{"id": f"wamid.{recipient_id}"}]}
+
+        whatsapp_service.send_text_message_async.side_effect = send
+        sender = WhatsAppSender(whatsapp_service, batch_size=2)
+
+        slow = await sender.enqueue("+1000", "Hola")
+        others = [await sender.enqueue(f"+200{index}", "Hola") for index in range(3)]
+
+        await asyncio.wait_for(asyncio.gather(*others), timeout=1)
+        assert not slow.done()
+        throttled.set()
+        await slow
+        await sender.aclose()
+
+    def test_rebinds_queue_to_new_event_loop(self, whatsapp_service):
+        sender = WhatsAppSender(whatsapp_service)
+
+        async def send_one():
+            result = await (await sender.enqueue("+1000", "Hola"))
+            return result["messages"][0]["id"]
+
+        assert asyncio.run(send_one()) == "wamid.+1000"
+        assert asyncio.run(send_one()) == "wamid.+1000"
@@ -5,10 +5,15 @@ This module contains comprehensive tests for the WhatsAppService class
 with mocked requests and full coverage of all methods.
 """
 
+import asyncio
+import json
+import httpx
+import warnings
 import pytest
 from unittest.mock import patch, Mock, MagicMock
 from requests.exceptions import HTTPError, RequestException
 from shared_code.whatsapp_service import WhatsAppService
+from shared_code.models import WebhookEvent
 
 class TestWhatsAppService:
     """Test cases for WhatsAppService class."""
@@ -146,7 +151,8 @@ class TestWhatsAppService:
                 }]
             }]
         }
-        result = whatsapp_service.process_webhook_event(event_data)
+        with pytest.warns(DeprecationWarning):
+            result = whatsapp_service.process_webhook_event(event_data)
         assert result["event_type"] == "message"
         assert result["message_content"] == "Hola"
 
@@ -154,6 +160,32 @@ class TestWhatsAppService:
         with pytest.raises(ValueError):
             whatsapp_service.process_webhook_event("")
 
+    def test_process_webhook_event_typed(self, whatsapp_service):
+        event = WebhookEvent.from_payload({
+            "entry": [{
+                "changes": [{
+                    "value": {
+                        "messages": [{
+                            "id": "msgid",
+                            "from": "54321",
+                            "type": "document",
+                            "timestamp": "123456",
+                            "document": {"filename": "boletin.pdf", "mime_type": "application/pdf"}
+                        }]
+                    }
+                }]
+            }]
+        })
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = whatsapp_service.process_webhook_event(event)
+
+        assert isinstance(result, WebhookEvent)
+        assert result.event_type == "message"
+        assert result.sender_id == "54321"
+        assert result.message_content["filename"] == "boletin.pdf"
+
     @patch('shared_code.whatsapp_service.requests.get')
     def test_get_message_status_success(self, mock_get, whatsapp_service):
         mock_response = Mock()
@@ -233,4 +265,126 @@ class TestWhatsAppService:
         mock_response.status_code = 500
         mock_get.return_value = mock_response
         with pytest.raises(Exception):
-            whatsapp_service.health_check() 
\ No newline at end of file
+            whatsapp_service.health_check()
+
+    @staticmethod
+    def _mock_async_client(handler):
+        """Patch httpx.AsyncClient so the service talks to an in-memory transport."""
+        real_async_client = httpx.AsyncClient
+        return patch(
+            'shared_code.whatsapp_service.httpx.AsyncClient',
+            side_effect=lambda **kwargs: real_async_client(transport=httpx.MockTransport(handler), **kwargs)
+        )
+
+    def test_send_text_message_async_concurrent(self, whatsapp_service):
+        sent = []
+
+        def handler(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json={"messages": [{"id": "wamid"}]})
+
+        async def send_all():
+            try:
+                return await asyncio.gather(*(
+                    whatsapp_service.send_text_message_async(f"Hola {i}", recipient_id="54321")
+                    for i in range(3)
+                ))
+            finally:
+                await whatsapp_service.aclose()
+
+        with self._mock_async_client(handler) as mock_client_class:
+            results = asyncio.run(send_all())
+
+        assert all("messages" in result for result in results)
+        assert sorted(payload["text"]["body"] for payload in sent) == ["Hola 0", "Hola 1", "Hola 2"]
+        mock_client_class.assert_called_once()
+
+    def test_send_text_message_async_invalid(self, whatsapp_service):
+        with pytest.raises(ValueError):
+            asyncio.run(whatsapp_service.send_text_message_async(""))
+
+    def test_mark_message_as_read_async_http_error(self, whatsapp_service):
+        def handler(request):
+            return httpx.Response(400, json={"error": "bad request"})
+
+        async def mark_read():
+            try:
+                return await whatsapp_service.mark_message_as_read_async("wamid")
+            finally:
+                await whatsapp_service.aclose()
+
+        with self._mock_async_client(handler):
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(mark_read())
+
+    def test_send_typing_indicator_async(self, whatsapp_service):
+        sent = []
+
+        def handler(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json={"success": True})
+
+        async def typing():
+            try:
+                return await whatsapp_service.send_typing_indicator_async("wamid.1")
+            finally:
+                await whatsapp_service.aclose()
+
+        with self._mock_async_client(handler):
+            result = asyncio.run(typing())
+
+        assert result == {"success": True}
+        assert sent == [{
+            "messaging_product": "whatsapp",
+            "status": "read",
+            "message_id": "wamid.1",
+            "typing_indicator": {"type": "text"}
+        }]
+
+    def test_send_bulk_text_messages(self, whatsapp_service):
+        mock_session = Mock()
+
+        def post(url, headers=None, json=None, timeout=None):
+            if json["to"] == "bad":
+                raise RequestException("connection reset")
+            response = Mock()
+            response.raise_for_status.return_value = None
+            response.json.return_value = {"messages": [{"id": f"wamid-{json['to']}"}]}
+            return response
+
+        mock_session.post.side_effect = post
+        items = [{"message": "Hola"}, {"message": "Hola"}, {"message": ""}]
+
+        with patch('shared_code.whatsapp_service.requests.Session', return_value=mock_session):
+            results = whatsapp_service.send_bulk_text_messages(items, recipient_ids=["1", "bad", "3"])
+
+        assert results[0] == {"messages": [{"id": "wamid-1"}]}
+        assert results[1]["success"] is False
+        assert results[1]["details"] == {"recipient_id": "bad"}
+        assert results[2]["success"] is False
+        assert mock_session.post.call_count == 2
+
+    def test_bulk_session_grows_and_closes_previous(self, whatsapp_service):
+        with patch('shared_code.whatsapp_service.requests.Session', side_effect=[Mock(), Mock()]):
+            small = whatsapp_service._get_bulk_session(4)
+            assert whatsapp_service._get_bulk_session(2) is small
+            large = whatsapp_service._get_bulk_session(16)
+
+        assert large is not small
+        small.close.assert_called_once()
+        large.close.assert_not_called()
+
+    def test_send_bulk_text_messages_recipient_mismatch(self, whatsapp_service):
+        with pytest.raises(ValueError):
+            whatsapp_service.send_bulk_text_messages([{"message": "Hola"}], recipient_ids=["1", "2"])
+
+    def test_mark_messages_as_read(self, whatsapp_service):
+        mock_session = Mock()
+        mock_session.post.return_value.json.return_value = {"success": True}
+
+        with patch('shared_code.whatsapp_service.requests.Session', return_value=mock_session):
+            results = whatsapp_service.mark_messages_as_read(["m1", "m2"], max_concurrency=2)
+
+        assert results == [{"success": True}, {"success": True}]
+        sent_ids = sorted(call.kwargs["json"]["message_id"] for call in mock_session.post.call_args_list)
+        assert sent_ids == ["m1", "m2"]
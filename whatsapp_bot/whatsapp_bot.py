@@ -933,7 +933,7 @@ class WhatsAppBot:
             # Generar embedding de la consulta
             query_embedding = self.openai_service.generate_embedding(query)
             
-            if not query_embedding:
+            if query_embedding is None or len(query_embedding) == 0:
                 return []
             
             # Buscar información similar en Redis
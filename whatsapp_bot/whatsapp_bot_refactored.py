@@ -7,7 +7,7 @@ para mejorar la modularidad, testabilidad y mantenibilidad del código.
 
 import azure.functions as func
 import logging
-import json
+import orjson
 import os
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
@@ -114,8 +114,8 @@ class WhatsAppBotRefactored:
             
             # Manejar mensajes (POST)
             if req.method == "POST":
-                # Obtener datos del request
-                body = req.get_json()
+                # Obtener datos del request (orjson en lugar del json de la stdlib)
+                body = orjson.loads(req.get_body() or b"null")
                 if not body:
                     return func.HttpResponse(
                         "Cuerpo de request inválido",
@@ -135,7 +135,7 @@ class WhatsAppBotRefactored:
                 response = self._handle_message(parsed_message)
                 
                 return func.HttpResponse(
-                    json.dumps(response),
+                    orjson.dumps(response),
                     mimetype="application/json",
                     status_code=200
                 )
@@ -156,7 +156,7 @@ class WhatsAppBotRefactored:
             )
             
             return func.HttpResponse(
-                json.dumps(error_response),
+                orjson.dumps(error_response),
                 mimetype="application/json",
                 status_code=500
             )
@@ -185,7 +185,7 @@ class WhatsAppBotRefactored:
             else:
                 logger.info(f"Evento no manejado: {event.event_type}")
                 return func.HttpResponse(
-                    json.dumps({"status": "ignored", "event_type": event.event_type}),
+                    orjson.dumps({"status": "ignored", "event_type": event.event_type}),
                     mimetype="application/json",
                     status_code=200
                 )
@@ -200,7 +200,7 @@ class WhatsAppBotRefactored:
             )
             
             return func.HttpResponse(
-                json.dumps(error_response),
+                orjson.dumps(error_response),
                 mimetype="application/json",
                 status_code=500
             )
@@ -229,7 +229,7 @@ class WhatsAppBotRefactored:
             if not phone_number:
                 logger.warning("No se pudo extraer número de teléfono del evento")
                 return func.HttpResponse(
-                    json.dumps({"status": "error", "message": "Phone number not found"}),
+                    orjson.dumps({"status": "error", "message": "Phone number not found"}),
                     mimetype="application/json",
                     status_code=400
                 )
@@ -243,7 +243,7 @@ class WhatsAppBotRefactored:
                 response = self._process_acs_unsupported_message(phone_number)
             
             return func.HttpResponse(
-                json.dumps(response),
+                orjson.dumps(response),
                 mimetype="application/json",
                 status_code=200
             )
@@ -255,7 +255,7 @@ class WhatsAppBotRefactored:
                 error_code="ACS_PROCESSING_ERROR"
             )
             return func.HttpResponse(
-                json.dumps(error_response),
+                orjson.dumps(error_response),
                 mimetype="application/json",
                 status_code=500
             )
@@ -379,7 +379,7 @@ class WhatsAppBotRefactored:
             logger.info(f"Delivery status update: {event_data}")
             
             return func.HttpResponse(
-                json.dumps({"status": "processed", "event_type": "delivery_status_update"}),
+                orjson.dumps({"status": "processed", "event_type": "delivery_status_update"}),
                 mimetype="application/json",
                 status_code=200
             )
@@ -391,7 +391,7 @@ class WhatsAppBotRefactored:
                 error_code="DELIVERY_STATUS_ERROR"
             )
             return func.HttpResponse(
-                json.dumps(error_response),
+                orjson.dumps(error_response),
                 mimetype="application/json",
                 status_code=500
             )
@@ -411,7 +411,7 @@ class WhatsAppBotRefactored:
             logger.info(f"Read status update: {event_data}")
             
             return func.HttpResponse(
-                json.dumps({"status": "processed", "event_type": "read_status_update"}),
+                orjson.dumps({"status": "processed", "event_type": "read_status_update"}),
                 mimetype="application/json",
                 status_code=200
             )
@@ -423,7 +423,7 @@ class WhatsAppBotRefactored:
                 error_code="READ_STATUS_ERROR"
             )
             return func.HttpResponse(
-                json.dumps(error_response),
+                orjson.dumps(error_response),
                 mimetype="application/json",
                 status_code=500
             )
@@ -538,8 +538,8 @@ class WhatsAppBotRefactored:
             user_data = self.user_service.get_user(sanitized_phone)
             
             if user_data:
-                # Usuario existe, actualizar última actividad
-                self.user_service.update_last_activity(sanitized_phone)
+                # Usuario existe, encolar la actualización de última actividad
+                self.user_service.schedule_last_activity(sanitized_phone)
                 return User.from_dict(user_data)
             else:
                 # Crear nuevo usuario
@@ -660,9 +660,9 @@ class WhatsAppBotRefactored:
             else:
                 services_health["redis_service"] = False
             
-            # Determinar estado general
+            # Determinar estado general (HealthStatus se evalúa como su campo ok)
             all_services_healthy = all(
-                health is True for health in services_health.values() 
+                bool(health) for health in services_health.values() 
                 if health is not None
             )
             
@@ -714,15 +714,15 @@ def main(req: Optional[func.HttpRequest] = None, event: Optional[func.EventGridE
         logger.error(traceback.format_exc())
         
         # Crear manejador de errores para respuesta
-        from shared_code.error_handler import ErrorHandler
-        error_handler = ErrorHandler()
+        from shared_code.error_handler import get_error_handler
+        error_handler = get_error_handler()
         error_response = error_handler.create_error_response(
             "Error interno del servidor",
             error_code="MAIN_FUNCTION_ERROR"
         )
         
         return func.HttpResponse(
-            json.dumps(error_response),
+            orjson.dumps(error_response),
             mimetype="application/json",
             status_code=500
         ) 
\ No newline at end of file